@@ -80,3 +80,10 @@ NICKNAME_MAX_LENGTH = 8
 
 PASSWORD_MIN_LENGTH = 8
 PASSWORD_MAX_LENGTH = 30
+
+
+# JWT 인증 시 캐시하는 User 필드 (account.entity_caches.authenticated_user_entity_cache)
+# 인증 후 request.user 에서 읽는 필드: id(view, 서비스), is_active(인증), user_status_id(raise_if_inaccessible), user_type_id(CMS 권한)
+# 여기에 없는 필드는 접근할 때마다 조회하기 때문에 request.user 에서 새 필드를 읽으면 추가합니다.
+# (account.test.test_authentication.AuthenticatedUserSnapshotFieldsTestCase)
+AUTHENTICATED_USER_SNAPSHOT_FIELDS = ('id', 'username', 'is_active', 'user_status_id', 'user_type_id')
@@ -0,0 +1,14 @@
+from account.constants import AUTHENTICATED_USER_SNAPSHOT_FIELDS
+from account.models import User
+from common_library import EntityCache
+
+
+# JWT 인증 시 username 으로 조회하는 User snapshot (AUTHENTICATED_USER_SNAPSHOT_FIELDS dict)
+authenticated_user_entity_cache = EntityCache(
+    'authenticated_user',
+    lambda username: User.objects.filter(
+        username=username,
+    ).values(
+        *AUTHENTICATED_USER_SNAPSHOT_FIELDS,
+    ).first(),
+)
@@ -45,6 +45,15 @@ class User(AbstractUser):
         managed = True
         db_table = 'account_user'
 
+    @classmethod
+    def from_snapshot(cls, snapshot: dict) -> 'User':
+        """
+        캐시된 일부 필드(snapshot)로 User 를 만듭니다.
+        snapshot 에 없는 필드는 deferred 필드로 접근 시 조회하며, save 시 snapshot 필드만 저장됩니다.
+        """
+        field_names = [field.attname for field in cls._meta.concrete_fields if field.attname in snapshot]
+        return cls.from_db('default', field_names, [snapshot[field_name] for field_name in field_names])
+
     def raise_if_inaccessible(self):
         if self.user_status_id != 1:
             raise UserStatusExceptionTypeSelector(self.user_status_id).selector()
@@ -0,0 +1,26 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from account.entity_caches import authenticated_user_entity_cache
+from account.models import User
+
+
+@receiver(pre_save, sender=User)
+def remember_previous_username(sender, instance, update_fields=None, **kwargs):
+    # username 이 바뀌는 경우 이전 username 의 캐시도 무효화 합니다.
+    if not instance.pk or (update_fields and 'username' not in update_fields):
+        return
+    instance._previous_username = sender.objects.filter(
+        pk=instance.pk,
+    ).values_list(
+        'username',
+        flat=True,
+    ).first()
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_authenticated_user(sender, instance, **kwargs):
+    authenticated_user_entity_cache.invalidate(instance.username)
+    previous_username = instance.__dict__.pop('_previous_username', None)
+    if previous_username and previous_username != instance.username:
+        authenticated_user_entity_cache.invalidate(previous_username)
@@ -0,0 +1,134 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import exceptions
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from account.models import User, UserType
+from common_library import clear_local_entity_caches, get_login_token
+from config.authorization.authentication import DefaultAuthentication
+from config.permissions.cms_permissions import CMSUserPermission
+from config.test_helper.helper import LOCMEM_CACHES
+from story.models import Sheet, Story
+
+
+@override_settings(CACHES=LOCMEM_CACHES, ENTITY_CACHE_LOCAL_MAX_SIZE=100)
+class DefaultAuthenticationTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        clear_local_entity_caches()
+        self.user = User.objects.create_user(username='jwt_user', password='secret', email='jwt_user@test.com')
+        self.token = get_login_token(self.user)
+
+    def tearDown(self):
+        clear_local_entity_caches()
+
+    def authenticate(self) -> User:
+        request = Request(APIRequestFactory().get('/', HTTP_AUTHORIZATION=f'JWT {self.token}'))
+        user, _ = DefaultAuthentication().authenticate(request)
+        return user
+
+    def test_authenticate_should_not_query_user_when_cached(self):
+        # Given: 인증된 적이 있는 유저
+        self.authenticate()
+
+        # When: 다시 인증합니다.
+        # Then: User 를 조회하지 않습니다.
+        with self.assertNumQueries(0):
+            user = self.authenticate()
+        self.assertEqual(user.id, self.user.id)
+        self.assertEqual(user.username, self.user.username)
+
+        # And: snapshot 에 없는 필드는 접근 시 조회합니다.
+        with self.assertNumQueries(1):
+            self.assertEqual(user.email, 'jwt_user@test.com')
+
+    def test_authenticate_should_fail_when_user_is_deactivated_after_cached(self):
+        # Given: 인증된 적이 있는 유저가 비활성화 됩니다.
+        self.authenticate()
+        self.user.is_active = False
+        self.user.save()
+
+        # When: 다시 인증합니다.
+        # Then: 인증 실패
+        with self.assertRaises(exceptions.AuthenticationFailed):
+            self.authenticate()
+
+    def test_authenticate_should_fail_when_user_is_deleted_after_cached(self):
+        # Given: 인증된 적이 있는 유저가 삭제됩니다.
+        self.authenticate()
+        self.user.delete()
+
+        # When: 다시 인증합니다.
+        # Then: 인증 실패
+        with self.assertRaises(exceptions.AuthenticationFailed):
+            self.authenticate()
+
+    def test_cms_user_permission_should_use_snapshot(self):
+        # Given: 인증된 적이 있는 일반 유저
+        request = Request(APIRequestFactory().get('/'))
+        request.user = self.authenticate()
+        self.assertFalse(CMSUserPermission().has_permission(request, None))
+
+        # When: CMS 유저로 바뀝니다.
+        self.user.user_type = UserType.objects.get(id=1)
+        self.user.save()
+        request.user = self.authenticate()
+
+        # Then: User 를 조회하지 않고 CMS 권한을 확인합니다.
+        with self.assertNumQueries(0):
+            self.assertTrue(CMSUserPermission().has_permission(request, None))
+
+    def test_snapshot_user_save_should_keep_other_fields(self):
+        # Given: 인증된 snapshot 유저
+        user = self.authenticate()
+
+        # When: snapshot 유저를 저장합니다.
+        user.save()
+
+        # Then: snapshot 에 없는 필드는 바뀌지 않습니다.
+        self.assertEqual(User.objects.get(id=self.user.id).email, 'jwt_user@test.com')
+
+
+@override_settings(CACHES=LOCMEM_CACHES, ENTITY_CACHE_LOCAL_MAX_SIZE=100)
+class AuthenticatedUserSnapshotFieldsTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        clear_local_entity_caches()
+        self.user = User.objects.create_user(username='jwt_user', password='secret', email='jwt_user@test.com')
+        self.story = Story.objects.create(author=self.user, title='test_story', description='test_description')
+        self.sheet = Sheet.objects.create(story=self.story, title='test_title', question='test_question', is_start=True)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'JWT {get_login_token(self.user)}')
+
+    def tearDown(self):
+        clear_local_entity_caches()
+
+    def test_views_should_not_load_deferred_user_fields(self):
+        # Given: 인증된 적이 있어 User snapshot 이 캐시된 유저
+        self.client.get(reverse('story:story_list'))
+        requests = [
+            ('get', reverse('story:story_list')),
+            ('get', reverse('story:story_detail', args=[self.story.id])),
+            ('get', reverse('story:story_play', args=[self.story.id])),
+            ('get', reverse('story:sheet_play', args=[self.sheet.id])),
+            ('get', reverse('story:solve_history', args=[self.story.id])),
+            ('post', reverse('story:story_like', args=[self.story.id])),
+            ('get', reverse('hint:sheet_hint', args=[self.sheet.id])),
+            ('get', reverse('point:user_point_info')),
+            ('get', reverse('cms_story:story_cms')),
+        ]
+        for method, url in requests:
+            # When: 인증이 필요한 API 를 요청합니다.
+            with CaptureQueriesContext(connection) as context:
+                getattr(self.client, method)(url)
+
+            # Then: AUTHENTICATED_USER_SNAPSHOT_FIELDS 외의 User 필드를 조회하지 않습니다.
+            deferred_user_queries = [
+                query['sql'] for query in context.captured_queries
+                if 'FROM "account_user" WHERE "account_user"."id" =' in query['sql']
+            ]
+            self.assertEqual(deferred_user_queries, [], url)
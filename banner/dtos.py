@@ -1,9 +1,10 @@
 import attr
 
 from banner.models import Banner
+from common_library import attrs_to_dict
 
 
-@attr.s
+@attr.s(slots=True)
 class BannerListItemDTO(object):
     id = attr.ib(type=int)
     title = attr.ib(type=str)
@@ -22,10 +23,10 @@ class BannerListItemDTO(object):
         )
 
     def to_dict(self):
-        return attr.asdict(self, recurse=True)
+        return attrs_to_dict(self)
 
 
-@attr.s
+@attr.s(slots=True)
 class BannerDetailItemDTO(object):
     id = attr.ib(type=int)
     title = attr.ib(type=str)
@@ -48,4 +49,4 @@ class BannerDetailItemDTO(object):
         )
 
     def to_dict(self):
-        return attr.asdict(self, recurse=True)
+        return attrs_to_dict(self)
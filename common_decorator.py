@@ -1,40 +1,49 @@
-from common_library import optional_key, mandatory_key, paging
+from common_library import ParameterExtractor, paging
 from config.common.exception_codes import LoginRequiredException
 
 
-def optionals(*keys):
+def optionals(*keys, types: dict = None):
+    """
+    keys 는 {key: 기본값} dict 이며, types 에 있는 key 는 값을 변환합니다. ex) @optionals({'size': 10}, types={'size': int})
+    """
     def decorate(func):
+        optional_defaults = {}
+        for arg in keys:
+            optional_defaults.update(arg)
+        parameter_extractor = ParameterExtractor(optional_defaults=optional_defaults, types=types)
+
         def wrapper(View, *args, **kwargs):
-            optional = dict()
-            for arg in keys:
-                for key, val in arg.items():
-                    data = optional_key(View.request, key, val)
-                    optional[key] = data
-            return func(View, o=optional, *args, **kwargs)
+            return func(View, o=parameter_extractor.extract_optionals(View.request), *args, **kwargs)
 
         return wrapper
 
     return decorate
 
 
-def mandatories(*keys):
+def mandatories(*keys, types: dict = None):
+    """
+    types 에 있는 key 는 값을 변환합니다. ex) @mandatories('sheet_id', 'answer', types={'sheet_id': int})
+    """
     def decorate(func):
+        parameter_extractor = ParameterExtractor(mandatory_keys=keys, types=types)
+
         def wrapper(View, *args, **kwargs):
-            mandatory = dict()
-            for key in keys:
-                data = mandatory_key(View.request, key)
-                mandatory[key] = data
-            return func(View, m=mandatory, *args, **kwargs)
+            return func(View, m=parameter_extractor.extract_mandatories(View.request), *args, **kwargs)
 
         return wrapper
 
     return decorate
 
 
-def pagination(default_size=10):
+def pagination(default_size=10, cursor=False):
+    """
+    cursor=True 이면 cursor 파라미터를 함께 넘깁니다. (cursor 파라미터가 없으면 None, 첫 페이지는 빈 문자열)
+    """
     def decorate(func):
         def wrapper(View, *args, **kwargs):
             start_row, end_row = paging(View.request, default_size)
+            if cursor:
+                kwargs['cursor'] = View.request.GET.get('cursor')
             return func(View, start_row=start_row, end_row=end_row, *args, **kwargs)
 
         return wrapper
@@ -1,32 +1,57 @@
+import attr
+import copy
 import json
+import logging
+import os
 import string
+import threading
+import time
 import uuid
 import boto3 as boto3
 import random
 import requests
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
 from botocore.config import Config
 from botocore.exceptions import ClientError
 
 from django.conf import settings
+from django.core import signing
+from django.core.exceptions import FieldDoesNotExist
 from django.core.mail import send_mail
 from django.core.cache import cache
-from django.db.models import QuerySet, Max
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import QuerySet, Max, Q
 from django.http import HttpRequest, JsonResponse
 from django.template.loader import render_to_string
 from django.utils.html import strip_tags
+from django_redis import get_redis_connection
 
 from rest_framework.exceptions import APIException
 from rest_framework_jwt.settings import api_settings
-from typing import Optional, Any, List
+from typing import Optional, Any, Callable, Dict, Iterable, List, Tuple
 
 from account.constants import SIGNUP_MACRO_EXPIRE_SECONDS
 from account.models import User
-from config.common.exception_codes import PageSizeMaximumException, MissingMandatoryParameterException
+from config.common.exception_codes import PageSizeMaximumException, MissingMandatoryParameterException, \
+    CursorInvalidException
+
+logger = logging.getLogger('django')
 
 jwt_payload_handler = api_settings.JWT_PAYLOAD_HANDLER
 jwt_encode_handler = api_settings.JWT_ENCODE_HANDLER
 jwt_decode_handler = api_settings.JWT_DECODE_HANDLER
 
+SLACK_WEBHOOK_TIMEOUT_SECONDS = 3
+SLACK_WEBHOOK_MAX_WORKERS = 8
+_slack_session = None
+
+ENTITY_CACHE_KEY = 'entity_cache:{name}:{entity_id}:{version}'
+ENTITY_CACHE_VERSION_KEY = 'entity_cache_version:{name}:{entity_id}'
+ENTITY_CACHE_INVALIDATION_CHANNEL = 'entity_cache_invalidation'
+
 
 def mandatory_key(request, name):
     try:
@@ -68,6 +93,54 @@ def optional_key(request, name, default_value=''):
     return data
 
 
+class ParameterExtractor(object):
+    """
+    @mandatories, @optionals 의 파라미터 추출기 (mandatory_key, optional_key 와 같은 값을 가져옵니다.)
+    데코레이터를 적용할 때 한번 만들어두고, 요청마다 파라미터를 가져올 곳(GET 이면 query string, 아니면 form/JSON body)을
+    한번만 정한 후 모든 key 를 한번에 읽습니다.
+    types 에 있는 key 는 값을 변환하며 (ex. {'sheet_id': int}), 변환할 수 없으면 MissingMandatoryParameterException 이 발생합니다.
+    """
+    def __init__(self, mandatory_keys: tuple = (), optional_defaults: dict = None, types: dict = None):
+        types = types or {}
+        self.mandatory_fields = tuple((key, types.get(key)) for key in mandatory_keys)
+        self.optional_fields = tuple((key, default, types.get(key)) for key, default in (optional_defaults or {}).items())
+
+    @staticmethod
+    def get_source(request) -> dict:
+        source = request.GET if request.method == 'GET' else request.data
+        return source if isinstance(source, dict) else {}
+
+    @staticmethod
+    def coerce(value: Any, value_type: Optional[type]) -> Any:
+        if value_type is None or isinstance(value, value_type):
+            return value
+        try:
+            return value_type(value)
+        except (TypeError, ValueError):
+            raise MissingMandatoryParameterException()
+
+    def extract_mandatories(self, request) -> dict:
+        source = self.get_source(request)
+        mandatory = {}
+        for key, value_type in self.mandatory_fields:
+            value = source.get(key)
+            if value is None or value == '':
+                raise MissingMandatoryParameterException()
+            mandatory[key] = self.coerce(value, value_type)
+        return mandatory
+
+    def extract_optionals(self, request) -> dict:
+        source = self.get_source(request)
+        optional = {}
+        for key, default_value, value_type in self.optional_fields:
+            value = source.get(key)
+            if value is None or value == '':
+                optional[key] = default_value
+            else:
+                optional[key] = self.coerce(value, value_type)
+        return optional
+
+
 def paging(request: HttpRequest, default_size: int = 10) -> tuple:
     try:
         page = int(request.GET.get('page', 1)) - 1
@@ -81,12 +154,189 @@ def paging(request: HttpRequest, default_size: int = 10) -> tuple:
     return start_row, end_row
 
 
+class CursorJSONSerializer(object):
+    """
+    cursor 값을 JSON 으로 직렬화합니다.
+    DjangoJSONEncoder 는 datetime 을 millisecond 까지만 남겨 같은 millisecond 의 row 를 건너뛰기 때문에,
+    datetime 은 microsecond 까지 isoformat 으로 저장하고 loads 시 datetime 으로 되돌립니다.
+    """
+    DATETIME_KEY = '__datetime__'
+
+    def dumps(self, obj):
+        return json.dumps(obj, separators=(',', ':'), default=self.default).encode('latin-1')
+
+    def loads(self, data):
+        return json.loads(data.decode('latin-1'), object_hook=self.object_hook)
+
+    @classmethod
+    def default(cls, value):
+        if isinstance(value, datetime):
+            return {cls.DATETIME_KEY: value.isoformat()}
+        return DjangoJSONEncoder().default(value)
+
+    @classmethod
+    def object_hook(cls, value: dict):
+        if len(value) == 1 and cls.DATETIME_KEY in value:
+            return datetime.fromisoformat(value[cls.DATETIME_KEY])
+        return value
+
+
+def get_keyset_ordering(order_by: str) -> List[str]:
+    """
+    order_by 가 같은 row 의 순서를 정하기 위해 id 를 같은 방향으로 붙입니다.
+    """
+    if order_by.lstrip('-') == 'id':
+        return [order_by]
+    return [order_by, '-id' if order_by.startswith('-') else 'id']
+
+
+def get_cursor_values(obj: Any, order_by: str) -> list:
+    return [getattr(obj, field_name.lstrip('-')) for field_name in get_keyset_ordering(order_by)]
+
+
+def encode_cursor(order_by: str, values: list) -> str:
+    return signing.dumps(
+        {'order_by': order_by, 'values': values},
+        salt='common_library.cursor',
+        serializer=CursorJSONSerializer,
+        compress=True,
+    )
+
+
+def decode_cursor(cursor: str, order_by: str) -> list:
+    """
+    서명이 틀리거나 다른 order_by 로 만든 cursor 이면 CursorInvalidException 이 발생합니다.
+    """
+    try:
+        payload = signing.loads(cursor, salt='common_library.cursor', serializer=CursorJSONSerializer)
+    except (signing.BadSignature, TypeError, ValueError):
+        raise CursorInvalidException()
+    if not isinstance(payload, dict) or payload.get('order_by') != order_by:
+        raise CursorInvalidException()
+    values = payload.get('values')
+    if not isinstance(values, list) or len(values) != len(get_keyset_ordering(order_by)):
+        raise CursorInvalidException()
+    return values
+
+
+def get_keyset_filter(order_by: str, values: list) -> Q:
+    """
+    (order_by, id) 가 cursor 값 다음인 row 조건
+    """
+    field_name = order_by.lstrip('-')
+    lookup = 'lt' if order_by.startswith('-') else 'gt'
+    if field_name == 'id':
+        return Q(**{f'id__{lookup}': values[0]})
+    value, last_id = values
+    return Q(**{f'{field_name}__{lookup}': value}) | Q(**{field_name: value, f'id__{lookup}': last_id})
+
+
+def keyset_paging(qs: QuerySet, cursor: str, size: int, order_by: str = '-id') -> Tuple[list, Optional[str]]:
+    """
+    cursor 기반 paging
+    OFFSET 대신 마지막 row 의 (order_by, id) 다음부터 가져오기 때문에 페이지 깊이와 관계없이 일정한 속도로 조회하고,
+    조회 중 row 가 추가되어도 건너뛰거나 중복되지 않습니다.
+    cursor 가 빈 문자열이면 첫 페이지를 가져오며, 다음 페이지가 없으면 next_cursor 는 None 입니다.
+    order_by 는 null 이 아닌 단일 필드나 annotate 한 값만 사용할 수 있습니다. (annotate 한 값은 null 이 아니어야 합니다.)
+    """
+    field_name = order_by.lstrip('-')
+    if field_name not in qs.query.annotations:
+        try:
+            if qs.model._meta.get_field(field_name).null:
+                raise CursorInvalidException()
+        except FieldDoesNotExist:
+            raise CursorInvalidException()
+
+    qs = qs.order_by(*get_keyset_ordering(order_by))
+    if cursor:
+        qs = qs.filter(get_keyset_filter(order_by, decode_cursor(cursor, order_by)))
+    rows = list(qs[:size + 1])
+    next_cursor = encode_cursor(order_by, get_cursor_values(rows[size - 1], order_by)) if len(rows) > size else None
+    return rows[:size], next_cursor
+
+
+def get_next_cursor(rows: list, size: int, order_by: str = '-id') -> Optional[str]:
+    """
+    page/size 로 가져온 목록에서 이어서 cursor 로 조회할 수 있도록 마지막 row 의 cursor 를 반환합니다.
+    """
+    if not rows or len(rows) < size:
+        return None
+    return encode_cursor(order_by, get_cursor_values(rows[-1], order_by))
+
+
+# attrs_to_dict 에서 변환하지 않고 그대로 넣는 필드 type
+ATTRS_TO_DICT_SCALAR_TYPES = (int, float, str, bool, datetime, date)
+_attrs_to_dict_scalar_types = frozenset(ATTRS_TO_DICT_SCALAR_TYPES + (type(None),))
+_attrs_to_dict_by_class = {}  # type: Dict[type, Callable[[Any], dict]]
+
+
+def convert_attrs_value(value: Any) -> Any:
+    """
+    attr.asdict(recurse=True) 와 같이 attrs 객체는 dict 로, list/tuple/set 은 list 로 변환합니다.
+    """
+    if type(value) in _attrs_to_dict_scalar_types:
+        return value
+    if attr.has(type(value)):
+        return attrs_to_dict(value)
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [
+            item if type(item) in _attrs_to_dict_scalar_types else convert_attrs_value(item)
+            for item in value
+        ]
+    if isinstance(value, dict):
+        return {
+            key: item if type(item) in _attrs_to_dict_scalar_types else convert_attrs_value(item)
+            for key, item in value.items()
+        }
+    return value
+
+
+def compile_attrs_to_dict(cls: type) -> Callable[[Any], dict]:
+    """
+    attrs class 의 필드로 dict literal 을 만드는 to_dict 함수를 생성합니다.
+    scalar type 필드는 값을 그대로 넣고, 나머지 필드만 convert_attrs_value 로 변환합니다.
+    """
+    items = []
+    for field in attr.fields(cls):
+        if field.type in ATTRS_TO_DICT_SCALAR_TYPES:
+            items.append(f'{field.name!r}: dto.{field.name}')
+        else:
+            items.append(f'{field.name!r}: convert(dto.{field.name})')
+    namespace = {'convert': convert_attrs_value}
+    exec(f'def to_dict(dto):\n    return {{{", ".join(items)}}}', namespace)
+    return namespace['to_dict']
+
+
+def attrs_to_dict(dto: Any) -> dict:
+    """
+    attr.asdict(dto, recurse=True) 와 같은 결과를 class 별로 한번 생성한 to_dict 함수로 만듭니다.
+    """
+    to_dict = _attrs_to_dict_by_class.get(type(dto))
+    if to_dict is None:
+        to_dict = _attrs_to_dict_by_class[type(dto)] = compile_attrs_to_dict(type(dto))
+    return to_dict(dto)
+
+
 def get_login_token(user: User) -> str:
     payload = jwt_payload_handler(user)
     token = jwt_encode_handler(payload)
     return token
 
 
+def only_model_fields(qs: QuerySet, model_fields: Iterable[str], *extra_fields: str) -> QuerySet:
+    """
+    DTO 의 MODEL_FIELDS 처럼 사용할 필드만 조회하도록 only 를 적용합니다.
+    'author__nickname' 처럼 관계 필드가 있으면 해당 관계를 select_related 합니다.
+    extra_fields 는 정렬/cursor 등 DTO 밖에서 사용하는 필드입니다.
+    나머지 필드는 deferred 되어 접근 시 row 마다 추가 query 가 발생하므로, DTO 가 사용하는 필드는 모두 선언되어야 합니다.
+    """
+    fields = list(model_fields) + list(extra_fields)
+    related_names = sorted({field.rsplit('__', 1)[0] for field in fields if '__' in field})
+    if related_names:
+        qs = qs.select_related(*related_names)
+    return qs.only(*fields)
+
+
 def get_max_int_from_queryset(qs: QuerySet, field_name: str) -> Optional[int]:
     return qs.aggregate(_max=Max(field_name)).get('_max')
 
@@ -175,6 +425,10 @@ def generate_str_value_by_key_to_cache(key: str, value: (str, int), expire_secon
     cache.set(key, value, expire_seconds)
 
 
+def generate_value_by_key_to_cache(key: str, value: Any, expire_seconds: int) -> None:
+    cache.set(key, value, expire_seconds)
+
+
 def get_cache_value_by_key(key: str) -> Any:
     return cache.get(key)
 
@@ -183,6 +437,95 @@ def delete_cache_value_by_key(key: str) -> None:
     cache.delete(key)
 
 
+def acquire_cache_lock(key: str, expire_seconds: int) -> Optional[str]:
+    """
+    lock 을 얻으면 lock token 을, 다른 곳에서 lock 을 가지고 있으면 None 을 반환합니다.
+    """
+    lock_token = uuid.uuid4().hex
+    return lock_token if cache.add(key, lock_token, expire_seconds) else None
+
+
+def renew_cache_lock(key: str, lock_token: str, expire_seconds: int) -> bool:
+    """
+    lock_token 으로 잡은 lock 이 아직 유지되고 있으면 만료 시간을 연장합니다.
+    """
+    return cache.get(key) == lock_token and cache.touch(key, expire_seconds)
+
+
+def release_cache_lock(key: str, lock_token: str) -> None:
+    """
+    lock 이 만료된 후 다른 곳에서 잡은 lock 은 지우지 않습니다.
+    """
+    if cache.get(key) == lock_token:
+        cache.delete(key)
+
+
+def get_or_generate_cache_value_by_key(
+        key: str,
+        generate_value: Callable[[], Any],
+        expire_seconds: int,
+        stale_seconds: int = 0,
+        lock_seconds: int = 10,
+        lock_wait_seconds: float = 1.0,
+) -> Any:
+    """
+    캐시 값을 가져오고, 없거나 expire_seconds 가 지났으면 generate_value 로 생성하여 캐시합니다.
+    single-flight: 생성은 lock 을 얻은 한 요청만 하고, 다른 요청은 stale 값을 반환하거나 생성될 때까지 기다립니다.
+    stale-while-revalidate: expire_seconds 가 지난 값은 stale_seconds 동안 남겨두고, 재생성 중에는 stale 값을 반환합니다.
+    lock_wait_seconds 동안 기다려도 값이 없으면 직접 생성합니다.
+    """
+    cached = cache.get(key)
+    if cached is not None and cached['fresh_until'] > time.time():
+        return cached['value']
+
+    lock_key = f'{key}:lock'
+    if cache.add(lock_key, 1, lock_seconds):
+        try:
+            value = generate_value()
+            cache.set(
+                key,
+                {'value': value, 'fresh_until': time.time() + expire_seconds},
+                expire_seconds + stale_seconds,
+            )
+            return value
+        finally:
+            cache.delete(lock_key)
+
+    if cached is not None:
+        return cached['value']
+
+    wait_until = time.time() + lock_wait_seconds
+    while time.time() < wait_until:
+        time.sleep(0.05)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached['value']
+    return generate_value()
+
+
+def get_cache_version_by_key(key: str) -> int:
+    """
+    캐시 key 에 붙일 version 을 가져옵니다.
+    version 이 캐시에서 지워진 후 다시 생성되어도 이전 version 과 겹치지 않도록 현재 시간(ns)으로 시작합니다.
+    """
+    version = cache.get(key)
+    if version is None:
+        initial_version = time.time_ns()
+        cache.add(key, initial_version, None)
+        version = cache.get(key, initial_version)
+    return version
+
+
+def increase_cache_version_by_key(key: str) -> int:
+    """
+    version 을 올려 이전 version 으로 만든 캐시를 모두 사용하지 않게 합니다. (이전 캐시는 만료 시 삭제됩니다.)
+    """
+    try:
+        return cache.incr(key)
+    except ValueError:
+        return get_cache_version_by_key(key)
+
+
 def increase_cache_int_value_by_key(key: str) -> int:
     try:
         return cache.incr(key)
@@ -195,6 +538,174 @@ def increase_cache_int_value_by_key(key: str) -> int:
         return 1
 
 
+class LocalLRUCache(object):
+    """
+    프로세스 로컬 LRU 캐시
+    max_size 를 넘으면 가장 오래 사용하지 않은 값부터 지우고, expire_seconds 가 지난 값은 조회 시 지웁니다.
+    """
+    def __init__(self):
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, key: Any) -> Optional[dict]:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at <= time.monotonic():
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return value
+
+    def set(self, key: Any, value: dict, max_size: int, expire_seconds: int) -> None:
+        with self._lock:
+            self._items[key] = (value, time.monotonic() + expire_seconds)
+            self._items.move_to_end(key)
+            while len(self._items) > max_size:
+                self._items.popitem(last=False)
+
+    def delete(self, key: Any) -> None:
+        with self._lock:
+            self._items.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+
+class EntityCache(object):
+    """
+    id 로 조회하는 row 의 2단계 read-through 캐시 (프로세스 로컬 LRU -> 캐시(Redis) -> DB)
+    id 는 int 또는 str 이며, load 는 id 로 객체를 가져오는 함수이고 없으면 None 을 반환합니다. (None 도 캐시합니다.)
+    캐시(Redis) key 에는 id 별 version 을 붙여, 무효화 시 version 을 올려 이전 값을 사용하지 않습니다.
+    DB 에서 읽은 후 무효화 전에 이전 값을 저장하더라도 이전 version 의 key 에 저장되기 때문에 사용되지 않습니다.
+    무효화는 Redis pub/sub 으로 전달되어 모든 프로세스의 로컬 LRU 에서 지워집니다.
+    메시지를 놓친 경우를 위해 로컬 값은 settings.ENTITY_CACHE_LOCAL_SECONDS 후 만료됩니다.
+    반환 값은 캐시된 객체의 복사본입니다.
+    """
+    def __init__(self, name: str, load: Callable[[Any], Any]):
+        self.name = name
+        self.load = load
+        self.local_cache = LocalLRUCache()
+        _entity_cache_by_name[name] = self
+
+    def get(self, entity_id: (int, str)) -> Any:
+        local_max_size = settings.ENTITY_CACHE_LOCAL_MAX_SIZE
+        if local_max_size:
+            _entity_cache_invalidation_subscriber.start()
+            cached = self.local_cache.get(entity_id)
+            if cached is not None:
+                return copy.copy(cached['value'])
+
+        version = get_cache_version_by_key(ENTITY_CACHE_VERSION_KEY.format(name=self.name, entity_id=entity_id))
+        cache_key = ENTITY_CACHE_KEY.format(name=self.name, entity_id=entity_id, version=version)
+        cached = get_cache_value_by_key(cache_key)
+        if cached is None:
+            cached = {'value': self.load(entity_id)}
+            generate_value_by_key_to_cache(cache_key, cached, settings.ENTITY_CACHE_SECONDS)
+
+        if local_max_size:
+            self.local_cache.set(entity_id, cached, local_max_size, settings.ENTITY_CACHE_LOCAL_SECONDS)
+        return copy.copy(cached['value'])
+
+    def invalidate(self, *entity_ids: (int, str)) -> None:
+        """
+        transaction 안에서 호출되면 commit 후 한번 더 무효화 하여,
+        commit 전에 다른 요청이 이전 값을 다시 캐시한 경우도 지웁니다.
+        """
+        entity_ids = [entity_id for entity_id in entity_ids if entity_id]
+        if not entity_ids:
+            return
+        self._invalidate(entity_ids)
+        if transaction.get_connection().in_atomic_block:
+            transaction.on_commit(lambda: self._invalidate(entity_ids))
+
+    def _invalidate(self, entity_ids: list) -> None:
+        for entity_id in entity_ids:
+            self.local_cache.delete(entity_id)
+            increase_cache_version_by_key(ENTITY_CACHE_VERSION_KEY.format(name=self.name, entity_id=entity_id))
+        try:
+            get_redis_connection('default').publish(
+                ENTITY_CACHE_INVALIDATION_CHANNEL,
+                json.dumps({'name': self.name, 'entity_ids': entity_ids}),
+            )
+        except NotImplementedError:
+            pass
+
+
+_entity_cache_by_name = {}  # type: Dict[str, EntityCache]
+
+
+def clear_local_entity_caches() -> None:
+    for entity_cache in _entity_cache_by_name.values():
+        entity_cache.local_cache.clear()
+
+
+def handle_entity_cache_invalidation_message(data: (bytes, str)) -> None:
+    """
+    {"name": 캐시 이름, "entity_ids": id 목록} 형식의 무효화 메시지로 로컬 LRU 의 값을 지웁니다.
+    """
+    message = json.loads(data)
+    entity_cache = _entity_cache_by_name.get(message['name'])
+    if not entity_cache:
+        return
+    for entity_id in message['entity_ids']:
+        entity_cache.local_cache.delete(entity_id)
+
+
+class EntityCacheInvalidationSubscriber(object):
+    """
+    프로세스마다 무효화 channel 을 구독하는 daemon thread 를 하나 실행합니다.
+    fork 된 worker 에서는 thread 가 없기 때문에 pid 가 바뀌면 다시 실행합니다.
+    기본 캐시가 django_redis 가 아니면 같은 프로세스에서만 무효화 됩니다.
+    """
+    def __init__(self):
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            try:
+                client = get_redis_connection('default')
+            except NotImplementedError:
+                return
+            clear_local_entity_caches()
+            threading.Thread(
+                target=self._listen,
+                args=(client,),
+                name='entity-cache-invalidation',
+                daemon=True,
+            ).start()
+
+    @staticmethod
+    def _listen(client) -> None:
+        while True:
+            try:
+                pubsub = client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(ENTITY_CACHE_INVALIDATION_CHANNEL)
+                # 구독이 끊긴 동안의 무효화 메시지를 놓쳤을 수 있으므로 로컬 값을 모두 지웁니다.
+                clear_local_entity_caches()
+                for message in pubsub.listen():
+                    handle_entity_cache_invalidation_message(message['data'])
+            except Exception:
+                logger.exception('entity cache invalidation subscriber error')
+                clear_local_entity_caches()
+                time.sleep(1)
+
+
+_entity_cache_invalidation_subscriber = EntityCacheInvalidationSubscriber()
+
+
 class ValidationErrorContext(dict):
     def add_error(self, field, error):
         value = self.setdefault(field, [])
@@ -249,16 +760,51 @@ class PayloadValidator(object):
         self._validate_payloads_type()
 
 
-def notify_slack(channel_url: str, text: str):
+def _get_slack_session() -> requests.Session:
+    """
+    Slack webhook 전송용 connection pool 을 재사용하는 Session
+    """
+    global _slack_session
+    if _slack_session is None:
+        _slack_session = requests.Session()
+        _slack_session.mount(
+            'https://',
+            requests.adapters.HTTPAdapter(pool_connections=SLACK_WEBHOOK_MAX_WORKERS, pool_maxsize=SLACK_WEBHOOK_MAX_WORKERS),
+        )
+    return _slack_session
+
+
+def notify_slack(channel_url: str, text: str, timeout: float = SLACK_WEBHOOK_TIMEOUT_SECONDS):
     payload = json.dumps({
         'text': text,
     })
-    requests.post(
+    _get_slack_session().post(
         url=channel_url,
         data=payload,
+        timeout=timeout,
     )
 
 
+def notify_slack_channels(channel_urls: List[str], text: str) -> int:
+    """
+    여러 Slack webhook 에 thread pool 로 동시에 전송합니다.
+    실패한 webhook 은 로그만 남기고, 성공한 개수를 반환합니다.
+    """
+    if not channel_urls:
+        return 0
+
+    def _notify(channel_url: str) -> bool:
+        try:
+            notify_slack(channel_url=channel_url, text=text)
+        except requests.RequestException as e:
+            logger.error(f'slack webhook 전송 실패 {channel_url}: {e}')
+            return False
+        return True
+
+    with ThreadPoolExecutor(max_workers=min(len(channel_urls), SLACK_WEBHOOK_MAX_WORKERS)) as executor:
+        return sum(executor.map(_notify, channel_urls))
+
+
 def create_sqs_event(queue_url: str, event_data: dict):
     sqs = boto3.client(
         'sqs',
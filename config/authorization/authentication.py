@@ -6,6 +6,8 @@ from rest_framework import exceptions
 from rest_framework.authentication import SessionAuthentication, get_authorization_header
 from rest_framework_jwt.settings import api_settings
 
+from account.entity_caches import authenticated_user_entity_cache
+
 jwt_decode_handler = api_settings.JWT_DECODE_HANDLER
 jwt_get_username_from_payload = api_settings.JWT_PAYLOAD_GET_USERNAME_HANDLER
 
@@ -69,6 +71,13 @@ class DefaultAuthentication(SessionAuthentication):
         return '{0} realm="{1}"'.format(api_settings.JWT_AUTH_HEADER_PREFIX, self.www_authenticate_realm)
 
     def authenticate_credentials(self, payload):
+        """
+        매 요청마다 User 를 조회하지 않도록 username 으로 캐시된 User snapshot 으로 인증합니다.
+        반환되는 User 는 snapshot 필드(AUTHENTICATED_USER_SNAPSHOT_FIELDS) 외의 필드는 접근 시 조회합니다.
+        snapshot 은 token 이 아닌 User row 의 값이기 때문에 token 의 orig_iat 는 key 에 넣지 않습니다.
+        token 의 서명, 만료는 캐시와 관계없이 매 요청 jwt_decode_handler 로 확인하고,
+        snapshot 값은 User save/delete 시 무효화되므로 (account.signals) 비활성화/삭제된 유저는 다음 요청부터 인증에 실패합니다.
+        """
         User = get_user_model()
         username = jwt_get_username_from_payload(payload)
 
@@ -76,14 +85,13 @@ class DefaultAuthentication(SessionAuthentication):
             msg = _('Invalid payload.')
             raise exceptions.AuthenticationFailed(msg)
 
-        try:
-            user = User.objects.get_by_natural_key(username)
-        except User.DoesNotExist:
+        snapshot = authenticated_user_entity_cache.get(username)
+        if not snapshot:
             msg = _('Invalid signature.')
             raise exceptions.AuthenticationFailed(msg)
 
-        if not user.is_active:
+        if not snapshot['is_active']:
             msg = _('User account is disabled.')
             raise exceptions.AuthenticationFailed(msg)
 
-        return user
+        return User.from_snapshot(snapshot)
@@ -7,6 +7,12 @@ class PageSizeMaximumException(APIException):
     default_code = 'page-size-maximum'
 
 
+class CursorInvalidException(APIException):
+    status_code = 400
+    default_detail = '유효하지 않은 cursor 입니다.'
+    default_code = 'cursor-invalid'
+
+
 class LoginFailedException(APIException):
     status_code = 400
     default_detail = '로그인에 실패했습니다.'
@@ -73,6 +79,18 @@ class SheetNotAccessibleException(APIException):
     default_code = 'sheet-not-accessible'
 
 
+class PopularStoryWindowInvalidException(APIException):
+    status_code = 400
+    default_detail = '유효하지 않은 인기 스토리 기간 입니다.'
+    default_code = 'popular-story-window-invalid'
+
+
+class SheetAlreadySolvedException(APIException):
+    status_code = 400
+    default_detail = '이미 문제를 해결한 기록이 있습니다.'
+    default_code = 'sheet-already-solved'
+
+
 class LoginRequiredException(APIException):
     status_code = 400
     default_detail = '로그인이 필요합니다.'
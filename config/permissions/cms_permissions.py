@@ -5,6 +5,7 @@ class CMSUserPermission(permissions.BasePermission):
     message = 'No Auth'
 
     def has_permission(self, request, view):
+        # JWT 인증 유저는 캐시된 snapshot 의 user_type_id 를 사용하기 때문에 User 를 조회하지 않습니다.
         if request.user.is_anonymous:
             return False
         return request.user.user_type_id == 1
@@ -0,0 +1,23 @@
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# orjson 이 직렬화하지 못하는 값(Decimal, lazy 번역 문자열 등)과 datetime 은 DRF JSONEncoder 와 같은 형식으로 변환합니다.
+_json_encoder = JSONEncoder()
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    orjson 으로 응답을 직렬화하는 JSONRenderer
+    DRF JSONRenderer 의 기본 설정(UNICODE_JSON, COMPACT_JSON)과 같은 결과를 만들며,
+    datetime 도 DRF 와 같이 밀리초까지 변환하기 위해 OPT_PASSTHROUGH_DATETIME 으로 JSONEncoder 에 넘깁니다.
+    indent 를 요청한 경우(browsable API 등)는 DRF JSONRenderer 를 사용합니다.
+    """
+    options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        return orjson.dumps(data, default=_json_encoder.default, option=self.options)
@@ -110,9 +110,32 @@ REST_FRAMEWORK = {
         'rest_framework.authentication.BasicAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'config.renderers.json_renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     'EXCEPTION_HANDLER': 'config.middleware.api_exception.custom_exception_handler'
 }
 
+# 틀린 답(WrongAnswer) 저장 방식
+# True 이면 오답을 버퍼에 쌓고 flush_wrong_answer_buffer task/command 로 bulk_create 합니다.
+# False 이면 제출 시 바로 insert 합니다.
+WRONG_ANSWER_WRITE_BEHIND = False
+WRONG_ANSWER_BUFFER_CHUNK_SIZE = 500
+WRONG_ANSWER_BUFFER_MAX_LATENCY_SECONDS = 10
+WRONG_ANSWER_BUFFER_FLUSH_LOCK_SECONDS = 60
+
+# Story 순 조회수(view_count) 집계 bucket 크기, flush_story_view_count command 로 끝난 bucket 을 반영합니다.
+STORY_VIEW_BUCKET_SECONDS = 60 * 60
+STORY_VIEW_FLUSH_CHUNK_SIZE = 500
+STORY_VIEW_FLUSH_LOCK_SECONDS = 60 * 10
+
+# common_library.EntityCache (Story, Sheet, SheetHint 등 id 조회 캐시)
+# 캐시(Redis) 보관 시간, 프로세스 로컬 LRU 보관 시간과 캐시마다 최대 개수 (0 이면 로컬 LRU 를 사용하지 않습니다.)
+ENTITY_CACHE_SECONDS = 60 * 60 * 24
+ENTITY_CACHE_LOCAL_SECONDS = 60
+ENTITY_CACHE_LOCAL_MAX_SIZE = 1000
+
 LANGUAGE_CODE = 'en-us'
 
 TIME_ZONE = 'Asia/Seoul'
@@ -0,0 +1,12 @@
+from .development import *  # noqa: F401, F403
+
+
+# 테스트는 Redis 없이 프로세스 로컬 캐시로 캐시 경로까지 실행합니다.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+# 테스트마다 DB 가 rollback 되어 같은 id 가 다시 생성되기 때문에 테스트 시작 전에 캐시를 비웁니다.
+TEST_RUNNER = 'config.test_helper.runner.CacheClearingDiscoverRunner'
@@ -4,6 +4,13 @@ from django.test import Client
 from account.models import User, UserType
 
 
+LOCMEM_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+
 class LoginMixin(object):
     def login(self, user=None):
         user_logged_in.receivers = []
@@ -0,0 +1,23 @@
+import unittest
+
+from django.core.cache import cache
+from django.test.runner import DiscoverRunner
+
+from common_library import clear_local_entity_caches
+
+
+class CacheClearingTestResultMixin(object):
+    def startTest(self, test):
+        cache.clear()
+        clear_local_entity_caches()
+        super(CacheClearingTestResultMixin, self).startTest(test)
+
+
+class CacheClearingDiscoverRunner(DiscoverRunner):
+    """
+    테스트마다 DB 가 rollback 되어도 이전 테스트의 캐시 값이 남지 않도록 테스트 시작 전에 캐시와 로컬 LRU 를 비웁니다.
+    --debug-sql, --pdb 의 result class 에도 같이 적용합니다.
+    """
+    def get_resultclass(self):
+        resultclass = super(CacheClearingDiscoverRunner, self).get_resultclass() or unittest.TextTestResult
+        return type(f'CacheClearing{resultclass.__name__}', (CacheClearingTestResultMixin, resultclass), {})
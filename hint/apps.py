@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class HintConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'hint'
+
+    def ready(self):
+        from hint import signals  # noqa: F401
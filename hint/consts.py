@@ -1 +1,4 @@
 GIVE_USER_HINT_POINT = '힌트를 위해 포인트를 사용했습니다.'
+# 유저가 Sheet 에서 받은 SheetHint id 목록 캐시 (UserSheetHintHistory 저장 시 갱신)
+USER_SHEET_HINT_IDS_CACHE_KEY = 'user_sheet_hint_ids:{user_id}:{sheet_id}'
+USER_SHEET_HINT_IDS_CACHE_SECONDS = 60 * 60
@@ -1,9 +1,10 @@
 import attr
 
+from common_library import attrs_to_dict
 from hint.models import SheetHint
 
 
-@attr.s
+@attr.s(slots=True)
 class UserSheetHintInfoDTO(object):
     id = attr.ib(type=int)
     hint = attr.ib(type=str)
@@ -22,12 +23,12 @@ class UserSheetHintInfoDTO(object):
         )
 
     def to_dict(self):
-        return attr.asdict(self, recurse=True)
+        return attrs_to_dict(self)
 
 
-@attr.s
+@attr.s(slots=True)
 class UserSheetHintInfosResponse(object):
     user_sheet_hint_infos = attr.ib(type=list)
 
     def to_dict(self):
-        return attr.asdict(self, recurse=True)
+        return attrs_to_dict(self)
@@ -0,0 +1,20 @@
+from common_library import EntityCache
+from hint.models import SheetHint
+
+
+sheet_hint_entity_cache = EntityCache(
+    'sheet_hint',
+    lambda sheet_hint_id: SheetHint.objects.filter(id=sheet_hint_id).first(),
+)
+# Sheet id 로 조회하는 Sheet 의 SheetHint 목록 (삭제되지 않은 것만 sequence 순)
+sheet_hints_entity_cache = EntityCache(
+    'sheet_hints',
+    lambda sheet_id: list(
+        SheetHint.objects.filter(
+            sheet_id=sheet_id,
+            is_deleted=False,
+        ).order_by(
+            'sequence',
+        )
+    ),
+)
@@ -1,6 +1,8 @@
 from django.db import models
 
 from account.models import User
+from common_library import delete_cache_value_by_key, generate_value_by_key_to_cache, get_cache_value_by_key
+from hint.consts import USER_SHEET_HINT_IDS_CACHE_KEY, USER_SHEET_HINT_IDS_CACHE_SECONDS
 from story.models import Sheet
 
 
@@ -28,3 +30,36 @@ class UserSheetHintHistory(models.Model):
 
     def __str__(self):
         return f'{self.id}'
+
+    @classmethod
+    def get_user_sheet_hint_ids(cls, user_id: int, sheet_id: int) -> frozenset:
+        """
+        유저가 Sheet 에서 받은 SheetHint id 목록을 (유저, Sheet) 별로 캐시에 frozenset 으로 가지고 있습니다.
+        UserSheetHintHistory 저장 시 hint.signals 에서 다시 만들어 저장하고 (write-through), 삭제 시 무효화 합니다.
+        """
+        sheet_hint_ids = get_cache_value_by_key(USER_SHEET_HINT_IDS_CACHE_KEY.format(user_id=user_id, sheet_id=sheet_id))
+        if sheet_hint_ids is None:
+            sheet_hint_ids = cls.generate_user_sheet_hint_ids_cache(user_id, sheet_id)
+        return sheet_hint_ids
+
+    @classmethod
+    def generate_user_sheet_hint_ids_cache(cls, user_id: int, sheet_id: int) -> frozenset:
+        sheet_hint_ids = frozenset(
+            cls.objects.filter(
+                user_id=user_id,
+                sheet_hint__sheet_id=sheet_id,
+            ).values_list(
+                'sheet_hint_id',
+                flat=True,
+            )
+        )
+        generate_value_by_key_to_cache(
+            USER_SHEET_HINT_IDS_CACHE_KEY.format(user_id=user_id, sheet_id=sheet_id),
+            sheet_hint_ids,
+            USER_SHEET_HINT_IDS_CACHE_SECONDS,
+        )
+        return sheet_hint_ids
+
+    @classmethod
+    def delete_user_sheet_hint_ids_cache(cls, user_id: int, sheet_id: int) -> None:
+        delete_cache_value_by_key(USER_SHEET_HINT_IDS_CACHE_KEY.format(user_id=user_id, sheet_id=sheet_id))
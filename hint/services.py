@@ -12,6 +12,7 @@ from config.common.exception_codes import (
 )
 from hint.consts import GIVE_USER_HINT_POINT
 from hint.dtos import UserSheetHintInfoDTO
+from hint.entity_caches import sheet_hint_entity_cache, sheet_hints_entity_cache
 from hint.models import (
     SheetHint,
     UserSheetHintHistory,
@@ -20,61 +21,58 @@ from point.services import use_point
 
 
 def get_sheet_hint_infos(user_id: int, sheet_id: int) -> list:
-    sheet_hints = SheetHint.objects.filter(
-        sheet_id=sheet_id,
-        is_deleted=False,
-    ).order_by(
-        'sequence',
-    )
-    user_accessible_sheet_hint_ids = UserSheetHintHistory.objects.select_related(
-        'sheet_hint',
-    ).filter(
-        user_id=user_id,
-        sheet_hint__sheet_id=sheet_id,
-    ).values_list(
-        'sheet_hint_id',
-        flat=True,
-    )
-
-    user_available_sheet_hint_infos = []
-    for sheet_hint in sheet_hints:
-        user_available_sheet_hint_infos.append(
-            UserSheetHintInfoDTO.of(
-                sheet_hint=sheet_hint,
-                has_history=sheet_hint.id in user_accessible_sheet_hint_ids,
-            ).to_dict()
-        )
-    return user_available_sheet_hint_infos
+    """
+    Sheet 의 SheetHint 목록(sheet_hints_entity_cache)과 유저가 받은 SheetHint id 목록(캐시)으로 만들며,
+    캐시되어 있으면 조회하지 않습니다.
+    """
+    sheet_hints = sheet_hints_entity_cache.get(sheet_id) or []
+    if not sheet_hints:
+        return []
+    user_sheet_hint_ids = UserSheetHintHistory.get_user_sheet_hint_ids(user_id, sheet_id)
+    return [
+        UserSheetHintInfoDTO.of(
+            sheet_hint=sheet_hint,
+            has_history=sheet_hint.id in user_sheet_hint_ids,
+        ).to_dict()
+        for sheet_hint in sheet_hints
+    ]
 
 
-def give_sheet_hint_information(user_id: int, sheet_hint_id: int) -> SheetHint:
+def give_sheet_hint_information(user_id: int, sheet_hint_id: int, sheet_id: int = None) -> SheetHint:
+    """
+    sheet_id 가 있으면 해당 Sheet 의 SheetHint 인지 확인합니다.
+    유저가 받은 SheetHint id 목록 캐시는 UserSheetHintHistory 저장 후 hint.signals 에서 갱신합니다.
+    """
+    sheet_hint = get_available_sheet_hint(sheet_hint_id, sheet_id)
     with transaction.atomic():
-        user_sheet_hint_history, is_created = UserSheetHintHistory.objects.select_related(
-            'sheet_hint',
-        ).get_or_create(
+        _, is_created = UserSheetHintHistory.objects.get_or_create(
             user_id=user_id,
             sheet_hint_id=sheet_hint_id,
         )
         if not is_created:
+            # 이미 받은 힌트를 받지 않은 것으로 보여준 경우이므로 캐시를 다시 만들도록 지웁니다.
+            UserSheetHintHistory.delete_user_sheet_hint_ids_cache(user_id, sheet_hint.sheet_id)
             raise UserSheetHintHistoryAlreadyExists
 
         use_point(
             user_id=user_id,
-            point=user_sheet_hint_history.sheet_hint.point,
+            point=sheet_hint.point,
             description=GIVE_USER_HINT_POINT
         )
 
-    return user_sheet_hint_history.sheet_hint
+    return sheet_hint
 
 
-def get_available_sheet_hint(sheet_hint_id: int) -> SheetHint:
-    try:
-        return SheetHint.objects.get(
-            id=sheet_hint_id,
-            is_deleted=False,
-        )
-    except SheetHint.DoesNotExist:
+def get_available_sheet_hint(sheet_hint_id: int, sheet_id: int = None) -> SheetHint:
+    """
+    sheet_id 가 있으면 해당 Sheet 의 SheetHint 인지 확인합니다.
+    """
+    sheet_hint = sheet_hint_entity_cache.get(sheet_hint_id)
+    if not sheet_hint or sheet_hint.is_deleted:
+        raise SheetHintDoesNotExists
+    if sheet_id is not None and sheet_hint.sheet_id != sheet_id:
         raise SheetHintDoesNotExists
+    return sheet_hint
 
 
 def get_available_sheet_hints_count(sheet_ids: List[int]) -> Dict[int, Optional[int]]:
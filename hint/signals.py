@@ -0,0 +1,50 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from hint.entity_caches import sheet_hint_entity_cache, sheet_hints_entity_cache
+from hint.models import SheetHint, UserSheetHintHistory
+
+
+@receiver(pre_save, sender=SheetHint)
+def remember_previous_sheet_id(sender, instance, update_fields=None, **kwargs):
+    # Sheet 가 바뀌는 경우 이전 Sheet 의 SheetHint 목록 캐시도 무효화 합니다.
+    if not instance.pk or (update_fields and 'sheet' not in update_fields):
+        return
+    instance._previous_sheet_id = sender.objects.filter(
+        pk=instance.pk,
+    ).values_list(
+        'sheet_id',
+        flat=True,
+    ).first()
+
+
+@receiver([post_save, post_delete], sender=SheetHint)
+def invalidate_sheet_hint_entity_cache(sender, instance, **kwargs):
+    sheet_hint_entity_cache.invalidate(instance.id)
+    sheet_hints_entity_cache.invalidate(instance.sheet_id)
+    previous_sheet_id = instance.__dict__.pop('_previous_sheet_id', None)
+    if previous_sheet_id and previous_sheet_id != instance.sheet_id:
+        sheet_hints_entity_cache.invalidate(previous_sheet_id)
+
+
+def get_sheet_id_by_sheet_hint_id(sheet_hint_id: int):
+    sheet_hint = sheet_hint_entity_cache.get(sheet_hint_id) if sheet_hint_id else None
+    return sheet_hint.sheet_id if sheet_hint else None
+
+
+@receiver(post_save, sender=UserSheetHintHistory)
+def write_through_user_sheet_hint_ids_cache(sender, instance, **kwargs):
+    # commit 후 DB 에서 다시 만들어 저장하여, rollback 된 힌트가 캐시에 남지 않도록 합니다.
+    user_id = instance.user_id
+    sheet_id = get_sheet_id_by_sheet_hint_id(instance.sheet_hint_id)
+    if not user_id or not sheet_id:
+        return
+    transaction.on_commit(lambda: UserSheetHintHistory.generate_user_sheet_hint_ids_cache(user_id, sheet_id))
+
+
+@receiver(post_delete, sender=UserSheetHintHistory)
+def delete_user_sheet_hint_ids_cache(sender, instance, **kwargs):
+    sheet_id = get_sheet_id_by_sheet_hint_id(instance.sheet_hint_id)
+    if instance.user_id and sheet_id:
+        UserSheetHintHistory.delete_user_sheet_hint_ids_cache(instance.user_id, sheet_id)
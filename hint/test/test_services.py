@@ -1,8 +1,10 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
 
 from account.models import User
+from common_library import clear_local_entity_caches
 from config.common.exception_codes import UserSheetHintHistoryAlreadyExists, SheetHintDoesNotExists, NotEnoughUserPoints
-from config.test_helper.helper import LoginMixin
+from config.test_helper.helper import LoginMixin, LOCMEM_CACHES
 from hint.models import SheetHint, UserSheetHintHistory
 from hint.services import get_sheet_hint_infos, give_sheet_hint_information, get_available_sheet_hint, \
     get_available_sheet_hints_count
@@ -87,6 +89,24 @@ class GetUserHistoryHintTestCase(LoginMixin, TestCase):
         # Then:
         self.assertEqual(self.start_sheet_hint.id, available_sheet_hint.id)
 
+    @override_settings(CACHES=LOCMEM_CACHES, ENTITY_CACHE_LOCAL_MAX_SIZE=100)
+    def test_get_available_sheet_hint_should_reload_when_sheet_hint_is_changed(self):
+        # Given: SheetHint 가 캐시되어 있습니다.
+        cache.clear()
+        clear_local_entity_caches()
+        get_available_sheet_hint(self.start_sheet_hint.id)
+        with self.assertNumQueries(0):
+            get_available_sheet_hint(self.start_sheet_hint.id)
+
+        # When: SheetHint 가 삭제됩니다.
+        self.start_sheet_hint.is_deleted = True
+        self.start_sheet_hint.save()
+
+        # Then: 캐시가 무효화 되어 오류 반환
+        with self.assertRaises(SheetHintDoesNotExists):
+            get_available_sheet_hint(self.start_sheet_hint.id)
+        clear_local_entity_caches()
+
 
 class GiveUserHistoryHintTestCase(LoginMixin, TestCase):
     def setUp(self):
@@ -154,6 +174,127 @@ class GiveUserHistoryHintTestCase(LoginMixin, TestCase):
         self.assertFalse(UserSheetHintHistory.objects.filter(sheet_hint_id=self.start_sheet_hint.id, user_id=self.c.user.id).exists())
 
 
+@override_settings(CACHES=LOCMEM_CACHES, ENTITY_CACHE_LOCAL_MAX_SIZE=100)
+class SheetHintCacheTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        clear_local_entity_caches()
+        self.user = User.objects.all()[0]
+        self.story = Story.objects.create(
+            author=self.user,
+            title='test_story',
+            description='test_description',
+        )
+        self.start_sheet = Sheet.objects.create(
+            story=self.story,
+            title='test_title',
+            question='test_question',
+            is_start=True,
+        )
+        self.other_sheet = Sheet.objects.create(
+            story=self.story,
+            title='test_title',
+            question='test_question',
+        )
+        self.first_sheet_hint = SheetHint.objects.create(
+            sheet=self.start_sheet,
+            hint='first_hint',
+            image='first_image',
+            sequence=1,
+            point=0,
+        )
+        self.second_sheet_hint = SheetHint.objects.create(
+            sheet=self.start_sheet,
+            hint='second_hint',
+            image='second_image',
+            sequence=2,
+            point=0,
+        )
+        self.other_sheet_hint = SheetHint.objects.create(
+            sheet=self.other_sheet,
+            hint='other_hint',
+            sequence=1,
+            point=0,
+        )
+
+    def tearDown(self):
+        clear_local_entity_caches()
+
+    def test_get_sheet_hint_infos_should_not_query_when_cached(self):
+        # Given: SheetHint 목록과 유저가 받은 힌트 목록이 캐시되어 있습니다.
+        get_sheet_hint_infos(self.user.id, self.start_sheet.id)
+
+        # When: 다시 요청
+        # Then: 조회하지 않습니다.
+        with self.assertNumQueries(0):
+            sheet_hint_infos = get_sheet_hint_infos(self.user.id, self.start_sheet.id)
+        self.assertEqual([info['id'] for info in sheet_hint_infos], [self.first_sheet_hint.id, self.second_sheet_hint.id])
+        self.assertFalse(any(info['has_history'] for info in sheet_hint_infos))
+
+    def test_give_sheet_hint_information_should_write_through_user_sheet_hint_ids(self):
+        # Given: 캐시되어 있습니다.
+        get_sheet_hint_infos(self.user.id, self.start_sheet.id)
+
+        # When: 힌트를 받습니다.
+        with self.captureOnCommitCallbacks(execute=True):
+            give_sheet_hint_information(self.user.id, self.second_sheet_hint.id, self.start_sheet.id)
+
+        # Then: 캐시가 갱신되어 조회 없이 받은 힌트를 보여줍니다.
+        with self.assertNumQueries(0):
+            sheet_hint_infos = get_sheet_hint_infos(self.user.id, self.start_sheet.id)
+        self.assertEqual([info['has_history'] for info in sheet_hint_infos], [False, True])
+        self.assertEqual(sheet_hint_infos[1]['hint'], 'second_hint')
+
+    def test_give_sheet_hint_information_should_not_write_through_when_rollback(self):
+        # Given: 포인트가 부족한 힌트
+        self.second_sheet_hint.point = 10
+        self.second_sheet_hint.save()
+        get_sheet_hint_infos(self.user.id, self.start_sheet.id)
+
+        # When: 힌트를 받지 못합니다.
+        with self.captureOnCommitCallbacks(execute=True), self.assertRaises(NotEnoughUserPoints):
+            give_sheet_hint_information(self.user.id, self.second_sheet_hint.id, self.start_sheet.id)
+
+        # Then: 받지 않은 것으로 보여줍니다.
+        sheet_hint_infos = get_sheet_hint_infos(self.user.id, self.start_sheet.id)
+        self.assertFalse(any(info['has_history'] for info in sheet_hint_infos))
+
+    def test_give_sheet_hint_information_should_raise_error_when_sheet_hint_is_in_other_sheet(self):
+        # Expect: 다른 Sheet 의 힌트는 받을 수 없습니다.
+        with self.assertRaises(SheetHintDoesNotExists):
+            give_sheet_hint_information(self.user.id, self.other_sheet_hint.id, self.start_sheet.id)
+        self.assertFalse(UserSheetHintHistory.objects.filter(user_id=self.user.id).exists())
+
+    def test_get_sheet_hint_infos_should_reload_when_sheet_hint_is_changed(self):
+        # Given: 캐시되어 있습니다.
+        get_sheet_hint_infos(self.user.id, self.start_sheet.id)
+
+        # When: 힌트가 삭제되고, 다른 Sheet 의 힌트가 옮겨집니다.
+        self.first_sheet_hint.is_deleted = True
+        self.first_sheet_hint.save()
+        self.other_sheet_hint.sheet = self.start_sheet
+        self.other_sheet_hint.sequence = 3
+        self.other_sheet_hint.save()
+
+        # Then: 변경된 목록을 보여줍니다.
+        sheet_hint_infos = get_sheet_hint_infos(self.user.id, self.start_sheet.id)
+        self.assertEqual([info['id'] for info in sheet_hint_infos], [self.second_sheet_hint.id, self.other_sheet_hint.id])
+        # And: 이전 Sheet 의 목록도 무효화 됩니다.
+        self.assertEqual(get_sheet_hint_infos(self.user.id, self.other_sheet.id), [])
+
+    def test_get_sheet_hint_infos_should_reload_when_user_sheet_hint_history_is_deleted(self):
+        # Given: 힌트를 받았습니다.
+        with self.captureOnCommitCallbacks(execute=True):
+            give_sheet_hint_information(self.user.id, self.first_sheet_hint.id, self.start_sheet.id)
+        self.assertTrue(get_sheet_hint_infos(self.user.id, self.start_sheet.id)[0]['has_history'])
+
+        # When: 받은 기록이 삭제됩니다.
+        UserSheetHintHistory.objects.get(user_id=self.user.id, sheet_hint_id=self.first_sheet_hint.id).delete()
+
+        # Then: 받지 않은 것으로 보여줍니다.
+        self.assertFalse(get_sheet_hint_infos(self.user.id, self.start_sheet.id)[0]['has_history'])
+
+
 class GetAvailableSheetHintsCountTest(TestCase):
     def setUp(self):
         # Given: 초기 상태 설정
@@ -193,3 +193,24 @@ class SheetHintAPIViewViewTestCase(LoginMixin, TestCase):
         # Then:
         self.assertEqual(response.status_code, 400)
         self.assertEqual(content.get('message'), SheetHintDoesNotExists.default_detail)
+
+    def test_give_sheet_hint_to_user_api_should_raise_error_when_sheet_hint_is_in_other_sheet(self):
+        # Given: 다른 Sheet 의 sheet hint
+        normal_sheet_hint = SheetHint.objects.create(
+            sheet=self.normal_sheet,
+            hint='normal_sheet_hint',
+            sequence=1,
+            point=0,
+        )
+        data = {
+            'sheet_hint_id': normal_sheet_hint.id
+        }
+
+        # When: start_sheet hint 요청
+        response = self.c.post(reverse('hint:sheet_hint', args=[self.start_sheet.id]), data=data)
+        content = json.loads(response.content)
+
+        # Then:
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(content.get('message'), SheetHintDoesNotExists.default_detail)
+        self.assertFalse(UserSheetHintHistory.objects.filter(sheet_hint=normal_sheet_hint).exists())
@@ -4,7 +4,7 @@ from rest_framework.views import APIView
 from common_decorator import custom_login_required_for_method, mandatories
 from story.services import get_running_sheet
 from .dtos import UserSheetHintInfosResponse, UserSheetHintInfoDTO
-from .services import get_sheet_hint_infos, give_sheet_hint_information, get_available_sheet_hint
+from .services import get_sheet_hint_infos, give_sheet_hint_information
 
 
 class SheetHintAPIView(APIView):
@@ -18,15 +18,15 @@ class SheetHintAPIView(APIView):
         ).to_dict()
         return Response(user_sheet_hint_infos, status=200)
 
-    @mandatories('sheet_hint_id')
+    @mandatories('sheet_hint_id', types={'sheet_hint_id': int})
     @custom_login_required_for_method
     def post(self, request, sheet_id, m):
         get_running_sheet(sheet_id)
-        available_sheet_hint = get_available_sheet_hint(m['sheet_hint_id'])
 
         sheet_hint = give_sheet_hint_information(
             user_id=request.user.id,
-            sheet_hint_id=available_sheet_hint.id,
+            sheet_hint_id=m['sheet_hint_id'],
+            sheet_id=sheet_id,
         )
         sheet_hint_info = UserSheetHintInfoDTO.of(sheet_hint, True).to_dict()
         return Response(sheet_hint_info, status=200)
@@ -1,11 +1,12 @@
 import attr
 from typing import List
 
+from common_library import attrs_to_dict
 from payment.consts import ProductType
 from payment.models import PointProduct
 
 
-@attr.s
+@attr.s(slots=True)
 class PointPayReadyRequestDTO(object):
     product_id = attr.ib(type=int)
     partner_order_id = attr.ib(type=str)
@@ -14,10 +15,10 @@ class PointPayReadyRequestDTO(object):
     cid_secret = attr.ib(type=str, default=None)
 
     def to_dict(self):
-        return attr.asdict(self, recurse=True)
+        return attrs_to_dict(self)
 
 
-@attr.s
+@attr.s(slots=True)
 class KakaoPayReadyResponseDTO(object):
     tid = attr.ib(type=str)
     next_redirect_mobile_url = attr.ib(type=str)
@@ -30,20 +31,20 @@ class KakaoPayReadyResponseDTO(object):
         )
 
     def to_dict(self):
-        return attr.asdict(self, recurse=True)
+        return attrs_to_dict(self)
 
 
-@attr.s
+@attr.s(slots=True)
 class AdditionalPointProductItemDTO(object):
     description = attr.ib(type=str)
     price = attr.ib(type=str)
     point = attr.ib(type=str)
 
     def to_dict(self):
-        return attr.asdict(self, recurse=True)
+        return attrs_to_dict(self)
 
 
-@attr.s
+@attr.s(slots=True)
 class PointProductItemDTO(object):
     product_id = attr.ib(type=int)
     product_type = attr.ib(type=str)
@@ -93,4 +94,4 @@ class PointProductItemDTO(object):
         )
 
     def to_dict(self):
-        return attr.asdict(self, recurse=True)
+        return attrs_to_dict(self)
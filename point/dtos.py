@@ -1,9 +1,11 @@
 import attr
 
+from common_library import attrs_to_dict
 
-@attr.s
+
+@attr.s(slots=True)
 class UserPointInfoResponseDTO(object):
     total_point = attr.ib(type=int)
 
     def to_dict(self):
-        return attr.asdict(self, recurse=True)
+        return attrs_to_dict(self)
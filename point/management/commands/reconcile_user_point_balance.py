@@ -0,0 +1,85 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Sum
+
+from account.models import User
+from point.models import UserPoint, UserPointBalance
+
+
+class Command(BaseCommand):
+    help = 'UserPointBalance 를 UserPoint 합계 기준으로 생성(backfill)하고 보정'
+
+    def add_arguments(self, parser):
+        # 키워드 인자 (named arguments)
+        parser.add_argument('-c', '--chunk-size', type=int, help='한번에 보정할 유저 수', default=1000)
+        parser.add_argument('--dry-run', action='store_true', help='보정하지 않고 없거나 어긋난 유저 수만 출력')
+
+    def handle(self, *args, **kwargs):
+        chunk_size = kwargs.get('chunk_size')
+        dry_run = kwargs.get('dry_run')
+
+        last_user_id = 0
+        missing_count = 0
+        drifted_count = 0
+        repaired_count = 0
+        while True:
+            user_ids = list(
+                User.objects.filter(
+                    id__gt=last_user_id,
+                ).values_list(
+                    'id',
+                    flat=True,
+                ).order_by(
+                    'id',
+                )[:chunk_size]
+            )
+            if not user_ids:
+                break
+            # 합계보다 먼저 읽어, 읽은 뒤 포인트가 바뀌면 아래 조건부 update 에서 제외되도록 합니다.
+            balance_by_user_id = dict(
+                UserPointBalance.objects.filter(
+                    user_id__in=user_ids,
+                ).values_list(
+                    'user_id',
+                    'balance',
+                )
+            )
+            total_point_by_user_id = dict(
+                UserPoint.objects.filter(
+                    user_id__in=user_ids,
+                    is_active=True,
+                ).values(
+                    'user_id',
+                ).annotate(
+                    total_point=Sum('point'),
+                ).values_list(
+                    'user_id',
+                    'total_point',
+                ).order_by()
+            )
+
+            for user_id in user_ids:
+                total_point = total_point_by_user_id.get(user_id, 0)
+                if user_id not in balance_by_user_id:
+                    # UserPoint 가 없는 유저는 처음 사용할 때 만듭니다.
+                    if not total_point:
+                        continue
+                    missing_count += 1
+                    if not dry_run:
+                        UserPointBalance.get_or_create_by_user_id(user_id)
+                    continue
+                balance = balance_by_user_id[user_id]
+                if balance == total_point:
+                    continue
+                drifted_count += 1
+                if dry_run:
+                    continue
+                # 읽은 뒤 다른 요청으로 값이 바뀌었으면 덮어쓰지 않고 다음 실행에서 보정합니다.
+                repaired_count += UserPointBalance.objects.filter(
+                    user_id=user_id,
+                    balance=balance,
+                ).update(
+                    balance=total_point,
+                )
+            last_user_id = user_ids[-1]
+
+        self.stdout.write(f'success: missing {missing_count}, drifted {drifted_count}, repaired {repaired_count}')
@@ -0,0 +1,23 @@
+# Generated by Django 3.2.14 on 2026-10-18 21:26
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0003_create_admin_account'),
+        ('point', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserPointBalance',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, serialize=False, to='account.user')),
+                ('balance', models.IntegerField(default=0, verbose_name='포인트 합계')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='수정일')),
+            ],
+        ),
+    ]
@@ -1,4 +1,8 @@
+from datetime import datetime
+
 from django.db import models
+from django.db.models import F, Sum
+from django.db.models.functions import Coalesce
 
 from account.models import User
 
@@ -13,3 +17,74 @@ class UserPoint(models.Model):
 
     def __str__(self):
         return f'{self.user} - {self.point} - is_active: {self.is_active}'
+
+    @property
+    def available_point(self) -> int:
+        return self.point if self.is_active else 0
+
+    @classmethod
+    def get_total_point(cls, user_id: int) -> int:
+        """
+        유저의 모든 UserPoint 를 합산합니다. (UserPointBalance 를 만들거나 검증할 때만 사용합니다.)
+        """
+        return cls.objects.filter(
+            user_id=user_id,
+            is_active=True,
+        ).aggregate(
+            total_point=Coalesce(Sum('point'), 0),
+        ).get(
+            'total_point'
+        )
+
+
+class UserPointBalance(models.Model):
+    """
+    유저의 포인트 합계 (is_active 인 UserPoint point 의 합)
+    UserPoint 저장/삭제 시 point.signals 에서 같은 transaction 으로 변경분을 더하며,
+    row 가 없으면 처음 사용할 때 UserPoint 합계로 만듭니다.
+    어긋난 합계는 reconcile_user_point_balance 로 보정합니다.
+    """
+    user = models.OneToOneField(User, on_delete=models.DO_NOTHING, primary_key=True)
+    balance = models.IntegerField(verbose_name='포인트 합계', default=0)
+    updated_at = models.DateTimeField(verbose_name='수정일', auto_now=True)
+
+    def __str__(self):
+        return f'{self.user_id} - {self.balance}'
+
+    @classmethod
+    def get_balance(cls, user_id: int) -> int:
+        balance = cls.objects.filter(
+            user_id=user_id,
+        ).values_list(
+            'balance',
+            flat=True,
+        ).first()
+        if balance is None:
+            return UserPoint.get_total_point(user_id)
+        return balance
+
+    @classmethod
+    def get_or_create_by_user_id(cls, user_id: int, for_update: bool = False) -> 'UserPointBalance':
+        """
+        for_update 이면 transaction 이 끝날 때까지 row 를 lock 합니다.
+        """
+        qs = cls.objects.select_for_update() if for_update else cls.objects
+        user_point_balance = qs.filter(user_id=user_id).first()
+        if user_point_balance:
+            return user_point_balance
+        cls.objects.get_or_create(
+            user_id=user_id,
+            defaults={'balance': UserPoint.get_total_point(user_id)},
+        )
+        return qs.get(user_id=user_id)
+
+    @classmethod
+    def increase_balance(cls, user_id: int, point: int) -> None:
+        if not point:
+            return
+        cls.objects.filter(
+            user_id=user_id,
+        ).update(
+            balance=F('balance') + point,
+            updated_at=datetime.now(),
+        )
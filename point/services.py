@@ -1,36 +1,39 @@
-from django.db.models import Sum
-from django.db.models.functions import Coalesce
+from django.db import transaction
 
 from config.common.exception_codes import NotEnoughUserPoints
-from point.models import UserPoint
+from point.models import UserPoint, UserPointBalance
 
 
 def get_user_available_total_point(user_id: int) -> int:
-    total_point = UserPoint.objects.filter(
-        user_id=user_id,
-        is_active=True
-    ).aggregate(
-        total_point=Coalesce(Sum('point'), 0)
-    ).get(
-        'total_point'
-    )
-    return max(total_point, 0)
+    """
+    UserPoint 를 합산하지 않고 UserPointBalance 를 조회합니다.
+    """
+    return max(UserPointBalance.get_balance(user_id), 0)
 
 
 def use_point(user_id: int, point: int, description: str):
-    total_point = get_user_available_total_point(user_id)
-    if total_point < point:
-        raise NotEnoughUserPoints
-    return UserPoint.objects.create(
-        user_id=user_id,
-        point=-point,
-        description=description,
-    )
+    """
+    UserPointBalance row 를 lock 한 후 확인하기 때문에, 동시에 사용해도 가진 포인트보다 많이 사용할 수 없습니다.
+    합계는 UserPoint 저장 시 point.signals 에서 차감합니다.
+    """
+    with transaction.atomic():
+        user_point_balance = UserPointBalance.get_or_create_by_user_id(user_id, for_update=True)
+        if user_point_balance.balance < point:
+            raise NotEnoughUserPoints
+        return UserPoint.objects.create(
+            user_id=user_id,
+            point=-point,
+            description=description,
+        )
 
 
 def give_point(user_id: int, point: int, description: str):
-    return UserPoint.objects.create(
-        user_id=user_id,
-        point=point,
-        description=description,
-    )
+    """
+    합계는 UserPoint 저장 시 point.signals 에서 같은 transaction 으로 더합니다.
+    """
+    with transaction.atomic():
+        return UserPoint.objects.create(
+            user_id=user_id,
+            point=point,
+            description=description,
+        )
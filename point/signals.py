@@ -0,0 +1,39 @@
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from point.models import UserPoint, UserPointBalance
+
+
+@receiver(pre_save, sender=UserPoint)
+def remember_previous_user_point(sender, instance, **kwargs):
+    # 변경분을 더하기 위해 저장 전 유저와 포인트를 기억하고, 합계 row 가 없으면 저장 전 UserPoint 합계로 만듭니다.
+    previous = sender.objects.filter(pk=instance.pk).first() if instance.pk else None
+    instance._previous_user_id_and_point = (previous.user_id, previous.available_point) if previous else (None, 0)
+    for user_id in {instance.user_id, previous.user_id if previous else None}:
+        if user_id:
+            UserPointBalance.get_or_create_by_user_id(user_id)
+
+
+@receiver(post_save, sender=UserPoint)
+def increase_user_point_balance(sender, instance, **kwargs):
+    previous_user_id, previous_point = instance.__dict__.pop('_previous_user_id_and_point', (None, 0))
+    if previous_user_id == instance.user_id:
+        if instance.user_id:
+            UserPointBalance.increase_balance(instance.user_id, instance.available_point - previous_point)
+        return
+    if previous_user_id:
+        UserPointBalance.increase_balance(previous_user_id, -previous_point)
+    if instance.user_id:
+        UserPointBalance.increase_balance(instance.user_id, instance.available_point)
+
+
+@receiver(pre_delete, sender=UserPoint)
+def create_user_point_balance_before_delete(sender, instance, **kwargs):
+    if instance.user_id:
+        UserPointBalance.get_or_create_by_user_id(instance.user_id)
+
+
+@receiver(post_delete, sender=UserPoint)
+def decrease_user_point_balance(sender, instance, **kwargs):
+    if instance.user_id:
+        UserPointBalance.increase_balance(instance.user_id, -instance.available_point)
@@ -0,0 +1,57 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from account.models import User
+from point.models import UserPoint, UserPointBalance
+from point.services import get_user_available_total_point, give_point
+
+
+class ReconcileUserPointBalanceCommandTestCase(TestCase):
+    def setUp(self):
+        self.users = [
+            User.objects.create_user(username=f'test_user{i}', password='secret', email=f'test_user{i}@example.com')
+            for i in range(2)
+        ]
+
+    def call_command(self, *args, **kwargs):
+        out = StringIO()
+        call_command(
+            'reconcile_user_point_balance',
+            *args,
+            stdout=out,
+            stderr=StringIO(),
+            **kwargs,
+        )
+        return out.getvalue()
+
+    def test_reconcile_user_point_balance(self):
+        # Given: users[0] 은 합계 row 가 없고 (backfill 전), users[1] 은 합계가 어긋나 있습니다.
+        give_point(self.users[0].id, 100, 'test')
+        give_point(self.users[1].id, 50, 'test')
+        UserPoint.objects.create(user=self.users[1], point=-20, description='test', is_active=False)
+        UserPointBalance.objects.filter(user_id=self.users[0].id).delete()
+        UserPointBalance.objects.filter(user_id=self.users[1].id).update(balance=999)
+
+        # When: 보정 실행
+        out = self.call_command(chunk_size=1)
+
+        # Then: UserPoint 합계로 생성/보정됩니다.
+        self.assertIn('missing 1, drifted 1, repaired 1', out)
+        self.assertEqual(UserPointBalance.objects.get(user_id=self.users[0].id).balance, 100)
+        self.assertEqual(UserPointBalance.objects.get(user_id=self.users[1].id).balance, 50)
+        # And: 다시 실행하면 어긋난 유저가 없습니다.
+        self.assertIn('missing 0, drifted 0, repaired 0', self.call_command())
+
+    def test_reconcile_user_point_balance_should_not_update_when_dry_run(self):
+        # Given: 어긋난 합계
+        give_point(self.users[0].id, 100, 'test')
+        UserPointBalance.objects.filter(user_id=self.users[0].id).update(balance=10)
+
+        # When: dry-run 으로 실행
+        out = self.call_command(dry_run=True)
+
+        # Then: 보정하지 않습니다.
+        self.assertIn('drifted 1, repaired 0', out)
+        self.assertEqual(get_user_available_total_point(self.users[0].id), 10)
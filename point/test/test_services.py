@@ -3,7 +3,7 @@ from django.test import TestCase
 from account.models import User
 from config.common.exception_codes import NotEnoughUserPoints
 from config.test_helper.helper import LoginMixin
-from point.models import UserPoint
+from point.models import UserPoint, UserPointBalance
 from point.services import get_user_available_total_point, use_point, give_point
 
 
@@ -84,3 +84,78 @@ class UserPointTestCase(LoginMixin, TestCase):
         self.assertEqual(user_point.user_id, self.user.id)
         self.assertEqual(user_point.description, description)
         self.assertEqual(user_point.point, point)
+
+
+class UserPointBalanceTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.all()[0]
+        self.other_user = User.objects.create_user(username='test_user', password='secret', email='test_user@example.com')
+
+    def test_give_point_and_use_point_should_update_balance(self):
+        # Given: 100 지급
+        give_point(self.user.id, 100, 'test')
+
+        # When: 30 사용
+        use_point(self.user.id, 30, 'test')
+
+        # Then: 합계 70
+        self.assertEqual(UserPointBalance.objects.get(user_id=self.user.id).balance, 70)
+
+    def test_get_user_available_total_point_should_query_once_regardless_of_history(self):
+        # Given: 포인트 기록이 많은 유저
+        for _ in range(20):
+            give_point(self.user.id, 10, 'test')
+
+        # Expect: UserPoint 를 합산하지 않고 한번만 조회합니다.
+        with self.assertNumQueries(1):
+            self.assertEqual(get_user_available_total_point(self.user.id), 200)
+
+    def test_use_point_should_not_create_user_point_when_balance_is_not_enough(self):
+        # Given: 100 지급
+        give_point(self.user.id, 100, 'test')
+
+        # When: 101 사용
+        with self.assertRaises(NotEnoughUserPoints):
+            use_point(self.user.id, 101, 'test')
+
+        # Then: 차감되지 않았습니다.
+        self.assertEqual(get_user_available_total_point(self.user.id), 100)
+        self.assertFalse(UserPoint.objects.filter(user_id=self.user.id, point__lt=0).exists())
+
+    def test_balance_should_follow_user_point_change_and_delete(self):
+        # Given: 100, 50 지급
+        user_point = give_point(self.user.id, 100, 'test')
+        give_point(self.user.id, 50, 'test')
+
+        # When: 100 을 비활성화
+        user_point.is_active = False
+        user_point.save()
+        # Then:
+        self.assertEqual(get_user_available_total_point(self.user.id), 50)
+
+        # When: 다시 활성화 후 다른 유저로 옮김
+        user_point.is_active = True
+        user_point.user = self.other_user
+        user_point.save()
+        # Then:
+        self.assertEqual(get_user_available_total_point(self.user.id), 50)
+        self.assertEqual(get_user_available_total_point(self.other_user.id), 100)
+
+        # When: 삭제
+        user_point.delete()
+        # Then:
+        self.assertEqual(get_user_available_total_point(self.other_user.id), 0)
+
+    def test_balance_should_be_created_from_user_point_when_not_exists(self):
+        # Given: 합계 row 가 없는 유저 (backfill 전)
+        give_point(self.user.id, 100, 'test')
+        UserPointBalance.objects.filter(user_id=self.user.id).delete()
+
+        # Expect: UserPoint 합계로 조회합니다.
+        self.assertEqual(get_user_available_total_point(self.user.id), 100)
+
+        # When: 사용
+        use_point(self.user.id, 40, 'test')
+
+        # Then: UserPoint 합계로 만든 후 차감합니다.
+        self.assertEqual(UserPointBalance.objects.get(user_id=self.user.id).balance, 60)
@@ -0,0 +1,85 @@
+import timeit
+from datetime import datetime
+
+import attr
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from config.renderers.json_renderers import FastJSONRenderer
+from story.cmd_dtos import CMSStorySheetMapItemDTO, CMSStorySheetMapResponse
+from story.dtos import GroupedSheetAnswerSolveDTO, StoryListItemDTO, UserSheetAnswerSolveHistoryItemDTO
+
+
+class Command(BaseCommand):
+    help = '응답 직렬화 비교 (attr.asdict + DRF JSONRenderer vs 생성한 to_dict + FastJSONRenderer), DB 를 사용하지 않습니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('-s', '--size', type=int, help='응답 목록 크기', default=30)
+        parser.add_argument('-n', '--number', type=int, help='측정 반복 횟수', default=2000)
+
+    def handle(self, *args, **kwargs):
+        size = kwargs.get('size')
+        number = kwargs.get('number')
+
+        story_list_items = [
+            StoryListItemDTO(
+                id=index,
+                title=f'스토리 {index}',
+                description='스토리 설명' * 10,
+                image='https://image.test',
+                background_image='https://image.test',
+            ) for index in range(size)
+        ]
+        solve_history_items = [
+            UserSheetAnswerSolveHistoryItemDTO(
+                group_id=index // 5,
+                sheet_title=f'Sheet {index}',
+                sheet_question='질문' * 10,
+                user_answer='정답',
+                solving_status='solved',
+                start_time=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                solved_time=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            ) for index in range(size)
+        ]
+        sheet_map_response = CMSStorySheetMapResponse(
+            sheets=[
+                CMSStorySheetMapItemDTO(
+                    id=index,
+                    title=f'Sheet {index}',
+                    question='질문' * 10,
+                    image='https://image.test',
+                    background_image='https://image.test',
+                    hint_count=3,
+                    answer_ids=list(range(index, index + 5)),
+                ) for index in range(size)
+            ],
+        )
+
+        json_renderer = JSONRenderer()
+        fast_json_renderer = FastJSONRenderer()
+        payloads = {
+            'story list': (
+                lambda: json_renderer.render({'stories': [attr.asdict(item, recurse=True) for item in story_list_items]}),
+                lambda: fast_json_renderer.render({'stories': [item.to_dict() for item in story_list_items]}),
+            ),
+            'solve history': (
+                lambda: json_renderer.render(
+                    [attr.asdict(item, recurse=True) for item in GroupedSheetAnswerSolveDTO.from_histories(solve_history_items)]
+                ),
+                lambda: fast_json_renderer.render(
+                    [item.to_dict() for item in GroupedSheetAnswerSolveDTO.from_histories(solve_history_items)]
+                ),
+            ),
+            'cms sheet map': (
+                lambda: json_renderer.render(attr.asdict(sheet_map_response, recurse=True)),
+                lambda: fast_json_renderer.render(sheet_map_response.to_dict()),
+            ),
+        }
+
+        self.stdout.write(f'{"payload":>15} {"asdict+drf(us)":>16} {"to_dict+fast(us)":>18}')
+        for name, (render_by_asdict, render_by_to_dict) in payloads.items():
+            asdict_seconds = timeit.timeit(render_by_asdict, number=number)
+            to_dict_seconds = timeit.timeit(render_by_to_dict, number=number)
+            self.stdout.write(
+                f'{name:>15} {asdict_seconds / number * 1000000:>16.2f} {to_dict_seconds / number * 1000000:>18.2f}'
+            )
@@ -0,0 +1,66 @@
+import random
+import timeit
+
+from django.core.management.base import BaseCommand
+
+from story.dtos import SheetAnswerResponseDTO
+from story.helpers import NextSheetPathSampler
+
+
+def legacy_sample(answer_responses: list):
+    """
+    기존 방식: quantity 만큼 복제 후 셔플하여 첫번째 값 선택
+    """
+    quantity_next_sheet_id_and_next_sheet_path_ids = []
+    for answer_response in answer_responses:
+        if answer_response.next_sheet_quantity:
+            quantity_next_sheet_id_and_next_sheet_path_ids += [
+                [
+                    answer_response.id,
+                    answer_response.next_sheet_path_id,
+                    answer_response.next_sheet_id,
+                ]
+            ] * answer_response.next_sheet_quantity
+    random.shuffle(quantity_next_sheet_id_and_next_sheet_path_ids)
+    return next(iter(quantity_next_sheet_id_and_next_sheet_path_ids), (None, None, None))
+
+
+class Command(BaseCommand):
+    help = 'NextSheetPath 가중치 선택 기존 방식(복제+셔플)과 NextSheetPathSampler 비교'
+
+    def add_arguments(self, parser):
+        parser.add_argument('-p', '--paths', type=int, help='정답 당 경로 개수', default=3)
+        parser.add_argument('-n', '--number', type=int, help='측정 반복 횟수', default=1000)
+        parser.add_argument(
+            '-q',
+            '--quantities',
+            type=int,
+            nargs='+',
+            help='측정할 경로 당 quantity 목록',
+            default=[1, 100, 10000],
+        )
+
+    def handle(self, *args, **kwargs):
+        paths = kwargs.get('paths')
+        number = kwargs.get('number')
+
+        self.stdout.write(f'{"quantity":>10} {"legacy(us)":>12} {"sampler(us)":>12}')
+        for quantity in kwargs.get('quantities'):
+            answer_responses = [
+                SheetAnswerResponseDTO(
+                    id=1,
+                    answer='answer',
+                    answer_reply='',
+                    is_always_correct=False,
+                    next_sheet_path_id=index,
+                    next_sheet_id=index,
+                    next_sheet_quantity=quantity,
+                ) for index in range(1, paths + 1)
+            ]
+            next_sheet_path_sampler = NextSheetPathSampler(answer_responses)
+
+            legacy_seconds = timeit.timeit(lambda: legacy_sample(answer_responses), number=number)
+            sampler_seconds = timeit.timeit(lambda: next_sheet_path_sampler.sample(), number=number)
+            self.stdout.write(
+                f'{quantity:>10} {legacy_seconds / number * 1000000:>12.2f} {sampler_seconds / number * 1000000:>12.2f}'
+            )
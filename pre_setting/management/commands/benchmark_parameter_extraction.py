@@ -0,0 +1,58 @@
+import json
+import timeit
+
+from django.core.management.base import BaseCommand
+from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from common_library import ParameterExtractor, mandatory_key, optional_key
+
+
+class Command(BaseCommand):
+    help = '@mandatories/@optionals 파라미터 추출 비교 (mandatory_key/optional_key 반복 vs ParameterExtractor)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('-n', '--number', type=int, help='측정 반복 횟수', default=10000)
+
+    def handle(self, *args, **kwargs):
+        number = kwargs.get('number')
+        mandatory_keys = ('sheet_id', 'answer')
+        optional_defaults = {'search': '', 'size': 10}
+        data = {'sheet_id': '1', 'answer': 'answer', 'search': 'search'}
+
+        factory = APIRequestFactory()
+        requests_by_source = {
+            'GET': lambda: factory.get('/', data),
+            'form': lambda: factory.post('/', data),
+            'json': lambda: factory.post('/', json.dumps(data), content_type='application/json'),
+        }
+        parameter_extractor = ParameterExtractor(
+            mandatory_keys=mandatory_keys,
+            optional_defaults=optional_defaults,
+            types={'sheet_id': int, 'size': int},
+        )
+
+        def extract_by_key(request):
+            mandatory = {key: mandatory_key(request, key) for key in mandatory_keys}
+            optional = {key: optional_key(request, key, default) for key, default in optional_defaults.items()}
+            return mandatory, optional
+
+        def extract_by_parameter_extractor(request):
+            return parameter_extractor.extract_mandatories(request), parameter_extractor.extract_optionals(request)
+
+        self.stdout.write(f'{"source":>10} {"by key(us)":>12} {"extractor(us)":>14}')
+        for source, create_request in requests_by_source.items():
+            # 요청마다 body 를 한번 parse 하는 것까지 측정하기 위해 매번 새 Request 를 만듭니다.
+            def to_request():
+                return Request(create_request(), parsers=[JSONParser(), FormParser(), MultiPartParser()])
+
+            create_seconds = timeit.timeit(to_request, number=number)
+            by_key_seconds = timeit.timeit(lambda: extract_by_key(to_request()), number=number) - create_seconds
+            extractor_seconds = timeit.timeit(
+                lambda: extract_by_parameter_extractor(to_request()),
+                number=number,
+            ) - create_seconds
+            self.stdout.write(
+                f'{source:>10} {by_key_seconds / number * 1000000:>12.2f} {extractor_seconds / number * 1000000:>14.2f}'
+            )
@@ -0,0 +1,84 @@
+import timeit
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from account.models import User
+from common_library import encode_cursor, keyset_paging
+from story.models import Story
+
+
+class Command(BaseCommand):
+    help = 'Story 목록 OFFSET paging 과 cursor(keyset) paging 페이지 깊이별 비교 (생성한 Story 는 rollback 됩니다.)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('-s', '--size', type=int, help='페이지 크기', default=10)
+        parser.add_argument('-n', '--number', type=int, help='측정 반복 횟수', default=20)
+        parser.add_argument(
+            '-p',
+            '--pages',
+            type=int,
+            nargs='+',
+            help='측정할 페이지 목록',
+            default=[1, 100, 10000],
+        )
+        parser.add_argument(
+            '--allow-write',
+            action='store_true',
+            help='테스트 DB 가 아니어도 Story 를 생성해서 측정 (rollback 전까지 테이블에 lock 이 걸릴 수 있습니다.)',
+        )
+
+    def handle(self, *args, **kwargs):
+        size = kwargs.get('size')
+        number = kwargs.get('number')
+        pages = kwargs.get('pages')
+
+        # 측정용 Story 를 (페이지 수 * 페이지 크기)만큼 생성하기 때문에 운영 DB 에서 실수로 실행하지 않도록 막습니다.
+        if not kwargs.get('allow_write') and not self.is_test_database():
+            raise CommandError(
+                f'{connection.settings_dict["NAME"]} 는 테스트 DB 가 아닙니다. 측정용 Story 를 생성하려면 --allow-write 를 사용하세요.'
+            )
+        if not User.objects.exists():
+            raise CommandError('측정용 Story 의 author 로 사용할 User 가 없습니다.')
+
+        with transaction.atomic():
+            self.create_stories(max(pages) * size)
+            qs = Story.objects.filter(is_deleted=False, displayable=True, is_secret=False)
+
+            self.stdout.write(f'{"page":>10} {"offset(ms)":>12} {"cursor(ms)":>12}')
+            for page in pages:
+                start_row = (page - 1) * size
+                # 이전 페이지 마지막 row 의 cursor (첫 페이지는 빈 문자열)
+                cursor = '' if page == 1 else encode_cursor('-id', [qs.order_by('-id')[start_row - 1].id])
+
+                offset_seconds = timeit.timeit(
+                    lambda: list(qs.order_by('-id')[start_row:start_row + size]),
+                    number=number,
+                )
+                cursor_seconds = timeit.timeit(
+                    lambda: keyset_paging(qs, cursor, size, '-id'),
+                    number=number,
+                )
+                self.stdout.write(
+                    f'{page:>10} {offset_seconds / number * 1000:>12.3f} {cursor_seconds / number * 1000:>12.3f}'
+                )
+            transaction.set_rollback(True)
+
+    @staticmethod
+    def is_test_database() -> bool:
+        name = str(connection.settings_dict['NAME'])
+        return name.startswith('test_') or name == ':memory:' or name.startswith('file:memorydb')
+
+    @staticmethod
+    def create_stories(count: int):
+        author = User.objects.first()
+        Story.objects.bulk_create(
+            [
+                Story(
+                    author=author,
+                    title=f'benchmark_story{index}',
+                    description='benchmark',
+                ) for index in range(count)
+            ],
+            batch_size=1000,
+        )
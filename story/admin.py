@@ -6,7 +6,8 @@ from hint.admin_forms import SheetHintInlineFormset, SheetHintAdminForm, SheetAn
 from hint.models import SheetHint
 from story.admin_forms import StoryAdminForm, SheetAdminForm
 from story.models import Story, Sheet, SheetAnswer, NextSheetPath, StoryEmailSubscription, PopularStory, \
-    UserSheetAnswerSolve, StorySlackSubscription, UserSheetAnswerSolveHistory, WrongAnswer
+    UserSheetAnswerSolve, StorySlackSubscription, UserSheetAnswerSolveHistory, WrongAnswer, \
+    SheetWrongAnswerCount
 
 
 class StoryAdmin(admin.ModelAdmin):
@@ -147,6 +148,7 @@ class PopularStoryAdmin(admin.ModelAdmin):
         'rank',
         'like_count',
         'base_past_second',
+        'generation',
     ]
 
     def story_title(self, obj):
@@ -352,6 +354,56 @@ class WrongAnswerAdmin(admin.ModelAdmin):
     sheet_title.short_description = 'Sheet title'
 
 
+class SheetWrongAnswerCountAdmin(admin.ModelAdmin):
+    list_display = [
+        'id',
+        'story_title',
+        'sheet_title',
+        'normalized_answer',
+        'count',
+        'first_seen',
+        'last_seen',
+    ]
+    list_select_related = [
+        'story',
+        'sheet',
+    ]
+    search_fields = [
+        'normalized_answer',
+    ]
+    raw_id_fields = [
+        'story',
+        'sheet',
+    ]
+    ordering = [
+        '-count',
+    ]
+
+    def story_title(self, obj):
+        return mark_safe('<a href="{}">[{}] {}</a>'.format(
+            reverse("admin:story_story_change", args=[obj.story_id]),
+            obj.story_id,
+            obj.story.title,
+        ))
+
+    story_title.short_description = 'Story title'
+
+    def sheet_title(self, obj):
+        return mark_safe('<a href="{}">[{}] {}</a>'.format(
+            reverse("admin:story_sheet_change", args=[obj.sheet_id]),
+            obj.sheet_id,
+            obj.sheet.title,
+        ))
+
+    sheet_title.short_description = 'Sheet title'
+
+    def get_search_results(self, request, queryset, search_term):
+        # 숫자로 검색하면 sheet id 로 해당 Sheet 의 틀린 답 순위를 조회합니다.
+        if search_term.isdigit():
+            return queryset.filter(sheet_id=int(search_term)), False
+        return super(SheetWrongAnswerCountAdmin, self).get_search_results(request, queryset, search_term)
+
+
 admin.site.register(Story, StoryAdmin)
 admin.site.register(Sheet, SheetAdmin)
 admin.site.register(SheetAnswer, SheetAnswerAdmin)
@@ -362,3 +414,4 @@ admin.site.register(PopularStory, PopularStoryAdmin)
 admin.site.register(UserSheetAnswerSolve, UserSheetAnswerSolveAdmin)
 admin.site.register(UserSheetAnswerSolveHistory, UserSheetAnswerSolveHistoryAdmin)
 admin.site.register(WrongAnswer, WrongAnswerAdmin)
+admin.site.register(SheetWrongAnswerCount, SheetWrongAnswerCountAdmin)
@@ -0,0 +1,429 @@
+import json
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from django_redis import get_redis_connection
+
+from common_library import acquire_cache_lock, release_cache_lock, renew_cache_lock
+from story.constants import (
+    STORY_VIEW_BUCKETS_KEY,
+    STORY_VIEW_BUCKET_STORY_IDS_KEY,
+    STORY_VIEW_FLUSH_LOCK_KEY,
+    STORY_VIEW_HYPER_LOG_LOG_KEY,
+    WRONG_ANSWER_BUFFER_DEAD_LETTER_KEY,
+    WRONG_ANSWER_BUFFER_FLUSH_LOCK_KEY,
+    WRONG_ANSWER_BUFFER_KEY,
+)
+
+logger = logging.getLogger('django')
+
+
+class LocalListBuffer(object):
+    """
+    Redis 를 사용하지 않는 환경(로컬/테스트)을 위한 프로세스 로컬 list 버퍼
+    WrongAnswerBuffer 가 사용하는 Redis list 명령(rpush, lrange, ltrim, llen)만 같은 의미로 구현합니다.
+    """
+    def __init__(self):
+        self._lists = {}
+        self._lock = threading.Lock()
+
+    def rpush(self, key: str, *values) -> int:
+        with self._lock:
+            items = self._lists.setdefault(key, [])
+            items.extend(values)
+            return len(items)
+
+    def lrange(self, key: str, start: int, end: int) -> list:
+        with self._lock:
+            items = self._lists.get(key, [])
+            return list(items[start:] if end == -1 else items[start:end + 1])
+
+    def ltrim(self, key: str, start: int, end: int) -> None:
+        with self._lock:
+            items = self._lists.get(key, [])
+            self._lists[key] = items[start:] if end == -1 else items[start:end + 1]
+
+    def llen(self, key: str) -> int:
+        with self._lock:
+            return len(self._lists.get(key, []))
+
+
+_local_list_buffer = LocalListBuffer()
+
+
+def get_list_buffer_client():
+    """
+    기본 캐시가 django_redis 이면 Redis 연결을, 아니면 프로세스 로컬 버퍼를 반환합니다.
+    """
+    try:
+        return get_redis_connection('default')
+    except NotImplementedError:
+        return _local_list_buffer
+
+
+class WrongAnswerBuffer(object):
+    """
+    WrongAnswer write-behind 버퍼
+    오답은 list 의 뒤에 rpush 하고, flush 는 앞에서부터 chunk 단위로 읽어 bulk_create 한 후 ltrim 합니다.
+    bulk_create 와 SheetWrongAnswerCount 증가는 하나의 transaction 으로 처리하고,
+    저장 후 ltrim 전에 실패하면 다음 flush 에서 같은 chunk 를 다시 저장하기 때문에 at-least-once 로 저장됩니다.
+    중복 저장을 막기 위해 flush 는 token 을 값으로 가진 캐시 lock 으로 동시에 하나만 실행하고, chunk 마다 lock 을 연장합니다.
+    저장할 수 없는 오답이 chunk 전체를 막지 않도록, 저장 전에 삭제된 Sheet 의 오답은 버리고 형식이 잘못된 오답은 dead letter list 로 옮깁니다.
+    """
+    def __init__(
+            self,
+            client=None,
+            key: str = WRONG_ANSWER_BUFFER_KEY,
+            dead_letter_key: str = WRONG_ANSWER_BUFFER_DEAD_LETTER_KEY,
+    ):
+        self.client = client or get_list_buffer_client()
+        self.key = key
+        self.dead_letter_key = dead_letter_key
+
+    def push(self, user_id: int, story_id: int, sheet_id: int, answer: str) -> int:
+        """
+        버퍼에 쌓인 오답 개수를 반환합니다.
+        answer 는 WrongAnswer.answer 길이에 맞춰 자릅니다.
+        """
+        return self.client.rpush(
+            self.key,
+            json.dumps({
+                'user_id': user_id,
+                'story_id': story_id,
+                'sheet_id': sheet_id,
+                'answer': answer[:self._get_answer_max_length()],
+                'created_at': datetime.now().isoformat(),
+            }),
+        )
+
+    def size(self) -> int:
+        return self.client.llen(self.key)
+
+    def dead_letter_size(self) -> int:
+        return self.client.llen(self.dead_letter_key)
+
+    def flush(self, chunk_size: int = None) -> int:
+        """
+        flush 시작 시점에 쌓여있던 오답을 chunk_size 단위로 bulk_create 하고, 저장한 개수를 반환합니다.
+        다른 flush 가 실행 중이면 0 을 반환하고, flush 중 lock 을 잃으면 남은 chunk 는 다음 flush 에서 저장합니다.
+        """
+        chunk_size = chunk_size or settings.WRONG_ANSWER_BUFFER_CHUNK_SIZE
+        lock_token = acquire_cache_lock(WRONG_ANSWER_BUFFER_FLUSH_LOCK_KEY, settings.WRONG_ANSWER_BUFFER_FLUSH_LOCK_SECONDS)
+        if not lock_token:
+            return 0
+
+        flushed_count = 0
+        try:
+            remain_count = self.size()
+            while remain_count > 0:
+                # 이전 chunk 저장이 오래 걸려 lock 이 만료되었으면, 다른 flush 와 같은 chunk 를 저장하지 않도록 멈춥니다.
+                if not renew_cache_lock(WRONG_ANSWER_BUFFER_FLUSH_LOCK_KEY, lock_token, settings.WRONG_ANSWER_BUFFER_FLUSH_LOCK_SECONDS):
+                    break
+                raw_items = self.client.lrange(self.key, 0, min(chunk_size, remain_count) - 1)
+                if not raw_items:
+                    break
+                flushed_count += self._save(raw_items)
+                self.client.ltrim(self.key, len(raw_items), -1)
+                remain_count -= len(raw_items)
+        finally:
+            release_cache_lock(WRONG_ANSWER_BUFFER_FLUSH_LOCK_KEY, lock_token)
+        return flushed_count
+
+    def _save(self, raw_items: list) -> int:
+        """
+        raw_items 를 저장하고, 저장한 개수를 반환합니다.
+        확인 후 Sheet 가 삭제되어 chunk 저장이 실패하면, 1개씩 저장하고 저장하지 못한 오답은 dead letter list 로 옮깁니다.
+        """
+        from story.models import SheetWrongAnswerCount, WrongAnswer
+
+        raw_item_wrong_answers = self._to_wrong_answers(raw_items)
+        wrong_answers = [wrong_answer for _, wrong_answer in raw_item_wrong_answers]
+        try:
+            with transaction.atomic():
+                WrongAnswer.objects.bulk_create(wrong_answers)
+                SheetWrongAnswerCount.increase_counts(wrong_answers)
+            return len(wrong_answers)
+        except IntegrityError:
+            pass
+
+        saved_count = 0
+        for raw_item, wrong_answer in raw_item_wrong_answers:
+            try:
+                with transaction.atomic():
+                    WrongAnswer.objects.bulk_create([wrong_answer])
+                    SheetWrongAnswerCount.increase_counts([wrong_answer])
+                saved_count += 1
+            except IntegrityError:
+                self._dead_letter([raw_item])
+        return saved_count
+
+    def _to_wrong_answers(self, raw_items: list) -> List[tuple]:
+        """
+        저장할 수 있는 오답만 (raw_item, WrongAnswer) 목록으로 반환합니다.
+        Sheet 가 삭제된 오답은 CASCADE 와 같이 버리고, 유저가 삭제된 오답은 SET_NULL 과 같이 user 없이 저장합니다.
+        형식이 잘못되었거나 Sheet 의 Story 와 다른 오답은 dead letter list 로 옮깁니다.
+        """
+        from account.models import User
+        from story.models import Sheet, WrongAnswer
+
+        answer_max_length = self._get_answer_max_length()
+        raw_item_wrong_answers = []
+        invalid_raw_items = []
+        for raw_item in raw_items:
+            try:
+                item = json.loads(raw_item)
+                raw_item_wrong_answers.append((
+                    raw_item,
+                    WrongAnswer(
+                        user_id=item['user_id'],
+                        story_id=int(item['story_id']),
+                        sheet_id=int(item['sheet_id']),
+                        answer=str(item['answer'])[:answer_max_length],
+                        created_at=datetime.fromisoformat(item['created_at']),
+                    ),
+                ))
+            except (KeyError, TypeError, ValueError):
+                invalid_raw_items.append(raw_item)
+
+        story_id_by_sheet_id = dict(
+            Sheet.objects.filter(
+                id__in={wrong_answer.sheet_id for _, wrong_answer in raw_item_wrong_answers},
+            ).values_list(
+                'id',
+                'story_id',
+            )
+        )
+        user_ids = set(
+            User.objects.filter(
+                id__in={wrong_answer.user_id for _, wrong_answer in raw_item_wrong_answers if wrong_answer.user_id},
+            ).values_list(
+                'id',
+                flat=True,
+            )
+        )
+        valid_raw_item_wrong_answers = []
+        deleted_sheet_count = 0
+        for raw_item, wrong_answer in raw_item_wrong_answers:
+            story_id = story_id_by_sheet_id.get(wrong_answer.sheet_id)
+            if story_id is None:
+                deleted_sheet_count += 1
+                continue
+            if story_id != wrong_answer.story_id:
+                invalid_raw_items.append(raw_item)
+                continue
+            if wrong_answer.user_id not in user_ids:
+                wrong_answer.user_id = None
+            valid_raw_item_wrong_answers.append((raw_item, wrong_answer))
+
+        if deleted_sheet_count:
+            logger.warning(f'wrong answer buffer: 삭제된 Sheet 의 오답 {deleted_sheet_count}개를 버립니다.')
+        self._dead_letter(invalid_raw_items)
+        return valid_raw_item_wrong_answers
+
+    def _dead_letter(self, raw_items: list) -> None:
+        if not raw_items:
+            return
+        self.client.rpush(self.dead_letter_key, *raw_items)
+        logger.warning(f'wrong answer buffer: 저장할 수 없는 오답 {len(raw_items)}개를 {self.dead_letter_key} 로 옮깁니다.')
+
+    @staticmethod
+    def _get_answer_max_length() -> int:
+        from story.models import WrongAnswer
+
+        return WrongAnswer._meta.get_field('answer').max_length
+
+
+class LocalHyperLogLogClient(object):
+    """
+    Redis 를 사용하지 않는 환경(로컬/테스트)을 위한 프로세스 로컬 카운터
+    StoryViewCounter 가 사용하는 Redis 명령(pfadd, pfcount, sadd, smembers, srem, delete, expire, pipeline)만 같은 의미로 구현합니다.
+    HyperLogLog 대신 set 으로 정확하게 셉니다.
+    """
+    def __init__(self):
+        self._sets = {}
+        self._lock = threading.Lock()
+
+    def pipeline(self):
+        return LocalPipeline(self)
+
+    def pfadd(self, key: str, *values) -> int:
+        return self.sadd(key, *values)
+
+    def pfcount(self, key: str) -> int:
+        with self._lock:
+            return len(self._sets.get(key, ()))
+
+    def sadd(self, key: str, *values) -> int:
+        with self._lock:
+            items = self._sets.setdefault(key, set())
+            added_count = len(set(map(str, values)) - items)
+            items.update(map(str, values))
+            return added_count
+
+    def smembers(self, key: str) -> set:
+        with self._lock:
+            return set(self._sets.get(key, ()))
+
+    def srem(self, key: str, *values) -> int:
+        with self._lock:
+            items = self._sets.get(key, set())
+            removed_count = len(items & set(map(str, values)))
+            items.difference_update(map(str, values))
+            return removed_count
+
+    def delete(self, *keys) -> int:
+        with self._lock:
+            return sum(1 for key in keys if self._sets.pop(key, None) is not None)
+
+    def expire(self, key: str, seconds: int) -> bool:
+        return True
+
+
+class LocalPipeline(object):
+    """
+    Redis pipeline 처럼 명령을 모아두고 execute 시 순서대로 실행합니다.
+    """
+    def __init__(self, client: LocalHyperLogLogClient):
+        self.client = client
+        self.commands = []
+
+    def __getattr__(self, name):
+        def queue_command(*args):
+            self.commands.append((name, args))
+            return self
+        return queue_command
+
+    def execute(self) -> list:
+        results = [getattr(self.client, name)(*args) for name, args in self.commands]
+        self.commands = []
+        return results
+
+
+_local_hyper_log_log_client = LocalHyperLogLogClient()
+
+
+def get_hyper_log_log_client():
+    """
+    기본 캐시가 django_redis 이면 Redis 연결을, 아니면 프로세스 로컬 카운터를 반환합니다.
+    """
+    try:
+        return get_redis_connection('default')
+    except NotImplementedError:
+        return _local_hyper_log_log_client
+
+
+class StoryViewCounter(object):
+    """
+    Story 순 조회수 카운터
+    조회는 시간 bucket 별 Story 마다 HyperLogLog 에 viewer 를 pfadd 하고 (Story 당 최대 12KB 고정 메모리),
+    flush 는 끝난 bucket 의 pfcount 를 view_count 에 bulk 로 더한 후 bucket 을 삭제합니다.
+    bucket 은 더하기 전에 bucket 목록에서 srem 으로 먼저 가져가므로, 여러 flush 가 겹치거나 flush 가 중간에 실패해도 최대 한번만 더합니다. (at-most-once)
+    조회 요청에서는 DB 에 쓰지 않습니다.
+    view_count 는 bucket 별 순 조회수의 합이며, HyperLogLog 오차(약 0.81%)가 있습니다.
+    """
+    def __init__(self, client=None, bucket_seconds: int = None):
+        self.client = client or get_hyper_log_log_client()
+        self.bucket_seconds = bucket_seconds or settings.STORY_VIEW_BUCKET_SECONDS
+
+    def get_bucket(self, timestamp: float = None) -> int:
+        return int((time.time() if timestamp is None else timestamp) // self.bucket_seconds)
+
+    def record(self, story_id: int, viewer_key: str, timestamp: float = None) -> None:
+        bucket = self.get_bucket(timestamp)
+        hyper_log_log_key = STORY_VIEW_HYPER_LOG_LOG_KEY.format(bucket=bucket, story_id=story_id)
+        bucket_story_ids_key = STORY_VIEW_BUCKET_STORY_IDS_KEY.format(bucket=bucket)
+        # flush 가 실패해도 남지 않도록 bucket 2개 이후 만료합니다.
+        expire_seconds = self.bucket_seconds * 2 + settings.STORY_VIEW_FLUSH_LOCK_SECONDS
+        self.client.pipeline().pfadd(
+            hyper_log_log_key, viewer_key,
+        ).expire(
+            hyper_log_log_key, expire_seconds,
+        ).sadd(
+            bucket_story_ids_key, story_id,
+        ).expire(
+            bucket_story_ids_key, expire_seconds,
+        ).sadd(
+            STORY_VIEW_BUCKETS_KEY, bucket,
+        ).execute()
+
+    def get_closed_buckets(self, timestamp: float = None) -> List[int]:
+        current_bucket = self.get_bucket(timestamp)
+        return sorted(
+            bucket for bucket in map(int, self.client.smembers(STORY_VIEW_BUCKETS_KEY))
+            if bucket < current_bucket
+        )
+
+    def get_view_count_by_story_id(self, bucket: int) -> Dict[int, int]:
+        story_ids = sorted(map(int, self.client.smembers(STORY_VIEW_BUCKET_STORY_IDS_KEY.format(bucket=bucket))))
+        pipeline = self.client.pipeline()
+        for story_id in story_ids:
+            pipeline.pfcount(STORY_VIEW_HYPER_LOG_LOG_KEY.format(bucket=bucket, story_id=story_id))
+        return {
+            story_id: view_count
+            for story_id, view_count in zip(story_ids, pipeline.execute())
+            if view_count
+        }
+
+    def flush(self, timestamp: float = None, chunk_size: int = None) -> int:
+        """
+        끝난 bucket 의 순 조회수를 Story view_count 에 더하고, 더한 조회수를 반환합니다.
+        다른 flush 가 실행 중이면 0 을 반환하고, flush 중 lock 을 잃으면 남은 bucket 은 다음 flush 에서 더합니다.
+        """
+        chunk_size = chunk_size or settings.STORY_VIEW_FLUSH_CHUNK_SIZE
+        lock_token = acquire_cache_lock(STORY_VIEW_FLUSH_LOCK_KEY, settings.STORY_VIEW_FLUSH_LOCK_SECONDS)
+        if not lock_token:
+            return 0
+
+        flushed_view_count = 0
+        try:
+            for bucket in self.get_closed_buckets(timestamp):
+                if not renew_cache_lock(STORY_VIEW_FLUSH_LOCK_KEY, lock_token, settings.STORY_VIEW_FLUSH_LOCK_SECONDS):
+                    break
+                # 다른 flush 가 먼저 가져간 bucket 은 건너뜁니다.
+                if not self.client.srem(STORY_VIEW_BUCKETS_KEY, bucket):
+                    continue
+                flushed_view_count += self._flush_bucket(bucket, chunk_size)
+        finally:
+            release_cache_lock(STORY_VIEW_FLUSH_LOCK_KEY, lock_token)
+        return flushed_view_count
+
+    def _flush_bucket(self, bucket: int, chunk_size: int) -> int:
+        """
+        bucket 의 순 조회수를 1개의 transaction 으로 더한 후 bucket 을 삭제하고, 더한 조회수를 반환합니다.
+        """
+        from story.entity_caches import story_entity_cache
+        from story.models import Story
+
+        view_count_by_story_id = self.get_view_count_by_story_id(bucket)
+        story_ids = list(view_count_by_story_id.keys())
+        with transaction.atomic():
+            for i in range(0, len(story_ids), chunk_size):
+                chunk_story_ids = story_ids[i:i + chunk_size]
+                Story.objects.filter(
+                    id__in=chunk_story_ids,
+                ).update(
+                    view_count=F('view_count') + Case(
+                        *[
+                            When(id=story_id, then=Value(view_count_by_story_id[story_id]))
+                            for story_id in chunk_story_ids
+                        ],
+                        default=Value(0),
+                        output_field=IntegerField(),
+                    )
+                )
+                story_entity_cache.invalidate(*chunk_story_ids)
+
+        self.client.delete(
+            STORY_VIEW_BUCKET_STORY_IDS_KEY.format(bucket=bucket),
+            *[
+                STORY_VIEW_HYPER_LOG_LOG_KEY.format(bucket=bucket, story_id=story_id)
+                for story_id in story_ids
+            ],
+        )
+        return sum(view_count_by_story_id.values())
@@ -3,9 +3,11 @@ from datetime import datetime
 
 from typing import (
     List,
+    Optional,
     Type,
 )
 
+from common_library import attrs_to_dict
 from story.models import (
     Sheet,
     SheetAnswer,
@@ -13,7 +15,7 @@ from story.models import (
 )
 
 
-@attr.s
+@attr.s(slots=True)
 class CMSStoryListItemDTO(object):
     id = attr.ib(type=int)
     title = attr.ib(type=str)
@@ -33,6 +35,13 @@ class CMSStoryListItemDTO(object):
     created_at = attr.ib(type=datetime)
     updated_at = attr.ib(type=datetime)
 
+    # of 에서 사용하는 Story 필드 (목록 조회 시 only 에 사용)
+    MODEL_FIELDS = (
+        'id', 'title', 'description', 'image', 'background_image', 'author__nickname', 'played_count', 'like_count',
+        'view_count', 'review_rate', 'playing_point', 'level', 'is_deleted', 'displayable', 'is_secret', 'created_at',
+        'updated_at',
+    )
+
     @classmethod
     def of(cls, story: Story):
         return cls(
@@ -56,19 +65,20 @@ class CMSStoryListItemDTO(object):
         )
 
     def to_dict(self):
-        return attr.asdict(self, recurse=True)
+        return attrs_to_dict(self)
 
 
-@attr.s
+@attr.s(slots=True)
 class CMSStoryListResponse(object):
     total_count = attr.ib(type=int)
     stories = attr.ib(type=List[CMSStoryListItemDTO])
+    next_cursor = attr.ib(type=Optional[str], default=None)
 
     def to_dict(self):
-        return attr.asdict(self, recurse=True)
+        return attrs_to_dict(self)
 
 
-@attr.s
+@attr.s(slots=True)
 class CMSStorySheetMapItemDTO(object):
     id = attr.ib(type=int)
     title = attr.ib(type=str)
@@ -91,18 +101,18 @@ class CMSStorySheetMapItemDTO(object):
         )
 
     def to_dict(self):
-        return attr.asdict(self, recurse=True)
+        return attrs_to_dict(self)
 
 
-@attr.s
+@attr.s(slots=True)
 class CMSStorySheetMapResponse(object):
     sheets = attr.ib(type=List[CMSStorySheetMapItemDTO])
 
     def to_dict(self):
-        return attr.asdict(self, recurse=True)
+        return attrs_to_dict(self)
 
 
-@attr.s
+@attr.s(slots=True)
 class CMSStorySheetAnswerMapItemDTO(object):
     id = attr.ib(type=int)
     sheet_id = attr.ib(type=Type[int])
@@ -121,24 +131,24 @@ class CMSStorySheetAnswerMapItemDTO(object):
         )
 
     def to_dict(self):
-        return attr.asdict(self, recurse=True)
+        return attrs_to_dict(self)
 
 
-@attr.s
+@attr.s(slots=True)
 class CMSStorySheetAnswerMapResponse(object):
     answers = attr.ib(type=List[CMSStorySheetAnswerMapItemDTO])
 
     def to_dict(self):
-        return attr.asdict(self, recurse=True)
+        return attrs_to_dict(self)
 
 
-@attr.s
+@attr.s(slots=True)
 class CMSStoryAnswerNextPathItemDTO(object):
     sheet_id = attr.ib(type=int)
     quantity = attr.ib(type=int)
 
 
-@attr.s
+@attr.s(slots=True)
 class CMSStoryAnswerNextPathMapItemDTO(object):
     answer_id = attr.ib(type=int)
     next_paths = attr.ib(type=List[CMSStoryAnswerNextPathItemDTO])
@@ -151,9 +161,9 @@ class CMSStoryAnswerNextPathMapItemDTO(object):
         )
 
 
-@attr.s
+@attr.s(slots=True)
 class CMSStoryAnswerNextPathMapResponse(object):
     answer_next_paths = attr.ib(type=List[CMSStoryAnswerNextPathMapItemDTO])
 
     def to_dict(self):
-        return attr.asdict(self, recurse=True)
+        return attrs_to_dict(self)
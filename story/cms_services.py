@@ -8,10 +8,11 @@ from typing import (
     List,
 )
 
+from story.constants import StorySearchField
 from story.models import (
     Sheet,
     Story,
-    SheetAnswer, NextSheetPath,
+    SheetAnswer, NextSheetPath, StorySearchToken,
 )
 
 
@@ -21,11 +22,11 @@ def get_stories_qs():
 
 def get_story_search_filter(search_type: str, search_value: Any) -> Q:
     if search_type == 'title':
-        return Q(title__icontains=search_value)
+        return StorySearchToken.get_search_filter(search_value, [StorySearchField.TITLE])
     elif search_type == 'author':
-        return Q(author__nickname__icontains=search_value)
+        return StorySearchToken.get_search_filter(search_value, [StorySearchField.AUTHOR])
     elif search_type == 'description':
-        return Q(description__icontains=search_value)
+        return StorySearchToken.get_search_filter(search_value, [StorySearchField.DESCRIPTION])
     return Q()
 
 
@@ -4,7 +4,7 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from common_decorator import pagination, optionals
-from common_library import get_integers_from_string
+from common_library import get_integers_from_string, keyset_paging, only_model_fields
 from config.permissions.cms_permissions import CMSUserPermission
 from hint.services import get_available_sheet_hints_count
 from story.cmd_dtos import (
@@ -30,20 +30,23 @@ from story.cms_services import (
 class CMSStoryListAPIView(APIView):
     permission_classes = [CMSUserPermission]
 
-    @pagination(default_size=20)
-    def get(self, request, start_row, end_row):
+    @pagination(default_size=20, cursor=True)
+    def get(self, request, start_row, end_row, cursor):
         search_type = request.GET.get('search_type', '')
         search_value = request.GET.get('search_value', '')
         order_by = request.GET.get('order_by', '-id')
 
-        stories_qs = get_stories_qs().select_related(
-            'author'
-        ).filter(
+        stories_qs = get_stories_qs().filter(
             get_story_search_filter(search_type, search_value)
         )
-
         total_count = stories_qs.count()
-        cms_stories = stories_qs.order_by(order_by)[start_row:end_row]
+        # CMSStoryListItemDTO 가 사용하는 필드와 정렬(cursor) 필드만 조회합니다.
+        stories_qs = only_model_fields(stories_qs, CMSStoryListItemDTO.MODEL_FIELDS, order_by.lstrip('-'))
+        if cursor is None:
+            cms_stories = list(stories_qs.order_by(order_by)[start_row:end_row])
+            next_cursor = None
+        else:
+            cms_stories, next_cursor = keyset_paging(stories_qs, cursor, end_row - start_row, order_by)
 
         return Response(
             data=CMSStoryListResponse(
@@ -51,7 +54,8 @@ class CMSStoryListAPIView(APIView):
                 stories=[
                     CMSStoryListItemDTO.of(story).to_dict()
                     for story in cms_stories
-                ]
+                ],
+                next_cursor=next_cursor,
             ).to_dict(),
             status=200,
         )
@@ -1,10 +1,6 @@
 from config.common.enums import StrValueLabel, IntValueSelector
 
 
-class StoryErrorMessage(StrValueLabel):
-    ALREADY_SOLVED = ('ALREADY_SOLVED', '이미 문제를 해결한 기록이 있습니다.')
-
-
 class StoryLevel(IntValueSelector):
     EASY = (0, '하')
     NORMAL = (1, '중')
@@ -17,4 +13,73 @@ class StoryLevel(IntValueSelector):
         return cls.NOT_FOUND
 
 
+class StorySearchField(StrValueLabel):
+    TITLE = ('title', '제목')
+    DESCRIPTION = ('description', '설명')
+    AUTHOR = ('author', '작성자')
+
+
+# 검색 관련도 가중치 (토큰 등장 횟수 * 가중치)
+STORY_SEARCH_FIELD_WEIGHTS = {
+    StorySearchField.TITLE: 3,
+    StorySearchField.AUTHOR: 2,
+    StorySearchField.DESCRIPTION: 1,
+}
+# 유저 Story 목록 검색 필드
+STORY_SEARCH_FIELDS = [
+    StorySearchField.TITLE,
+    StorySearchField.DESCRIPTION,
+]
+
 DEFAULT_POPULAR_KILL_SWITCH_STORY_COUNT = 6
+
+STORY_TITLE_AUTOCOMPLETE_VERSION_KEY = 'story_title_autocomplete_version'
+# like_count 순서를 반영하기 위해 다시 만드는 주기
+STORY_TITLE_AUTOCOMPLETE_REBUILD_SECONDS = 60 * 10
+DEFAULT_STORY_TITLE_AUTOCOMPLETE_SIZE = 10
+MAX_STORY_TITLE_AUTOCOMPLETE_SIZE = 20
+# 일치하는 Story 가 많은 짧은 prefix 는 like_count 상위 MAX_STORY_TITLE_AUTOCOMPLETE_SIZE 개를 미리 계산합니다.
+STORY_TITLE_AUTOCOMPLETE_TOP_PREFIX_LENGTH = 2
+# 긴 prefix 는 검색어 길이와 확인하는 key 개수를 제한합니다.
+MAX_STORY_TITLE_AUTOCOMPLETE_PREFIX_LENGTH = 30
+STORY_TITLE_AUTOCOMPLETE_SCAN_BUDGET = 1000
+
+# 인기 스토리 기간 (window: base_past_second)
+POPULAR_STORY_WINDOW_SECONDS = {
+    '1h': 60 * 60,
+    '24h': 60 * 60 * 24,
+    '7d': 60 * 60 * 24 * 7,
+}
+DEFAULT_POPULAR_STORY_WINDOW = '1h'
+# update_popular_story 가 겹쳐 실행되어 같은 generation 을 만들지 않도록 잡는 lock
+POPULAR_STORY_UPDATE_LOCK_KEY = 'popular_story_update_lock'
+POPULAR_STORY_UPDATE_LOCK_SECONDS = 60 * 10
+
+# 캐시된 DTO 의 pickle 형식(slots)이 바뀌면 이전 값을 읽지 않도록 key 의 v 를 올립니다.
+SHEET_ANSWER_TABLE_CACHE_KEY = 'sheet_answer_table:v2:{sheet_id}'
+SHEET_ANSWER_TABLE_CACHE_SECONDS = 60 * 60 * 24
+
+STORY_GRAPH_CACHE_KEY = 'story_graph:{story_id}'
+STORY_GRAPH_CACHE_SECONDS = 60 * 60 * 24
+
+POPULAR_STORY_CACHE_VERSION_KEY = 'popular_story_cache_version'
+POPULAR_STORY_LIST_CACHE_KEY = 'popular_story_list:v2:{version}:{window}'
+POPULAR_STORY_LIST_CACHE_SECONDS = 60 * 60
+POPULAR_STORY_LIST_CACHE_STALE_SECONDS = 60 * 5
+POPULAR_STORY_KILL_SWITCH_LIST_CACHE_KEY = 'popular_story_kill_switch_list:v2:{version}'
+POPULAR_STORY_KILL_SWITCH_LIST_CACHE_SECONDS = 60
+POPULAR_STORY_KILL_SWITCH_LIST_CACHE_STALE_SECONDS = 60
+USER_SECRET_STORY_IDS_CACHE_KEY = 'user_secret_story_ids:{user_id}'
+USER_SECRET_STORY_IDS_CACHE_SECONDS = 60 * 60
+
+STORY_RESPONDENT_USER_IDS_CACHE_KEY = '{subscription_name}_respondent_user_ids:{story_id}'
+STORY_RESPONDENT_USER_IDS_CACHE_SECONDS = 60 * 60 * 24
+
+WRONG_ANSWER_BUFFER_KEY = 'wrong_answer_buffer'
+WRONG_ANSWER_BUFFER_FLUSH_LOCK_KEY = 'wrong_answer_buffer_flush_lock'
+WRONG_ANSWER_BUFFER_DEAD_LETTER_KEY = 'wrong_answer_buffer_dead_letter'
+
+STORY_VIEW_HYPER_LOG_LOG_KEY = 'story_view:{bucket}:{story_id}'
+STORY_VIEW_BUCKET_STORY_IDS_KEY = 'story_view_story_ids:{bucket}'
+STORY_VIEW_BUCKETS_KEY = 'story_view_buckets'
+STORY_VIEW_FLUSH_LOCK_KEY = 'story_view_flush_lock'
@@ -1,12 +1,14 @@
 import attr
 from collections import defaultdict
-from typing import List
+from typing import Dict, List, Optional, Set
 
+from common_library import attrs_to_dict
 from story.constants import StoryLevel
+from story.helpers import SheetAnswerMatcher
 from story.models import Sheet, UserSheetAnswerSolve, Story, PopularStory, UserSheetAnswerSolveHistory
 
 
-@attr.s
+@attr.s(slots=True)
 class SheetAnswerResponseDTO(object):
     id = attr.ib(type=int)
     answer = attr.ib(type=str)
@@ -17,31 +19,166 @@ class SheetAnswerResponseDTO(object):
     next_sheet_quantity = attr.ib(type=int)
 
     @classmethod
-    def of(cls, sheet_answer: dict):
+    def of_next_sheet_path(cls, sheet_answer: dict):
+        """
+        SheetAnswer 와 NextSheetPath 를 한번만 join 한 values 로 생성합니다.
+        """
         return cls(
             id=sheet_answer['id'],
             answer=sheet_answer['answer'].replace(' ', ''),
             answer_reply=sheet_answer['answer_reply'],
             is_always_correct=sheet_answer['is_always_correct'],
             next_sheet_path_id=sheet_answer['nextsheetpath'],
-            next_sheet_id=sheet_answer['next_sheet_paths__nextsheetpath__sheet_id'],
-            next_sheet_quantity=sheet_answer['next_sheet_paths__nextsheetpath__quantity'],
+            next_sheet_id=sheet_answer['nextsheetpath__sheet_id'],
+            next_sheet_quantity=sheet_answer['nextsheetpath__quantity'],
         )
 
     def to_dict(self):
-        return attr.asdict(self, recurse=True)
+        return attrs_to_dict(self)
+
+
+@attr.s
+class SheetAnswerSnapshotDTO(object):
+    """
+    UserSheetAnswerSolve 에 남기는 SheetAnswer Snapshot
+    answer 는 공백을 제거하지 않은 원본 정답 입니다.
+    """
+    id = attr.ib(type=int)
+    answer = attr.ib(type=str)
+    answer_reply = attr.ib(type=str)
+    version = attr.ib(type=int)
+
+    @classmethod
+    def of(cls, sheet_answer: dict):
+        return cls(
+            id=sheet_answer['id'],
+            answer=sheet_answer['answer'],
+            answer_reply=sheet_answer['answer_reply'],
+            version=sheet_answer['version'],
+        )
+
+
+@attr.s
+class SheetAnswerTableDTO(object):
+    """
+    Sheet 의 정답과 다음 경로를 컴파일한 캐시용 정답 테이블
+    sheet_version 이 현재 Sheet 의 version 과 다르면 사용하지 않습니다.
+    """
+    sheet_id = attr.ib(type=int)
+    sheet_version = attr.ib(type=int)
+    answer_responses = attr.ib(type=List[SheetAnswerResponseDTO])
+    answer_matcher = attr.ib(type=SheetAnswerMatcher)
+    sheet_answer_by_id = attr.ib(type=Dict[int, SheetAnswerSnapshotDTO])
+
+    @classmethod
+    def of(cls, sheet: Sheet, sheet_answer_values: List[dict]):
+        """
+        sheet_answer_values 는 SheetAnswer 와 NextSheetPath 를 한번 join 한 values 목록 입니다.
+        """
+        answer_responses = [
+            SheetAnswerResponseDTO.of_next_sheet_path(sheet_answer_value)
+            for sheet_answer_value in sheet_answer_values
+        ]
+        return cls(
+            sheet_id=sheet.id,
+            sheet_version=sheet.version,
+            answer_responses=answer_responses,
+            answer_matcher=SheetAnswerMatcher(answer_responses),
+            sheet_answer_by_id={
+                sheet_answer_value['id']: SheetAnswerSnapshotDTO.of(sheet_answer_value)
+                for sheet_answer_value in sheet_answer_values
+            },
+        )
+
+    def is_compiled_for(self, sheet: Sheet) -> bool:
+        return self.sheet_id == sheet.id and self.sheet_version == sheet.version
 
 
 @attr.s
+class StoryGraphSheetDTO(object):
+    id = attr.ib(type=int)
+    title = attr.ib(type=str)
+    is_start = attr.ib(type=bool)
+    is_final = attr.ib(type=bool)
+
+
+@attr.s
+class StoryGraphDTO(object):
+    """
+    Story 의 삭제되지 않은 Sheet 와 정답, Sheet 로 들어오는 NextSheetPath 를 컴파일한 캐시용 그래프
+    sheet_by_id: Sheet id 별 Sheet 정보
+    answers_by_sheet_id: Sheet id 별 정답 목록
+    incoming_next_sheet_path_ids_by_sheet_id: Sheet id 로 들어오는 NextSheetPath id 목록 (역방향 간선)
+    """
+    story_id = attr.ib(type=int)
+    sheet_by_id = attr.ib(type=Dict[int, StoryGraphSheetDTO])
+    answers_by_sheet_id = attr.ib(type=Dict[int, Set[str]])
+    incoming_next_sheet_path_ids_by_sheet_id = attr.ib(type=Dict[int, Set[int]])
+
+    @classmethod
+    def of(cls, story_id: int, sheet_values: List[dict], sheet_answer_values: List[dict]):
+        """
+        sheet_values 는 Story 의 삭제되지 않은 Sheet values 목록,
+        sheet_answer_values 는 해당 Sheet 들의 SheetAnswer 와 NextSheetPath 를 한번 join 한 values 목록 입니다.
+        """
+        sheet_by_id = {
+            sheet_value['id']: StoryGraphSheetDTO(
+                id=sheet_value['id'],
+                title=sheet_value['title'],
+                is_start=sheet_value['is_start'],
+                is_final=sheet_value['is_final'],
+            )
+            for sheet_value in sheet_values
+        }
+        answers_by_sheet_id = defaultdict(set)
+        incoming_next_sheet_path_ids_by_sheet_id = defaultdict(set)
+        for sheet_answer_value in sheet_answer_values:
+            answers_by_sheet_id[sheet_answer_value['sheet_id']].add(sheet_answer_value['answer'])
+            next_sheet_id = sheet_answer_value['nextsheetpath__sheet_id']
+            if next_sheet_id not in sheet_by_id:
+                continue
+            incoming_next_sheet_path_ids_by_sheet_id[next_sheet_id].add(sheet_answer_value['nextsheetpath'])
+        return cls(
+            story_id=story_id,
+            sheet_by_id=sheet_by_id,
+            answers_by_sheet_id=dict(answers_by_sheet_id),
+            incoming_next_sheet_path_ids_by_sheet_id=dict(incoming_next_sheet_path_ids_by_sheet_id),
+        )
+
+    def get_sheet(self, sheet_id: int) -> Optional[StoryGraphSheetDTO]:
+        return self.sheet_by_id.get(sheet_id)
+
+    def is_start_sheet(self, sheet_id: int) -> bool:
+        sheet = self.get_sheet(sheet_id)
+        return bool(sheet and sheet.is_start)
+
+    def is_sheet_answer(self, sheet_id: int, answer: str) -> bool:
+        return answer in self.answers_by_sheet_id.get(sheet_id, ())
+
+    def get_incoming_next_sheet_path_ids(self, sheet_id: int) -> Set[int]:
+        return self.incoming_next_sheet_path_ids_by_sheet_id.get(sheet_id, set())
+
+
+@attr.s(slots=True)
+class SheetAnswerSubmitResultDTO(object):
+    is_valid = attr.ib(type=bool)
+    next_sheet_id = attr.ib(type=int)
+    answer_reply = attr.ib(type=str)
+
+    def to_dict(self):
+        return attrs_to_dict(self)
+
+
+@attr.s(slots=True)
 class PreviousSheetInfoDTO(object):
     sheet_id = attr.ib(type=int)
     title = attr.ib(type=str)
 
     def to_dict(self):
-        return attr.asdict(self, recurse=True)
+        return attrs_to_dict(self)
 
 
-@attr.s
+@attr.s(slots=True)
 class PlayingSheetInfoDTO(object):
     sheet_id = attr.ib(type=int)
     title = attr.ib(type=str)
@@ -53,12 +190,17 @@ class PlayingSheetInfoDTO(object):
     answer = attr.ib(type=str)
     answer_reply = attr.ib(type=str)
     is_solved = attr.ib(type=bool)
+    sheet_path_infos = attr.ib(type=List[PreviousSheetInfoDTO], factory=list)
+
+    # of 에서 사용하는 user_sheet_answer_solve 의 필드 (get_sheet_solved_user_sheet_answer 의 only 에 사용)
+    USER_SHEET_ANSWER_SOLVE_FIELDS = ('answer', 'next_sheet_path__sheet', 'solved_sheet_answer__answer_reply')
 
     @classmethod
-    def of(cls, sheet: Sheet, user_sheet_answer_solve: UserSheetAnswerSolve = None, previous_sheet_infos: list = None):
+    def of(cls, sheet: Sheet, user_sheet_answer_solve: UserSheetAnswerSolve = None, previous_sheet_infos: list = None, sheet_path_infos: list = None):
         """
         user_sheet_answer_solve의 next_sheet_path__answer 필요
         answer
+        sheet_path_infos: 이전에 풀었던 문제로 돌아가기 위한 해결한 Sheet 경로
         """
         return cls(
             sheet_id=sheet.id,
@@ -71,13 +213,14 @@ class PlayingSheetInfoDTO(object):
             answer=user_sheet_answer_solve.answer if user_sheet_answer_solve else None,
             answer_reply=user_sheet_answer_solve.solved_sheet_answer.answer_reply if (user_sheet_answer_solve and user_sheet_answer_solve.solved_sheet_answer) else None,
             is_solved=bool(user_sheet_answer_solve),
+            sheet_path_infos=sheet_path_infos or [],
         )
 
     def to_dict(self):
-        return attr.asdict(self, recurse=True)
+        return attrs_to_dict(self)
 
 
-@attr.s
+@attr.s(slots=True)
 class StoryListItemDTO(object):
     id = attr.ib(type=int)
     title = attr.ib(type=str)
@@ -85,6 +228,9 @@ class StoryListItemDTO(object):
     image = attr.ib(type=str)
     background_image = attr.ib(type=str)
 
+    # of 에서 사용하는 Story 필드 (목록 조회 시 only 에 사용)
+    MODEL_FIELDS = ('id', 'title', 'description', 'image', 'background_image')
+
     @classmethod
     def of(cls, story: Story):
         return cls(
@@ -96,15 +242,18 @@ class StoryListItemDTO(object):
         )
 
     def to_dict(self):
-        return attr.asdict(self, recurse=True)
+        return attrs_to_dict(self)
 
 
-@attr.s
+@attr.s(slots=True)
 class StoryPopularListItemDTO(object):
     story_id = attr.ib(type=int)
     title = attr.ib(type=str)
     image = attr.ib(type=str)
 
+    # by_story 에서 사용하는 Story 필드 (목록 조회 시 only 에 사용)
+    MODEL_FIELDS = ('id', 'title', 'image')
+
     @classmethod
     def of(cls, popular_story: PopularStory):
         return cls(
@@ -122,10 +271,45 @@ class StoryPopularListItemDTO(object):
         )
 
     def to_dict(self):
-        return attr.asdict(self, recurse=True)
+        return attrs_to_dict(self)
+
+
+@attr.s(slots=True)
+class StoryTitleAutocompleteItemDTO(object):
+    story_id = attr.ib(type=int)
+    title = attr.ib(type=str)
+
+    def to_dict(self):
+        return attrs_to_dict(self)
 
 
 @attr.s
+class PopularStoryListDTO(object):
+    """
+    유저와 관계없이 공유하는 인기 스토리 목록 (캐시용)
+    비밀 Story 도 포함하며, 유저별로 볼 수 있는 비밀 Story 만 get_visible_items 로 걸러냅니다.
+    """
+    items = attr.ib(type=List[StoryPopularListItemDTO])
+    secret_story_ids = attr.ib(type=frozenset)
+
+    # of 에서 사용하는 Story 필드 (목록 조회 시 only 에 사용)
+    MODEL_FIELDS = StoryPopularListItemDTO.MODEL_FIELDS + ('is_secret',)
+
+    @classmethod
+    def of(cls, stories: List[Story]):
+        return cls(
+            items=[StoryPopularListItemDTO.by_story(story) for story in stories],
+            secret_story_ids=frozenset(story.id for story in stories if story.is_secret),
+        )
+
+    def get_visible_items(self, visible_secret_story_ids: frozenset = frozenset()) -> List[StoryPopularListItemDTO]:
+        return [
+            item for item in self.items
+            if item.story_id not in self.secret_story_ids or item.story_id in visible_secret_story_ids
+        ]
+
+
+@attr.s(slots=True)
 class StoryDetailItemDTO(object):
     id = attr.ib(type=int)
     title = attr.ib(type=str)
@@ -158,10 +342,10 @@ class StoryDetailItemDTO(object):
         )
 
     def to_dict(self):
-        return attr.asdict(self, recurse=True)
+        return attrs_to_dict(self)
 
 
-@attr.s
+@attr.s(slots=True)
 class UserSheetAnswerSolveHistoryItemDTO(object):
     group_id = attr.ib(type=int)
     sheet_title = attr.ib(type=str)
@@ -186,10 +370,10 @@ class UserSheetAnswerSolveHistoryItemDTO(object):
         )
 
     def to_dict(self):
-        return attr.asdict(self, recurse=True)
+        return attrs_to_dict(self)
 
 
-@attr.s
+@attr.s(slots=True)
 class GroupedSheetAnswerSolveDTO(object):
     group_id = attr.ib(type=int)
     sheet_answer_solve = attr.ib(type=List[UserSheetAnswerSolveHistoryItemDTO])
@@ -199,9 +383,9 @@ class GroupedSheetAnswerSolveDTO(object):
         grouped_data = defaultdict(list)
 
         for history_item in user_sheet_answer_solve_history_items:
-            grouped_data[history_item.group_id].append(history_item.to_dict())
+            grouped_data[history_item.group_id].append(history_item)
 
         return [cls(group_id=group_id, sheet_answer_solve=solve_list) for group_id, solve_list in grouped_data.items()]
 
     def to_dict(self):
-        return attr.asdict(self, recurse=True)
+        return attrs_to_dict(self)
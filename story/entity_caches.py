@@ -0,0 +1,23 @@
+from common_library import EntityCache
+from story.models import Sheet, Story
+
+
+story_entity_cache = EntityCache(
+    'story',
+    lambda story_id: Story.objects.filter(id=story_id).first(),
+)
+sheet_entity_cache = EntityCache(
+    'sheet',
+    lambda sheet_id: Sheet.objects.filter(id=sheet_id).first(),
+)
+# Story id 로 조회하는 Story 의 시작 Sheet
+start_sheet_entity_cache = EntityCache(
+    'start_sheet',
+    lambda story_id: Sheet.objects.filter(
+        story_id=story_id,
+        is_start=True,
+        is_deleted=False,
+    ).order_by(
+        'id',
+    ).first(),
+)
@@ -0,0 +1,282 @@
+import bisect
+import heapq
+import random
+import threading
+import time
+import unicodedata
+from collections import Counter
+from typing import (
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from story.constants import (
+    MAX_STORY_TITLE_AUTOCOMPLETE_PREFIX_LENGTH,
+    MAX_STORY_TITLE_AUTOCOMPLETE_SIZE,
+    STORY_TITLE_AUTOCOMPLETE_SCAN_BUDGET,
+    STORY_TITLE_AUTOCOMPLETE_TOP_PREFIX_LENGTH,
+)
+
+
+def normalize_answer(answer: str) -> str:
+    """
+    정답 비교용 정규화
+    NFC 로 분리된 한글 자모(맥 등에서 입력된 NFD)를 완성형 음절로 합친 후,
+    소문자로 바꾸고 모든 공백을 제거합니다.
+    """
+    return ''.join(unicodedata.normalize('NFC', answer).lower().split())
+
+
+def get_search_tokens(text: Optional[str]) -> Counter:
+    """
+    검색 색인용 토큰과 등장 횟수
+    NFC 로 정규화 후 소문자로 바꾸고 공백으로 나눈 단어마다 글자(unigram)와 연속된 두 글자(bigram)를 만듭니다.
+    한글은 형태소 분석 없이도 음절 bigram 으로 부분 검색이 가능합니다. ex) '스토리' -> 스, 토, 리, 스토, 토리
+    """
+    tokens = Counter()
+    for word in unicodedata.normalize('NFC', text or '').lower().split():
+        tokens.update(word)
+        tokens.update(word[index:index + 2] for index in range(len(word) - 1))
+    return tokens
+
+
+def get_search_query_tokens(search: str) -> Set[str]:
+    """
+    검색어 토큰
+    2글자 이상 단어는 bigram 만, 1글자 단어는 unigram 을 사용하며 모든 토큰이 있는 경우를 후보로 봅니다.
+    """
+    tokens = set()
+    for word in unicodedata.normalize('NFC', search or '').lower().split():
+        if len(word) == 1:
+            tokens.add(word)
+            continue
+        tokens.update(word[index:index + 2] for index in range(len(word) - 1))
+    return tokens
+
+
+class NextSheetPathSampler(object):
+    """
+    NextSheetPath quantity(가중치) 기반 다음 Sheet 선택기
+    가중치의 누적합을 미리 계산해두고 bisect 로 선택하기 때문에,
+    quantity 만큼 목록을 복제 후 셔플하는 것과 같은 분포를 가지면서
+    quantity 크기와 관계없이 경로 개수에 대해 O(log n) 으로 선택합니다.
+
+    quantity 가 0 이하 이거나 없는 경로는 선택되지 않으며,
+    선택할 경로가 없으면 첫번째 정답의 id 와 경로 None 을 반환합니다.
+    """
+    def __init__(self, answer_responses: list):
+        self.default_choice = (answer_responses[0].id, None, None) if answer_responses else (None, None, None)
+        self.choices = []
+        self.cumulative_quantities = []
+        total_quantity = 0
+        for answer_response in answer_responses:
+            if not answer_response.next_sheet_quantity or answer_response.next_sheet_quantity < 0:
+                continue
+            total_quantity += answer_response.next_sheet_quantity
+            self.choices.append(
+                (
+                    answer_response.id,
+                    answer_response.next_sheet_path_id,
+                    answer_response.next_sheet_id,
+                )
+            )
+            self.cumulative_quantities.append(total_quantity)
+        self.total_quantity = total_quantity
+
+    def sample(self, rng: random.Random = None) -> Tuple[Optional[int], Optional[int], Optional[int]]:
+        """
+        sheet_answer_id, next_sheet_path_id, next_sheet_id 를 반환합니다.
+        rng 는 테스트 재현을 위해 주입할 수 있습니다. (기본 random 모듈)
+        """
+        if not self.total_quantity:
+            return self.default_choice
+        picked_quantity = (rng or random).randrange(self.total_quantity)
+        return self.choices[bisect.bisect_right(self.cumulative_quantities, picked_quantity)]
+
+
+class SheetAnswerMatcher(object):
+    """
+    Sheet 정답 매칭 엔진
+    정답을 한번만 정규화하여 정규화된 정답을 key 로 하는 dict 에 색인하고,
+    항상 정답(is_always_correct) 인 정답들은 따로 모아둡니다.
+    제출된 정답은 한번의 정규화와 한번의 dict 조회로 판별합니다.
+
+    answer_responses 는 SheetAnswerResponseDTO 목록입니다.
+    """
+    def __init__(self, answer_responses: list):
+        self.answer_responses_by_normalized_answer = {}  # type: Dict[str, list]
+        self.always_correct_answer_responses = []
+        for answer_response in answer_responses:
+            if answer_response.is_always_correct:
+                self.always_correct_answer_responses.append(answer_response)
+                continue
+            self.answer_responses_by_normalized_answer.setdefault(
+                normalize_answer(answer_response.answer),
+                [],
+            ).append(answer_response)
+
+        self.next_sheet_path_sampler_by_normalized_answer = {
+            normalized_answer: NextSheetPathSampler(matched_answer_responses)
+            for normalized_answer, matched_answer_responses in self.answer_responses_by_normalized_answer.items()
+        }  # type: Dict[str, NextSheetPathSampler]
+        self.always_correct_next_sheet_path_sampler = NextSheetPathSampler(self.always_correct_answer_responses)
+
+    def get_matched_answer_responses(self, answer: str) -> List:
+        """
+        제출된 정답과 일치하는 정답이 없으면 항상 정답인 정답들을 반환합니다.
+        """
+        return self.answer_responses_by_normalized_answer.get(
+            normalize_answer(answer),
+            self.always_correct_answer_responses,
+        )
+
+    def get_valid_answer_info(self, answer: str, rng: random.Random = None) -> Tuple[bool, Optional[int], Optional[int], Optional[int]]:
+        """
+        is_answer_valid: 정답 유무
+        sheet_answer_id: quantity 를 통해 무작위로 결정된 SheetAnswer id
+        next_sheet_path_id: quantity 를 통해 무작위로 결정된 NextSheetPath id
+        next_sheet_id: quantity 를 통해 무작위로 결정된 다음 Sheet id
+        """
+        next_sheet_path_sampler = self.next_sheet_path_sampler_by_normalized_answer.get(
+            normalize_answer(answer),
+            self.always_correct_next_sheet_path_sampler,
+        )
+        sheet_answer_id, next_sheet_path_id, next_sheet_id = next_sheet_path_sampler.sample(rng)
+        if not sheet_answer_id:
+            return False, None, None, None
+        return True, sheet_answer_id, next_sheet_path_id, next_sheet_id
+
+
+def normalize_autocomplete_title(title: Optional[str]) -> str:
+    """
+    자동완성 비교용 정규화: NFC 정규화 후 소문자로 바꾸고 연속된 공백을 하나로 합칩니다.
+    """
+    return ' '.join(unicodedata.normalize('NFC', title or '').lower().split())
+
+
+class StoryTitleAutocomplete(object):
+    """
+    Story 제목 prefix 자동완성
+    정규화된 제목과 제목의 각 단어부터 시작하는 문자열을 key 로 정렬된 배열에 두고 bisect 로 prefix 범위를 찾습니다.
+    ex) '모험 스토리' -> '모험 스토리', '스토리'
+    prefix 로 시작하는 Story 중 like_count 상위 limit 개를 반환합니다.
+
+    일치하는 key 가 많은 top_prefix_length 이하의 prefix 는 상위 top_size 개 story_id 를 미리 계산해두고,
+    긴 prefix 는 max_prefix_length 까지만 사용하며 scan_budget 개의 key 까지만 확인합니다.
+    items 는 (story_id, title, like_count) 목록이며, upsert/remove 로 Story 하나씩 갱신할 수 있습니다.
+    version, built_at 은 다시 만들 때를 판단하기 위해 사용합니다.
+    """
+    def __init__(
+            self,
+            items: Iterable[Tuple[int, str, int]] = (),
+            version: int = None,
+            top_size: int = MAX_STORY_TITLE_AUTOCOMPLETE_SIZE,
+            top_prefix_length: int = STORY_TITLE_AUTOCOMPLETE_TOP_PREFIX_LENGTH,
+            max_prefix_length: int = MAX_STORY_TITLE_AUTOCOMPLETE_PREFIX_LENGTH,
+            scan_budget: int = STORY_TITLE_AUTOCOMPLETE_SCAN_BUDGET,
+    ):
+        self.version = version
+        self.built_at = time.time()
+        self.top_size = top_size
+        self.top_prefix_length = top_prefix_length
+        self.max_prefix_length = max_prefix_length
+        self.scan_budget = scan_budget
+        self.title_and_like_count_by_story_id = {}  # type: Dict[int, Tuple[str, int]]
+        self.keys = []  # type: List[Tuple[str, int]]
+        self.top_story_ids_by_prefix = {}  # type: Dict[str, List[int]]
+        self._lock = threading.Lock()
+
+        story_ids_by_prefix = {}  # type: Dict[str, Set[int]]
+        for story_id, title, like_count in items:
+            self.title_and_like_count_by_story_id[story_id] = (title, like_count)
+            for key in self.get_keys(title):
+                self.keys.append((key, story_id))
+                for prefix in self.get_top_prefixes(key):
+                    story_ids_by_prefix.setdefault(prefix, set()).add(story_id)
+        self.keys.sort()
+        for prefix, story_ids in story_ids_by_prefix.items():
+            self.top_story_ids_by_prefix[prefix] = self._get_top_story_ids(story_ids, self.top_size)
+
+    @staticmethod
+    def get_keys(title: str) -> List[str]:
+        words = normalize_autocomplete_title(title).split(' ')
+        return [' '.join(words[index:]) for index in range(len(words)) if words[index]]
+
+    def get_top_prefixes(self, key: str) -> List[str]:
+        return [key[:length] for length in range(1, min(len(key), self.top_prefix_length) + 1)]
+
+    def __len__(self):
+        return len(self.title_and_like_count_by_story_id)
+
+    def upsert(self, story_id: int, title: str, like_count: int) -> None:
+        with self._lock:
+            prefixes = self._remove(story_id)
+            self.title_and_like_count_by_story_id[story_id] = (title, like_count)
+            for key in self.get_keys(title):
+                bisect.insort(self.keys, (key, story_id))
+                prefixes.update(self.get_top_prefixes(key))
+            self._update_top_story_ids(prefixes)
+
+    def remove(self, story_id: int) -> None:
+        with self._lock:
+            self._update_top_story_ids(self._remove(story_id))
+
+    def _remove(self, story_id: int) -> Set[str]:
+        """
+        top story_id 를 다시 계산해야 하는 prefix 를 반환합니다.
+        """
+        title_and_like_count = self.title_and_like_count_by_story_id.pop(story_id, None)
+        if not title_and_like_count:
+            return set()
+        prefixes = set()
+        for key in self.get_keys(title_and_like_count[0]):
+            index = bisect.bisect_left(self.keys, (key, story_id))
+            if index < len(self.keys) and self.keys[index] == (key, story_id):
+                del self.keys[index]
+            prefixes.update(self.get_top_prefixes(key))
+        return prefixes
+
+    def _update_top_story_ids(self, prefixes: Set[str]) -> None:
+        for prefix in prefixes:
+            story_ids = self._scan_story_ids(prefix)
+            if story_ids:
+                self.top_story_ids_by_prefix[prefix] = self._get_top_story_ids(story_ids, self.top_size)
+            else:
+                self.top_story_ids_by_prefix.pop(prefix, None)
+
+    def _scan_story_ids(self, prefix: str, budget: int = None) -> Set[int]:
+        """
+        key 가 prefix 로 시작하는 story_id 를 budget 개의 key 까지 찾습니다.
+        """
+        story_ids = set()
+        index = bisect.bisect_left(self.keys, (prefix,))
+        end = len(self.keys) if budget is None else min(index + budget, len(self.keys))
+        while index < end and self.keys[index][0].startswith(prefix):
+            story_ids.add(self.keys[index][1])
+            index += 1
+        return story_ids
+
+    def _get_top_story_ids(self, story_ids: Iterable[int], limit: int) -> List[int]:
+        return heapq.nlargest(
+            limit,
+            story_ids,
+            key=lambda story_id: (self.title_and_like_count_by_story_id[story_id][1], story_id),
+        )
+
+    def search(self, prefix: str, limit: int) -> List[Tuple[int, str]]:
+        """
+        (story_id, title) 목록을 like_count, story_id 내림차순으로 반환합니다.
+        """
+        prefix = normalize_autocomplete_title(prefix)[:self.max_prefix_length].rstrip()
+        if not prefix:
+            return []
+        with self._lock:
+            if len(prefix) <= self.top_prefix_length and limit <= self.top_size:
+                top_story_ids = self.top_story_ids_by_prefix.get(prefix, [])[:limit]
+            else:
+                top_story_ids = self._get_top_story_ids(self._scan_story_ids(prefix, self.scan_budget), limit)
+            return [(story_id, self.title_and_like_count_by_story_id[story_id][0]) for story_id in top_story_ids]
@@ -0,0 +1,114 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand
+from django.db import IntegrityError, transaction
+
+from story.helpers import normalize_answer
+from story.models import SheetWrongAnswerCount, WrongAnswer
+
+
+class Command(BaseCommand):
+    help = 'WrongAnswer 로 SheetWrongAnswerCount(틀린 답 집계) 재생성'
+
+    def add_arguments(self, parser):
+        # 키워드 인자 (named arguments)
+        parser.add_argument('-c', '--chunk-size', type=int, help='한번에 집계할 WrongAnswer 개수', default=5000)
+
+    def handle(self, *args, **kwargs):
+        chunk_size = kwargs.get('chunk_size')
+
+        # 집계를 지우고 다시 만들지 않고, 1개 트랜잭션에서 집계 row 를 잠근 뒤 계산한 값으로 덮어씁니다.
+        # WrongAnswer 저장 시 증가는 잠금이 풀린 뒤 반영되므로, 실행 중 저장된 WrongAnswer 도 빠지거나 두번 집계되지 않습니다.
+        with transaction.atomic():
+            wrong_answer_counts = {
+                (story_id, sheet_id, normalized_answer): (wrong_answer_count_id, (count, first_seen, last_seen))
+                for wrong_answer_count_id, story_id, sheet_id, normalized_answer, count, first_seen, last_seen
+                in SheetWrongAnswerCount.objects.select_for_update().values_list(
+                    'id',
+                    'story_id',
+                    'sheet_id',
+                    'normalized_answer',
+                    'count',
+                    'first_seen',
+                    'last_seen',
+                )
+            }
+            counts_by_key = self.get_counts_by_key(chunk_size)
+
+            for key, counts in counts_by_key.items():
+                wrong_answer_count_id, current_counts = wrong_answer_counts.pop(key, (None, None))
+                if wrong_answer_count_id is None:
+                    self.create_wrong_answer_count(*key, *counts)
+                elif current_counts != counts:
+                    count, first_seen, last_seen = counts
+                    SheetWrongAnswerCount.objects.filter(
+                        id=wrong_answer_count_id,
+                    ).update(
+                        count=count,
+                        first_seen=first_seen,
+                        last_seen=last_seen,
+                    )
+            # WrongAnswer 로 다시 집계되지 않은 row 는 잘못 남은 집계입니다.
+            SheetWrongAnswerCount.objects.filter(
+                id__in=[wrong_answer_count_id for wrong_answer_count_id, _ in wrong_answer_counts.values()],
+            ).delete()
+
+        self.stdout.write(f'success: {sum(count for count, _, _ in counts_by_key.values())}')
+
+    @staticmethod
+    def get_counts_by_key(chunk_size: int) -> dict:
+        """
+        (story_id, sheet_id, 정규화된 답) 별 (count, first_seen, last_seen) 를 반환합니다.
+        """
+        counts_by_key = {}
+        last_wrong_answer_id = 0
+        while True:
+            wrong_answers = list(
+                WrongAnswer.objects.filter(
+                    id__gt=last_wrong_answer_id,
+                ).values_list(
+                    'id',
+                    'story_id',
+                    'sheet_id',
+                    'answer',
+                    'created_at',
+                ).order_by(
+                    'id',
+                )[:chunk_size]
+            )
+            if not wrong_answers:
+                break
+            for _, story_id, sheet_id, answer, created_at in wrong_answers:
+                key = (story_id, sheet_id, normalize_answer(answer)[:100])
+                count, first_seen, last_seen = counts_by_key.get(key, (0, created_at, created_at))
+                counts_by_key[key] = (count + 1, min(first_seen, created_at), max(last_seen, created_at))
+            last_wrong_answer_id = wrong_answers[-1][0]
+        return counts_by_key
+
+    @staticmethod
+    def create_wrong_answer_count(
+            story_id: int, sheet_id: int, normalized_answer: str, count: int, first_seen: datetime, last_seen: datetime,
+    ) -> None:
+        """
+        잠근 뒤 WrongAnswer 저장으로 먼저 생성되었으면 생성된 row 를 계산한 값으로 덮어씁니다.
+        """
+        try:
+            with transaction.atomic():
+                SheetWrongAnswerCount.objects.create(
+                    story_id=story_id,
+                    sheet_id=sheet_id,
+                    normalized_answer=normalized_answer,
+                    count=count,
+                    first_seen=first_seen,
+                    last_seen=last_seen,
+                )
+        except IntegrityError:
+            SheetWrongAnswerCount.objects.filter(
+                story_id=story_id,
+                sheet_id=sheet_id,
+                normalized_answer=normalized_answer,
+            ).update(
+                count=count,
+                first_seen=first_seen,
+                last_seen=last_seen,
+            )
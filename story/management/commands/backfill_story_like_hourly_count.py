@@ -0,0 +1,98 @@
+from collections import Counter
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import IntegrityError, transaction
+
+from story.constants import POPULAR_STORY_WINDOW_SECONDS
+from story.models import StoryLike, StoryLikeHourlyCount
+
+
+class Command(BaseCommand):
+    help = 'StoryLike 로 StoryLikeHourlyCount(시간별 좋아요 집계) 재생성'
+
+    def add_arguments(self, parser):
+        # 키워드 인자 (named arguments)
+        parser.add_argument('-c', '--chunk-size', type=int, help='한번에 집계할 StoryLike 개수', default=5000)
+
+    def handle(self, *args, **kwargs):
+        chunk_size = kwargs.get('chunk_size')
+
+        # 인기 스토리의 가장 긴 기간만큼만 집계합니다.
+        since = StoryLikeHourlyCount.truncate_hour(
+            datetime.now() - timedelta(seconds=max(POPULAR_STORY_WINDOW_SECONDS.values()))
+        )
+
+        # 집계를 지우고 다시 만들지 않고, 1개 트랜잭션에서 집계 row 를 잠근 뒤 계산한 값으로 덮어씁니다.
+        # 좋아요 시 증감은 잠금이 풀린 뒤 반영되므로, 실행 중 생긴 좋아요도 빠지거나 두번 집계되지 않습니다.
+        with transaction.atomic():
+            hourly_counts = {
+                (story_id, hour): (hourly_count_id, like_count)
+                for hourly_count_id, story_id, hour, like_count in StoryLikeHourlyCount.objects.select_for_update().values_list(
+                    'id',
+                    'story_id',
+                    'hour',
+                    'like_count',
+                )
+            }
+            like_count_by_story_hour = self.get_like_count_by_story_hour(since, chunk_size)
+
+            for (story_id, hour), like_count in like_count_by_story_hour.items():
+                hourly_count_id, current_like_count = hourly_counts.pop((story_id, hour), (None, None))
+                if hourly_count_id is None:
+                    self.create_hourly_count(story_id, hour, like_count)
+                elif current_like_count != like_count:
+                    StoryLikeHourlyCount.objects.filter(id=hourly_count_id).update(like_count=like_count)
+            # StoryLike 로 다시 집계되지 않은 row 는 잘못 남은 집계입니다.
+            StoryLikeHourlyCount.objects.filter(
+                id__in=[hourly_count_id for hourly_count_id, _ in hourly_counts.values()],
+            ).delete()
+
+        self.stdout.write(f'success: {sum(like_count_by_story_hour.values())}')
+
+    @staticmethod
+    def get_like_count_by_story_hour(since: datetime, chunk_size: int) -> Counter:
+        like_count_by_story_hour = Counter()
+        last_story_like_id = 0
+        while True:
+            story_likes = list(
+                StoryLike.objects.filter(
+                    id__gt=last_story_like_id,
+                ).values_list(
+                    'id',
+                    'story_id',
+                    'is_deleted',
+                    'updated_at',
+                ).order_by(
+                    'id',
+                )[:chunk_size]
+            )
+            if not story_likes:
+                break
+            like_count_by_story_hour.update(
+                (story_id, StoryLikeHourlyCount.truncate_hour(updated_at))
+                for _, story_id, is_deleted, updated_at in story_likes
+                if story_id and not is_deleted and updated_at >= since
+            )
+            last_story_like_id = story_likes[-1][0]
+        return like_count_by_story_hour
+
+    @staticmethod
+    def create_hourly_count(story_id: int, hour: datetime, like_count: int) -> None:
+        """
+        잠근 뒤 좋아요로 먼저 생성되었으면 생성된 row 를 계산한 값으로 덮어씁니다.
+        """
+        try:
+            with transaction.atomic():
+                StoryLikeHourlyCount.objects.create(
+                    story_id=story_id,
+                    hour=hour,
+                    like_count=like_count,
+                )
+        except IntegrityError:
+            StoryLikeHourlyCount.objects.filter(
+                story_id=story_id,
+                hour=hour,
+            ).update(
+                like_count=like_count,
+            )
@@ -0,0 +1,16 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from story.buffers import StoryViewCounter
+
+
+class Command(BaseCommand):
+    help = '끝난 bucket 의 Story 순 조회수를 view_count 에 반영'
+
+    def add_arguments(self, parser):
+        # 키워드 인자 (named arguments)
+        parser.add_argument('-c', '--chunk-size', type=int, help='한번에 update 할 Story 개수', default=settings.STORY_VIEW_FLUSH_CHUNK_SIZE)
+
+    def handle(self, *args, **kwargs):
+        flushed_view_count = StoryViewCounter().flush(chunk_size=kwargs.get('chunk_size'))
+        self.stdout.write(f'success: {flushed_view_count}')
@@ -0,0 +1,16 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from story.buffers import WrongAnswerBuffer
+
+
+class Command(BaseCommand):
+    help = 'WrongAnswer write-behind 버퍼 flush (flush task 유실 대비)'
+
+    def add_arguments(self, parser):
+        # 키워드 인자 (named arguments)
+        parser.add_argument('-c', '--chunk-size', type=int, help='bulk_create 할 chunk 크기', default=settings.WRONG_ANSWER_BUFFER_CHUNK_SIZE)
+
+    def handle(self, *args, **kwargs):
+        flushed_count = WrongAnswerBuffer().flush(chunk_size=kwargs.get('chunk_size'))
+        self.stdout.write(f'success: {flushed_count}')
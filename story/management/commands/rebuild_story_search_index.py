@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+
+from common_library import get_max_int_from_queryset
+from story.models import Story, StorySearchToken
+
+
+class Command(BaseCommand):
+    help = 'Story 검색 색인(StorySearchToken) 재생성'
+
+    def add_arguments(self, parser):
+        # 키워드 인자 (named arguments)
+        parser.add_argument('-c', '--chunk-size', type=int, help='한번에 색인할 Story 개수', default=500)
+
+    def handle(self, *args, **kwargs):
+        chunk_size = kwargs.get('chunk_size')
+
+        # 시작 시점의 마지막 id 까지만 색인합니다. 이후 생성되는 Story 는 저장 시 색인됩니다.
+        max_story_id = get_max_int_from_queryset(Story.objects.all(), 'id') or 0
+
+        last_story_id = 0
+        total_count = 0
+        while last_story_id < max_story_id:
+            story_ids = list(
+                Story.objects.filter(
+                    id__gt=last_story_id,
+                    id__lte=max_story_id,
+                ).values_list(
+                    'id',
+                    flat=True,
+                ).order_by(
+                    'id',
+                )[:chunk_size]
+            )
+            if not story_ids:
+                break
+            for story_id in story_ids:
+                StorySearchToken.reindex_story(story_id)
+            last_story_id = story_ids[-1]
+            total_count += len(story_ids)
+
+        self.stdout.write(f'success: {total_count}')
@@ -0,0 +1,78 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+
+from story.entity_caches import story_entity_cache
+from story.models import Story, StoryLike, UserStorySolve
+
+
+class Command(BaseCommand):
+    help = 'Story like_count, played_count 를 StoryLike, UserStorySolve 기준으로 보정'
+
+    def add_arguments(self, parser):
+        # 키워드 인자 (named arguments)
+        parser.add_argument('-c', '--chunk-size', type=int, help='한번에 보정할 Story 개수', default=1000)
+        parser.add_argument('--dry-run', action='store_true', help='보정하지 않고 어긋난 Story 개수만 출력')
+
+    def handle(self, *args, **kwargs):
+        chunk_size = kwargs.get('chunk_size')
+        dry_run = kwargs.get('dry_run')
+
+        last_story_id = 0
+        drifted_count = 0
+        repaired_count = 0
+        while True:
+            stories = list(
+                Story.objects.filter(
+                    id__gt=last_story_id,
+                ).values_list(
+                    'id',
+                    'like_count',
+                    'played_count',
+                ).order_by(
+                    'id',
+                )[:chunk_size]
+            )
+            if not stories:
+                break
+            story_ids = [story_id for story_id, _, _ in stories]
+            like_count_by_story_id = self.get_count_by_story_id(
+                StoryLike.objects.filter(story_id__in=story_ids, is_deleted=False)
+            )
+            played_count_by_story_id = self.get_count_by_story_id(
+                UserStorySolve.objects.filter(story_id__in=story_ids)
+            )
+
+            for story_id, like_count, played_count in stories:
+                actual_like_count = like_count_by_story_id.get(story_id, 0)
+                actual_played_count = played_count_by_story_id.get(story_id, 0)
+                if (like_count, played_count) == (actual_like_count, actual_played_count):
+                    continue
+                drifted_count += 1
+                if dry_run:
+                    continue
+                # 읽은 뒤 다른 요청으로 값이 바뀌었으면 덮어쓰지 않고 다음 실행에서 보정합니다.
+                repaired_count += Story.objects.filter(
+                    id=story_id,
+                    like_count=like_count,
+                    played_count=played_count,
+                ).update(
+                    like_count=actual_like_count,
+                    played_count=actual_played_count,
+                )
+                story_entity_cache.invalidate(story_id)
+            last_story_id = story_ids[-1]
+
+        self.stdout.write(f'success: drifted {drifted_count}, repaired {repaired_count}')
+
+    @staticmethod
+    def get_count_by_story_id(qs) -> dict:
+        return dict(
+            qs.values(
+                'story_id',
+            ).annotate(
+                total=Count('id'),
+            ).values_list(
+                'story_id',
+                'total',
+            ).order_by()
+        )
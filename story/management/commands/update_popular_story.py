@@ -1,9 +1,13 @@
 from datetime import datetime, timedelta
 
-from django.core.management.base import BaseCommand
-from django.db.models import Count
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Sum
 
-from story.models import StoryLike, PopularStory
+from common_library import acquire_cache_lock, get_max_int_from_queryset, release_cache_lock, renew_cache_lock
+from story.constants import POPULAR_STORY_UPDATE_LOCK_KEY, POPULAR_STORY_UPDATE_LOCK_SECONDS, POPULAR_STORY_WINDOW_SECONDS
+from story.models import StoryLikeHourlyCount, PopularStory
+from story.services import delete_popular_story_list_cache
 
 
 class Command(BaseCommand):
@@ -11,56 +15,96 @@ class Command(BaseCommand):
 
     def __init__(self, stdout=None, stderr=None, no_color=False, force_color=False):
         super().__init__(stdout, stderr, no_color, force_color)
-        self.second = None
+        self.base_past_seconds = None
         self.rank = None
 
     def add_arguments(self, parser):
         # 키워드 인자 (named arguments)
-        parser.add_argument('-s', '--second', type=int, help='현재 시간에서 필터링할 범위 (기본 1시간)', default=3600)
+        parser.add_argument('-s', '--second', type=int, help='현재 시간에서 필터링할 범위 (입력 시 window 대신 사용)', default=None)
+        parser.add_argument(
+            '-w', '--window', nargs='+', choices=list(POPULAR_STORY_WINDOW_SECONDS.keys()),
+            help='인기 스토리 기간 (기본 전체)', default=list(POPULAR_STORY_WINDOW_SECONDS.keys()),
+        )
         parser.add_argument('-r', '--rank', type=int, help='상위 몇개 가져올지 설정', default=6)
 
     def handle(self, *args, **kwargs):
-        self.second = kwargs.get('second')
+        second = kwargs.get('second')
+        if second:
+            self.base_past_seconds = [second]
+        else:
+            self.base_past_seconds = [POPULAR_STORY_WINDOW_SECONDS[window] for window in kwargs.get('window')]
         self.rank = kwargs.get('rank')
 
-        top_stories = self.get_top_stories()
+        # 다른 실행이 generation 을 읽고 쓰는 중이면 같은 generation 을 만들지 않도록 실행하지 않습니다.
+        lock_token = acquire_cache_lock(POPULAR_STORY_UPDATE_LOCK_KEY, POPULAR_STORY_UPDATE_LOCK_SECONDS)
+        if not lock_token:
+            self.stdout.write('skip: 다른 update_popular_story 가 실행 중입니다.')
+            return
+
+        try:
+            now = datetime.now()
+            top_stories_by_base_past_second = {
+                base_past_second: self.get_top_stories(now, base_past_second)
+                for base_past_second in self.base_past_seconds
+            }
+            # 집계가 오래 걸려 lock 이 만료되었으면 다른 실행과 겹칠 수 있으므로 저장하지 않습니다.
+            if not renew_cache_lock(POPULAR_STORY_UPDATE_LOCK_KEY, lock_token, POPULAR_STORY_UPDATE_LOCK_SECONDS):
+                raise CommandError('update_popular_story lock 이 만료되었습니다.')
 
-        self.delete_old_popular_stories()
-        self.create_new_popular_stories(top_stories)
+            # 새 세대를 먼저 생성한 후 이전 세대를 삭제하는 것을 한 transaction 으로 처리하여
+            # 조회 시 인기 스토리가 비어있거나 두 세대가 섞여 보이지 않도록 합니다.
+            with transaction.atomic():
+                generation = (get_max_int_from_queryset(PopularStory.objects.all(), 'generation') or 0) + 1
+                self.create_new_popular_stories(generation, top_stories_by_base_past_second)
+                self.delete_old_popular_stories(generation)
+        finally:
+            release_cache_lock(POPULAR_STORY_UPDATE_LOCK_KEY, lock_token)
+        delete_popular_story_list_cache()
 
         self.stdout.write('success')
 
-    def get_top_stories(self):
-        return StoryLike.objects.filter(
-            is_deleted=False,
-            updated_at__gte=datetime.now() - timedelta(seconds=self.second),
+    def get_top_stories(self, now: datetime, base_past_second: int):
+        """
+        StoryLikeHourlyCount 의 시간 bucket 을 합산합니다. (7일 기준 최대 169개 bucket)
+        시작 시간이 포함된 bucket 부터 합산하기 때문에 기간보다 최대 1시간 전의 좋아요까지 포함될 수 있습니다.
+        """
+        return StoryLikeHourlyCount.objects.filter(
+            hour__gte=StoryLikeHourlyCount.truncate_hour(now - timedelta(seconds=base_past_second)),
         ).values(
             'story'
         ).annotate(
-            total=Count('story')
+            total=Sum('like_count')
+        ).filter(
+            total__gt=0,
         ).values_list(
             'story',
             'total',
         ).order_by(
-            '-total'
+            '-total',
+            'story',
         )[:self.rank]
 
-    @staticmethod
-    def delete_old_popular_stories():
+    def delete_old_popular_stories(self, generation: int):
         PopularStory.objects.filter(
             is_deleted=False,
+            base_past_second__in=self.base_past_seconds,
+            generation__lt=generation,
         ).update(
             is_deleted=True,
             updated_at=datetime.now(),
         )
 
-    def create_new_popular_stories(self, top_popular_stories):
+    @staticmethod
+    def create_new_popular_stories(generation: int, top_stories_by_base_past_second: dict):
         popular_stories = [
             PopularStory(
                 rank=rank,
                 like_count=story[1],
-                base_past_second=self.second,
+                base_past_second=base_past_second,
+                generation=generation,
                 story_id=story[0],
-            ) for rank, story in enumerate(top_popular_stories, 1)
+            )
+            for base_past_second, top_stories in top_stories_by_base_past_second.items()
+            for rank, story in enumerate(top_stories, 1)
         ]
         PopularStory.objects.bulk_create(popular_stories)
@@ -1,41 +1,40 @@
 from django.contrib.auth.models import AnonymousUser
-from django.db.models import Manager, Q, Exists, OuterRef
+from django.db.models import Manager, Q
+
+
+def get_visible_secret_filter(user, field_prefix='') -> Q:
+    """
+    공개 Story 또는 유저가 멤버인 비밀 Story 조건
+    유저의 비밀 Story id 목록은 캐시에서 가져오기 때문에 row 마다 subquery 를 실행하지 않습니다.
+    """
+    public_filter = Q(**{f'{field_prefix}is_secret': False})
+    if not user or isinstance(user, AnonymousUser):
+        return public_filter
+
+    from story.models import Story
+
+    secret_story_ids = Story.get_user_secret_story_ids(user.id)
+    if not secret_story_ids:
+        return public_filter
+    return public_filter | Q(**{f'{field_prefix}id__in': sorted(secret_story_ids)})
 
 
 class StoryManager(Manager):
     def get_actives(self, user=None):
-        base_query = self.filter(
+        return self.filter(
             is_deleted=False,
             displayable=True,
+        ).filter(
+            get_visible_secret_filter(user),
         )
-        if user and not isinstance(user, AnonymousUser):
-            secret_member_condition = Exists(
-                user.secret_stories.filter(pk=OuterRef('pk'))
-            )
-            base_query = base_query.filter(
-                Q(is_secret=False) | secret_member_condition,
-            )
-        else:
-            base_query = base_query.filter(is_secret=False)
-
-        return base_query
 
 
 class PopularStoryManager(Manager):
     def get_actives(self, user=None):
-        base_query = self.filter(
+        return self.filter(
             story__is_deleted=False,
             story__displayable=True,
             is_deleted=False,
+        ).filter(
+            get_visible_secret_filter(user, 'story__'),
         )
-        if user and not isinstance(user, AnonymousUser):
-            secret_member_condition = Exists(
-                user.secret_stories.filter(pk=OuterRef('story_id'))
-            )
-            base_query = base_query.filter(
-                Q(story__is_secret=False) | secret_member_condition,
-            )
-        else:
-            base_query = base_query.filter(story__is_secret=False)
-
-        return base_query
@@ -0,0 +1,19 @@
+# Generated by Django 3.2.14 on 2026-10-18 20:42
+
+import datetime
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('story', '0021_wronganswer'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='wronganswer',
+            name='created_at',
+            field=models.DateTimeField(default=datetime.datetime.now, editable=False, verbose_name='생성일'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 3.2.14 on 2026-10-18 20:43
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('story', '0022_wronganswer_created_at_default'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SheetWrongAnswerCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('normalized_answer', models.CharField(max_length=100, verbose_name='정규화된 틀린 답')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='제출 횟수')),
+                ('first_seen', models.DateTimeField(verbose_name='처음 제출된 시간')),
+                ('last_seen', models.DateTimeField(verbose_name='마지막으로 제출된 시간')),
+                ('sheet', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='story.sheet')),
+                ('story', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='story.story')),
+            ],
+            options={
+                'verbose_name': '틀린 답 집계',
+                'verbose_name_plural': '틀린 답 집계',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='sheetwronganswercount',
+            index=models.Index(fields=['sheet', '-count'], name='story_sheet_sheet_i_ae26b1_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='sheetwronganswercount',
+            constraint=models.UniqueConstraint(fields=('story', 'sheet', 'normalized_answer'), name='unique_sheet_wrong_answer_count'),
+        ),
+    ]
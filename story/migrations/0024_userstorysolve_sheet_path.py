@@ -0,0 +1,53 @@
+# Generated by Django 3.2.14 on 2026-10-18 20:47
+
+from django.db import migrations, models
+
+
+def forward(apps, schema_editor):
+    """
+    해결한 UserSheetAnswerSolve 로 기존 유저의 경로(breadcrumb)를 만듭니다.
+    """
+    UserStorySolve = apps.get_model('story', 'UserStorySolve')
+    UserSheetAnswerSolve = apps.get_model('story', 'UserSheetAnswerSolve')
+
+    sheet_path_by_user_story = {}
+    for user_id, story_id, sheet_id, next_sheet_id in UserSheetAnswerSolve.objects.filter(
+        solving_status='solved',
+    ).order_by(
+        'solved_time',
+        'id',
+    ).values_list(
+        'user_id',
+        'story_id',
+        'sheet_id',
+        'next_sheet_path__sheet_id',
+    ).iterator():
+        sheet_path_by_user_story.setdefault((user_id, story_id), []).append(f'{sheet_id}>{next_sheet_id or ""},')
+
+    user_story_solves = []
+    for user_story_solve in UserStorySolve.objects.filter(user_id__isnull=False, story_id__isnull=False).iterator():
+        sheet_path = sheet_path_by_user_story.get((user_story_solve.user_id, user_story_solve.story_id))
+        if sheet_path:
+            user_story_solve.sheet_path = ''.join(sheet_path)
+            user_story_solves.append(user_story_solve)
+    UserStorySolve.objects.bulk_update(user_story_solves, ['sheet_path'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('story', '0023_sheetwronganswercount'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userstorysolve',
+            name='sheet_path',
+            field=models.TextField(blank=True, default='', verbose_name='해결한 Sheet 경로'),
+        ),
+        migrations.AddIndex(
+            model_name='userstorysolve',
+            index=models.Index(fields=['user', 'story'], name='story_users_user_id_513150_idx'),
+        ),
+        migrations.RunPython(forward, migrations.RunPython.noop),
+    ]
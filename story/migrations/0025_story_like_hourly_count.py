@@ -0,0 +1,36 @@
+# Generated by Django 3.2.14 on 2026-10-18 20:55
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('story', '0024_userstorysolve_sheet_path'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='popularstory',
+            name='generation',
+            field=models.IntegerField(db_index=True, default=0, verbose_name='생성 세대'),
+        ),
+        migrations.CreateModel(
+            name='StoryLikeHourlyCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hour', models.DateTimeField(db_index=True, verbose_name='시간')),
+                ('like_count', models.IntegerField(default=0, verbose_name='좋아요 개수')),
+                ('story', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='story.story')),
+            ],
+            options={
+                'verbose_name': 'Story 시간별 좋아요 집계',
+                'verbose_name_plural': 'Story 시간별 좋아요 집계',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='storylikehourlycount',
+            constraint=models.UniqueConstraint(fields=('story', 'hour'), name='unique_story_like_hourly_count'),
+        ),
+    ]
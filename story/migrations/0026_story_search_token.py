@@ -0,0 +1,72 @@
+# Generated by Django 3.2.14 on 2026-10-18 21:04
+
+import unicodedata
+from collections import Counter
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def get_search_tokens(text):
+    """
+    이 migration 시점의 검색 색인 토큰 (story.helpers.get_search_tokens 가 바뀌어도 migration 결과가 바뀌지 않도록 복사)
+    """
+    tokens = Counter()
+    for word in unicodedata.normalize('NFC', text or '').lower().split():
+        tokens.update(word)
+        tokens.update(word[index:index + 2] for index in range(len(word) - 1))
+    return tokens
+
+
+def forward(apps, schema_editor):
+    """
+    기존 Story 의 제목, 설명, 작성자 닉네임을 색인합니다.
+    """
+    Story = apps.get_model('story', 'Story')
+    StorySearchToken = apps.get_model('story', 'StorySearchToken')
+
+    story_search_tokens = []
+    for story_id, title, description, nickname in Story.objects.values_list(
+        'id',
+        'title',
+        'description',
+        'author__nickname',
+    ).iterator():
+        for field, text in (('title', title), ('description', description), ('author', nickname)):
+            story_search_tokens += [
+                StorySearchToken(story_id=story_id, field=field, token=token, count=count)
+                for token, count in get_search_tokens(text).items()
+            ]
+        if len(story_search_tokens) >= 5000:
+            StorySearchToken.objects.bulk_create(story_search_tokens)
+            story_search_tokens = []
+    StorySearchToken.objects.bulk_create(story_search_tokens)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('story', '0025_story_like_hourly_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StorySearchToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('field', models.CharField(choices=[('title', '제목'), ('description', '설명'), ('author', '작성자')], max_length=20, verbose_name='필드')),
+                ('token', models.CharField(max_length=2, verbose_name='토큰')),
+                ('count', models.IntegerField(default=1, verbose_name='등장 횟수')),
+                ('story', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='story.story')),
+            ],
+            options={
+                'verbose_name': 'Story 검색 색인',
+                'verbose_name_plural': 'Story 검색 색인',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='storysearchtoken',
+            index=models.Index(fields=['token', 'field'], name='story_story_token_301bde_idx'),
+        ),
+        migrations.RunPython(forward, migrations.RunPython.noop),
+    ]
@@ -1,13 +1,18 @@
 from datetime import datetime
+from typing import List, Optional, Tuple
 
 from django.contrib.auth.models import AnonymousUser
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import Case, Count, F, IntegerField, OuterRef, Q, QuerySet, Subquery, Sum, Value, When
+from django.db.models.functions import Concat, Greatest, Least
 
 from account.models import User
-from common_library import notify_slack
-from .constants import StoryLevel
+from common_library import delete_cache_value_by_key, generate_value_by_key_to_cache, get_cache_value_by_key
+from .constants import StoryLevel, STORY_RESPONDENT_USER_IDS_CACHE_KEY, STORY_RESPONDENT_USER_IDS_CACHE_SECONDS, \
+    StorySearchField, STORY_SEARCH_FIELD_WEIGHTS, USER_SECRET_STORY_IDS_CACHE_KEY, USER_SECRET_STORY_IDS_CACHE_SECONDS
+from .helpers import get_search_query_tokens, get_search_tokens, normalize_answer
 from .managers import StoryManager, PopularStoryManager
-from .task import send_user_sheet_solved_email
+from .task import send_user_sheet_solved_notifications
 
 
 class Story(models.Model):
@@ -40,6 +45,43 @@ class Story(models.Model):
     def __str__(self):
         return f'{self.id} {self.title}'
 
+    def is_active(self, user=None) -> bool:
+        """
+        StoryManager.get_actives 와 같은 조건으로 조회 가능한 Story 인지 확인합니다.
+        """
+        if self.is_deleted or not self.displayable:
+            return False
+        if not self.is_secret:
+            return True
+        if not user or isinstance(user, AnonymousUser):
+            return False
+        return self.id in Story.get_user_secret_story_ids(user.id)
+
+    @classmethod
+    def get_user_secret_story_ids(cls, user_id: int) -> frozenset:
+        """
+        유저가 멤버인 비밀 Story id 목록을 캐시에 frozenset 으로 가지고 있습니다.
+        목록 조회 시 row 마다 멤버 여부를 subquery 로 확인하지 않고 is_secret=False OR id IN (목록) 으로 조회합니다.
+        secret_members 변경 시 story.signals 에서 무효화 합니다.
+        """
+        cache_key = USER_SECRET_STORY_IDS_CACHE_KEY.format(user_id=user_id)
+        secret_story_ids = get_cache_value_by_key(cache_key)
+        if secret_story_ids is None:
+            secret_story_ids = frozenset(
+                cls.secret_members.through.objects.filter(
+                    user_id=user_id,
+                ).values_list(
+                    'story_id',
+                    flat=True,
+                )
+            )
+            generate_value_by_key_to_cache(cache_key, secret_story_ids, USER_SECRET_STORY_IDS_CACHE_SECONDS)
+        return secret_story_ids
+
+    @classmethod
+    def delete_user_secret_story_ids_cache(cls, user_id: int) -> None:
+        delete_cache_value_by_key(USER_SECRET_STORY_IDS_CACHE_KEY.format(user_id=user_id))
+
 
 class PopularStory(models.Model):
     """
@@ -47,12 +89,14 @@ class PopularStory(models.Model):
     rank 순위
     like_count 좋아요 개수 (base_past_second 기준 인기 스토리가 된 기준의 like_count)
     base_past_second 기준 과거 초 (인기 스토리가 된 기준의 과거 초) ex) 10 -> 현재로 부터 10초 전, 기준 생성한 like_count 용으로 사용
+    generation 생성 세대 (update_popular_story 실행마다 증가하며, 같은 세대는 한 transaction 으로 교체됩니다.)
     is_deleted 삭제 여부
     """
     story = models.ForeignKey(Story, on_delete=models.CASCADE)
     rank = models.IntegerField(verbose_name='순위', db_index=True)
     like_count = models.IntegerField(verbose_name='좋아요 개수')
     base_past_second = models.IntegerField(verbose_name='기준 과거 초')
+    generation = models.IntegerField(verbose_name='생성 세대', default=0, db_index=True)
     is_deleted = models.BooleanField(verbose_name='삭제 여부', default=False, db_index=True)
     created_at = models.DateTimeField(verbose_name='생성일', auto_now_add=True)
     updated_at = models.DateTimeField(verbose_name='수정일', auto_now=True)
@@ -69,14 +113,107 @@ class UserStorySolve(models.Model):
         ('give_up', '포기'),
         ('solved', '성공'),
     )
+    SHEET_PATH_EDGE_SEPARATOR = ','
+    SHEET_PATH_SHEET_SEPARATOR = '>'
+
     story = models.ForeignKey(Story, on_delete=models.SET_NULL, null=True)
     user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_CHOICES[0][0])
     solved_time = models.DateTimeField(blank=True, null=True)
+    # 해결한 순서대로 "sheet_id>next_sheet_id," 를 이어 붙인 경로 (breadcrumb), 다음 Sheet 가 없으면 "sheet_id>,"
+    sheet_path = models.TextField(verbose_name='해결한 Sheet 경로', default='', blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'story']),
+        ]
 
     def __str__(self):
         return f'User: {self.user_id} Story: {self.story_id} Status: {self.status}'
 
+    @classmethod
+    def append_sheet_path(cls, user_id: int, story_id: int, sheet_id: int, next_sheet_id: Optional[int]) -> None:
+        """
+        경로를 읽지 않고 한번의 update 로 뒤에 이어 붙입니다.
+        """
+        cls.objects.filter(
+            user_id=user_id,
+            story_id=story_id,
+        ).update(
+            sheet_path=Concat(
+                F('sheet_path'),
+                Value(cls.to_sheet_path_edge(sheet_id, next_sheet_id)),
+                output_field=models.TextField(),
+            )
+        )
+
+    @classmethod
+    def replace_sheet_path(cls, user_id: int, story_id: int, sheet_id: int, next_sheet_id: Optional[int]) -> None:
+        """
+        sheet_id 의 이전 간선을 지우고 뒤에 이어 붙입니다.
+        다른 version 에서 다시 해결한 Sheet 의 이전 다음 Sheet 가 경로에 남지 않게 합니다.
+        경로를 읽은 후 update 하기 때문에 row 를 잠급니다.
+        """
+        with transaction.atomic():
+            sheet_path = cls.objects.select_for_update().filter(
+                user_id=user_id,
+                story_id=story_id,
+            ).values_list(
+                'sheet_path',
+                flat=True,
+            ).first()
+            if sheet_path is None:
+                return
+            cls.objects.filter(
+                user_id=user_id,
+                story_id=story_id,
+            ).update(
+                sheet_path=''.join(
+                    [
+                        cls.to_sheet_path_edge(edge_sheet_id, edge_next_sheet_id)
+                        for edge_sheet_id, edge_next_sheet_id in cls.parse_sheet_path(sheet_path)
+                        if edge_sheet_id != sheet_id
+                    ] + [cls.to_sheet_path_edge(sheet_id, next_sheet_id)]
+                ),
+            )
+
+    @classmethod
+    def reset_sheet_path(cls, user_id: int, story_id: int) -> None:
+        cls.objects.filter(
+            user_id=user_id,
+            story_id=story_id,
+        ).update(
+            sheet_path='',
+        )
+
+    @classmethod
+    def get_sheet_path(cls, user_id: int, story_id: int) -> List[Tuple[int, Optional[int]]]:
+        """
+        해결한 순서대로 (sheet_id, next_sheet_id) 목록을 반환합니다.
+        """
+        sheet_path = cls.objects.filter(
+            user_id=user_id,
+            story_id=story_id,
+        ).values_list(
+            'sheet_path',
+            flat=True,
+        ).first()
+        return cls.parse_sheet_path(sheet_path or '')
+
+    @classmethod
+    def to_sheet_path_edge(cls, sheet_id: int, next_sheet_id: Optional[int]) -> str:
+        return f'{sheet_id}{cls.SHEET_PATH_SHEET_SEPARATOR}{next_sheet_id or ""}{cls.SHEET_PATH_EDGE_SEPARATOR}'
+
+    @classmethod
+    def parse_sheet_path(cls, sheet_path: str) -> List[Tuple[int, Optional[int]]]:
+        edges = []
+        for edge in sheet_path.split(cls.SHEET_PATH_EDGE_SEPARATOR):
+            if not edge:
+                continue
+            sheet_id, next_sheet_id = edge.split(cls.SHEET_PATH_SHEET_SEPARATOR)
+            edges.append((int(sheet_id), int(next_sheet_id) if next_sheet_id else None))
+        return edges
+
 
 class Sheet(models.Model):
     story = models.ForeignKey(Story, on_delete=models.SET_NULL, null=True)
@@ -174,23 +311,6 @@ class UserSheetAnswerSolveBaseModel(models.Model):
 
 
 class UserSheetAnswerSolve(UserSheetAnswerSolveBaseModel):
-    @classmethod
-    def get_previous_user_sheet_answer_solves_with_current_sheet_id(cls, user_id: int, current_sheet_id: int):
-        return list(
-            cls.objects.select_related(
-                'sheet',
-                'next_sheet_path',
-            ).filter(
-                user_id=user_id,
-                next_sheet_path__sheet_id=current_sheet_id,
-                sheet__is_deleted=False,
-                solving_status=cls.SOLVING_STATUS_CHOICES[1][0],
-            ).values(
-                'sheet_id',
-                'sheet__title',
-            )
-        )
-
     @classmethod
     def generate_cls_if_first_time(cls, user, sheet_id):
         try:
@@ -215,13 +335,35 @@ class UserSheetAnswerSolve(UserSheetAnswerSolveBaseModel):
             return None, None
         return user_sheet_answer_solve, is_created
 
-    def solved_sheet_action(self, solved_sheet_answer, next_sheet_path):
-        self.answer = solved_sheet_answer.answer
-        self.sheet_question = solved_sheet_answer.sheet.question
-        self.solved_sheet_version = solved_sheet_answer.sheet.version
-        self.solved_answer_version = solved_sheet_answer.version
-        self.solved_sheet_answer = solved_sheet_answer
-        self.next_sheet_path = next_sheet_path
+    def is_solved_sheet_version(self, sheet_version: int) -> bool:
+        return (
+            self.solving_status == self.SOLVING_STATUS_CHOICES[1][0]
+            and self.solved_sheet_version == sheet_version
+        )
+
+    def append_sheet_path(self, next_sheet_id: Optional[int], is_resolved: bool = False) -> None:
+        """
+        is_resolved: 이전 version 에서 해결했던 Sheet 를 다시 해결했으면 경로의 이전 간선을 바꿉니다.
+        """
+        append_sheet_path = UserStorySolve.replace_sheet_path if is_resolved else UserStorySolve.append_sheet_path
+        append_sheet_path(
+            user_id=self.user_id,
+            story_id=self.story_id,
+            sheet_id=self.sheet_id,
+            next_sheet_id=next_sheet_id,
+        )
+
+    def save_solved(self, answer: str, sheet_question: str, solved_sheet_version: int, solved_answer_version: int,
+                    solved_sheet_answer_id: int, next_sheet_path_id: Optional[int]):
+        """
+        문제 해결 Snapshot 을 한번의 update 로 저장합니다.
+        """
+        self.answer = answer
+        self.sheet_question = sheet_question
+        self.solved_sheet_version = solved_sheet_version
+        self.solved_answer_version = solved_answer_version
+        self.solved_sheet_answer_id = solved_sheet_answer_id
+        self.next_sheet_path_id = next_sheet_path_id
         self.solving_status = self.SOLVING_STATUS_CHOICES[1][0]
         self.solved_time = datetime.now()
         self.save(
@@ -229,36 +371,28 @@ class UserSheetAnswerSolve(UserSheetAnswerSolveBaseModel):
                 'solving_status',
                 'solved_time',
                 'answer',
+                'sheet_question',
                 'solved_sheet_version',
                 'solved_answer_version',
                 'solved_sheet_answer',
                 'next_sheet_path',
             ]
         )
-        if StoryEmailSubscription.has_respondent_user(self.story_id, self.user_id):
-            from .services import get_story_email_subscription_emails
-            send_user_sheet_solved_email.apply_async(
-                (
-                    self.id,
-                    get_story_email_subscription_emails(
-                        int(self.story_id),
-                        int(self.user_id),
-                    )
-                )
-            )
-        if StorySlackSubscription.has_respondent_user(self.story_id, self.user_id):
-            from .services import get_story_slack_subscription_slack_webhook_urls
-            for urls in get_story_slack_subscription_slack_webhook_urls(self.story_id, self.user_id):
-                notify_slack(
-                    channel_url=urls,
-                    text=f'story_id: {self.story_id}\n'
-                         f'story_title: {self.story.title}\n'
-                         f'sheet_id: {self.sheet_id}\n'
-                         f'sheet_title: {self.sheet.title}\n'
-                         f'sheet_question: {self.sheet.question}\n'
-                         f'username: {self.user.username}\n'
-                         f'user_answer: {self.answer}\n'
-                )
+
+    def notify_solved_sheet(self, has_email_subscription: bool = None, has_slack_subscription: bool = None):
+        """
+        관전 중인 이메일/슬랙이 있으면 알림 task 를 한번만 enqueue 합니다.
+        worker 가 commit 전의 해결 기록을 읽지 않도록 transaction commit 후에 enqueue 합니다.
+        전송 대상 조회 및 전송은 worker 에서 합니다.
+        구독 여부를 모르면(None) Story 별 respondent_user id 캐시로 판별합니다.
+        """
+        if has_email_subscription is None:
+            has_email_subscription = StoryEmailSubscription.has_respondent_user(self.story_id, self.user_id)
+        if has_slack_subscription is None:
+            has_slack_subscription = StorySlackSubscription.has_respondent_user(self.story_id, self.user_id)
+
+        if has_email_subscription or has_slack_subscription:
+            transaction.on_commit(lambda: send_user_sheet_solved_notifications.apply_async((self.id,)))
 
 
 class UserSheetAnswerSolveHistory(UserSheetAnswerSolveBaseModel):
@@ -277,7 +411,46 @@ class UserSheetAnswerSolveHistory(UserSheetAnswerSolveBaseModel):
         verbose_name_plural = '유저 풀이 히스토리'
 
 
-class StoryEmailSubscription(models.Model):
+class StoryRespondentUserSubscriptionMixin(object):
+    """
+    Story 별 관전 대상 respondent_user id 목록을 캐시에 frozenset 으로 가지고 있습니다.
+    대부분의 (story, user) 는 관전 대상이 아니기 때문에, 캐시가 있으면 DB 조회 없이 판별합니다.
+    구독 생성/수정/삭제 시 story.signals 에서 무효화 합니다.
+    """
+    @classmethod
+    def get_respondent_user_ids_cache_key(cls, story_id) -> str:
+        return STORY_RESPONDENT_USER_IDS_CACHE_KEY.format(
+            subscription_name=cls._meta.model_name,
+            story_id=story_id,
+        )
+
+    @classmethod
+    def get_respondent_user_ids(cls, story_id) -> frozenset:
+        cache_key = cls.get_respondent_user_ids_cache_key(story_id)
+        respondent_user_ids = get_cache_value_by_key(cache_key)
+        if respondent_user_ids is None:
+            respondent_user_ids = frozenset(
+                cls.objects.filter(
+                    story_id=story_id,
+                    respondent_user_id__isnull=False,
+                ).values_list(
+                    'respondent_user_id',
+                    flat=True,
+                )
+            )
+            generate_value_by_key_to_cache(cache_key, respondent_user_ids, STORY_RESPONDENT_USER_IDS_CACHE_SECONDS)
+        return respondent_user_ids
+
+    @classmethod
+    def delete_respondent_user_ids_cache(cls, story_id) -> None:
+        delete_cache_value_by_key(cls.get_respondent_user_ids_cache_key(story_id))
+
+    @classmethod
+    def has_respondent_user(cls, story_id, user_id):
+        return user_id in cls.get_respondent_user_ids(story_id)
+
+
+class StoryEmailSubscription(StoryRespondentUserSubscriptionMixin, models.Model):
     """
     story: 사용자가 풀고 있는 스토리
     respondent_user: Story 에서 행동에 대한 관찰할 user
@@ -296,12 +469,8 @@ class StoryEmailSubscription(models.Model):
         verbose_name = 'Story 관전을 위한 이메일'
         verbose_name_plural = 'Story 관전을 위한 이메일'
 
-    @classmethod
-    def has_respondent_user(cls, story_id, user_id):
-        return cls.objects.filter(story_id=story_id, respondent_user=user_id).exists()
 
-
-class StorySlackSubscription(models.Model):
+class StorySlackSubscription(StoryRespondentUserSubscriptionMixin, models.Model):
     """
     story: 사용자가 풀고 있는 스토리
     respondent_user: Story 에서 행동에 대한 관찰할 user
@@ -322,10 +491,6 @@ class StorySlackSubscription(models.Model):
         verbose_name = 'Story 관전을 위한 Slack 웹훅'
         verbose_name_plural = 'Story 관전을 위한 Slack 웹훅'
 
-    @classmethod
-    def has_respondent_user(cls, story_id, user_id):
-        return cls.objects.filter(story_id=story_id, respondent_user=user_id).exists()
-
 
 class StoryLike(models.Model):
     story = models.ForeignKey(Story, on_delete=models.SET_NULL, null=True)
@@ -357,7 +522,8 @@ class WrongAnswer(models.Model):
     story = models.ForeignKey(Story, on_delete=models.CASCADE)
     sheet = models.ForeignKey(Sheet, on_delete=models.CASCADE)
     answer = models.CharField(verbose_name='틀린 답', max_length=100)
-    created_at = models.DateTimeField(verbose_name='생성일', auto_now_add=True)
+    # write-behind 로 나중에 저장되어도 제출 시간을 유지하기 위해 auto_now_add 대신 default 를 사용합니다.
+    created_at = models.DateTimeField(verbose_name='생성일', default=datetime.now, editable=False)
 
     class Meta:
         verbose_name = '틀린 답'
@@ -365,3 +531,264 @@ class WrongAnswer(models.Model):
 
     def __str__(self):
         return f'{self.id} {self.user_id} - {self.story_id} - {self.sheet_id} - 틀린 답: {self.answer}'
+
+
+class SheetWrongAnswerCount(models.Model):
+    """
+    Sheet 별 틀린 답 집계 (WrongAnswer rollup)
+    normalized_answer: normalize_answer 로 정규화된 틀린 답
+    count: 제출 횟수
+    first_seen: 처음 제출된 시간
+    last_seen: 마지막으로 제출된 시간
+    """
+    story = models.ForeignKey(Story, on_delete=models.CASCADE)
+    sheet = models.ForeignKey(Sheet, on_delete=models.CASCADE)
+    normalized_answer = models.CharField(verbose_name='정규화된 틀린 답', max_length=100)
+    count = models.PositiveIntegerField(verbose_name='제출 횟수', default=0)
+    first_seen = models.DateTimeField(verbose_name='처음 제출된 시간')
+    last_seen = models.DateTimeField(verbose_name='마지막으로 제출된 시간')
+
+    class Meta:
+        verbose_name = '틀린 답 집계'
+        verbose_name_plural = '틀린 답 집계'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['story', 'sheet', 'normalized_answer'],
+                name='unique_sheet_wrong_answer_count',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['sheet', '-count']),
+        ]
+
+    def __str__(self):
+        return f'{self.id} {self.story_id} - {self.sheet_id} - {self.normalized_answer}: {self.count}'
+
+    @classmethod
+    def increase_counts(cls, wrong_answers: list) -> None:
+        """
+        wrong_answers(WrongAnswer 목록) 를 (story, sheet, 정규화된 답) 별로 모아 한번씩 F() 로 증가시킵니다.
+        집계 row 가 없으면 생성하며, 동시에 생성되어 IntegrityError 가 나면 다시 증가시킵니다.
+        """
+        counts_by_key = {}
+        for wrong_answer in wrong_answers:
+            key = (wrong_answer.story_id, wrong_answer.sheet_id, normalize_answer(wrong_answer.answer)[:100])
+            created_at = wrong_answer.created_at or datetime.now()
+            count, first_seen, last_seen = counts_by_key.get(key, (0, created_at, created_at))
+            counts_by_key[key] = (count + 1, min(first_seen, created_at), max(last_seen, created_at))
+
+        for (story_id, sheet_id, normalized_answer), (count, first_seen, last_seen) in counts_by_key.items():
+            if cls._increase_count(story_id, sheet_id, normalized_answer, count, first_seen, last_seen):
+                continue
+            try:
+                with transaction.atomic():
+                    cls.objects.create(
+                        story_id=story_id,
+                        sheet_id=sheet_id,
+                        normalized_answer=normalized_answer,
+                        count=count,
+                        first_seen=first_seen,
+                        last_seen=last_seen,
+                    )
+            except IntegrityError:
+                cls._increase_count(story_id, sheet_id, normalized_answer, count, first_seen, last_seen)
+
+    @classmethod
+    def _increase_count(cls, story_id, sheet_id, normalized_answer, count, first_seen, last_seen) -> bool:
+        return cls.objects.filter(
+            story_id=story_id,
+            sheet_id=sheet_id,
+            normalized_answer=normalized_answer,
+        ).update(
+            count=F('count') + count,
+            first_seen=Least('first_seen', first_seen),
+            last_seen=Greatest('last_seen', last_seen),
+        ) > 0
+
+
+class StoryLikeHourlyCount(models.Model):
+    """
+    Story 시간별 좋아요 집계 (StoryLike rollup)
+    hour: StoryLike 가 마지막으로 수정(좋아요)된 시간을 시간 단위로 내림한 시간
+    like_count: hour 에 마지막으로 좋아요 된 활성 StoryLike 개수
+    """
+    story = models.ForeignKey(Story, on_delete=models.CASCADE)
+    hour = models.DateTimeField(verbose_name='시간', db_index=True)
+    like_count = models.IntegerField(verbose_name='좋아요 개수', default=0)
+
+    class Meta:
+        verbose_name = 'Story 시간별 좋아요 집계'
+        verbose_name_plural = 'Story 시간별 좋아요 집계'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['story', 'hour'],
+                name='unique_story_like_hourly_count',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.id} {self.story_id} - {self.hour}: {self.like_count}'
+
+    @staticmethod
+    def truncate_hour(value: datetime) -> datetime:
+        return value.replace(minute=0, second=0, microsecond=0)
+
+    @classmethod
+    def increase_like_count(cls, story_id: int, liked_at: datetime, amount: int) -> None:
+        """
+        liked_at 이 속한 시간의 like_count 를 F() 로 증감합니다. (0 미만이 되지 않습니다.)
+        증가할 row 가 없으면 생성하며, 동시에 생성되어 IntegrityError 가 나면 다시 증가시킵니다.
+        """
+        hour = cls.truncate_hour(liked_at)
+        is_updated = cls.objects.filter(
+            story_id=story_id,
+            hour=hour,
+        ).update(
+            like_count=Greatest(F('like_count') + amount, 0),
+        )
+        if is_updated or amount <= 0:
+            return
+        try:
+            with transaction.atomic():
+                cls.objects.create(
+                    story_id=story_id,
+                    hour=hour,
+                    like_count=amount,
+                )
+        except IntegrityError:
+            cls.objects.filter(
+                story_id=story_id,
+                hour=hour,
+            ).update(
+                like_count=F('like_count') + amount,
+            )
+
+
+class StorySearchToken(models.Model):
+    """
+    Story 검색 색인 (역색인)
+    token: 제목, 설명, 작성자 닉네임을 나눈 unigram/bigram (story.helpers.get_search_tokens)
+    field: 토큰이 나온 필드
+    count: field 에서 토큰이 나온 횟수
+    Story 가 저장되거나 작성자 닉네임이 바뀌면 story.signals 에서 다시 색인합니다.
+    """
+    story = models.ForeignKey(Story, on_delete=models.CASCADE)
+    field = models.CharField(verbose_name='필드', max_length=20, choices=StorySearchField.choices())
+    token = models.CharField(verbose_name='토큰', max_length=2)
+    count = models.IntegerField(verbose_name='등장 횟수', default=1)
+
+    class Meta:
+        verbose_name = 'Story 검색 색인'
+        verbose_name_plural = 'Story 검색 색인'
+        indexes = [
+            models.Index(fields=['token', 'field']),
+        ]
+
+    def __str__(self):
+        return f'{self.id} {self.story_id} {self.field}: {self.token} ({self.count})'
+
+    search_lookup_by_field = {
+        StorySearchField.TITLE: 'title',
+        StorySearchField.DESCRIPTION: 'description',
+        StorySearchField.AUTHOR: 'author__nickname',
+    }
+
+    @classmethod
+    def reindex_story(cls, story_id: int) -> None:
+        """
+        Story 의 색인을 지우고 다시 만듭니다.
+        같은 Story 를 동시에 색인하지 않도록 Story row 를 lock 합니다.
+        """
+        with transaction.atomic():
+            story_value = Story.objects.select_for_update().filter(
+                id=story_id,
+            ).values(
+                'title',
+                'description',
+                'author_id',
+            ).first()
+            cls.objects.filter(story_id=story_id).delete()
+            if not story_value:
+                return
+
+            nickname = User.objects.filter(
+                id=story_value['author_id'],
+            ).values_list(
+                'nickname',
+                flat=True,
+            ).first() if story_value['author_id'] else None
+            text_by_field = {
+                StorySearchField.TITLE: story_value['title'],
+                StorySearchField.DESCRIPTION: story_value['description'],
+                StorySearchField.AUTHOR: nickname,
+            }
+            cls.objects.bulk_create([
+                cls(
+                    story_id=story_id,
+                    field=field.value,
+                    token=token,
+                    count=count,
+                )
+                for field, text in text_by_field.items()
+                for token, count in get_search_tokens(text).items()
+            ])
+
+    @classmethod
+    def get_search_filter(cls, search: str, fields: List[StorySearchField]) -> Q:
+        """
+        fields 중 하나에 search 가 포함된 Story 조건
+        색인에서 검색어의 모든 토큰이 한 필드에 있는 Story 를 후보로 찾은 후, 후보만 icontains 로 확인합니다.
+        """
+        exact_filter = Q()
+        for field in fields:
+            exact_filter |= Q(**{f'{cls.search_lookup_by_field[field]}__icontains': search})
+
+        tokens = get_search_query_tokens(search)
+        if not tokens:
+            return exact_filter
+        return Q(id__in=cls.get_matched_story_ids_qs(tokens, fields)) & exact_filter
+
+    @classmethod
+    def get_matched_story_ids_qs(cls, tokens: set, fields: List[StorySearchField]) -> QuerySet:
+        return cls.objects.filter(
+            token__in=tokens,
+            field__in=[field.value for field in fields],
+        ).values(
+            'story_id',
+            'field',
+        ).annotate(
+            matched_token_count=Count('token', distinct=True),
+        ).filter(
+            matched_token_count=len(tokens),
+        ).values(
+            'story_id',
+        )
+
+    @classmethod
+    def get_search_score(cls, search: str, fields: List[StorySearchField]) -> Subquery:
+        """
+        Story 검색 관련도: 검색어 토큰의 필드별 등장 횟수 * 필드 가중치의 합 (Story 에 annotate 하여 사용)
+        """
+        return Subquery(
+            cls.objects.filter(
+                story_id=OuterRef('pk'),
+                token__in=get_search_query_tokens(search),
+                field__in=[field.value for field in fields],
+            ).values(
+                'story_id',
+            ).annotate(
+                score=Sum(
+                    F('count') * Case(
+                        *[
+                            When(field=field.value, then=Value(STORY_SEARCH_FIELD_WEIGHTS[field]))
+                            for field in fields
+                        ],
+                        default=Value(0),
+                        output_field=IntegerField(),
+                    )
+                ),
+            ).values(
+                'score',
+            ),
+            output_field=IntegerField(),
+        )
@@ -1,223 +1,494 @@
 import random
-from typing import List, Optional
+import time
+from datetime import datetime
+from typing import List, Optional, Tuple
 
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
 from django.db import transaction
-from django.db.models import Q
-
-from common_library import get_max_int_from_queryset
+from django.db.models import F, Q, QuerySet
+from django.db.models.functions import Coalesce, Greatest
+
+from common_library import (
+    delete_cache_value_by_key,
+    generate_value_by_key_to_cache,
+    get_cache_value_by_key,
+    get_cache_version_by_key,
+    get_keyset_ordering,
+    get_max_int_from_queryset,
+    get_or_generate_cache_value_by_key,
+    increase_cache_version_by_key,
+    keyset_paging,
+    only_model_fields,
+)
 from config.common.exception_codes import StartingSheetDoesNotExists, SheetDoesNotExists, SheetNotAccessibleException, \
-    StoryDoesNotExists
-from story.constants import DEFAULT_POPULAR_KILL_SWITCH_STORY_COUNT
-from story.dtos import SheetAnswerResponseDTO, UserSheetAnswerSolveHistoryItemDTO
-from story.models import Sheet, UserSheetAnswerSolve, StoryEmailSubscription, StoryLike, Story, PopularStory, \
-    StorySlackSubscription, UserSheetAnswerSolveHistory, WrongAnswer
+    StoryDoesNotExists, SheetAlreadySolvedException, PopularStoryWindowInvalidException
+from story.buffers import StoryViewCounter, WrongAnswerBuffer
+from story.constants import (
+    DEFAULT_POPULAR_KILL_SWITCH_STORY_COUNT,
+    DEFAULT_POPULAR_STORY_WINDOW,
+    DEFAULT_STORY_TITLE_AUTOCOMPLETE_SIZE,
+    MAX_STORY_TITLE_AUTOCOMPLETE_SIZE,
+    POPULAR_STORY_CACHE_VERSION_KEY,
+    POPULAR_STORY_KILL_SWITCH_LIST_CACHE_KEY,
+    POPULAR_STORY_KILL_SWITCH_LIST_CACHE_SECONDS,
+    POPULAR_STORY_KILL_SWITCH_LIST_CACHE_STALE_SECONDS,
+    POPULAR_STORY_LIST_CACHE_KEY,
+    POPULAR_STORY_LIST_CACHE_SECONDS,
+    POPULAR_STORY_LIST_CACHE_STALE_SECONDS,
+    POPULAR_STORY_WINDOW_SECONDS,
+    SHEET_ANSWER_TABLE_CACHE_KEY,
+    SHEET_ANSWER_TABLE_CACHE_SECONDS,
+    STORY_GRAPH_CACHE_KEY,
+    STORY_GRAPH_CACHE_SECONDS,
+    STORY_SEARCH_FIELDS,
+    STORY_TITLE_AUTOCOMPLETE_REBUILD_SECONDS,
+    STORY_TITLE_AUTOCOMPLETE_VERSION_KEY,
+)
+from story.dtos import SheetAnswerSubmitResultDTO, SheetAnswerTableDTO, \
+    UserSheetAnswerSolveHistoryItemDTO, StoryGraphDTO, PreviousSheetInfoDTO, PopularStoryListDTO, StoryPopularListItemDTO, \
+    StoryTitleAutocompleteItemDTO, StoryListItemDTO, PlayingSheetInfoDTO
+from story.entity_caches import sheet_entity_cache, start_sheet_entity_cache, story_entity_cache
+from story.helpers import StoryTitleAutocomplete, normalize_autocomplete_title
+from story.models import Sheet, SheetAnswer, UserSheetAnswerSolve, StoryEmailSubscription, StoryLike, Story, PopularStory, \
+    StorySlackSubscription, UserSheetAnswerSolveHistory, WrongAnswer, SheetWrongAnswerCount, UserStorySolve, \
+    StoryLikeHourlyCount, StorySearchToken
+from story.task import flush_wrong_answer_buffer
+
+
+def get_active_stories_qs(search='', user=None) -> QuerySet:
+    """
+    검색어가 있으면 검색 관련도(search_score)를 annotate 합니다.
+    """
+    qs = Story.objects.get_actives(user)
 
+    if search:
+        qs = qs.filter(
+            StorySearchToken.get_search_filter(search, STORY_SEARCH_FIELDS),
+        ).annotate(
+            search_score=Coalesce(StorySearchToken.get_search_score(search, STORY_SEARCH_FIELDS), 0),
+        )
+    return qs
 
-def get_active_stories(search='', start_row=None, end_row=None, user=None) -> List[Story]:
-    qs = Story.objects.get_actives(user).order_by('-id')
 
-    if search:
-        qs = qs.filter(Q(title__icontains=search) | Q(description__icontains=search))
+def get_active_stories_order_by(search='') -> str:
+    """
+    검색어가 있으면 검색 관련도 순, 없으면 최신순
+    """
+    return '-search_score' if search else '-id'
+
+
+def get_active_stories(search='', start_row=None, end_row=None, user=None) -> List[Story]:
+    """
+    검색어가 있으면 검색 관련도 순, 없으면 최신순으로 가져옵니다.
+    StoryListItemDTO 가 사용하는 필드만 조회합니다.
+    """
+    qs = only_model_fields(get_active_stories_qs(search, user), StoryListItemDTO.MODEL_FIELDS)
+    qs = qs.order_by(*get_keyset_ordering(get_active_stories_order_by(search)))
 
     if start_row is not None and end_row is not None:
         return list(qs[start_row:end_row])
     return list(qs)
 
 
-def get_active_popular_stories(user=None) -> List[PopularStory]:
-    qs = PopularStory.objects.get_actives(user).order_by('rank')
-    return list(qs)
+def get_active_stories_by_cursor(search='', cursor='', size=10, user=None) -> Tuple[List[Story], Optional[str]]:
+    """
+    stories, next_cursor 를 반환합니다.
+    검색어가 있으면 (search_score, id), 없으면 id 로 cursor 를 이어서 get_active_stories 와 같은 순서로 가져옵니다.
+    StoryListItemDTO 가 사용하는 필드만 조회합니다.
+    """
+    qs = only_model_fields(get_active_stories_qs(search, user), StoryListItemDTO.MODEL_FIELDS)
+    return keyset_paging(qs, cursor, size, get_active_stories_order_by(search))
 
 
-def get_stories_order_by_fields(user=None, *args) -> List[Story]:
-    qs = Story.objects.get_actives(user).filter(like_count__gt=0).order_by(*args)
-    return list(qs[:DEFAULT_POPULAR_KILL_SWITCH_STORY_COUNT])
+def get_popular_story_list_items(user=None, window: str = DEFAULT_POPULAR_STORY_WINDOW) -> List[StoryPopularListItemDTO]:
+    """
+    window 기간의 인기 스토리 목록을 캐시에서 가져오고, 볼 수 없는 비밀 Story 는 제외합니다.
+    인기 스토리가 없으면 좋아요 순 Story 목록(kill switch)을 반환합니다.
+    목록은 유저와 관계없이 공유하며, 비밀 Story 가 있을 때만 유저의 비밀 Story id 를 확인합니다.
+    kill switch 목록은 공개 Story 만 공유하고, 볼 수 있는 비밀 Story 가 있는 유저는 그 비밀 Story 를 포함하여 따로 조회합니다.
+    캐시 key 의 version 은 update_popular_story 실행 또는 Story 변경 시 올라갑니다.
+    """
+    try:
+        base_past_second = POPULAR_STORY_WINDOW_SECONDS[window]
+    except KeyError:
+        raise PopularStoryWindowInvalidException()
+
+    version = get_cache_version_by_key(POPULAR_STORY_CACHE_VERSION_KEY)
+    popular_story_list = get_or_generate_cache_value_by_key(
+        key=POPULAR_STORY_LIST_CACHE_KEY.format(version=version, window=window),
+        generate_value=lambda: get_popular_story_list(base_past_second),
+        expire_seconds=POPULAR_STORY_LIST_CACHE_SECONDS,
+        stale_seconds=POPULAR_STORY_LIST_CACHE_STALE_SECONDS,
+    )
+    items = get_visible_popular_story_list_items(popular_story_list, user)
+    if items:
+        return items
+
+    secret_story_ids = get_user_secret_story_ids(user)
+    if secret_story_ids:
+        return get_kill_switch_popular_story_list(secret_story_ids).get_visible_items(secret_story_ids)
+
+    kill_switch_popular_story_list = get_or_generate_cache_value_by_key(
+        key=POPULAR_STORY_KILL_SWITCH_LIST_CACHE_KEY.format(version=version),
+        generate_value=get_kill_switch_popular_story_list,
+        expire_seconds=POPULAR_STORY_KILL_SWITCH_LIST_CACHE_SECONDS,
+        stale_seconds=POPULAR_STORY_KILL_SWITCH_LIST_CACHE_STALE_SECONDS,
+    )
+    return kill_switch_popular_story_list.get_visible_items()
 
 
-def get_active_story_by_id(story_id: int, user=None) -> Story:
-    try:
-        return Story.objects.get_actives(user=user).get(
-            id=story_id,
+def get_visible_popular_story_list_items(popular_story_list: PopularStoryListDTO, user=None) -> List[StoryPopularListItemDTO]:
+    if not popular_story_list.secret_story_ids:
+        return popular_story_list.get_visible_items()
+    return popular_story_list.get_visible_items(get_user_secret_story_ids(user))
+
+
+def get_user_secret_story_ids(user=None) -> frozenset:
+    if not user or isinstance(user, AnonymousUser):
+        return frozenset()
+    return Story.get_user_secret_story_ids(user.id)
+
+
+def get_popular_story_list(base_past_second: int) -> PopularStoryListDTO:
+    """
+    PopularStoryListDTO 가 사용하는 Story 필드만 조회합니다.
+    """
+    popular_stories = only_model_fields(
+        PopularStory.objects.filter(
+            story__is_deleted=False,
+            story__displayable=True,
+            is_deleted=False,
+            base_past_second=base_past_second,
+        ),
+        [f'story__{field}' for field in PopularStoryListDTO.MODEL_FIELDS],
+    ).order_by(
+        'rank',
+    )
+    return PopularStoryListDTO.of([popular_story.story for popular_story in popular_stories])
+
+
+def get_kill_switch_popular_story_list(secret_story_ids: frozenset = frozenset()) -> PopularStoryListDTO:
+    """
+    공개 Story 와 secret_story_ids 의 비밀 Story 중에서 좋아요 순으로 kill switch 개수만큼 가져옵니다.
+    PopularStoryListDTO 가 사용하는 필드만 조회합니다.
+    """
+    qs = Story.objects.filter(
+        is_deleted=False,
+        displayable=True,
+        like_count__gt=0,
+    )
+    if secret_story_ids:
+        qs = qs.filter(Q(is_secret=False) | Q(id__in=secret_story_ids))
+    else:
+        qs = qs.filter(is_secret=False)
+    stories = only_model_fields(
+        qs,
+        PopularStoryListDTO.MODEL_FIELDS,
+    ).order_by(
+        '-like_count',
+        'id',
+    )[:DEFAULT_POPULAR_KILL_SWITCH_STORY_COUNT]
+    return PopularStoryListDTO.of(list(stories))
+
+
+def delete_popular_story_list_cache() -> None:
+    """
+    version 을 올려 이전 version 의 인기 스토리 목록 캐시를 사용하지 않게 합니다.
+    """
+    increase_cache_version_by_key(POPULAR_STORY_CACHE_VERSION_KEY)
+
+
+_story_title_autocomplete = None  # type: Optional[StoryTitleAutocomplete]
+
+
+def get_story_title_autocomplete() -> StoryTitleAutocomplete:
+    """
+    프로세스에 만들어둔 활성, 공개 Story 제목 자동완성을 반환합니다.
+    다른 프로세스에서 Story 가 바뀌어 version 이 다르거나, REBUILD_SECONDS 가 지나면 DB 에서 다시 만듭니다.
+    """
+    global _story_title_autocomplete
+    version = get_cache_version_by_key(STORY_TITLE_AUTOCOMPLETE_VERSION_KEY)
+    story_title_autocomplete = _story_title_autocomplete
+    if story_title_autocomplete is None or story_title_autocomplete.version != version or \
+            story_title_autocomplete.built_at + STORY_TITLE_AUTOCOMPLETE_REBUILD_SECONDS < time.time():
+        story_title_autocomplete = StoryTitleAutocomplete(
+            Story.objects.get_actives().values_list(
+                'id',
+                'title',
+                'like_count',
+            ),
+            version=version,
         )
-    except Story.DoesNotExist:
+        _story_title_autocomplete = story_title_autocomplete
+    return story_title_autocomplete
+
+
+def update_story_title_autocomplete(story: Story, is_deleted: bool = False) -> None:
+    """
+    Story 변경을 이 프로세스의 자동완성에 바로 반영하고, version 을 올려 다른 프로세스는 다시 만들게 합니다.
+    """
+    version = increase_cache_version_by_key(STORY_TITLE_AUTOCOMPLETE_VERSION_KEY)
+    story_title_autocomplete = _story_title_autocomplete
+    if story_title_autocomplete is None:
+        return
+
+    if is_deleted or story.is_deleted or not story.displayable or story.is_secret:
+        story_title_autocomplete.remove(story.id)
+    else:
+        story_title_autocomplete.upsert(story.id, story.title, story.like_count)
+    # 사이에 다른 변경이 없었으면 다시 만들지 않아도 됩니다.
+    if story_title_autocomplete.version is not None and version == story_title_autocomplete.version + 1:
+        story_title_autocomplete.version = version
+
+
+def autocomplete_story_titles(search: str, size: int = DEFAULT_STORY_TITLE_AUTOCOMPLETE_SIZE) -> List[StoryTitleAutocompleteItemDTO]:
+    """
+    search 로 시작하는 (또는 단어가 search 로 시작하는) Story 제목을 like_count 순으로 가져옵니다. (DB 조회 없음)
+    size 는 1 ~ MAX_STORY_TITLE_AUTOCOMPLETE_SIZE 로 맞춥니다.
+    """
+    if not normalize_autocomplete_title(search):
+        return []
+    size = max(1, min(size, MAX_STORY_TITLE_AUTOCOMPLETE_SIZE))
+    return [
+        StoryTitleAutocompleteItemDTO(story_id=story_id, title=title)
+        for story_id, title in get_story_title_autocomplete().search(search, size)
+    ]
+
+
+def get_active_story_by_id(story_id: int, user=None) -> Story:
+    story = story_entity_cache.get(story_id)
+    if not story or not story.is_active(user):
         raise StoryDoesNotExists()
+    return story
 
 
 def get_running_start_sheet_by_story(story_id) -> Sheet:
     """
     Story 에서 시작하는 처음 Sheet 가져오기
     """
-    try:
-        return Sheet.objects.get(
-            story_id=story_id,
-            story__is_deleted=False,
-            story__displayable=True,
-            is_start=True,
-            is_deleted=False
-        )
-    except Sheet.DoesNotExist:
+    story = story_entity_cache.get(story_id)
+    if not story or story.is_deleted or not story.displayable:
+        raise StartingSheetDoesNotExists()
+    start_sheet = start_sheet_entity_cache.get(story_id)
+    if not start_sheet:
         raise StartingSheetDoesNotExists()
+    start_sheet.story = story
+    return start_sheet
 
 
 def get_running_sheet(sheet_id) -> Sheet:
-    try:
-        return Sheet.objects.get(
-            id=sheet_id,
-            story__is_deleted=False,
-            story__displayable=True,
-            is_deleted=False
-        )
-    except Sheet.DoesNotExist:
+    sheet = sheet_entity_cache.get(sheet_id)
+    if not sheet or sheet.is_deleted or not sheet.story_id:
+        raise SheetDoesNotExists()
+    story = story_entity_cache.get(sheet.story_id)
+    if not story or story.is_deleted or not story.displayable:
         raise SheetDoesNotExists()
+    sheet.story = story
+    return sheet
 
 
-def validate_user_playing_sheet(user_id: int, sheet_id: int):
+def get_user_playing_sheet(user_id: int, sheet_id: int) -> Sheet:
     """
-    check UserSheetAnswerSolve next_sheet_path of sheet exists
-    And check if answer has been changed
-
-    And check if sheet is start then just return
+    유저가 진행할 Sheet 를 get_running_sheet 로 가져옵니다.
+    진행할 수 없는 Sheet 는 접근 검사를 먼저 하던 SheetPlayAPIView 와 같은 에러를 반환합니다.
+    없는 Sheet 이거나 유저가 갈 수 없었던 Sheet 는 SheetNotAccessibleException,
+    시작 Sheet 이거나 유저가 해결하여 갈 수 있었던 Sheet 가 삭제되었으면 SheetDoesNotExists 입니다.
     """
     try:
-        if Sheet.objects.get(id=sheet_id).is_start:
-            return
-        user_sheet_answer_solve = UserSheetAnswerSolve.objects.select_related(
-            'next_sheet_path',
-            'sheet',
-        ).get(
+        return get_running_sheet(sheet_id)
+    except SheetDoesNotExists:
+        sheet = sheet_entity_cache.get(sheet_id)
+        if not sheet:
+            raise SheetNotAccessibleException()
+        if not sheet.is_start and not UserSheetAnswerSolve.objects.filter(
             user_id=user_id,
             next_sheet_path__sheet_id=sheet_id,
             solving_status=UserSheetAnswerSolve.SOLVING_STATUS_CHOICES[1][0],
-        )
-    except (UserSheetAnswerSolve.DoesNotExist, Sheet.DoesNotExist):
+        ).exists():
+            raise SheetNotAccessibleException()
+        raise
+
+
+def validate_user_playing_sheet(user_id: int, sheet_id: int, story_graph: StoryGraphDTO = None):
+    """
+    check UserSheetAnswerSolve next_sheet_path of sheet exists
+    And check if answer has been changed
+
+    And check if sheet is start then just return
+
+    Sheet 와 정답, 경로는 캐시된 Story 그래프에서 확인하고, 유저 진행 상황만 한번 조회합니다.
+    story_graph 가 없으면 sheet 의 story 를 조회 후 가져옵니다.
+    """
+    if story_graph is None:
+        story_id = Sheet.objects.filter(
+            id=sheet_id,
+        ).values_list(
+            'story_id',
+            flat=True,
+        ).first()
+        if not story_id:
+            raise SheetNotAccessibleException()
+        story_graph = get_story_graph(story_id)
+
+    if not story_graph.get_sheet(sheet_id):
         raise SheetNotAccessibleException()
+    if story_graph.is_start_sheet(sheet_id):
+        return
 
-    if not (user_sheet_answer_solve.answer in get_sheet_answers(user_sheet_answer_solve.sheet_id)):
+    incoming_next_sheet_path_ids = story_graph.get_incoming_next_sheet_path_ids(sheet_id)
+    if not incoming_next_sheet_path_ids:
         raise SheetNotAccessibleException()
 
+    solved_sheet_answers = UserSheetAnswerSolve.objects.filter(
+        user_id=user_id,
+        next_sheet_path_id__in=incoming_next_sheet_path_ids,
+        solving_status=UserSheetAnswerSolve.SOLVING_STATUS_CHOICES[1][0],
+    ).values_list(
+        'sheet_id',
+        'answer',
+    )
+    if not any(
+        story_graph.is_sheet_answer(solved_sheet_id, solved_answer)
+        for solved_sheet_id, solved_answer in solved_sheet_answers
+    ):
+        raise SheetNotAccessibleException()
 
-def get_sheet_answers(sheet_id: int) -> set:
-    try:
-        sheet = Sheet.objects.get(
-            id=sheet_id,
-            story__is_deleted=False,
-            story__displayable=True,
-            is_deleted=False
-        )
-    except Sheet.DoesNotExist:
-        raise SheetDoesNotExists()
 
-    return set(
-        sheet.sheetanswer_set.all().values_list(
+def get_story_graph_values(story_id: int) -> (List[dict], List[dict]):
+    """
+    Story 의 삭제되지 않은 Sheet 와, 그 Sheet 들의 SheetAnswer 별 NextSheetPath 마다 하나의 row 를 가져옵니다.
+    """
+    sheet_values = list(
+        Sheet.objects.filter(
+            story_id=story_id,
+            is_deleted=False,
+        ).values(
+            'id',
+            'title',
+            'is_start',
+            'is_final',
+        )
+    )
+    sheet_answer_values = list(
+        SheetAnswer.objects.filter(
+            sheet__story_id=story_id,
+            sheet__is_deleted=False,
+        ).values(
+            'sheet_id',
             'answer',
-            flat=True
+            'nextsheetpath',
+            'nextsheetpath__sheet_id',
         )
     )
+    return sheet_values, sheet_answer_values
 
 
-def get_valid_answer_info_with_random_quantity(answer: str, answer_responses: List[SheetAnswerResponseDTO]) -> (bool, int, int, int):
+def get_story_graph(story_id: int) -> StoryGraphDTO:
     """
-    is_answer_valid: 정답 유무
-    sheet_answer_id: quantity 를 통해 무작위로 결정된 SheetAnswer id
-    next_sheet_path_id: quantity 를 통해 무작위로 결정된 NextSheetPath id
-    next_sheet_id: quantity 를 통해 무작위로 결정된 다음 Sheet id
+    캐시된 Story 그래프가 있으면 DB 조회 없이 반환하고, 없으면 컴파일 후 캐시합니다.
+    Sheet, SheetAnswer, NextSheetPath 가 변경되면 story.signals 에서 무효화 합니다.
     """
-    not_always_correct_answer_responses = [response for response in answer_responses if not response.is_always_correct]
-    always_correct_answer_responses = [response for response in answer_responses if response.is_always_correct]
-    matched_with_answer_of_answer_responses = [
-        response for response in not_always_correct_answer_responses if
-        response.answer.lower().replace(' ', '') == answer.lower().replace(' ', '')
-    ]
-
-    is_answer_valid = bool(len(matched_with_answer_of_answer_responses))
-    sheet_answer_id = None
-
-    # 정답이 있는 경우
-    if is_answer_valid:
-        quantity_next_sheet_id_and_next_sheet_path_ids = []
-        # 정답들 가져오기
-        for matched_with_answer_of_answer_response in matched_with_answer_of_answer_responses:
-            if matched_with_answer_of_answer_response.next_sheet_quantity:
-                quantity_next_sheet_id_and_next_sheet_path_ids += [
-                    [
-                        matched_with_answer_of_answer_response.id,
-                        matched_with_answer_of_answer_response.next_sheet_path_id,
-                        matched_with_answer_of_answer_response.next_sheet_id
-                    ]
-                ] * matched_with_answer_of_answer_response.next_sheet_quantity
-
-        # 셔플하기
-        random.shuffle(quantity_next_sheet_id_and_next_sheet_path_ids)
-
-        # 값 가져오기
-        sheet_answer_id, next_sheet_path_id, next_sheet_id = next(iter(quantity_next_sheet_id_and_next_sheet_path_ids), (None, None, None))
+    cache_key = STORY_GRAPH_CACHE_KEY.format(story_id=story_id)
+    story_graph = get_cache_value_by_key(cache_key)
+    if story_graph:
+        return story_graph
 
-        # 정답에 경로가 없을 경우, 정답 id 만 정의
-        if not sheet_answer_id:
-            sheet_answer_id = matched_with_answer_of_answer_responses[0].id
-
-        return is_answer_valid, sheet_answer_id, next_sheet_path_id, next_sheet_id
-
-    # 항상 정답인 것이 있는 경우
-    if always_correct_answer_responses:
-        quantity_next_sheet_id_and_next_sheet_path_ids = []
-        for always_correct_answer_response in always_correct_answer_responses:
-            if always_correct_answer_response.next_sheet_quantity:
-                quantity_next_sheet_id_and_next_sheet_path_ids += [
-                    [
-                        always_correct_answer_response.id,
-                        always_correct_answer_response.next_sheet_path_id,
-                        always_correct_answer_response.next_sheet_id,
-                    ]
-                ] * always_correct_answer_response.next_sheet_quantity
-
-        # 셔플하기
-        random.shuffle(quantity_next_sheet_id_and_next_sheet_path_ids)
-
-        # 값 가져오기
-        sheet_answer_id, next_sheet_path_id, next_sheet_id = next(iter(quantity_next_sheet_id_and_next_sheet_path_ids), (None, None, None))
+    sheet_values, sheet_answer_values = get_story_graph_values(story_id)
+    story_graph = StoryGraphDTO.of(
+        story_id=story_id,
+        sheet_values=sheet_values,
+        sheet_answer_values=sheet_answer_values,
+    )
+    generate_value_by_key_to_cache(cache_key, story_graph, STORY_GRAPH_CACHE_SECONDS)
+    return story_graph
 
-        if not sheet_answer_id:
-            sheet_answer_id = always_correct_answer_responses[0].id
 
-        return True, sheet_answer_id, next_sheet_path_id, next_sheet_id
+def delete_story_graph_cache(story_id: int) -> None:
+    delete_cache_value_by_key(STORY_GRAPH_CACHE_KEY.format(story_id=story_id))
 
-    return is_answer_valid, sheet_answer_id, None, None
 
+def get_previous_sheet_infos(sheet_path: List[tuple], current_sheet_id: int, story_graph: StoryGraphDTO) -> List[PreviousSheetInfoDTO]:
+    """
+    sheet_path: UserStorySolve.get_sheet_path 로 가져온 유저의 Story 경로(breadcrumb)
+    경로에서 current_sheet_id 로 온 이전 Sheet 목록을 반환합니다.
+    Sheet 제목은 Story 그래프에서 가져오며, 삭제된 Sheet 는 제외합니다.
+    """
+    return get_sheet_path_infos(
+        [(sheet_id, next_sheet_id) for sheet_id, next_sheet_id in sheet_path if next_sheet_id == current_sheet_id],
+        story_graph,
+    )
 
-def get_sheet_answer_with_next_path_responses(sheet_id: int) -> List[SheetAnswerResponseDTO]:
-    try:
-        sheet = Sheet.objects.get(
-            id=sheet_id,
-            story__is_deleted=False,
-            story__displayable=True,
-            is_deleted=False
-        )
-    except Sheet.DoesNotExist:
-        raise SheetDoesNotExists()
 
-    sheet_answer_responses = [
-        SheetAnswerResponseDTO.of(sheet_answer_info_with_next_path) for
-        sheet_answer_info_with_next_path
-        in sheet.sheetanswer_set.all().values(
+def get_sheet_path_infos(sheet_path: List[tuple], story_graph: StoryGraphDTO) -> List[PreviousSheetInfoDTO]:
+    """
+    이전에 풀었던 문제로 돌아가기 위한 경로
+    경로에서 처음 해결한 순서대로 중복 없이 Sheet 목록을 반환합니다.
+    """
+    sheet_path_infos = []
+    sheet_ids = set()
+    for sheet_id, _ in sheet_path:
+        sheet = story_graph.get_sheet(sheet_id)
+        if not sheet or sheet_id in sheet_ids:
+            continue
+        sheet_ids.add(sheet_id)
+        sheet_path_infos.append(PreviousSheetInfoDTO(sheet_id=sheet.id, title=sheet.title))
+    return sheet_path_infos
+
+
+def get_sheet_answer_with_next_path_values(sheet_id: int) -> List[dict]:
+    """
+    SheetAnswer 별 NextSheetPath 마다 하나의 row 를 가져옵니다.
+    NextSheetPath 가 없는 SheetAnswer 는 경로가 None 인 하나의 row 입니다.
+    """
+    return list(
+        SheetAnswer.objects.filter(
+            sheet_id=sheet_id,
+        ).values(
             'id',
             'answer',
             'answer_reply',
             'is_always_correct',
+            'version',
+            'nextsheetpath',
+            'nextsheetpath__sheet_id',
+            'nextsheetpath__quantity',
+        ).order_by(
+            'id',
             'nextsheetpath',
-            'next_sheet_paths__nextsheetpath__sheet_id',
-            'next_sheet_paths__nextsheetpath__quantity',
         )
-    ]
+    )
+
+
+def get_sheet_answer_table(sheet: Sheet) -> SheetAnswerTableDTO:
+    """
+    sheet 는 get_running_sheet 로 가져온 진행 가능한 Sheet 여야 합니다.
+    캐시된 정답 테이블이 현재 sheet version 과 같으면 DB 조회 없이 반환하고,
+    없거나 version 이 다르면 다시 컴파일 후 캐시합니다.
+    """
+    cache_key = SHEET_ANSWER_TABLE_CACHE_KEY.format(sheet_id=sheet.id)
+    sheet_answer_table = get_cache_value_by_key(cache_key)
+    if sheet_answer_table and sheet_answer_table.is_compiled_for(sheet):
+        return sheet_answer_table
+
+    sheet_answer_table = SheetAnswerTableDTO.of(
+        sheet=sheet,
+        sheet_answer_values=get_sheet_answer_with_next_path_values(sheet.id),
+    )
+    generate_value_by_key_to_cache(cache_key, sheet_answer_table, SHEET_ANSWER_TABLE_CACHE_SECONDS)
+    return sheet_answer_table
+
 
-    return sheet_answer_responses
+def delete_sheet_answer_table_cache(sheet_id: int) -> None:
+    delete_cache_value_by_key(SHEET_ANSWER_TABLE_CACHE_KEY.format(sheet_id=sheet_id))
 
 
 def get_sheet_solved_user_sheet_answer(user_id: int, sheet_id: int) -> Optional[UserSheetAnswerSolve]:
     running_sheet = get_running_sheet(sheet_id)
     try:
-        return UserSheetAnswerSolve.objects.select_related(
-            'next_sheet_path__answer',
+        return only_model_fields(
+            UserSheetAnswerSolve.objects.all(),
+            PlayingSheetInfoDTO.USER_SHEET_ANSWER_SOLVE_FIELDS,
         ).get(
             user_id=user_id,
             sheet_id=sheet_id,
@@ -228,6 +499,62 @@ def get_sheet_solved_user_sheet_answer(user_id: int, sheet_id: int) -> Optional[
         return
 
 
+def submit_sheet_answer(user_id: int, sheet_id: int, answer: str, rng: random.Random = None) -> SheetAnswerSubmitResultDTO:
+    """
+    정답 제출 (submit_answer)
+    조회는 아래 2번만 하며, 정답 테이블은 get_sheet_answer_table 캐시를 사용합니다.
+    1. 진행 가능한 Sheet (story 포함)
+    2. 유저의 UserSheetAnswerSolve
+    관전 구독 여부는 Story 별 respondent_user id 캐시로 판별합니다.
+    정답이면 UserSheetAnswerSolve update 와 UserStorySolve 경로 추가를, 오답이면 WrongAnswer insert 와 SheetWrongAnswerCount 증가를
+    각각 1개의 transaction 으로 저장합니다.
+    """
+    sheet = get_running_sheet(sheet_id)
+    sheet_answer_table = get_sheet_answer_table(sheet)
+
+    try:
+        user_sheet_answer_solve = UserSheetAnswerSolve.objects.get(
+            user_id=user_id,
+            sheet_id=sheet.id,
+        )
+    except UserSheetAnswerSolve.DoesNotExist:
+        user_sheet_answer_solve = None
+
+    if user_sheet_answer_solve and user_sheet_answer_solve.is_solved_sheet_version(sheet.version):
+        raise SheetAlreadySolvedException()
+
+    is_valid, sheet_answer_id, next_sheet_path_id, next_sheet_id = sheet_answer_table.answer_matcher.get_valid_answer_info(
+        answer=answer,
+        rng=rng,
+    )
+    if not is_valid:
+        create_wrong_answer(user_id, int(sheet.story_id), sheet.id, answer)
+        return SheetAnswerSubmitResultDTO(is_valid=False, next_sheet_id=None, answer_reply=None)
+
+    solved_sheet_answer = sheet_answer_table.sheet_answer_by_id[sheet_answer_id]
+    if user_sheet_answer_solve:
+        user_sheet_answer_solve.story = sheet.story
+        user_sheet_answer_solve.sheet = sheet
+        is_resolved = user_sheet_answer_solve.solving_status == UserSheetAnswerSolve.SOLVING_STATUS_CHOICES[1][0]
+        with transaction.atomic():
+            user_sheet_answer_solve.save_solved(
+                answer=solved_sheet_answer.answer,
+                sheet_question=sheet.question,
+                solved_sheet_version=sheet.version,
+                solved_answer_version=solved_sheet_answer.version,
+                solved_sheet_answer_id=solved_sheet_answer.id,
+                next_sheet_path_id=next_sheet_path_id,
+            )
+            user_sheet_answer_solve.append_sheet_path(next_sheet_id, is_resolved=is_resolved)
+            user_sheet_answer_solve.notify_solved_sheet()
+
+    return SheetAnswerSubmitResultDTO(
+        is_valid=True,
+        next_sheet_id=next_sheet_id,
+        answer_reply=solved_sheet_answer.answer_reply,
+    )
+
+
 def get_recent_played_sheet_by_story_id(user_id: int, story_id: int):
     user_sheet_answer_solve = UserSheetAnswerSolve.objects.select_related(
         'sheet',
@@ -269,35 +596,83 @@ def get_story_slack_subscription_slack_webhook_urls(story_id: int, user_id: int)
 
 
 def create_story_like(story_id: int, user_id: int):
+    """
+    좋아요 상태가 바뀐 경우에만 Story like_count 와 현재 시간의 StoryLikeHourlyCount 를 1 증가시킵니다.
+    """
     with transaction.atomic():
         story_like, is_created = StoryLike.objects.get_or_create(
             story_id=story_id,
             user_id=user_id,
         )
-        if not is_created:
-            story_like.is_deleted = False
-            story_like.save(update_fields=['is_deleted', 'updated_at'])
-        update_story_total_like_count(story_id)
+        liked_at = story_like.updated_at if is_created else datetime.now()
+        is_liked = is_created or StoryLike.objects.filter(
+            id=story_like.id,
+            is_deleted=True,
+        ).update(
+            is_deleted=False,
+            updated_at=liked_at,
+        ) > 0
+        if is_liked:
+            increase_story_like_count(story_id, 1)
+            StoryLikeHourlyCount.increase_like_count(story_id, liked_at, 1)
+        story_like.is_deleted = False
     return story_like
 
 
 def delete_story_like(story_id: int, user_id: int):
+    """
+    좋아요 상태가 바뀐 경우에만 Story like_count 와 좋아요 했던 시간의 StoryLikeHourlyCount 를 1 감소시킵니다.
+    """
     with transaction.atomic():
         story_like = StoryLike.objects.get(
             story_id=story_id,
             user_id=user_id,
             is_deleted=False,
         )
+        is_unliked = StoryLike.objects.filter(
+            id=story_like.id,
+            is_deleted=False,
+        ).update(
+            is_deleted=True,
+            updated_at=datetime.now(),
+        ) > 0
+        if is_unliked:
+            increase_story_like_count(story_id, -1)
+            StoryLikeHourlyCount.increase_like_count(story_id, story_like.updated_at, -1)
         story_like.is_deleted = True
-        story_like.save(update_fields=['is_deleted', 'updated_at'])
-        update_story_total_like_count(story_id)
     return story_like
 
 
-def update_story_total_like_count(story_id: int):
-    story = Story.objects.get(id=story_id)
-    story.like_count = StoryLike.get_active_story_like_count(story_id)
-    story.save(update_fields=['like_count'])
+def increase_story_like_count(story_id: int, amount: int) -> None:
+    """
+    like_count 를 읽지 않고 F() 로 증감합니다. (0 미만이 되지 않습니다.)
+    어긋난 값은 reconcile_story_counters command 로 보정합니다.
+    """
+    is_updated = Story.objects.filter(
+        id=story_id,
+    ).update(
+        like_count=Greatest(F('like_count') + amount, 0),
+    )
+    if not is_updated:
+        raise Story.DoesNotExist()
+    story_entity_cache.invalidate(story_id)
+
+
+def record_story_view(story_id: int, user_id: Optional[int], ip: str) -> None:
+    """
+    Story 순 조회수를 위해 viewer 를 기록합니다. (DB 에 쓰지 않습니다.)
+    로그인 유저는 user id, 비로그인 유저는 ip 로 구분합니다.
+    """
+    StoryViewCounter().record(story_id, f'user:{user_id}' if user_id else f'ip:{ip}')
+
+
+def increase_story_played_count(story_id: int) -> None:
+    Story.objects.filter(
+        id=story_id,
+    ).update(
+        played_count=F('played_count') + 1,
+    )
+    story_entity_cache.invalidate(story_id)
 
 
 @transaction.atomic
@@ -332,18 +707,34 @@ def reset_user_story_sheet_answer_solves(user_id: int, story_id: int):
             bulk_create_user_sheet_answer_solve_history_list
         )
         user_sheet_answer_solves.delete()
+        UserStorySolve.reset_sheet_path(user_id, story_id)
         return True
 
     return False
 
 
-def create_wrong_answer(user_id: int, story_id: int, sheet_id: int, wrong_answer: str):
-    return WrongAnswer.objects.create(
-        user_id=user_id,
-        story_id=story_id,
-        sheet_id=sheet_id,
-        answer=wrong_answer,
-    )
+def create_wrong_answer(user_id: int, story_id: int, sheet_id: int, wrong_answer: str) -> Optional[WrongAnswer]:
+    """
+    WRONG_ANSWER_WRITE_BEHIND 가 아니면 WrongAnswer insert 와 SheetWrongAnswerCount 증가를 1개의 transaction 으로 저장합니다.
+    WRONG_ANSWER_WRITE_BEHIND 이면 버퍼에 쌓고 None 을 반환합니다.
+    버퍼가 비어있다 처음 쌓이면 최대 지연 시간 후 flush 를, chunk 크기만큼 쌓이면 즉시 flush 를 enqueue 합니다.
+    """
+    if not settings.WRONG_ANSWER_WRITE_BEHIND:
+        with transaction.atomic():
+            wrong_answer = WrongAnswer.objects.create(
+                user_id=user_id,
+                story_id=story_id,
+                sheet_id=sheet_id,
+                answer=wrong_answer,
+            )
+            SheetWrongAnswerCount.increase_counts([wrong_answer])
+        return wrong_answer
+
+    buffered_count = WrongAnswerBuffer().push(user_id, story_id, sheet_id, wrong_answer)
+    if buffered_count == 1:
+        flush_wrong_answer_buffer.apply_async(countdown=settings.WRONG_ANSWER_BUFFER_MAX_LATENCY_SECONDS)
+    elif buffered_count % settings.WRONG_ANSWER_BUFFER_CHUNK_SIZE == 0:
+        flush_wrong_answer_buffer.apply_async()
 
 
 def get_user_sheet_answer_solve_histories(user_id: int, story_id: int) -> List[UserSheetAnswerSolveHistoryItemDTO]:
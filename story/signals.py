@@ -0,0 +1,144 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from account.models import User
+from story.entity_caches import sheet_entity_cache, start_sheet_entity_cache, story_entity_cache
+from story.models import NextSheetPath, PopularStory, Sheet, SheetAnswer, Story, StoryEmailSubscription, \
+    StorySearchToken, StorySlackSubscription
+from story.services import delete_popular_story_list_cache, delete_sheet_answer_table_cache, delete_story_graph_cache, \
+    update_story_title_autocomplete
+
+
+@receiver([post_save, post_delete], sender=Sheet)
+def invalidate_sheet_answer_table_by_sheet(sender, instance, **kwargs):
+    delete_sheet_answer_table_cache(instance.id)
+    delete_story_graph_cache(instance.story_id)
+
+
+@receiver([post_save, post_delete], sender=SheetAnswer)
+def invalidate_sheet_answer_table_by_sheet_answer(sender, instance, **kwargs):
+    if instance.sheet_id:
+        delete_sheet_answer_table_cache(instance.sheet_id)
+        story_id = Sheet.objects.filter(
+            id=instance.sheet_id,
+        ).values_list(
+            'story_id',
+            flat=True,
+        ).first()
+        if story_id:
+            delete_story_graph_cache(story_id)
+
+
+@receiver([post_save, post_delete], sender=NextSheetPath)
+def invalidate_sheet_answer_table_by_next_sheet_path(sender, instance, **kwargs):
+    sheet_answer_value = SheetAnswer.objects.filter(
+        id=instance.answer_id,
+    ).values(
+        'sheet_id',
+        'sheet__story_id',
+    ).first()
+    if sheet_answer_value:
+        delete_sheet_answer_table_cache(sheet_answer_value['sheet_id'])
+        delete_story_graph_cache(sheet_answer_value['sheet__story_id'])
+
+
+@receiver(pre_save, sender=StoryEmailSubscription)
+@receiver(pre_save, sender=StorySlackSubscription)
+def invalidate_respondent_user_ids_by_previous_story(sender, instance, **kwargs):
+    # 구독의 story 가 바뀌는 경우 이전 story 의 캐시도 무효화 합니다.
+    if not instance.pk:
+        return
+    previous_story_id = sender.objects.filter(
+        pk=instance.pk,
+    ).values_list(
+        'story_id',
+        flat=True,
+    ).first()
+    if previous_story_id and previous_story_id != instance.story_id:
+        sender.delete_respondent_user_ids_cache(previous_story_id)
+
+
+@receiver([post_save, post_delete], sender=StoryEmailSubscription)
+@receiver([post_save, post_delete], sender=StorySlackSubscription)
+def invalidate_respondent_user_ids(sender, instance, **kwargs):
+    if instance.story_id:
+        sender.delete_respondent_user_ids_cache(instance.story_id)
+
+
+@receiver([post_save, post_delete], sender=Story)
+@receiver([post_save, post_delete], sender=PopularStory)
+def invalidate_popular_story_list(sender, instance, **kwargs):
+    delete_popular_story_list_cache()
+
+
+@receiver(m2m_changed, sender=Story.secret_members.through)
+def invalidate_user_secret_story_ids(sender, instance, action, reverse, pk_set, **kwargs):
+    # reverse 이면 instance 는 User, 아니면 Story 이며 pk_set 은 반대편 id 목록입니다.
+    if reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            Story.delete_user_secret_story_ids_cache(instance.pk)
+        return
+
+    if action == 'pre_clear':
+        # clear 는 pk_set 을 주지 않기 때문에 삭제 전 멤버를 기억해둡니다.
+        instance._cleared_secret_member_ids = list(instance.secret_members.values_list('id', flat=True))
+    elif action == 'post_clear':
+        for user_id in getattr(instance, '_cleared_secret_member_ids', []):
+            Story.delete_user_secret_story_ids_cache(user_id)
+    elif action in ('post_add', 'post_remove'):
+        for user_id in pk_set or []:
+            Story.delete_user_secret_story_ids_cache(user_id)
+
+
+@receiver(post_save, sender=Story)
+def reindex_story_search_tokens(sender, instance, update_fields=None, **kwargs):
+    # 색인하는 필드가 바뀌지 않은 저장은 건너뜁니다.
+    if update_fields and not {'title', 'description', 'author'} & set(update_fields):
+        return
+    StorySearchToken.reindex_story(instance.id)
+
+
+@receiver(post_save, sender=Story)
+def update_story_title_autocomplete_by_story(sender, instance, **kwargs):
+    update_story_title_autocomplete(instance)
+
+
+@receiver(post_delete, sender=Story)
+def remove_story_title_autocomplete_by_story(sender, instance, **kwargs):
+    update_story_title_autocomplete(instance, is_deleted=True)
+
+
+@receiver(pre_save, sender=User)
+def remember_previous_nickname(sender, instance, update_fields=None, **kwargs):
+    # 로그인 시 last_login 저장처럼 nickname 을 저장하지 않는 경우는 조회하지 않습니다.
+    if not instance.pk or (update_fields and 'nickname' not in update_fields):
+        return
+    instance._previous_nickname = sender.objects.filter(
+        pk=instance.pk,
+    ).values_list(
+        'nickname',
+        flat=True,
+    ).first()
+
+
+@receiver(post_save, sender=User)
+def reindex_story_search_tokens_by_author(sender, instance, created, **kwargs):
+    # 작성자 닉네임이 바뀌면 작성한 Story 를 다시 색인합니다.
+    if created or not hasattr(instance, '_previous_nickname'):
+        return
+    previous_nickname = instance.__dict__.pop('_previous_nickname')
+    if previous_nickname == instance.nickname:
+        return
+    for story_id in Story.objects.filter(author_id=instance.id).values_list('id', flat=True):
+        StorySearchToken.reindex_story(story_id)
+
+
+@receiver([post_save, post_delete], sender=Story)
+def invalidate_story_entity_cache(sender, instance, **kwargs):
+    story_entity_cache.invalidate(instance.id)
+
+
+@receiver([post_save, post_delete], sender=Sheet)
+def invalidate_sheet_entity_cache(sender, instance, **kwargs):
+    sheet_entity_cache.invalidate(instance.id)
+    start_sheet_entity_cache.invalidate(instance.story_id)
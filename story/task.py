@@ -1,30 +1,91 @@
-from common_library import send_email
+from django.conf import settings
+
+from common_library import notify_slack_channels, send_email
 from config.celery import app
 
 
+def _send_user_sheet_solved_email(user_sheet_answer_solve, emails: list) -> None:
+    """
+    user_sheet_answer_solve 는 user, story, sheet 를 select_related 로 가져와야 합니다.
+    """
+    send_email(
+        title=f'[문제 해결] {user_sheet_answer_solve.user.username} 님이 {user_sheet_answer_solve.sheet_id}번 sheet 문제를 해결했습니다.',
+        html_body_content='email/story/story_solved.html',
+        payload={
+            'story_id': user_sheet_answer_solve.story_id,
+            'story_title': user_sheet_answer_solve.story.title,
+            'sheet_id': user_sheet_answer_solve.sheet_id,
+            'sheet_title': user_sheet_answer_solve.sheet.title,
+            'sheet_question': user_sheet_answer_solve.sheet.question,
+            'username': user_sheet_answer_solve.user.username,
+            'user_answer': user_sheet_answer_solve.answer,
+        },
+        to=emails
+    )
+
+
 @app.task
 def send_user_sheet_solved_email(user_sheet_answer_solve_id: int, emails: list) -> None:
+    """
+    send_user_sheet_solved_notifications 로 바뀌기 전에 enqueue 된 메시지를 처리하기 위해 남겨둡니다.
+    send_user_sheet_solved_notifications 배포 후 queue 에 남은 메시지가 모두 처리되면 다음 배포에서 삭제합니다.
+    """
     from story.models import UserSheetAnswerSolve
     try:
         user_sheet_answer_solve = UserSheetAnswerSolve.objects.select_related(
             'user',
             'story',
             'sheet',
-            'next_sheet_path__answer',
         ).get(id=user_sheet_answer_solve_id)
-        send_email(
-            title=f'[문제 해결] {user_sheet_answer_solve.user.username} 님이 {user_sheet_answer_solve.sheet_id}번 sheet 문제를 해결했습니다.',
-            html_body_content='email/story/story_solved.html',
-            payload={
-                'story_id': user_sheet_answer_solve.story_id,
-                'story_title': user_sheet_answer_solve.story.title,
-                'sheet_id': user_sheet_answer_solve.sheet_id,
-                'sheet_title': user_sheet_answer_solve.sheet.title,
-                'sheet_question': user_sheet_answer_solve.sheet.question,
-                'username': user_sheet_answer_solve.user.username,
-                'user_answer': user_sheet_answer_solve.answer,
-            },
-            to=emails
-        )
     except UserSheetAnswerSolve.DoesNotExist:
-        pass
+        return
+    _send_user_sheet_solved_email(user_sheet_answer_solve, emails)
+
+
+@app.task
+def send_user_sheet_solved_notifications(user_sheet_answer_solve_id: int) -> None:
+    """
+    문제 해결 한번에 대해 관전 이메일과 Slack webhook 대상을 worker 에서 조회 후 한번에 전송합니다.
+    Slack webhook 은 thread pool 로 동시에 전송합니다.
+    """
+    from story.models import UserSheetAnswerSolve
+    from story.services import get_story_email_subscription_emails, get_story_slack_subscription_slack_webhook_urls
+    try:
+        user_sheet_answer_solve = UserSheetAnswerSolve.objects.select_related(
+            'user',
+            'story',
+            'sheet',
+        ).get(id=user_sheet_answer_solve_id)
+    except UserSheetAnswerSolve.DoesNotExist:
+        return
+
+    story_id = user_sheet_answer_solve.story_id
+    user_id = user_sheet_answer_solve.user_id
+    emails = get_story_email_subscription_emails(story_id, user_id)
+    if emails:
+        _send_user_sheet_solved_email(user_sheet_answer_solve, emails)
+
+    notify_slack_channels(
+        channel_urls=get_story_slack_subscription_slack_webhook_urls(story_id, user_id),
+        text=f'story_id: {story_id}\n'
+             f'story_title: {user_sheet_answer_solve.story.title}\n'
+             f'sheet_id: {user_sheet_answer_solve.sheet_id}\n'
+             f'sheet_title: {user_sheet_answer_solve.sheet.title}\n'
+             f'sheet_question: {user_sheet_answer_solve.sheet.question}\n'
+             f'username: {user_sheet_answer_solve.user.username}\n'
+             f'user_answer: {user_sheet_answer_solve.answer}\n'
+    )
+
+
+@app.task
+def flush_wrong_answer_buffer() -> int:
+    """
+    버퍼에 쌓인 오답을 bulk_create 합니다.
+    flush 중에 새로 쌓인 오답이 남아있으면 최대 지연 시간 후에 다시 flush 합니다.
+    """
+    from story.buffers import WrongAnswerBuffer
+    wrong_answer_buffer = WrongAnswerBuffer()
+    flushed_count = wrong_answer_buffer.flush()
+    if wrong_answer_buffer.size():
+        flush_wrong_answer_buffer.apply_async(countdown=settings.WRONG_ANSWER_BUFFER_MAX_LATENCY_SECONDS)
+    return flushed_count
@@ -0,0 +1,255 @@
+from datetime import datetime
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.db import IntegrityError
+from django.test import TestCase, override_settings
+from freezegun import freeze_time
+
+from account.models import User
+from config.test_helper.helper import LOCMEM_CACHES
+from story.buffers import LocalHyperLogLogClient, LocalListBuffer, StoryViewCounter, WrongAnswerBuffer
+from story.constants import STORY_VIEW_FLUSH_LOCK_KEY, WRONG_ANSWER_BUFFER_FLUSH_LOCK_KEY
+from story.models import Sheet, Story, WrongAnswer
+from story.task import flush_wrong_answer_buffer
+
+
+class WrongAnswerBufferTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.all()[0]
+        self.story = Story.objects.create(
+            author=self.user,
+            title='test_story',
+            description='test_description',
+        )
+        self.sheet = Sheet.objects.create(
+            story=self.story,
+            title='test_title',
+            question='test_question',
+            is_start=True,
+        )
+        self.wrong_answer_buffer = WrongAnswerBuffer(client=LocalListBuffer())
+
+    def test_flush_should_bulk_create_by_chunk(self):
+        # Given: 오답 5개를 버퍼에 쌓습니다.
+        with freeze_time('2022-01-01'):
+            for i in range(5):
+                self.wrong_answer_buffer.push(self.user.id, self.story.id, self.sheet.id, f'wrong{i}')
+
+        # When: chunk 크기 2로 flush 합니다.
+        # Then: bulk_create 3번으로 저장합니다.
+        with patch.object(WrongAnswer.objects, 'bulk_create', wraps=WrongAnswer.objects.bulk_create) as mock_bulk_create:
+            flushed_count = self.wrong_answer_buffer.flush(chunk_size=2)
+        self.assertEqual(flushed_count, 5)
+        self.assertEqual(mock_bulk_create.call_count, 3)
+
+        # And: 제출 순서와 제출 시간을 유지하며 버퍼는 비워집니다.
+        wrong_answers = list(WrongAnswer.objects.filter(sheet=self.sheet).order_by('id'))
+        self.assertEqual([wrong_answer.answer for wrong_answer in wrong_answers], [f'wrong{i}' for i in range(5)])
+        self.assertTrue(all(wrong_answer.created_at == datetime(2022, 1, 1) for wrong_answer in wrong_answers))
+        self.assertEqual(self.wrong_answer_buffer.size(), 0)
+
+    def test_flush_should_keep_items_when_bulk_create_failed(self):
+        # Given: 오답 2개를 버퍼에 쌓습니다.
+        self.wrong_answer_buffer.push(self.user.id, self.story.id, self.sheet.id, 'wrong1')
+        self.wrong_answer_buffer.push(self.user.id, self.story.id, self.sheet.id, 'wrong2')
+
+        # When: bulk_create 가 실패합니다.
+        with patch.object(WrongAnswer.objects, 'bulk_create', side_effect=Exception('db error')):
+            with self.assertRaises(Exception):
+                self.wrong_answer_buffer.flush()
+
+        # Then: 버퍼에 그대로 남아 다음 flush 에서 저장됩니다.
+        self.assertEqual(self.wrong_answer_buffer.size(), 2)
+        self.assertEqual(self.wrong_answer_buffer.flush(), 2)
+        self.assertEqual(WrongAnswer.objects.filter(sheet=self.sheet).count(), 2)
+
+    def test_push_should_truncate_answer_to_wrong_answer_max_length(self):
+        # Given: WrongAnswer.answer 보다 긴 오답을 버퍼에 쌓습니다.
+        self.wrong_answer_buffer.push(self.user.id, self.story.id, self.sheet.id, 'a' * 150)
+
+        # When: flush 합니다.
+        flushed_count = self.wrong_answer_buffer.flush()
+
+        # Then: 길이에 맞춰 잘라서 저장합니다.
+        self.assertEqual(flushed_count, 1)
+        self.assertEqual(WrongAnswer.objects.get(sheet=self.sheet).answer, 'a' * 100)
+
+    def test_flush_should_skip_deleted_sheet_and_dead_letter_invalid_items(self):
+        # Given: 정상 오답, 삭제될 Sheet 의 오답, 형식이 잘못된 오답, Sheet 의 Story 와 다른 오답을 버퍼에 쌓습니다.
+        deleted_sheet = Sheet.objects.create(story=self.story, title='deleted', question='deleted')
+        other_story = Story.objects.create(author=self.user, title='other_story', description='test_description')
+        self.wrong_answer_buffer.push(self.user.id, self.story.id, self.sheet.id, 'wrong1')
+        self.wrong_answer_buffer.push(self.user.id, self.story.id, deleted_sheet.id, 'wrong2')
+        self.wrong_answer_buffer.client.rpush(self.wrong_answer_buffer.key, '{"user_id": 1}')
+        self.wrong_answer_buffer.push(self.user.id, other_story.id, self.sheet.id, 'wrong3')
+        self.wrong_answer_buffer.push(self.user.id, self.story.id, self.sheet.id, 'wrong4')
+        # And: flush 전에 Sheet 가 삭제됩니다.
+        deleted_sheet.delete()
+
+        # When: flush 합니다.
+        flushed_count = self.wrong_answer_buffer.flush()
+
+        # Then: 정상 오답만 저장하고 버퍼는 비워집니다.
+        self.assertEqual(flushed_count, 2)
+        self.assertEqual(list(WrongAnswer.objects.order_by('id').values_list('answer', flat=True)), ['wrong1', 'wrong4'])
+        self.assertEqual(self.wrong_answer_buffer.size(), 0)
+        # And: 형식이 잘못된 오답, Story 가 다른 오답은 dead letter list 로 옮깁니다.
+        self.assertEqual(self.wrong_answer_buffer.dead_letter_size(), 2)
+
+    def test_flush_should_dead_letter_item_when_chunk_integrity_error(self):
+        # Given: 오답 3개를 버퍼에 쌓습니다.
+        for answer in ['wrong1', 'bad', 'wrong2']:
+            self.wrong_answer_buffer.push(self.user.id, self.story.id, self.sheet.id, answer)
+        bulk_create = WrongAnswer.objects.bulk_create
+
+        def bulk_create_or_fail(wrong_answers, *args, **kwargs):
+            if any(wrong_answer.answer == 'bad' for wrong_answer in wrong_answers):
+                raise IntegrityError('FOREIGN KEY constraint failed')
+            return bulk_create(wrong_answers, *args, **kwargs)
+
+        # When: 확인 후 삭제 등으로 chunk 저장이 IntegrityError 로 실패합니다.
+        with patch.object(WrongAnswer.objects, 'bulk_create', side_effect=bulk_create_or_fail):
+            flushed_count = self.wrong_answer_buffer.flush()
+
+        # Then: 1개씩 저장하고 실패한 오답만 dead letter list 로 옮깁니다.
+        self.assertEqual(flushed_count, 2)
+        self.assertEqual(list(WrongAnswer.objects.order_by('id').values_list('answer', flat=True)), ['wrong1', 'wrong2'])
+        self.assertEqual(self.wrong_answer_buffer.size(), 0)
+        self.assertEqual(self.wrong_answer_buffer.dead_letter_size(), 1)
+
+    def test_flush_should_stop_when_lock_is_lost(self):
+        # Given: 오답 4개를 버퍼에 쌓습니다.
+        for i in range(4):
+            self.wrong_answer_buffer.push(self.user.id, self.story.id, self.sheet.id, f'wrong{i}')
+        bulk_create = WrongAnswer.objects.bulk_create
+
+        def bulk_create_and_lose_lock(*args, **kwargs):
+            # 저장 중 lock 이 만료되어 다른 flush 가 lock 을 잡습니다.
+            cache.set(WRONG_ANSWER_BUFFER_FLUSH_LOCK_KEY, 'other_flush', 60)
+            return bulk_create(*args, **kwargs)
+
+        # When: chunk 크기 2로 flush 합니다.
+        with patch.object(WrongAnswer.objects, 'bulk_create', side_effect=bulk_create_and_lose_lock):
+            flushed_count = self.wrong_answer_buffer.flush(chunk_size=2)
+
+        # Then: 첫 chunk 만 저장하고 멈춥니다.
+        self.assertEqual(flushed_count, 2)
+        self.assertEqual(self.wrong_answer_buffer.size(), 2)
+        # And: 다른 flush 의 lock 은 지우지 않습니다.
+        self.assertEqual(cache.get(WRONG_ANSWER_BUFFER_FLUSH_LOCK_KEY), 'other_flush')
+
+    @override_settings(CACHES=LOCMEM_CACHES)
+    def test_flush_should_skip_when_other_flush_is_running(self):
+        # Given: 다른 flush 가 실행 중입니다.
+        cache.clear()
+        cache.add(WRONG_ANSWER_BUFFER_FLUSH_LOCK_KEY, 1, 60)
+        self.wrong_answer_buffer.push(self.user.id, self.story.id, self.sheet.id, 'wrong1')
+
+        # When: flush 합니다.
+        flushed_count = self.wrong_answer_buffer.flush()
+
+        # Then: 저장하지 않습니다.
+        self.assertEqual(flushed_count, 0)
+        self.assertEqual(self.wrong_answer_buffer.size(), 1)
+
+    @patch('story.buffers._local_list_buffer', new_callable=LocalListBuffer)
+    @patch('story.task.flush_wrong_answer_buffer.apply_async')
+    def test_flush_wrong_answer_buffer_task_should_reschedule_when_items_remain(self, mock_flush_wrong_answer_buffer, mock_local_list_buffer):
+        # Given: flush 중에 새로운 오답이 쌓입니다.
+        WrongAnswerBuffer().push(self.user.id, self.story.id, self.sheet.id, 'wrong1')
+
+        def bulk_create_and_push(*args, **kwargs):
+            WrongAnswerBuffer().push(self.user.id, self.story.id, self.sheet.id, 'wrong2')
+
+        # When: flush task 를 실행합니다.
+        with patch.object(WrongAnswer.objects, 'bulk_create', side_effect=bulk_create_and_push):
+            flushed_count = flush_wrong_answer_buffer()
+
+        # Then: 시작 시점의 오답만 저장하고 남은 오답은 다시 flush 를 enqueue 합니다.
+        self.assertEqual(flushed_count, 1)
+        self.assertEqual(WrongAnswerBuffer().size(), 1)
+        mock_flush_wrong_answer_buffer.assert_called_once()
+
+
+class StoryViewCounterTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.all()[0]
+        self.story1 = Story.objects.create(
+            author=self.user,
+            title='test_story1',
+            description='test_description',
+        )
+        self.story2 = Story.objects.create(
+            author=self.user,
+            title='test_story2',
+            description='test_description',
+        )
+        self.story_view_counter = StoryViewCounter(client=LocalHyperLogLogClient(), bucket_seconds=60)
+
+    def test_flush_should_add_unique_view_count_of_closed_buckets(self):
+        # Given: 첫번째 bucket 에 story1 을 2명이 3번, story2 를 1명이 조회합니다.
+        self.story_view_counter.record(self.story1.id, 'user:1', timestamp=0)
+        self.story_view_counter.record(self.story1.id, 'user:1', timestamp=10)
+        self.story_view_counter.record(self.story1.id, 'ip:127.0.0.1', timestamp=20)
+        self.story_view_counter.record(self.story2.id, 'user:1', timestamp=30)
+        # And: 두번째 bucket 에 story1 을 1명이 조회합니다.
+        self.story_view_counter.record(self.story1.id, 'user:1', timestamp=60)
+
+        # When: 두번째 bucket 진행 중에 chunk 크기 1로 flush 합니다.
+        # Then: 1개의 transaction(savepoint) 안에서 chunk 마다 update 합니다.
+        with self.assertNumQueries(4):
+            flushed_view_count = self.story_view_counter.flush(timestamp=70, chunk_size=1)
+
+        # Then: 끝난 첫번째 bucket 의 순 조회수만 더합니다.
+        self.assertEqual(flushed_view_count, 3)
+        self.story1.refresh_from_db()
+        self.story2.refresh_from_db()
+        self.assertEqual(self.story1.view_count, 2)
+        self.assertEqual(self.story2.view_count, 1)
+
+        # When: 두번째 bucket 이 끝난 후 flush 합니다.
+        flushed_view_count = self.story_view_counter.flush(timestamp=120)
+
+        # Then: 두번째 bucket 의 순 조회수를 더하고, 이미 flush 한 bucket 은 다시 더하지 않습니다.
+        self.assertEqual(flushed_view_count, 1)
+        self.story1.refresh_from_db()
+        self.assertEqual(self.story1.view_count, 3)
+        self.assertEqual(self.story_view_counter.flush(timestamp=180), 0)
+
+    def test_flush_should_not_add_claimed_bucket_again_when_flush_failed(self):
+        # Given: 첫번째 bucket 에 story1 을 1명이 조회합니다.
+        self.story_view_counter.record(self.story1.id, 'user:1', timestamp=0)
+
+        # When: bucket 을 가져간 후 flush 가 실패합니다.
+        with patch.object(StoryViewCounter, 'get_view_count_by_story_id', side_effect=Exception('redis error')):
+            with self.assertRaises(Exception):
+                self.story_view_counter.flush(timestamp=70)
+
+        # Then: 다음 flush 에서 다시 더하지 않습니다. (at-most-once)
+        self.assertEqual(self.story_view_counter.flush(timestamp=70), 0)
+        self.story1.refresh_from_db()
+        self.assertEqual(self.story1.view_count, 0)
+        # And: lock 은 풀려있습니다.
+        self.assertIsNone(cache.get(STORY_VIEW_FLUSH_LOCK_KEY))
+
+    def test_flush_should_stop_when_lock_is_lost(self):
+        # Given: 첫번째, 두번째 bucket 에 story1 을 1명씩 조회합니다.
+        self.story_view_counter.record(self.story1.id, 'user:1', timestamp=0)
+        self.story_view_counter.record(self.story1.id, 'user:2', timestamp=60)
+        get_view_count_by_story_id = self.story_view_counter.get_view_count_by_story_id
+
+        def get_view_count_by_story_id_and_lose_lock(bucket):
+            # 더하는 중 lock 이 만료되어 다른 flush 가 lock 을 잡습니다.
+            cache.set(STORY_VIEW_FLUSH_LOCK_KEY, 'other_flush', 60)
+            return get_view_count_by_story_id(bucket)
+
+        # When: 두 bucket 이 끝난 후 flush 합니다.
+        with patch.object(self.story_view_counter, 'get_view_count_by_story_id', side_effect=get_view_count_by_story_id_and_lose_lock):
+            flushed_view_count = self.story_view_counter.flush(timestamp=120)
+
+        # Then: 첫번째 bucket 만 더하고 멈춥니다.
+        self.assertEqual(flushed_view_count, 1)
+        self.assertEqual(self.story_view_counter.get_closed_buckets(timestamp=120), [1])
+        # And: 다른 flush 의 lock 은 지우지 않습니다.
+        self.assertEqual(cache.get(STORY_VIEW_FLUSH_LOCK_KEY), 'other_flush')
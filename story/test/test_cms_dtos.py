@@ -1,11 +1,20 @@
+from decimal import Decimal
+
+import attr
 from django.test import TestCase
+from rest_framework.renderers import JSONRenderer
 
 from account.models import User
+from common_library import only_model_fields
+from config.renderers.json_renderers import FastJSONRenderer
 from story.cmd_dtos import (
+    CMSStoryListItemDTO,
+    CMSStoryListResponse,
     CMSStorySheetMapItemDTO,
     CMSStorySheetAnswerMapItemDTO,
     CMSStoryAnswerNextPathItemDTO,
-    CMSStoryAnswerNextPathMapItemDTO
+    CMSStoryAnswerNextPathMapItemDTO,
+    CMSStoryAnswerNextPathMapResponse,
 )
 from story.models import (
     Sheet,
@@ -133,3 +142,88 @@ class CMSStoryAnswerNextPathMapResponseTest(TestCase):
         self.assertEqual(answer_next_path.answer_id, self.start_sheet_answer1.id)
         self.assertEqual(answer_next_path.next_paths[0].sheet_id, self.start_sheet_answer1.id)
         self.assertEqual(answer_next_path.next_paths[0].quantity, 4)
+
+
+class CMSStoryListItemDTOTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.all()[0]
+        self.story = Story.objects.create(
+            author=self.user,
+            title='test_story',
+            description='test_description',
+        )
+
+    def test_of_method_should_not_query_when_only_model_fields(self):
+        # Given: MODEL_FIELDS 만 조회
+        stories = list(only_model_fields(Story.objects.filter(id=self.story.id), CMSStoryListItemDTO.MODEL_FIELDS))
+        # Then: author 는 nickname 외에 조회하지 않습니다.
+        self.assertIn('password', stories[0].author.get_deferred_fields())
+
+        # When: DTO 생성
+        # Then: 추가 query 가 없습니다.
+        with self.assertNumQueries(0):
+            item = CMSStoryListItemDTO.of(stories[0]).to_dict()
+        self.assertEqual(item['nickname'], self.user.nickname)
+        self.assertEqual(item['description'], 'test_description')
+
+
+class CMSResponseSerializationTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.all()[0]
+        self.story = Story.objects.create(
+            author=self.user,
+            title='테스트 스토리',
+            description='test_description',
+        )
+        self.start_sheet = Sheet.objects.create(
+            story=self.story,
+            title='test_title',
+            question='test_question',
+            is_start=True,
+            is_final=False,
+        )
+        self.start_sheet_answer = SheetAnswer.objects.create(
+            sheet=self.start_sheet,
+            answer='test',
+            answer_reply='test_reply',
+        )
+
+    def test_to_dict_should_equal_attr_asdict(self):
+        # Given: 중첩된 DTO 를 가진 응답
+        responses = [
+            CMSStoryListResponse(
+                total_count=1,
+                stories=[CMSStoryListItemDTO.of(self.story)],
+            ),
+            CMSStoryAnswerNextPathMapResponse(
+                answer_next_paths=[
+                    CMSStoryAnswerNextPathMapItemDTO.of(
+                        self.start_sheet_answer,
+                        [CMSStoryAnswerNextPathItemDTO(sheet_id=self.start_sheet.id, quantity=4)],
+                    ),
+                ],
+            ),
+        ]
+
+        for response in responses:
+            # When: to_dict
+            # Then: attr.asdict(recurse=True) 와 같은 dict 를 반환합니다.
+            self.assertEqual(response.to_dict(), attr.asdict(response, recurse=True))
+
+    def test_fast_json_renderer_should_equal_json_renderer(self):
+        # Given: datetime, 한글, Decimal, int key 를 가진 응답
+        data = {
+            'stories': CMSStoryListResponse(
+                total_count=1,
+                stories=[CMSStoryListItemDTO.of(self.story)],
+            ).to_dict(),
+            'rate': Decimal('4.5'),
+            'count_by_id': {1: 2},
+            'empty': None,
+        }
+
+        # When: FastJSONRenderer 로 직렬화
+        content = FastJSONRenderer().render(data)
+
+        # Then: DRF JSONRenderer 와 같은 결과를 반환합니다.
+        self.assertEqual(content, JSONRenderer().render(data))
@@ -27,27 +27,31 @@ class StoryFilterTestCase(TestCase):
         self.assertEqual(stories_qs.count(), Story.objects.count())
 
     def test_get_story_search_filter(self):
-        # Given: A search type and search value
-        search_type = 'title'
-        search_value = 'example'
+        # Given: 제목, 설명, 작성자 닉네임이 다른 Story
+        user = User.objects.create_user(username='search_author', password='secret', email='search_author@test.com')
+        user.nickname = '검색작가'
+        user.save()
+        title_story = Story.objects.create(author=user, title='예제 스토리', description='설명')
+        description_story = Story.objects.create(title='스토리', description='예제 설명')
 
-        # When: Calling get_story_search_filter function
-        search_filter = get_story_search_filter(search_type, search_value)
+        # When: Calling get_story_search_filter function with title
+        search_filter = get_story_search_filter('title', '예제')
 
         # Then: We should get a valid Q object for title search
         self.assertIsInstance(search_filter, Q)
-        self.assertEqual(search_filter, Q(title__icontains=search_value))
+        self.assertEqual(list(Story.objects.filter(search_filter)), [title_story])
 
-        # Given: A search type and search value for author
-        search_type = 'author'
-        search_value = 'admin'
+        # When: Calling get_story_search_filter function with description
+        search_filter = get_story_search_filter('description', '예제')
 
-        # When: Calling get_story_search_filter function
-        search_filter = get_story_search_filter(search_type, search_value)
+        # Then: We should get a valid Q object for description search
+        self.assertEqual(list(Story.objects.filter(search_filter)), [description_story])
+
+        # When: Calling get_story_search_filter function with author
+        search_filter = get_story_search_filter('author', '작가')
 
         # Then: We should get a valid Q object for author search
-        self.assertIsInstance(search_filter, Q)
-        self.assertEqual(search_filter, Q(author__nickname__icontains=search_value))
+        self.assertEqual(list(Story.objects.filter(search_filter)), [title_story])
 
         # Given: An unsupported search type
         search_type = 'unsupported'
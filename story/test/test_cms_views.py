@@ -1,4 +1,5 @@
 import json
+from datetime import datetime, timedelta
 
 from django.test import TestCase
 from django.urls import reverse
@@ -70,6 +71,85 @@ class CMSStoryListAPIViewTestCase(LoginMixin, TestCase):
         story = content['stories'][0]
         self.assertEqual(story['id'], self.story.id)
 
+    def test_get_cms_story_api_with_cursor_should_success(self):
+        # Given: 관리자 로그인, 좋아요 수가 같은 story 추가
+        self.cms_login()
+        story2 = Story.objects.create(
+            author=self.user,
+            title='test_story2',
+            description='test_description2',
+        )
+        story3 = Story.objects.create(
+            author=self.user,
+            title='test_story3',
+            description='test_description3',
+            like_count=1,
+        )
+
+        # When: 좋아요 순으로 cursor 요청을 끝까지 반복
+        story_ids = []
+        cursor = ''
+        while cursor is not None:
+            response = self.c.get(
+                reverse('cms_story:story_cms'),
+                data={'cursor': cursor, 'size': 1, 'order_by': '-like_count'},
+            )
+            content = json.loads(response.content)
+            self.assertEqual(response.status_code, 200)
+            story_ids += [story['id'] for story in content['stories']]
+            cursor = content['next_cursor']
+
+        # Then: (like_count, id) 내림차순으로 중복 없이 조회
+        self.assertEqual(story_ids, [story3.id, story2.id, self.story.id])
+        self.assertEqual(content['total_count'], 3)
+
+    def test_get_cms_story_api_with_datetime_cursor_should_keep_microseconds(self):
+        # Given: 관리자 로그인, 생성일이 같은 millisecond 안에서 다른 story 추가
+        self.cms_login()
+        story2 = Story.objects.create(author=self.user, title='test_story2', description='test_description2')
+        story3 = Story.objects.create(author=self.user, title='test_story3', description='test_description3')
+        created_at = datetime(2022, 1, 1, 0, 0, 0, 100)
+        for microseconds, story in enumerate([self.story, story2, story3]):
+            Story.objects.filter(id=story.id).update(created_at=created_at + timedelta(microseconds=microseconds * 100))
+
+        # When: 생성일 순으로 cursor 요청을 끝까지 반복
+        story_ids = []
+        cursor = ''
+        while cursor is not None:
+            response = self.c.get(
+                reverse('cms_story:story_cms'),
+                data={'cursor': cursor, 'size': 1, 'order_by': '-created_at'},
+            )
+            content = json.loads(response.content)
+            self.assertEqual(response.status_code, 200)
+            story_ids += [story['id'] for story in content['stories']]
+            cursor = content['next_cursor']
+
+        # Then: microsecond 까지 비교하여 건너뛰지 않고 조회
+        self.assertEqual(story_ids, [story3.id, story2.id, self.story.id])
+
+    def test_get_cms_story_api_should_fail_when_cursor_order_by_changed(self):
+        # Given: 관리자 로그인, id 순 cursor
+        self.cms_login()
+        Story.objects.create(
+            author=self.user,
+            title='test_story2',
+            description='test_description2',
+        )
+        response = self.c.get(reverse('cms_story:story_cms'), data={'cursor': '', 'size': 1})
+        cursor = json.loads(response.content)['next_cursor']
+
+        # When: 다른 order_by 로 cursor 요청
+        response = self.c.get(
+            reverse('cms_story:story_cms'),
+            data={'cursor': cursor, 'size': 1, 'order_by': '-like_count'},
+        )
+        content = json.loads(response.content)
+
+        # Then: cursor 조회 실패
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(content['message'], '유효하지 않은 cursor 입니다.')
+
     def test_get_cms_story_api_should_fail_when_not_admin_user(self):
         # Given: 일반 로그인
         self.login()
@@ -1,11 +1,19 @@
 from io import StringIO
+from unittest.mock import patch
 
+from django.core.cache import cache
 from django.core.management import call_command
-from django.test import TestCase
-from datetime import datetime
+from django.core.management.base import CommandError
+from django.test import TestCase, override_settings
+from datetime import datetime, timedelta
 
 from account.models import User
-from story.models import Story, StoryLike, PopularStory
+from config.test_helper.helper import LOCMEM_CACHES
+from story.constants import POPULAR_STORY_UPDATE_LOCK_KEY, POPULAR_STORY_WINDOW_SECONDS
+from story.management.commands.update_popular_story import Command
+from story.models import Story, StoryLike, PopularStory, Sheet, SheetWrongAnswerCount, WrongAnswer, UserStorySolve, \
+    StoryLikeHourlyCount
+from story.services import create_story_like, delete_story_like, get_popular_story_list_items
 
 
 class PopularStoryCommandTestCase(TestCase):
@@ -35,6 +43,7 @@ class PopularStoryCommandTestCase(TestCase):
         )
 
     def call_command(self, *args, **kwargs):
+        kwargs.setdefault('window', ['1h'])
         out = StringIO()
         call_command(
             'update_popular_story',
@@ -49,10 +58,7 @@ class PopularStoryCommandTestCase(TestCase):
         # Given: story1 좋아요 1개, story2 좋아요 2개, story3 좋아요 3개
         stories = [self.story1, self.story2, self.story2, self.story3, self.story3, self.story3]
         for story in stories:
-            StoryLike.objects.create(
-                user=self.user,
-                story=story,
-            )
+            StoryLikeHourlyCount.increase_like_count(story.id, datetime.now(), 1)
 
         # When: update_popular_story command 실행
         self.call_command()
@@ -75,10 +81,7 @@ class PopularStoryCommandTestCase(TestCase):
         # Given: story1 좋아요 1개, story2 좋아요 2개, story3 좋아요 3개
         stories = [self.story1, self.story2, self.story2, self.story3, self.story3, self.story3]
         for story in stories:
-            StoryLike.objects.create(
-                user=self.user,
-                story=story,
-            )
+            StoryLikeHourlyCount.increase_like_count(story.id, datetime.now(), 1)
 
         # When: update_popular_story command 실행
         self.call_command()
@@ -120,10 +123,7 @@ class PopularStoryCommandTestCase(TestCase):
         # Given: story1 좋아요 1개, story2 좋아요 2개, story3 좋아요 3개
         stories = [self.story1, self.story2, self.story2, self.story3, self.story3, self.story3]
         for story in stories:
-            StoryLike.objects.create(
-                user=self.user,
-                story=story,
-            )
+            StoryLikeHourlyCount.increase_like_count(story.id, datetime.now(), 1)
 
         # When: update_popular_story command 실행 (rank=2)
         self.call_command(rank=2)
@@ -143,12 +143,9 @@ class PopularStoryCommandTestCase(TestCase):
         # Given: story1 좋아요 1개, story2 좋아요 2개, story3 좋아요 3개
         stories = [self.story1, self.story2, self.story2, self.story3, self.story3, self.story3]
         for story in stories:
-            StoryLike.objects.create(
-                user=self.user,
-                story=story,
-            )
-        # And: story1 의 like 를 과거 초로 생성
-        StoryLike.objects.filter(story=self.story1).update(updated_at=datetime(2017, 1, 1))
+            StoryLikeHourlyCount.increase_like_count(story.id, datetime.now(), 1)
+        # And: story1 의 like 를 과거 시간으로 집계
+        StoryLikeHourlyCount.objects.filter(story=self.story1).update(hour=datetime(2017, 1, 1))
 
         # When: update_popular_story command 실행 (second=50)
         self.call_command(second=50)
@@ -163,3 +160,300 @@ class PopularStoryCommandTestCase(TestCase):
         self.assertEqual(qs[1].story, self.story2)
         self.assertEqual(qs[1].rank, 2)
         self.assertEqual(qs[1].like_count, 2)
+
+    def test_create_popular_stories_by_windows(self):
+        # Given: 현재 story1 좋아요 1개, 3시간 전 story2 좋아요 2개, 3일 전 story3 좋아요 3개
+        now = datetime.now()
+        StoryLikeHourlyCount.increase_like_count(self.story1.id, now, 1)
+        StoryLikeHourlyCount.increase_like_count(self.story2.id, now - timedelta(hours=3), 2)
+        StoryLikeHourlyCount.increase_like_count(self.story3.id, now - timedelta(days=3), 3)
+
+        # When: update_popular_story command 실행 (전체 window)
+        self.call_command(window=list(POPULAR_STORY_WINDOW_SECONDS.keys()))
+
+        # Then: window 별로 기간 내 좋아요로 rank 가 매겨짐
+        qs = PopularStory.objects.filter(is_deleted=False).order_by('rank')
+        self.assertEqual(
+            [(popular_story.story, popular_story.like_count) for popular_story in qs.filter(base_past_second=60 * 60)],
+            [(self.story1, 1)],
+        )
+        self.assertEqual(
+            [(popular_story.story, popular_story.like_count) for popular_story in qs.filter(base_past_second=60 * 60 * 24)],
+            [(self.story2, 2), (self.story1, 1)],
+        )
+        self.assertEqual(
+            [(popular_story.story, popular_story.like_count) for popular_story in qs.filter(base_past_second=60 * 60 * 24 * 7)],
+            [(self.story3, 3), (self.story2, 2), (self.story1, 1)],
+        )
+        # And: 모두 같은 세대로 생성됨
+        self.assertEqual(set(qs.values_list('generation', flat=True)), {1})
+
+    def test_create_popular_stories_only_replaces_given_window(self):
+        # Given: 현재 story1 좋아요 1개, 전체 window 로 1번 실행
+        StoryLikeHourlyCount.increase_like_count(self.story1.id, datetime.now(), 1)
+        self.call_command(window=list(POPULAR_STORY_WINDOW_SECONDS.keys()))
+
+        # When: 1h window 만 다시 실행
+        self.call_command(window=['1h'])
+
+        # Then: 1h window 만 새 세대로 교체되고, 다른 window 는 유지됨
+        qs = PopularStory.objects.filter(is_deleted=False)
+        self.assertEqual(qs.get(base_past_second=60 * 60).generation, 2)
+        self.assertEqual(qs.get(base_past_second=60 * 60 * 24).generation, 1)
+        self.assertEqual(qs.get(base_past_second=60 * 60 * 24 * 7).generation, 1)
+
+    def test_create_popular_stories_by_story_like(self):
+        # Given: user1, user2 가 story2 를 좋아요, user1 이 story1 을 좋아요 후 취소
+        user2 = User.objects.create_user(username='like_user2', password='secret', email='like_user2@test.com')
+        create_story_like(self.story2.id, self.user.id)
+        create_story_like(self.story2.id, user2.id)
+        create_story_like(self.story1.id, self.user.id)
+        delete_story_like(self.story1.id, self.user.id)
+
+        # When: update_popular_story command 실행
+        self.call_command()
+
+        # Then: 활성 좋아요가 있는 story2 만 인기 스토리가 됨
+        qs = PopularStory.objects.filter(is_deleted=False)
+        self.assertEqual(
+            [(popular_story.story, popular_story.like_count) for popular_story in qs],
+            [(self.story2, 2)],
+        )
+
+    @override_settings(CACHES=LOCMEM_CACHES)
+    def test_create_popular_stories_should_invalidate_popular_story_list_cache(self):
+        # Given: 인기 스토리가 없을 때 조회한 목록이 캐시되어 있습니다.
+        cache.clear()
+        self.assertEqual(get_popular_story_list_items(), [])
+        StoryLikeHourlyCount.increase_like_count(self.story1.id, datetime.now(), 1)
+
+        # When: update_popular_story command 실행
+        self.call_command()
+
+        # Then: 새로 만든 인기 스토리를 조회합니다.
+        self.assertEqual([item.story_id for item in get_popular_story_list_items()], [self.story1.id])
+
+    def test_create_popular_stories_should_skip_when_other_update_is_running(self):
+        # Given: 다른 update_popular_story 가 실행 중입니다.
+        StoryLikeHourlyCount.increase_like_count(self.story1.id, datetime.now(), 1)
+        cache.add(POPULAR_STORY_UPDATE_LOCK_KEY, 'other_update', 60)
+
+        # When: update_popular_story command 실행
+        out = self.call_command()
+
+        # Then: 새 세대를 만들지 않습니다.
+        self.assertIn('skip', out)
+        self.assertFalse(PopularStory.objects.exists())
+        # And: 다른 실행의 lock 은 지우지 않습니다.
+        self.assertEqual(cache.get(POPULAR_STORY_UPDATE_LOCK_KEY), 'other_update')
+
+    def test_create_popular_stories_should_not_save_when_lock_is_lost(self):
+        # Given: 집계 중 lock 이 만료되어 다른 실행이 lock 을 잡습니다.
+        StoryLikeHourlyCount.increase_like_count(self.story1.id, datetime.now(), 1)
+        get_top_stories = Command.get_top_stories
+
+        def get_top_stories_and_lose_lock(command, now, base_past_second):
+            cache.set(POPULAR_STORY_UPDATE_LOCK_KEY, 'other_update', 60)
+            return get_top_stories(command, now, base_past_second)
+
+        # When: update_popular_story command 실행
+        # Then: 저장하지 않고 실패합니다.
+        with patch.object(Command, 'get_top_stories', get_top_stories_and_lose_lock):
+            with self.assertRaises(CommandError):
+                self.call_command()
+        self.assertFalse(PopularStory.objects.exists())
+        self.assertEqual(cache.get(POPULAR_STORY_UPDATE_LOCK_KEY), 'other_update')
+
+
+class BackfillStoryLikeHourlyCountCommandTestCase(TestCase):
+    def setUp(self):
+        super(BackfillStoryLikeHourlyCountCommandTestCase, self).setUp()
+        self.user = User.objects.all()[0]
+        self.user2 = User.objects.create_user(username='backfill_user2', password='secret', email='backfill_user2@test.com')
+        self.story = Story.objects.create(
+            author=self.user,
+            title='test_story',
+            description='test_description',
+        )
+
+    def call_command(self, *args, **kwargs):
+        out = StringIO()
+        call_command(
+            'backfill_story_like_hourly_count',
+            *args,
+            stdout=out,
+            stderr=StringIO(),
+            **kwargs,
+        )
+        return out.getvalue()
+
+    def test_backfill_story_like_hourly_count(self):
+        # Given: 집계 없이 쌓인 활성 좋아요 2개, 삭제된 좋아요 1개, 8일 전 좋아요 1개, 잘못된 집계 row
+        user3 = User.objects.create_user(username='backfill_user3', password='secret', email='backfill_user3@test.com')
+        user4 = User.objects.create_user(username='backfill_user4', password='secret', email='backfill_user4@test.com')
+        StoryLike.objects.create(user=self.user, story=self.story)
+        StoryLike.objects.create(user=self.user2, story=self.story)
+        StoryLike.objects.create(user=user3, story=self.story, is_deleted=True)
+        old_story_like = StoryLike.objects.create(user=user4, story=self.story)
+        StoryLike.objects.filter(id=old_story_like.id).update(updated_at=datetime.now() - timedelta(days=8))
+        StoryLikeHourlyCount.objects.create(story=self.story, hour=datetime(2017, 1, 1), like_count=100)
+
+        # When: backfill_story_like_hourly_count command 실행 (chunk_size=1)
+        out = self.call_command(chunk_size=1)
+
+        # Then: 7일 내 활성 좋아요만 현재 시간으로 집계됨
+        self.assertEqual(out, 'success: 2\n')
+        hourly_count = StoryLikeHourlyCount.objects.get()
+        self.assertEqual(hourly_count.hour, StoryLikeHourlyCount.truncate_hour(datetime.now()))
+        self.assertEqual(hourly_count.like_count, 2)
+
+    def test_backfill_story_like_hourly_count_should_update_existing_row(self):
+        # Given: 활성 좋아요 2개, 잘못 집계된 현재 시간 row
+        StoryLike.objects.create(user=self.user, story=self.story)
+        StoryLike.objects.create(user=self.user2, story=self.story)
+        hourly_count = StoryLikeHourlyCount.objects.create(
+            story=self.story,
+            hour=StoryLikeHourlyCount.truncate_hour(datetime.now()),
+            like_count=100,
+        )
+
+        # When: backfill_story_like_hourly_count command 실행
+        self.call_command()
+
+        # Then: 지우고 다시 만들지 않고 기존 row 를 계산한 값으로 덮어씁니다.
+        self.assertEqual(StoryLikeHourlyCount.objects.get().id, hourly_count.id)
+        self.assertEqual(StoryLikeHourlyCount.objects.get().like_count, 2)
+
+
+class BackfillSheetWrongAnswerCountCommandTestCase(TestCase):
+    def setUp(self):
+        super(BackfillSheetWrongAnswerCountCommandTestCase, self).setUp()
+        self.user = User.objects.all()[0]
+        self.story = Story.objects.create(
+            author=self.user,
+            title='test_story',
+            description='test_description',
+        )
+        self.sheet = Sheet.objects.create(
+            story=self.story,
+            title='test_title',
+            question='test_question',
+            is_start=True,
+        )
+
+    def call_command(self, *args, **kwargs):
+        out = StringIO()
+        call_command(
+            'backfill_sheet_wrong_answer_count',
+            *args,
+            stdout=out,
+            stderr=StringIO(),
+            **kwargs,
+        )
+        return out.getvalue()
+
+    def test_backfill_sheet_wrong_answer_count(self):
+        # Given: 집계 없이 쌓인 WrongAnswer 5개 (wrong 3개, other 2개), 잘못된 집계 row
+        WrongAnswer.objects.bulk_create([
+            WrongAnswer(user=self.user, story=self.story, sheet=self.sheet, answer=answer)
+            for answer in ['wrong', 'Wrong', 'w rong', 'other', 'other']
+        ])
+        SheetWrongAnswerCount.objects.create(
+            story=self.story,
+            sheet=self.sheet,
+            normalized_answer='wrong',
+            count=100,
+            first_seen=datetime.now(),
+            last_seen=datetime.now(),
+        )
+
+        # When: chunk 크기 2로 backfill command 실행
+        out = self.call_command(chunk_size=2)
+
+        # Then: WrongAnswer 기준으로 집계가 다시 만들어집니다.
+        self.assertIn('success: 5', out)
+        self.assertEqual(SheetWrongAnswerCount.objects.get(sheet=self.sheet, normalized_answer='wrong').count, 3)
+        self.assertEqual(SheetWrongAnswerCount.objects.get(sheet=self.sheet, normalized_answer='other').count, 2)
+
+    def test_backfill_sheet_wrong_answer_count_should_update_existing_row(self):
+        # Given: 집계 없이 쌓인 WrongAnswer 2개, 잘못 집계된 row
+        WrongAnswer.objects.bulk_create([
+            WrongAnswer(user=self.user, story=self.story, sheet=self.sheet, answer=answer)
+            for answer in ['wrong', 'Wrong']
+        ])
+        wrong_answer_count = SheetWrongAnswerCount.objects.create(
+            story=self.story,
+            sheet=self.sheet,
+            normalized_answer='wrong',
+            count=100,
+            first_seen=datetime(2017, 1, 1),
+            last_seen=datetime(2017, 1, 1),
+        )
+
+        # When: backfill command 실행
+        self.call_command()
+
+        # Then: 지우고 다시 만들지 않고 기존 row 를 계산한 값으로 덮어씁니다.
+        sheet_wrong_answer_count = SheetWrongAnswerCount.objects.get()
+        self.assertEqual(sheet_wrong_answer_count.id, wrong_answer_count.id)
+        self.assertEqual(sheet_wrong_answer_count.count, 2)
+        self.assertGreater(sheet_wrong_answer_count.first_seen, datetime(2017, 1, 1))
+
+
+class ReconcileStoryCountersCommandTestCase(TestCase):
+    def setUp(self):
+        super(ReconcileStoryCountersCommandTestCase, self).setUp()
+        self.users = [
+            User.objects.create_user(username=f'test_user{i}', password='secret', email=f'test_user{i}@example.com')
+            for i in range(3)
+        ]
+        self.story1 = Story.objects.create(
+            author=self.users[0],
+            title='test_story1',
+            description='test_description1',
+        )
+        self.story2 = Story.objects.create(
+            author=self.users[0],
+            title='test_story2',
+            description='test_description2',
+        )
+
+    def call_command(self, *args, **kwargs):
+        out = StringIO()
+        call_command(
+            'reconcile_story_counters',
+            *args,
+            stdout=out,
+            stderr=StringIO(),
+            **kwargs,
+        )
+        return out.getvalue()
+
+    def test_reconcile_story_counters(self):
+        # Given: story1 좋아요 2개(1개 취소 포함 3개), 플레이 3번 이지만 카운터가 어긋나 있습니다.
+        for i, user in enumerate(self.users):
+            StoryLike.objects.create(user=user, story=self.story1, is_deleted=(i == 0))
+            UserStorySolve.objects.create(user=user, story=self.story1)
+        Story.objects.filter(id=self.story1.id).update(like_count=10, played_count=0)
+        # And: story2 는 카운터가 맞습니다.
+
+        # When: chunk 크기 1로 보정 command 실행
+        out = self.call_command(chunk_size=1)
+
+        # Then: story1 만 보정됩니다.
+        self.assertIn('success: drifted 1, repaired 1', out)
+        self.story1.refresh_from_db()
+        self.assertEqual(self.story1.like_count, 2)
+        self.assertEqual(self.story1.played_count, 3)
+
+    def test_reconcile_story_counters_should_not_update_when_dry_run(self):
+        # Given: 어긋난 카운터
+        Story.objects.filter(id=self.story1.id).update(like_count=10)
+
+        # When: dry-run 으로 실행
+        out = self.call_command(dry_run=True)
+
+        # Then: 보정하지 않습니다.
+        self.assertIn('success: drifted 1, repaired 0', out)
+        self.story1.refresh_from_db()
+        self.assertEqual(self.story1.like_count, 10)
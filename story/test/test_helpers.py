@@ -0,0 +1,248 @@
+import random
+import unicodedata
+from collections import Counter
+from unittest.mock import patch
+
+from django.test import TestCase
+
+from story.dtos import SheetAnswerResponseDTO
+from story.helpers import normalize_answer, NextSheetPathSampler, SheetAnswerMatcher, get_search_tokens, \
+    get_search_query_tokens, StoryTitleAutocomplete
+
+
+def _answer_response(id: int, answer: str, is_always_correct: bool = False, next_sheet_path_id: int = None,
+                     next_sheet_id: int = None, next_sheet_quantity: int = None) -> SheetAnswerResponseDTO:
+    return SheetAnswerResponseDTO(
+        id=id,
+        answer=answer,
+        answer_reply=f'{answer}_reply',
+        is_always_correct=is_always_correct,
+        next_sheet_path_id=next_sheet_path_id,
+        next_sheet_id=next_sheet_id,
+        next_sheet_quantity=next_sheet_quantity,
+    )
+
+
+class NormalizeAnswerTestCase(TestCase):
+    def test_normalize_answer_should_remove_spaces_and_lower_case(self):
+        # Given: 대문자와 공백이 섞인 정답
+        # When: 정규화 합니다.
+        # Then: 소문자로 바뀌고 공백이 모두 제거됩니다.
+        self.assertEqual(normalize_answer(' Hello  World\t'), 'helloworld')
+
+    def test_normalize_answer_should_compose_decomposed_hangul(self):
+        # Given: 자모가 분리된(NFD) 한글 정답
+        decomposed_answer = unicodedata.normalize('NFD', '정답 입니다')
+
+        # When: 정규화 합니다.
+        # Then: 완성형(NFC) 정답과 같습니다.
+        self.assertNotEqual(decomposed_answer, '정답 입니다')
+        self.assertEqual(normalize_answer(decomposed_answer), '정답입니다')
+
+
+class SearchTokenTestCase(TestCase):
+    def test_get_search_tokens_should_split_words_into_unigrams_and_bigrams(self):
+        # Given: 대문자와 자모가 분리된(NFD) 한글이 섞인 제목
+        title = unicodedata.normalize('NFD', '스토리 A스토')
+
+        # When: 검색 토큰을 만듭니다.
+        # Then: 단어마다 글자와 연속된 두 글자를 셉니다. (단어 사이 공백은 토큰이 되지 않습니다.)
+        self.assertEqual(
+            get_search_tokens(title),
+            Counter({'스': 2, '토': 2, '리': 1, 'a': 1, '스토': 2, '토리': 1, 'a스': 1}),
+        )
+        self.assertEqual(get_search_tokens(None), Counter())
+
+    def test_get_search_query_tokens_should_use_bigrams_except_single_letter_word(self):
+        # Expect: 2글자 이상 단어는 bigram, 1글자 단어는 unigram
+        self.assertEqual(get_search_query_tokens('스토리 빌 더'), {'스토', '토리', '빌', '더'})
+        self.assertEqual(get_search_query_tokens('  '), set())
+
+
+class SheetAnswerMatcherTestCase(TestCase):
+    def test_get_valid_answer_info_should_match_normalized_answer(self):
+        # Given: 여러 정답이 색인된 matcher
+        answer_matcher = SheetAnswerMatcher(
+            [_answer_response(index, f'Answer {index}') for index in range(1, 301)]
+        )
+
+        # When: 공백과 대소문자가 다른 정답을 제출합니다.
+        is_valid, sheet_answer_id, next_sheet_path_id, next_sheet_id = answer_matcher.get_valid_answer_info('answer150')
+
+        # Then: 일치하는 정답을 찾습니다.
+        self.assertTrue(is_valid)
+        self.assertEqual(sheet_answer_id, 150)
+        self.assertIsNone(next_sheet_path_id)
+        self.assertIsNone(next_sheet_id)
+
+    def test_get_valid_answer_info_should_match_decomposed_hangul_answer(self):
+        # Given: 한글 정답이 색인된 matcher
+        answer_matcher = SheetAnswerMatcher([_answer_response(1, '비밀 번호', next_sheet_path_id=10, next_sheet_id=20, next_sheet_quantity=1)])
+
+        # When: 자모가 분리된(NFD) 정답을 제출합니다.
+        is_valid, sheet_answer_id, next_sheet_path_id, next_sheet_id = answer_matcher.get_valid_answer_info(
+            unicodedata.normalize('NFD', '비밀번호')
+        )
+
+        # Then: 정답입니다.
+        self.assertTrue(is_valid)
+        self.assertEqual(sheet_answer_id, 1)
+        self.assertEqual(next_sheet_path_id, 10)
+        self.assertEqual(next_sheet_id, 20)
+
+    def test_get_valid_answer_info_should_prefer_matched_answer_over_always_correct_answer(self):
+        # Given: 일반 정답과 항상 정답인 정답이 있습니다.
+        answer_matcher = SheetAnswerMatcher(
+            [
+                _answer_response(1, 'always', is_always_correct=True),
+                _answer_response(2, 'normal'),
+            ]
+        )
+
+        # When: 일반 정답을 제출합니다.
+        # Then: 일반 정답을 반환합니다.
+        self.assertEqual(answer_matcher.get_valid_answer_info('normal'), (True, 2, None, None))
+        # And: 틀린 정답을 제출하면 항상 정답인 정답을 반환합니다.
+        self.assertEqual(answer_matcher.get_valid_answer_info('wrong'), (True, 1, None, None))
+
+    def test_get_valid_answer_info_should_fail_when_answer_is_invalid(self):
+        # Given: 항상 정답인 정답이 없는 matcher
+        answer_matcher = SheetAnswerMatcher([_answer_response(1, 'normal')])
+
+        # When: 틀린 정답을 제출합니다.
+        # Then: 정답이 아닙니다.
+        self.assertEqual(answer_matcher.get_valid_answer_info('wrong'), (False, None, None, None))
+
+
+class NextSheetPathSamplerTestCase(TestCase):
+    def test_sample_should_be_reproducible_with_injected_rng(self):
+        # Given: 여러 경로를 가진 sampler
+        next_sheet_path_sampler = NextSheetPathSampler(
+            [
+                _answer_response(1, 'a', next_sheet_path_id=index, next_sheet_id=index, next_sheet_quantity=index)
+                for index in range(1, 6)
+            ]
+        )
+
+        # When: 같은 seed 의 rng 로 선택합니다.
+        first_samples = [next_sheet_path_sampler.sample(random.Random(7)) for _ in range(10)]
+        second_samples = [next_sheet_path_sampler.sample(random.Random(7)) for _ in range(10)]
+
+        # Then: 같은 결과입니다.
+        self.assertEqual(first_samples, second_samples)
+
+    def test_sample_should_follow_quantity_distribution(self):
+        # Given: quantity 1 과 3 인 경로, quantity 0 인 경로
+        next_sheet_path_sampler = NextSheetPathSampler(
+            [
+                _answer_response(1, 'a', next_sheet_path_id=10, next_sheet_id=100, next_sheet_quantity=1),
+                _answer_response(1, 'a', next_sheet_path_id=20, next_sheet_id=200, next_sheet_quantity=3),
+                _answer_response(2, 'a', next_sheet_path_id=30, next_sheet_id=300, next_sheet_quantity=0),
+            ]
+        )
+
+        # When: 여러번 선택합니다.
+        rng = random.Random(0)
+        sample_counter = Counter(next_sheet_path_sampler.sample(rng)[1] for _ in range(20000))
+
+        # Then: quantity 0 인 경로는 선택되지 않습니다.
+        self.assertNotIn(30, sample_counter)
+        # And: quantity 비율(1:3)대로 선택됩니다.
+        self.assertAlmostEqual(sample_counter[20] / 20000, 0.75, delta=0.02)
+
+    def test_sample_should_return_every_weighted_entry_in_order_of_quantity(self):
+        # Given: quantity 2, 3 인 경로
+        next_sheet_path_sampler = NextSheetPathSampler(
+            [
+                _answer_response(1, 'a', next_sheet_path_id=10, next_sheet_id=100, next_sheet_quantity=2),
+                _answer_response(2, 'a', next_sheet_path_id=20, next_sheet_id=200, next_sheet_quantity=3),
+            ]
+        )
+
+        # When: 가능한 모든 randrange 값으로 선택합니다.
+        class SequenceRandom(random.Random):
+            def __init__(self, value):
+                super().__init__()
+                self.value = value
+
+            def randrange(self, *args, **kwargs):
+                return self.value
+
+        samples = [next_sheet_path_sampler.sample(SequenceRandom(value)) for value in range(5)]
+
+        # Then: 복제 목록과 같은 분포로 경로가 선택됩니다.
+        self.assertEqual(
+            samples,
+            [(1, 10, 100)] * 2 + [(2, 20, 200)] * 3,
+        )
+
+    def test_sample_should_return_first_answer_when_next_sheet_path_not_exists(self):
+        # Given: 경로가 없는 정답
+        next_sheet_path_sampler = NextSheetPathSampler([_answer_response(1, 'a'), _answer_response(2, 'a')])
+
+        # When: 선택합니다.
+        # Then: 첫번째 정답 id 와 경로 None 을 반환합니다.
+        self.assertEqual(next_sheet_path_sampler.sample(), (1, None, None))
+
+
+class StoryTitleAutocompleteTestCase(TestCase):
+    def setUp(self):
+        self.story_title_autocomplete = StoryTitleAutocomplete([
+            (1, '모험 스토리', 3),
+            (2, '스토리 빌더', 5),
+            (3, 'Story  Builder', 1),
+            (4, '스토리', 5),
+        ])
+
+    def test_search_should_return_prefix_matches_ordered_by_like_count(self):
+        # Expect: 제목 또는 제목의 단어가 prefix 로 시작하는 Story 를 like_count, id 내림차순으로 반환
+        self.assertEqual(
+            self.story_title_autocomplete.search('스토', 10),
+            [(4, '스토리'), (2, '스토리 빌더'), (1, '모험 스토리')],
+        )
+        # And: limit 개만 반환
+        self.assertEqual(self.story_title_autocomplete.search('스토', 1), [(4, '스토리')])
+        # And: 대소문자, 연속 공백을 무시
+        self.assertEqual(self.story_title_autocomplete.search('story b', 10), [(3, 'Story  Builder')])
+        # And: 일치하지 않거나 빈 prefix 는 빈 목록
+        self.assertEqual(self.story_title_autocomplete.search('없음', 10), [])
+        self.assertEqual(self.story_title_autocomplete.search(' ', 10), [])
+
+    def test_upsert_and_remove_should_update_keys(self):
+        # When: 1번 제목을 바꾸고, 4번을 제거합니다.
+        self.story_title_autocomplete.upsert(1, '빌더 모험', 10)
+        self.story_title_autocomplete.remove(4)
+
+        # Then: 바뀐 제목으로 검색됩니다.
+        self.assertEqual(self.story_title_autocomplete.search('스토', 10), [(2, '스토리 빌더')])
+        self.assertEqual(self.story_title_autocomplete.search('빌더', 10), [(1, '빌더 모험'), (2, '스토리 빌더')])
+        self.assertEqual(len(self.story_title_autocomplete), 3)
+
+    def test_search_short_prefix_should_use_precomputed_top_story_ids(self):
+        # Given: 짧은 prefix 는 상위 2개만 미리 계산합니다.
+        story_title_autocomplete = StoryTitleAutocomplete(
+            [(1, '스토리1', 1), (2, '스토리2', 2), (3, '스토리3', 3)],
+            top_size=2,
+            top_prefix_length=2,
+        )
+        self.assertEqual(story_title_autocomplete.top_story_ids_by_prefix['스토'], [3, 2])
+
+        # When: 3번을 제거하고, 1번 좋아요가 늘어납니다.
+        story_title_autocomplete.remove(3)
+        story_title_autocomplete.upsert(1, '스토리1', 10)
+
+        # Then: key 를 scan 하지 않고 다시 계산된 상위 Story 를 반환합니다.
+        with patch.object(story_title_autocomplete, '_scan_story_ids') as mock_scan_story_ids:
+            self.assertEqual(story_title_autocomplete.search('스토', 2), [(1, '스토리1'), (2, '스토리2')])
+        mock_scan_story_ids.assert_not_called()
+
+    def test_search_long_prefix_should_limit_prefix_length_and_scan_budget(self):
+        # Given: 검색어는 5글자, key 는 2개까지만 확인합니다.
+        story_title_autocomplete = StoryTitleAutocomplete(
+            [(1, '스토리 빌더1', 1), (2, '스토리 빌더2', 2), (3, '스토리 빌더3', 3)],
+            max_prefix_length=5,
+            scan_budget=2,
+        )
+
+        # Expect: 5글자 뒤의 검색어는 무시하고, 앞에서부터 2개의 key 중 상위 Story 를 반환합니다.
+        self.assertEqual(story_title_autocomplete.search('스토리 빌더9', 10), [(2, '스토리 빌더2'), (1, '스토리 빌더1')])
@@ -1,6 +1,8 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
 
 from account.models import User
+from config.test_helper.helper import LOCMEM_CACHES
 from story.models import Story, PopularStory
 
 
@@ -79,6 +81,41 @@ class TestStoryManager(TestCase):
         self.assertIn(self.story1, active_stories)
         self.assertNotIn(self.story3, active_stories)
 
+    @override_settings(CACHES=LOCMEM_CACHES)
+    def test_get_actives_secret_story_ids_cache(self):
+        # Given: user2 가 멤버인 비밀 Story
+        cache.clear()
+        story = Story.objects.create(
+            author=self.user1,
+            title='Secret Story',
+            is_secret=True,
+        )
+        story.secret_members.add(self.user2)
+
+        # When: 비밀 Story id 목록이 캐시된 후 조회
+        self.assertIn(story, Story.objects.get_actives(user=self.user2))
+        with self.assertNumQueries(1) as context:
+            active_stories = list(Story.objects.get_actives(user=self.user2))
+
+        # Then: row 마다 멤버 여부를 확인하는 subquery 없이 한번의 query 로 조회
+        self.assertIn(story, active_stories)
+        self.assertNotIn('EXISTS', context.captured_queries[0]['sql'].upper())
+
+        # When: secret_members 에서 제거
+        story.secret_members.remove(self.user2)
+        # Then: 캐시가 무효화 되어 조회되지 않음
+        self.assertNotIn(story, Story.objects.get_actives(user=self.user2))
+
+        # When: 역방향으로 추가
+        self.user2.secret_stories.add(story)
+        # Then:
+        self.assertIn(story, Story.objects.get_actives(user=self.user2))
+
+        # When: secret_members 전체 삭제
+        story.secret_members.clear()
+        # Then:
+        self.assertNotIn(story, Story.objects.get_actives(user=self.user2))
+
 
 class TestPopularStoryManager(TestCase):
     def setUp(self):
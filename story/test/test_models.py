@@ -1,13 +1,16 @@
 from datetime import datetime
 
 from django.contrib.auth.models import AnonymousUser
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
 from unittest.mock import patch
 from freezegun import freeze_time
 
 from account.models import User
+from config.test_helper.helper import LOCMEM_CACHES
+from story.constants import StorySearchField
 from story.models import Sheet, Story, SheetAnswer, NextSheetPath, UserSheetAnswerSolve, UserStorySolve, \
-    StoryEmailSubscription, StoryLike, StorySlackSubscription
+    StoryEmailSubscription, StoryLike, StorySlackSubscription, SheetWrongAnswerCount, WrongAnswer, StorySearchToken
 
 
 class UserSheetAnswerSolveTestCase(TestCase):
@@ -64,36 +67,8 @@ class UserSheetAnswerSolveTestCase(TestCase):
         )
 
     @freeze_time('2022-05-31')
-    def test_solved_sheet_action(self):
-        # Given: 해결하지 못한 UserSheetAnswerSolve 생성
-        user_sheet_answer_solve = UserSheetAnswerSolve.objects.create(
-            user=self.user,
-            story=self.story,
-            sheet=self.start_sheet,
-            solved_sheet_version=1,
-            solved_answer_version=1,
-            solving_status=UserSheetAnswerSolve.SOLVING_STATUS_CHOICES[0][0],
-        )
-
-        # When: solved_sheet_action 실행
-        user_sheet_answer_solve.solved_sheet_action(
-            solved_sheet_answer=self.start_sheet_answer1,
-            next_sheet_path=self.next_sheet_path,
-        )
-
-        # Then:
-        self.assertEqual(user_sheet_answer_solve.solving_status, UserSheetAnswerSolve.SOLVING_STATUS_CHOICES[1][0])
-        self.assertEqual(user_sheet_answer_solve.solved_time, datetime.now())
-        self.assertEqual(user_sheet_answer_solve.answer, self.start_sheet_answer1.answer)
-        self.assertEqual(user_sheet_answer_solve.sheet_question, self.start_sheet.question)
-        self.assertEqual(user_sheet_answer_solve.solved_sheet_version, self.start_sheet.version)
-        self.assertEqual(user_sheet_answer_solve.solved_answer_version, self.start_sheet_answer1.version)
-        self.assertEqual(user_sheet_answer_solve.next_sheet_path, self.next_sheet_path)
-        self.assertEqual(user_sheet_answer_solve.solved_sheet_answer, self.start_sheet_answer1)
-
-    @freeze_time('2022-05-31')
-    @patch('story.models.send_user_sheet_solved_email.apply_async')
-    def test_solved_sheet_action_when_success_then_send_user_sheet_solved_email(self, mock_send_user_sheet_solved_email):
+    @patch('story.models.send_user_sheet_solved_notifications.apply_async')
+    def test_notify_solved_sheet_should_enqueue_when_email_subscription_exists(self, mock_send_user_sheet_solved_notifications):
         # Given: 해결하지 못한 UserSheetAnswerSolve 생성
         user_sheet_answer_solve = UserSheetAnswerSolve.objects.create(
             user=self.user,
@@ -110,18 +85,16 @@ class UserSheetAnswerSolveTestCase(TestCase):
             email='cwadven@kakao.com',
         )
 
-        # When: solved_sheet_action 실행
-        user_sheet_answer_solve.solved_sheet_action(
-            solved_sheet_answer=self.start_sheet_answer1,
-            next_sheet_path=self.next_sheet_path,
-        )
+        # When: notify_solved_sheet 실행 후 commit 합니다.
+        with self.captureOnCommitCallbacks(execute=True):
+            user_sheet_answer_solve.notify_solved_sheet()
 
-        # Then: 호출이 됐는지 확인
-        mock_send_user_sheet_solved_email.assert_called_once()
+        # Then: 알림 task 를 한번 enqueue 합니다.
+        mock_send_user_sheet_solved_notifications.assert_called_once_with((user_sheet_answer_solve.id,))
 
     @freeze_time('2022-05-31')
-    @patch('story.models.notify_slack')
-    def test_solved_sheet_action_when_success_then_send_user_sheet_solved_slack_web_hook(self, mock_notify_slack):
+    @patch('story.models.send_user_sheet_solved_notifications.apply_async')
+    def test_notify_solved_sheet_should_enqueue_when_slack_subscription_exists(self, mock_send_user_sheet_solved_notifications):
         # Given: 해결하지 못한 UserSheetAnswerSolve 생성
         user_sheet_answer_solve = UserSheetAnswerSolve.objects.create(
             user=self.user,
@@ -139,14 +112,29 @@ class UserSheetAnswerSolveTestCase(TestCase):
             slack_channel_description='test',
         )
 
-        # When: solved_sheet_action 실행
-        user_sheet_answer_solve.solved_sheet_action(
-            solved_sheet_answer=self.start_sheet_answer1,
-            next_sheet_path=self.next_sheet_path,
+        # When: notify_solved_sheet 실행 후 commit 합니다.
+        with self.captureOnCommitCallbacks(execute=True):
+            user_sheet_answer_solve.notify_solved_sheet()
+
+        # Then: 알림 task 를 한번 enqueue 합니다.
+        mock_send_user_sheet_solved_notifications.assert_called_once_with((user_sheet_answer_solve.id,))
+
+    @freeze_time('2022-05-31')
+    @patch('story.models.send_user_sheet_solved_notifications.apply_async')
+    def test_notify_solved_sheet_should_not_enqueue_when_nobody_is_watching(self, mock_send_user_sheet_solved_notifications):
+        # Given: 관전 구독이 없는 UserSheetAnswerSolve 생성
+        user_sheet_answer_solve = UserSheetAnswerSolve.objects.create(
+            user=self.user,
+            story=self.story,
+            sheet=self.start_sheet,
+            solving_status=UserSheetAnswerSolve.SOLVING_STATUS_CHOICES[0][0],
         )
 
-        # Then: 호출이 됐는지 확인
-        mock_notify_slack.assert_called_once()
+        # When: notify_solved_sheet 실행
+        user_sheet_answer_solve.notify_solved_sheet()
+
+        # Then: 알림 task 를 enqueue 하지 않습니다.
+        mock_send_user_sheet_solved_notifications.assert_not_called()
 
     @freeze_time('2022-05-31')
     def test_generate_cls_if_first_time_should_create_user_sheet_answer_solve_when_not_exists(self):
@@ -205,92 +193,6 @@ class UserSheetAnswerSolveTestCase(TestCase):
         self.assertIsNone(user_sheet_answer_solve)
         self.assertIsNone(is_created)
 
-    def test_get_solved_previous_sheet_with_current_sheet_id(self):
-        # Given: UserStorySolve 생성
-        UserStorySolve.objects.create(
-            story=self.story,
-            user=self.user,
-        )
-        # And: start_sheet generate_cls_if_first_time 실행으로 문제를 해결하기 위한 UserSheetAnswerSolve 생성
-        user_sheet_answer_solve, _ = UserSheetAnswerSolve.generate_cls_if_first_time(
-            self.user,
-            self.start_sheet.id,
-        )
-        # And: solved_sheet_action 실행
-        user_sheet_answer_solve.solved_sheet_action(
-            solved_sheet_answer=self.start_sheet_answer1,
-            next_sheet_path=self.next_sheet_path,
-        )
-        # And: final Sheet로 generate_cls_if_first_time 생성
-        UserSheetAnswerSolve.generate_cls_if_first_time(
-            self.user,
-            self.final_sheet1.id,
-        )
-
-        # When: solved_sheet_action 실행
-        previous_user_sheet_answer_solves = UserSheetAnswerSolve.get_previous_user_sheet_answer_solves_with_current_sheet_id(
-            user_id=self.user.id,
-            current_sheet_id=self.final_sheet1.id,
-        )
-
-        # Then: 이전에 푼 start_sheet 조회
-        self.assertEqual(previous_user_sheet_answer_solves[0]['sheet_id'], self.start_sheet.id)
-
-    def test_get_solved_previous_sheet_with_current_sheet_id_should_return_none_due_to_solved_sheet_deleted(self):
-        # Given: UserStorySolve 생성
-        UserStorySolve.objects.create(
-            story=self.story,
-            user=self.user,
-        )
-        # And: start_sheet generate_cls_if_first_time 실행으로 문제를 해결하기 위한 UserSheetAnswerSolve 생성
-        user_sheet_answer_solve, _ = UserSheetAnswerSolve.generate_cls_if_first_time(
-            self.user,
-            self.start_sheet.id,
-        )
-        # And: solved_sheet_action 실행
-        user_sheet_answer_solve.solved_sheet_action(
-            solved_sheet_answer=self.start_sheet_answer1,
-            next_sheet_path=self.next_sheet_path,
-        )
-        # And: start_sheet 제거
-        self.start_sheet.is_deleted = True
-        self.start_sheet.save()
-        # And: final Sheet로 generate_cls_if_first_time 생성
-        UserSheetAnswerSolve.generate_cls_if_first_time(
-            self.user,
-            self.final_sheet1.id,
-        )
-
-        # When: solved_sheet_action 실행
-        previous_user_sheet_answer_solves = UserSheetAnswerSolve.get_previous_user_sheet_answer_solves_with_current_sheet_id(
-            user_id=self.user.id,
-            current_sheet_id=self.final_sheet1.id,
-        )
-
-        # Then: start_sheet 제거돼서 안보임
-        self.assertEqual(list(previous_user_sheet_answer_solves), [])
-
-    def test_get_solved_previous_sheet_with_current_sheet_id_should_return_none_due_to_not_exists(self):
-        # Given: UserStorySolve 생성
-        UserStorySolve.objects.create(
-            story=self.story,
-            user=self.user,
-        )
-        # And: start_sheet generate_cls_if_first_time 실행으로 문제를 해결하기 위한 UserSheetAnswerSolve 생성
-        user_sheet_answer_solve, _ = UserSheetAnswerSolve.generate_cls_if_first_time(
-            self.user,
-            self.start_sheet.id,
-        )
-
-        # When: solved_sheet_action 실행
-        previous_user_sheet_answer_solves = UserSheetAnswerSolve.get_previous_user_sheet_answer_solves_with_current_sheet_id(
-            user_id=self.user.id,
-            current_sheet_id=self.start_sheet.id,
-        )
-
-        # Then: start_sheet 에서 시작해서 이전에 푼 문제 자체가 없어서 None 반환
-        self.assertEqual(list(previous_user_sheet_answer_solves), [])
-
 
 class StoryEmailSubscriptionMethodTestCase(TestCase):
     def setUp(self):
@@ -318,6 +220,69 @@ class StoryEmailSubscriptionMethodTestCase(TestCase):
         self.assertTrue(StoryEmailSubscription.has_respondent_user(self.story.id, self.user.id))
 
 
+@override_settings(CACHES=LOCMEM_CACHES)
+class StoryRespondentUserIdsCacheTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.all()[0]
+        self.story = Story.objects.create(
+            author=self.user,
+            title='test_story',
+            description='test_description',
+        )
+
+    def test_has_respondent_user_should_not_query_when_cached(self):
+        # Given: 관전 구독이 없는 Story 의 respondent_user id 목록이 캐시되어 있습니다.
+        self.assertFalse(StoryEmailSubscription.has_respondent_user(self.story.id, self.user.id))
+
+        # When: 다시 관전 여부를 확인합니다.
+        # Then: DB 조회 없이 False 를 반환합니다.
+        with self.assertNumQueries(0):
+            self.assertFalse(StoryEmailSubscription.has_respondent_user(self.story.id, self.user.id))
+
+    def test_has_respondent_user_should_be_invalidated_when_subscription_created_or_deleted(self):
+        # Given: 관전 구독이 없는 상태로 캐시되어 있습니다.
+        self.assertFalse(StorySlackSubscription.has_respondent_user(self.story.id, self.user.id))
+
+        # When: 구독을 생성합니다.
+        story_slack_subscription = StorySlackSubscription.objects.create(
+            story_id=self.story.id,
+            respondent_user_id=self.user.id,
+            slack_webhook_url='test_slack',
+            slack_channel_description='test_slack',
+        )
+        # Then: 캐시가 무효화 되어 True 를 반환합니다.
+        self.assertTrue(StorySlackSubscription.has_respondent_user(self.story.id, self.user.id))
+
+        # When: 구독을 삭제합니다.
+        story_slack_subscription.delete()
+        # Then: 캐시가 무효화 되어 False 를 반환합니다.
+        self.assertFalse(StorySlackSubscription.has_respondent_user(self.story.id, self.user.id))
+
+    def test_has_respondent_user_should_be_invalidated_when_subscription_story_changed(self):
+        # Given: 다른 Story 의 구독이 캐시되어 있습니다.
+        other_story = Story.objects.create(
+            author=self.user,
+            title='other_story',
+            description='test_description',
+        )
+        story_email_subscription = StoryEmailSubscription.objects.create(
+            story_id=other_story.id,
+            respondent_user_id=self.user.id,
+            email='test@test.com',
+        )
+        self.assertTrue(StoryEmailSubscription.has_respondent_user(other_story.id, self.user.id))
+        self.assertFalse(StoryEmailSubscription.has_respondent_user(self.story.id, self.user.id))
+
+        # When: 구독의 Story 를 변경합니다.
+        story_email_subscription.story_id = self.story.id
+        story_email_subscription.save()
+
+        # Then: 이전/변경된 Story 모두 캐시가 무효화 됩니다.
+        self.assertFalse(StoryEmailSubscription.has_respondent_user(other_story.id, self.user.id))
+        self.assertTrue(StoryEmailSubscription.has_respondent_user(self.story.id, self.user.id))
+
+
 class StorySlackSubscriptionMethodTestCase(TestCase):
     def setUp(self):
         self.user = User.objects.all()[0]
@@ -412,3 +377,193 @@ class TestIsUserHasActiveStoryLike(TestCase):
 
         # Then: True 반환
         self.assertTrue(result)
+
+
+class SheetWrongAnswerCountMethodTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.all()[0]
+        self.story = Story.objects.create(
+            author=self.user,
+            title='test_story',
+            description='test_description',
+        )
+        self.sheet = Sheet.objects.create(
+            story=self.story,
+            title='test_title',
+            question='test_question',
+            is_start=True,
+        )
+
+    def create_wrong_answer(self, answer, created_at):
+        return WrongAnswer(
+            user=self.user,
+            story=self.story,
+            sheet=self.sheet,
+            answer=answer,
+            created_at=created_at,
+        )
+
+    def test_increase_counts_should_group_by_normalized_answer(self):
+        # Given: 정규화하면 같은 오답 3개와 다른 오답 1개
+        wrong_answers = [
+            self.create_wrong_answer('Wrong Answer', datetime(2022, 1, 2)),
+            self.create_wrong_answer('wronganswer', datetime(2022, 1, 1)),
+            self.create_wrong_answer(' WRONG answer ', datetime(2022, 1, 3)),
+            self.create_wrong_answer('other', datetime(2022, 1, 1)),
+        ]
+
+        # When: 집계합니다.
+        SheetWrongAnswerCount.increase_counts(wrong_answers)
+
+        # Then: 정규화된 답 별로 집계됩니다.
+        sheet_wrong_answer_count = SheetWrongAnswerCount.objects.get(sheet=self.sheet, normalized_answer='wronganswer')
+        self.assertEqual(sheet_wrong_answer_count.count, 3)
+        self.assertEqual(sheet_wrong_answer_count.first_seen, datetime(2022, 1, 1))
+        self.assertEqual(sheet_wrong_answer_count.last_seen, datetime(2022, 1, 3))
+        self.assertEqual(SheetWrongAnswerCount.objects.get(sheet=self.sheet, normalized_answer='other').count, 1)
+
+    def test_increase_counts_should_increase_existing_count(self):
+        # Given: 이미 집계된 오답
+        SheetWrongAnswerCount.increase_counts([self.create_wrong_answer('wrong', datetime(2022, 1, 2))])
+
+        # When: 이전/이후 시간의 같은 오답을 집계합니다.
+        SheetWrongAnswerCount.increase_counts([
+            self.create_wrong_answer('wrong', datetime(2022, 1, 1)),
+            self.create_wrong_answer('wrong', datetime(2022, 1, 5)),
+        ])
+
+        # Then: 하나의 row 에 증가되고, 처음/마지막 제출 시간이 갱신됩니다.
+        sheet_wrong_answer_count = SheetWrongAnswerCount.objects.get(sheet=self.sheet)
+        self.assertEqual(sheet_wrong_answer_count.count, 3)
+        self.assertEqual(sheet_wrong_answer_count.first_seen, datetime(2022, 1, 1))
+        self.assertEqual(sheet_wrong_answer_count.last_seen, datetime(2022, 1, 5))
+
+
+class UserStorySolveSheetPathTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.all()[0]
+        self.story = Story.objects.create(
+            author=self.user,
+            title='test_story',
+            description='test_description',
+        )
+        UserStorySolve.objects.create(
+            user=self.user,
+            story=self.story,
+        )
+
+    def test_append_sheet_path(self):
+        # When: 해결한 경로를 순서대로 추가합니다.
+        UserStorySolve.append_sheet_path(self.user.id, self.story.id, 1, 2)
+        UserStorySolve.append_sheet_path(self.user.id, self.story.id, 2, None)
+
+        # Then: 해결한 순서대로 (sheet_id, next_sheet_id) 목록을 반환합니다.
+        self.assertEqual(UserStorySolve.objects.get(user=self.user, story=self.story).sheet_path, '1>2,2>,')
+        self.assertEqual(UserStorySolve.get_sheet_path(self.user.id, self.story.id), [(1, 2), (2, None)])
+
+    def test_replace_sheet_path_should_replace_edge_of_same_sheet(self):
+        # Given: 해결한 경로
+        UserStorySolve.append_sheet_path(self.user.id, self.story.id, 3, 4)
+        UserStorySolve.append_sheet_path(self.user.id, self.story.id, 13, 4)
+        UserStorySolve.append_sheet_path(self.user.id, self.story.id, 4, None)
+
+        # When: 3번 Sheet 를 다시 해결하여 다음 Sheet 가 5번으로 바뀝니다.
+        UserStorySolve.replace_sheet_path(self.user.id, self.story.id, 3, 5)
+
+        # Then: 3번 Sheet 의 이전 간선은 지우고 뒤에 이어 붙입니다.
+        self.assertEqual(UserStorySolve.get_sheet_path(self.user.id, self.story.id), [(13, 4), (4, None), (3, 5)])
+
+    def test_reset_sheet_path(self):
+        # Given: 해결한 경로
+        UserStorySolve.append_sheet_path(self.user.id, self.story.id, 1, 2)
+
+        # When: 초기화 합니다.
+        UserStorySolve.reset_sheet_path(self.user.id, self.story.id)
+
+        # Then: 빈 경로
+        self.assertEqual(UserStorySolve.get_sheet_path(self.user.id, self.story.id), [])
+
+    def test_get_sheet_path_should_return_empty_list_when_user_story_solve_not_exists(self):
+        # Expect: UserStorySolve 가 없으면 빈 경로
+        self.assertEqual(UserStorySolve.get_sheet_path(self.user.id, 0), [])
+
+
+class StorySearchTokenTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='search_author', password='secret', email='search_author@test.com')
+        self.user.nickname = '작가'
+        self.user.save()
+        self.story = Story.objects.create(
+            author=self.user,
+            title='스토리 빌더',
+            description='설명',
+        )
+
+    def search(self, search: str, fields=None):
+        return list(
+            Story.objects.filter(
+                StorySearchToken.get_search_filter(search, fields or list(StorySearchField)),
+            ).order_by('id')
+        )
+
+    def test_story_should_be_indexed_on_save(self):
+        # Expect: Story 생성 시 제목, 설명, 작성자 닉네임이 색인됩니다.
+        self.assertEqual(
+            set(StorySearchToken.objects.filter(story=self.story).values_list('field', 'token')),
+            {
+                ('title', token) for token in ['스', '토', '리', '빌', '더', '스토', '토리', '빌더']
+            } | {
+                ('description', token) for token in ['설', '명', '설명']
+            } | {
+                ('author', token) for token in ['작', '가', '작가']
+            },
+        )
+
+        # When: 제목을 바꿉니다.
+        self.story.title = '모험'
+        self.story.save()
+
+        # Then: 바뀐 제목으로 다시 색인됩니다.
+        self.assertEqual(self.search('모험'), [self.story])
+        self.assertEqual(self.search('스토리'), [])
+
+    def test_get_search_filter_should_match_substring_only(self):
+        # Given: 검색어의 bigram 이 모두 있지만 연속되지 않은 Story
+        other_story = Story.objects.create(title='리스토 토리', description='')
+
+        # Expect: 부분 문자열이 일치하는 Story 만 조회합니다.
+        self.assertEqual(self.search('스토리'), [self.story])
+        self.assertEqual(self.search('토리'), [self.story, other_story])
+        # And: 1글자 검색어도 색인으로 조회합니다.
+        self.assertEqual(self.search('빌'), [self.story])
+        # And: 필드를 지정하면 해당 필드에서만 찾습니다.
+        self.assertEqual(self.search('작가', [StorySearchField.TITLE]), [])
+        self.assertEqual(self.search('작가', [StorySearchField.AUTHOR]), [self.story])
+
+    def test_author_nickname_change_should_reindex_stories(self):
+        # When: 작성자 닉네임을 바꿉니다.
+        self.user.nickname = '이야기꾼'
+        self.user.save()
+
+        # Then: 작성한 Story 가 바뀐 닉네임으로 다시 색인됩니다.
+        self.assertEqual(self.search('이야기', [StorySearchField.AUTHOR]), [self.story])
+        self.assertEqual(self.search('작가', [StorySearchField.AUTHOR]), [])
+
+    def test_get_search_score_should_weight_title_over_description(self):
+        # Given: 설명에만 검색어가 있는 Story
+        description_story = Story.objects.create(title='모험', description='스토리 스토리')
+
+        # When: 검색 관련도를 annotate 합니다.
+        scores = dict(
+            Story.objects.filter(
+                id__in=[self.story.id, description_story.id],
+            ).annotate(
+                search_score=StorySearchToken.get_search_score('스토리', list(StorySearchField)),
+            ).values_list(
+                'id',
+                'search_score',
+            )
+        )
+
+        # Then: 토큰 등장 횟수 * 가중치의 합 (제목 3, 설명 1)
+        self.assertEqual(scores, {self.story.id: 6, description_story.id: 4})
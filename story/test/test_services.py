@@ -1,21 +1,39 @@
+import json
 from datetime import datetime
-from django.test import TestCase
+from unittest.mock import patch
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.db import DatabaseError, connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from freezegun import freeze_time
 
 from account.models import User
 from config.common.exception_codes import StartingSheetDoesNotExists, SheetDoesNotExists, SheetNotAccessibleException, \
-    StoryDoesNotExists
-from config.test_helper.helper import LoginMixin
+    StoryDoesNotExists, SheetAlreadySolvedException, PopularStoryWindowInvalidException
+from config.test_helper.helper import LoginMixin, LOCMEM_CACHES
+from story.buffers import LocalListBuffer, WrongAnswerBuffer
+from common_library import clear_local_entity_caches, handle_entity_cache_invalidation_message, \
+    increase_cache_version_by_key
+from story.constants import DEFAULT_POPULAR_KILL_SWITCH_STORY_COUNT, DEFAULT_POPULAR_STORY_WINDOW, POPULAR_STORY_CACHE_VERSION_KEY, POPULAR_STORY_LIST_CACHE_KEY, \
+    STORY_TITLE_AUTOCOMPLETE_VERSION_KEY
+from story.dtos import PlayingSheetInfoDTO, PreviousSheetInfoDTO, StoryListItemDTO
+from story.entity_caches import sheet_entity_cache
+from story.helpers import SheetAnswerMatcher
 from story.models import Story, Sheet, SheetAnswer, NextSheetPath, UserSheetAnswerSolve, UserStorySolve, \
-    StoryEmailSubscription, StoryLike, PopularStory, StorySlackSubscription, UserSheetAnswerSolveHistory
+    StoryEmailSubscription, StoryLike, PopularStory, StorySlackSubscription, UserSheetAnswerSolveHistory, WrongAnswer, \
+    SheetWrongAnswerCount
 from story.services import (
     get_running_start_sheet_by_story,
-    get_sheet_answers,
-    get_valid_answer_info_with_random_quantity,
-    get_sheet_answer_with_next_path_responses, get_running_sheet, validate_user_playing_sheet,
+    get_running_sheet, validate_user_playing_sheet,
     get_sheet_solved_user_sheet_answer, get_recent_played_sheet_by_story_id, get_story_email_subscription_emails,
-    create_story_like, update_story_total_like_count, delete_story_like, get_active_stories, get_active_story_by_id,
-    get_active_popular_stories, get_stories_order_by_fields, get_story_slack_subscription_slack_webhook_urls,
+    create_story_like, delete_story_like, increase_story_played_count, get_active_stories, get_active_story_by_id,
+    get_story_slack_subscription_slack_webhook_urls,
     reset_user_story_sheet_answer_solves, create_wrong_answer, get_user_sheet_answer_solve_histories,
+    get_sheet_answer_table, submit_sheet_answer, get_story_graph, get_previous_sheet_infos, get_sheet_path_infos,
+    get_popular_story_list_items, autocomplete_story_titles, increase_story_like_count, get_active_stories_by_cursor,
+    get_popular_story_list, get_kill_switch_popular_story_list,
 )
 
 
@@ -126,6 +144,154 @@ class GetSheetStoryTestCase(TestCase):
         self.assertEqual(sheet.id, self.story.sheet_set.all()[0].id)
 
 
+@override_settings(CACHES=LOCMEM_CACHES, ENTITY_CACHE_LOCAL_MAX_SIZE=100)
+class EntityCacheTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        clear_local_entity_caches()
+        self.user = User.objects.all()[0]
+        self.story = Story.objects.create(
+            author=self.user,
+            title='test_story',
+            description='test_description',
+        )
+        self.start_sheet = Sheet.objects.create(
+            story=self.story,
+            title='test_title',
+            question='test_question',
+            is_start=True,
+            is_final=False,
+        )
+
+    def tearDown(self):
+        clear_local_entity_caches()
+
+    def test_get_running_sheet_should_not_query_when_cached(self):
+        # Given: Sheet 와 Story 가 캐시되어 있습니다.
+        get_running_sheet(self.start_sheet.id)
+        get_running_start_sheet_by_story(self.story.id)
+
+        # When: 다시 조회합니다.
+        # Then: DB 를 조회하지 않습니다.
+        with self.assertNumQueries(0):
+            sheet = get_running_sheet(self.start_sheet.id)
+            start_sheet = get_running_start_sheet_by_story(self.story.id)
+            story = get_active_story_by_id(self.story.id)
+        self.assertEqual(sheet.id, self.start_sheet.id)
+        self.assertEqual(sheet.story.id, self.story.id)
+        self.assertEqual(start_sheet.id, self.start_sheet.id)
+        self.assertEqual(story.id, self.story.id)
+
+    def test_get_running_sheet_should_use_redis_cache_when_local_cache_is_cleared(self):
+        # Given: 다른 프로세스처럼 로컬 LRU 가 비어있고 캐시(Redis)에만 값이 있습니다.
+        get_running_sheet(self.start_sheet.id)
+        clear_local_entity_caches()
+
+        # When: 다시 조회합니다.
+        # Then: DB 를 조회하지 않습니다.
+        with self.assertNumQueries(0):
+            sheet = get_running_sheet(self.start_sheet.id)
+        self.assertEqual(sheet.id, self.start_sheet.id)
+
+    def test_get_running_sheet_should_fail_when_story_is_deleted_after_cached(self):
+        # Given: Sheet 와 Story 가 캐시된 후 Story 를 삭제합니다.
+        get_running_sheet(self.start_sheet.id)
+        self.story.is_deleted = True
+        self.story.save()
+
+        # When: get_running_sheet 요청
+        # Then: Sheet 조회 실패
+        with self.assertRaises(SheetDoesNotExists):
+            get_running_sheet(self.start_sheet.id)
+
+    def test_get_running_start_sheet_by_story_should_reload_when_start_sheet_is_changed(self):
+        # Given: 시작 Sheet 가 캐시된 후 다른 Sheet 를 시작 Sheet 로 바꿉니다.
+        get_running_start_sheet_by_story(self.story.id)
+        self.start_sheet.is_start = False
+        self.start_sheet.save()
+        new_start_sheet = Sheet.objects.create(
+            story=self.story,
+            title='new_start_sheet',
+            question='test_question',
+            is_start=True,
+            is_final=False,
+        )
+
+        # When: get_running_start_sheet_by_story 요청
+        start_sheet = get_running_start_sheet_by_story(self.story.id)
+
+        # Then: 바뀐 시작 Sheet 를 반환합니다.
+        self.assertEqual(start_sheet.id, new_start_sheet.id)
+
+    def test_get_active_story_by_id_should_reload_when_like_count_is_increased(self):
+        # Given: Story 가 캐시된 후 좋아요 수가 증가합니다.
+        get_active_story_by_id(self.story.id)
+        increase_story_like_count(self.story.id, 1)
+
+        # When: get_active_story_by_id 요청
+        story = get_active_story_by_id(self.story.id)
+
+        # Then: 증가한 좋아요 수를 반환합니다.
+        self.assertEqual(story.like_count, 1)
+
+    def test_get_active_story_by_id_should_return_copy(self):
+        # Given: Story 가 캐시되어 있습니다.
+        story = get_active_story_by_id(self.story.id)
+
+        # When: 반환된 객체를 수정합니다.
+        story.title = 'changed'
+
+        # Then: 캐시된 값은 바뀌지 않습니다.
+        self.assertEqual(get_active_story_by_id(self.story.id).title, 'test_story')
+
+    def test_get_active_story_by_id_should_check_secret_member(self):
+        # Given: 비밀 Story
+        self.story.is_secret = True
+        self.story.save()
+
+        # When: 멤버가 아닌 유저가 조회합니다.
+        # Then: Story 조회 실패
+        with self.assertRaises(StoryDoesNotExists):
+            get_active_story_by_id(self.story.id, user=self.user)
+
+        # When: Story 가 캐시된 후 멤버로 추가 후 조회합니다.
+        self.story.secret_members.add(self.user)
+        # Then: Story 조회 성공
+        self.assertEqual(get_active_story_by_id(self.story.id, user=self.user).id, self.story.id)
+
+    def test_invalidation_message_should_delete_local_cache(self):
+        # Given: 로컬 LRU 에 Sheet 가 캐시되어 있습니다.
+        get_running_sheet(self.start_sheet.id)
+        self.assertEqual(len(sheet_entity_cache.local_cache), 1)
+
+        # When: 다른 프로세스에서 발행한 무효화 메시지를 받습니다.
+        handle_entity_cache_invalidation_message(
+            json.dumps({'name': 'sheet', 'entity_ids': [self.start_sheet.id]}).encode()
+        )
+
+        # Then: 로컬 LRU 에서 지워집니다.
+        self.assertEqual(len(sheet_entity_cache.local_cache), 0)
+
+    @override_settings(ENTITY_CACHE_LOCAL_MAX_SIZE=1)
+    def test_local_cache_should_keep_max_size(self):
+        # Given: 두개의 Sheet
+        final_sheet = Sheet.objects.create(
+            story=self.story,
+            title='test_title',
+            question='test_question',
+            is_start=False,
+            is_final=True,
+        )
+
+        # When: 로컬 LRU 최대 개수보다 많이 조회합니다.
+        get_running_sheet(self.start_sheet.id)
+        get_running_sheet(final_sheet.id)
+
+        # Then: 최근 조회한 Sheet 만 남습니다.
+        self.assertEqual(len(sheet_entity_cache.local_cache), 1)
+        self.assertIsNotNone(sheet_entity_cache.local_cache.get(final_sheet.id))
+
+
 class GetSheetAnswerTestCase(TestCase):
     def setUp(self):
         self.user = User.objects.all()[0]
@@ -179,62 +345,7 @@ class GetSheetAnswerTestCase(TestCase):
             is_final=True,
         )
 
-    def test_get_sheet_answers(self):
-        # Given:
-        # When: Sheet의 정답을 가져옵니다.
-        answers = get_sheet_answers(self.start_sheet.id)
-
-        # Then: start_sheet_answer1 와 start_sheet_answer2 의 answer 값이 있습니다.
-        self.assertTrue(self.start_sheet_answer1.answer in answers)
-        self.assertTrue(self.start_sheet_answer2.answer in answers)
-
-    def test_get_sheet_answer_with_next_path_responses_should_success(self):
-        # Given: is_always_correct start_sheet_answer1 은 False, start_sheet_answer2 는 True 입니다.
-        self.start_sheet_answer1.is_always_correct = False
-        self.start_sheet_answer1.save()
-        self.start_sheet_answer2.is_always_correct = True
-        self.start_sheet_answer2.save()
-
-        # When: Sheet의 정답을 SheetAnswerResponse 형태로 가져옵니다.
-        sheet_answer_responses = get_sheet_answer_with_next_path_responses(self.start_sheet.id)
-
-        # When: Sheet의 정답을 SheetAnswerResponse 형태로 요청합니다.
-        self.assertEqual(sheet_answer_responses[0].id, self.start_sheet_answer1.id)
-        self.assertFalse(sheet_answer_responses[0].is_always_correct)
-        self.assertEqual(sheet_answer_responses[1].id, self.start_sheet_answer2.id)
-        self.assertTrue(sheet_answer_responses[1].is_always_correct)
-
-    def test_get_sheet_answer_with_next_path_responses_should_fail_when_sheet_is_deleted(self):
-        # Given: Sheet 가 삭제됐을 경우
-        self.start_sheet.is_deleted = True
-        self.start_sheet.save()
-
-        # When: Sheet의 정답을 SheetAnswerResponse 형태로 요청합니다.
-        # Then: Sheet 삭제되어서 Error 반환
-        with self.assertRaises(SheetDoesNotExists):
-            get_sheet_answer_with_next_path_responses(self.start_sheet.id)
-
-    def test_get_sheet_answer_with_next_path_responses_should_fail_when_story_is_deleted(self):
-        # Given:
-        self.start_sheet.story.is_deleted = True
-        self.start_sheet.story.save()
-
-        # When: Sheet의 정답을 SheetAnswerResponse 형태로 요청합니다.
-        # Then: Story 삭제되어서 Error 반환
-        with self.assertRaises(SheetDoesNotExists):
-            get_sheet_answer_with_next_path_responses(self.start_sheet.id)
-
-    def test_get_sheet_answer_with_next_path_responses_should_fail_when_story_not_displayable(self):
-        # Given:
-        self.start_sheet.story.displayable = False
-        self.start_sheet.story.save()
-
-        # When: Sheet의 정답을 SheetAnswerResponse 형태로 요청합니다.
-        # Then: Story 삭제되어서 Error 반환
-        with self.assertRaises(SheetDoesNotExists):
-            get_sheet_answer_with_next_path_responses(self.start_sheet.id)
-
-    def test_get_valid_answer_info_with_random_quantity_should_success_when_answer_is_valid(self):
+    def test_sheet_answer_matcher_get_valid_answer_info_should_success_when_answer_is_valid(self):
         # Given: SheetAnswer 에 final_sheet1 을 바라보는 NextSheetPath 를 추가합니다. quantity 10
         possible_next_sheet_path = NextSheetPath.objects.create(
             answer=self.start_sheet_answer1,
@@ -248,13 +359,10 @@ class GetSheetAnswerTestCase(TestCase):
             quantity=0,
         )
         # And: sheet answer response 를 가져옵니다.
-        sheet_answer_response = get_sheet_answer_with_next_path_responses(self.start_sheet.id)
+        sheet_answer_response = get_sheet_answer_table(self.start_sheet).answer_responses
 
         # When: 정답 및 랜덤 값들을 가져옵니다.
-        is_valid, sheet_answer_id, next_sheet_path_id, next_sheet_id = get_valid_answer_info_with_random_quantity(
-            answer=self.start_sheet_answer1.answer,
-            answer_responses=sheet_answer_response,
-        )
+        is_valid, sheet_answer_id, next_sheet_path_id, next_sheet_id = SheetAnswerMatcher(sheet_answer_response).get_valid_answer_info(self.start_sheet_answer1.answer)
 
         # Then: 정답이 맞습니다.
         self.assertTrue(is_valid)
@@ -266,7 +374,7 @@ class GetSheetAnswerTestCase(TestCase):
         # And: next_sheet_path id 를 가져옵니다
         self.assertEqual(next_sheet_path_id, possible_next_sheet_path.id)
 
-    def test_get_valid_answer_info_with_random_quantity_should_success_when_answer_is_valid_and_english_different_lower_case(self):
+    def test_sheet_answer_matcher_get_valid_answer_info_should_success_when_answer_is_valid_and_english_different_lower_case(self):
         # Given: SheetAnswer 에 final_sheet1 을 바라보는 NextSheetPath 를 추가합니다. quantity 10
         possible_next_sheet_path = NextSheetPath.objects.create(
             answer=self.start_sheet_answer1,
@@ -283,13 +391,10 @@ class GetSheetAnswerTestCase(TestCase):
             quantity=0,
         )
         # And: sheet answer response 를 가져옵니다.
-        sheet_answer_response = get_sheet_answer_with_next_path_responses(self.start_sheet.id)
+        sheet_answer_response = get_sheet_answer_table(self.start_sheet).answer_responses
 
         # When: 정답 및 랜덤 값들을 가져옵니다. (정답을 소문자로 설정)
-        is_valid, sheet_answer_id, next_sheet_path_id, next_sheet_id = get_valid_answer_info_with_random_quantity(
-            answer='test',
-            answer_responses=sheet_answer_response,
-        )
+        is_valid, sheet_answer_id, next_sheet_path_id, next_sheet_id = SheetAnswerMatcher(sheet_answer_response).get_valid_answer_info('test')
 
         # Then: 정답이 맞습니다.
         self.assertTrue(is_valid)
@@ -301,15 +406,12 @@ class GetSheetAnswerTestCase(TestCase):
         # And: next_sheet_path id 를 가져옵니다
         self.assertEqual(next_sheet_path_id, possible_next_sheet_path.id)
 
-    def test_get_valid_answer_info_with_random_quantity_should_success_when_answer_is_valid_but_next_path_is_not_exists(self):
+    def test_sheet_answer_matcher_get_valid_answer_info_should_success_when_answer_is_valid_but_next_path_is_not_exists(self):
         # Given: NextSheetPath 가 없는 sheet 문제를 해결했을 경우
-        sheet_answer_response = get_sheet_answer_with_next_path_responses(self.final_sheet1.id)
+        sheet_answer_response = get_sheet_answer_table(self.final_sheet1).answer_responses
 
         # When: 정답 및 랜덤 값들을 가져옵니다.
-        is_valid, sheet_answer_id, next_sheet_path_id, next_sheet_id = get_valid_answer_info_with_random_quantity(
-            answer=self.final_sheet1_answer1.answer,
-            answer_responses=sheet_answer_response,
-        )
+        is_valid, sheet_answer_id, next_sheet_path_id, next_sheet_id = SheetAnswerMatcher(sheet_answer_response).get_valid_answer_info(self.final_sheet1_answer1.answer)
 
         # Then: 정답이 맞습니다.
         self.assertTrue(is_valid)
@@ -320,7 +422,7 @@ class GetSheetAnswerTestCase(TestCase):
         # And: None 을 반환합니다.
         self.assertIsNone(next_sheet_path_id)
 
-    def test_get_valid_answer_info_with_random_quantity_should_fail_when_answer_is_invalid(self):
+    def test_sheet_answer_matcher_get_valid_answer_info_should_fail_when_answer_is_invalid(self):
         # Given: SheetAnswer 에 final_sheet1 을 바라보는 NextSheetPath 를 추가합니다. quantity 10
         NextSheetPath.objects.create(
             answer=self.start_sheet_answer1,
@@ -334,13 +436,10 @@ class GetSheetAnswerTestCase(TestCase):
             quantity=0,
         )
         # And: sheet answer response 를 가져옵니다.
-        sheet_answer_response = get_sheet_answer_with_next_path_responses(self.start_sheet.id)
+        sheet_answer_response = get_sheet_answer_table(self.start_sheet).answer_responses
 
         # When: 없는 정답으로 정답 및 랜덤 값들을 가져옵니다.
-        is_valid, sheet_answer_id, next_sheet_path_id, next_sheet_id = get_valid_answer_info_with_random_quantity(
-            answer='wrong_answer',
-            answer_responses=sheet_answer_response,
-        )
+        is_valid, sheet_answer_id, next_sheet_path_id, next_sheet_id = SheetAnswerMatcher(sheet_answer_response).get_valid_answer_info('wrong_answer')
 
         # Then: 정답이 틀렸습니다
         self.assertFalse(is_valid)
@@ -351,7 +450,7 @@ class GetSheetAnswerTestCase(TestCase):
         # And: 정답을 맞추지 못해 None 입니다.
         self.assertIsNone(next_sheet_path_id)
 
-    def test_get_valid_answer_info_with_random_quantity_should_success_when_always_correct_answer_sheet_exists(self):
+    def test_sheet_answer_matcher_get_valid_answer_info_should_success_when_always_correct_answer_sheet_exists(self):
         # Given: 항상 정답 처리되는 정답을 가진 sheet answer 를 만듭니다.
         self.start_sheet_answer1.is_always_correct = True
         self.start_sheet_answer1.save()
@@ -368,13 +467,10 @@ class GetSheetAnswerTestCase(TestCase):
             quantity=0,
         )
         # And: sheet answer response 를 가져옵니다.
-        sheet_answer_response = get_sheet_answer_with_next_path_responses(self.start_sheet.id)
+        sheet_answer_response = get_sheet_answer_table(self.start_sheet).answer_responses
 
         # When: 항상 정답인 것을 가져옵니다.
-        is_valid, sheet_answer_id, next_sheet_path_id, next_sheet_id = get_valid_answer_info_with_random_quantity(
-            answer='wrong_answer',
-            answer_responses=sheet_answer_response,
-        )
+        is_valid, sheet_answer_id, next_sheet_path_id, next_sheet_id = SheetAnswerMatcher(sheet_answer_response).get_valid_answer_info('wrong_answer')
 
         # Then: 정답이 맞습니다
         self.assertTrue(is_valid)
@@ -385,18 +481,15 @@ class GetSheetAnswerTestCase(TestCase):
         # And: next_sheet_path_id 를 가져옵니다
         self.assertEqual(next_sheet_path_id, next_sheet_path1.id)
 
-    def test_get_valid_answer_info_with_random_quantity_should_success_when_always_correct_answer_sheet_exists_but_not_have_next_path(self):
+    def test_sheet_answer_matcher_get_valid_answer_info_should_success_when_always_correct_answer_sheet_exists_but_not_have_next_path(self):
         # Given: 항상 정답 처리되는 정답을 가진 sheet answer 를 만듭니다.
         self.start_sheet_answer1.is_always_correct = True
         self.start_sheet_answer1.save()
         # And: sheet answer response 를 가져옵니다.
-        sheet_answer_response = get_sheet_answer_with_next_path_responses(self.start_sheet.id)
+        sheet_answer_response = get_sheet_answer_table(self.start_sheet).answer_responses
 
         # When: 항상 정답인 것을 가져옵니다.
-        is_valid, sheet_answer_id, next_sheet_path_id, next_sheet_id = get_valid_answer_info_with_random_quantity(
-            answer='wrong_answer',
-            answer_responses=sheet_answer_response,
-        )
+        is_valid, sheet_answer_id, next_sheet_path_id, next_sheet_id = SheetAnswerMatcher(sheet_answer_response).get_valid_answer_info('wrong_answer')
 
         # Then: 정답이 맞습니다
         self.assertTrue(is_valid)
@@ -408,6 +501,293 @@ class GetSheetAnswerTestCase(TestCase):
         self.assertIsNone(next_sheet_path_id)
 
 
+@override_settings(CACHES=LOCMEM_CACHES)
+class GetSheetAnswerTableTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.all()[0]
+        self.story = Story.objects.create(
+            author=self.user,
+            title='test_story',
+            description='test_description',
+        )
+        self.start_sheet = Sheet.objects.create(
+            story=self.story,
+            title='test_title',
+            question='test_question',
+            is_start=True,
+        )
+        self.final_sheet = Sheet.objects.create(
+            story=self.story,
+            title='test_title1',
+            question='test_question1',
+            is_final=True,
+        )
+        self.start_sheet_answer1 = SheetAnswer.objects.create(
+            sheet=self.start_sheet,
+            answer='test',
+            answer_reply='test_reply',
+        )
+        self.start_sheet_answer2 = SheetAnswer.objects.create(
+            sheet=self.start_sheet,
+            answer='test2',
+            answer_reply='test_reply2',
+        )
+        self.next_sheet_path1 = NextSheetPath.objects.create(
+            answer=self.start_sheet_answer1,
+            sheet=self.final_sheet,
+            quantity=10,
+        )
+        self.next_sheet_path2 = NextSheetPath.objects.create(
+            answer=self.start_sheet_answer2,
+            sheet=self.final_sheet,
+            quantity=3,
+        )
+
+    def test_get_sheet_answer_table_should_compile_one_response_per_next_sheet_path(self):
+        # Given: 두 정답이 같은 final_sheet 를 바라보고 있습니다.
+        # When: 정답 테이블을 가져옵니다.
+        sheet_answer_table = get_sheet_answer_table(self.start_sheet)
+
+        # Then: 정답 별 경로가 섞이지 않고 하나씩 컴파일 됩니다.
+        self.assertEqual(
+            [
+                (response.id, response.next_sheet_path_id, response.next_sheet_quantity)
+                for response in sheet_answer_table.answer_responses
+            ],
+            [
+                (self.start_sheet_answer1.id, self.next_sheet_path1.id, 10),
+                (self.start_sheet_answer2.id, self.next_sheet_path2.id, 3),
+            ]
+        )
+        self.assertEqual(sheet_answer_table.sheet_version, self.start_sheet.version)
+
+    def test_get_sheet_answer_table_should_not_query_when_cache_is_warm(self):
+        # Given: 정답 테이블이 캐시되어 있습니다.
+        get_sheet_answer_table(self.start_sheet)
+
+        # When: 다시 정답 테이블을 가져옵니다.
+        # Then: DB 조회가 없습니다.
+        with self.assertNumQueries(0):
+            sheet_answer_table = get_sheet_answer_table(self.start_sheet)
+        self.assertEqual(len(sheet_answer_table.answer_responses), 2)
+
+    def test_get_sheet_answer_table_should_recompile_when_sheet_answer_is_changed(self):
+        # Given: 정답 테이블이 캐시되어 있습니다.
+        get_sheet_answer_table(self.start_sheet)
+
+        # When: 정답이 추가됩니다.
+        new_sheet_answer = SheetAnswer.objects.create(
+            sheet=self.start_sheet,
+            answer='test3',
+        )
+
+        # Then: 새로운 정답이 포함된 테이블을 가져옵니다.
+        sheet_answer_table = get_sheet_answer_table(self.start_sheet)
+        self.assertIn(new_sheet_answer.id, [response.id for response in sheet_answer_table.answer_responses])
+
+    def test_get_sheet_answer_table_should_recompile_when_next_sheet_path_is_deleted(self):
+        # Given: 정답 테이블이 캐시되어 있습니다.
+        get_sheet_answer_table(self.start_sheet)
+
+        # When: 경로가 삭제됩니다.
+        deleted_next_sheet_path_id = self.next_sheet_path2.id
+        self.next_sheet_path2.delete()
+
+        # Then: 삭제된 경로는 테이블에 없습니다.
+        sheet_answer_table = get_sheet_answer_table(self.start_sheet)
+        self.assertNotIn(
+            deleted_next_sheet_path_id,
+            [response.next_sheet_path_id for response in sheet_answer_table.answer_responses]
+        )
+
+    def test_get_sheet_answer_table_should_recompile_when_sheet_version_is_different(self):
+        # Given: 정답 테이블이 캐시되어 있습니다.
+        get_sheet_answer_table(self.start_sheet)
+
+        # When: 캐시 무효화 없이 Sheet version 만 달라진 Sheet 로 요청합니다.
+        Sheet.objects.filter(id=self.start_sheet.id).update(version=1)
+        changed_sheet = Sheet.objects.get(id=self.start_sheet.id)
+
+        # Then: 변경된 version 으로 다시 컴파일 됩니다.
+        self.assertEqual(get_sheet_answer_table(changed_sheet).sheet_version, 1)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class SubmitSheetAnswerTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.all()[0]
+        self.story = Story.objects.create(
+            author=self.user,
+            title='test_story',
+            description='test_description',
+        )
+        self.start_sheet = Sheet.objects.create(
+            story=self.story,
+            title='test_title',
+            question='test_question',
+            is_start=True,
+        )
+        self.final_sheet = Sheet.objects.create(
+            story=self.story,
+            title='test_title1',
+            question='test_question1',
+            is_final=True,
+        )
+        self.start_sheet_answer = SheetAnswer.objects.create(
+            sheet=self.start_sheet,
+            answer='test answer',
+            answer_reply='test_reply',
+        )
+        self.next_sheet_path = NextSheetPath.objects.create(
+            answer=self.start_sheet_answer,
+            sheet=self.final_sheet,
+            quantity=10,
+        )
+        user_story_solve = UserStorySolve.objects.create(
+            story=self.story,
+            user=self.user,
+        )
+        self.user_sheet_answer_solve = UserSheetAnswerSolve.objects.create(
+            user=self.user,
+            story=self.story,
+            user_story_solve=user_story_solve,
+            sheet=self.start_sheet,
+        )
+
+    @freeze_time('2022-01-01')
+    def test_submit_sheet_answer_should_solve_when_answer_is_valid(self):
+        # Given: Sheet, 정답 테이블과 관전 구독 respondent_user id 목록이 캐시되어 있습니다.
+        get_running_sheet(self.start_sheet.id)
+        get_sheet_answer_table(self.start_sheet)
+        StoryEmailSubscription.get_respondent_user_ids(self.story.id)
+        StorySlackSubscription.get_respondent_user_ids(self.story.id)
+
+        # When: 정답을 제출합니다.
+        with CaptureQueriesContext(connection) as context:
+            result = submit_sheet_answer(self.user.id, self.start_sheet.id, 'TEST answer')
+
+        # Then: 조회는 UserSheetAnswerSolve 1번이고,
+        # UserSheetAnswerSolve update 와 UserStorySolve 경로 update 는 1개의 transaction(savepoint) 으로 저장합니다.
+        self.assertEqual(
+            [query['sql'].split()[0] for query in context.captured_queries],
+            ['SELECT', 'SAVEPOINT', 'UPDATE', 'UPDATE', 'RELEASE'],
+        )
+
+        # And: 다음 Sheet 와 정답 응답을 반환합니다.
+        self.assertTrue(result.is_valid)
+        self.assertEqual(result.next_sheet_id, self.final_sheet.id)
+        self.assertEqual(result.answer_reply, self.start_sheet_answer.answer_reply)
+        # And: 정답 Snapshot 이 저장됩니다.
+        user_sheet_answer_solve = UserSheetAnswerSolve.objects.get(id=self.user_sheet_answer_solve.id)
+        self.assertEqual(user_sheet_answer_solve.solving_status, UserSheetAnswerSolve.SOLVING_STATUS_CHOICES[1][0])
+        self.assertEqual(user_sheet_answer_solve.solved_time, datetime.now())
+        self.assertEqual(user_sheet_answer_solve.answer, self.start_sheet_answer.answer)
+        self.assertEqual(user_sheet_answer_solve.sheet_question, self.start_sheet.question)
+        self.assertEqual(user_sheet_answer_solve.solved_sheet_version, self.start_sheet.version)
+        self.assertEqual(user_sheet_answer_solve.solved_answer_version, self.start_sheet_answer.version)
+        self.assertEqual(user_sheet_answer_solve.solved_sheet_answer_id, self.start_sheet_answer.id)
+        self.assertEqual(user_sheet_answer_solve.next_sheet_path_id, self.next_sheet_path.id)
+        # And: 유저의 Story 경로에 추가됩니다.
+        self.assertEqual(
+            UserStorySolve.get_sheet_path(self.user.id, self.story.id),
+            [(self.start_sheet.id, self.final_sheet.id)],
+        )
+
+    def test_submit_sheet_answer_should_create_wrong_answer_when_answer_is_invalid(self):
+        # Given: Sheet 와 정답 테이블이 캐시되어 있고, 같은 오답 집계가 있습니다.
+        get_sheet_answer_table(self.start_sheet)
+        submit_sheet_answer(self.user.id, self.start_sheet.id, 'wrong')
+
+        # When: 오답을 제출합니다.
+        with CaptureQueriesContext(connection) as context:
+            result = submit_sheet_answer(self.user.id, self.start_sheet.id, 'wrong')
+
+        # Then: 조회는 UserSheetAnswerSolve 1번이고,
+        # WrongAnswer insert 와 오답 집계 update 는 1개의 transaction(savepoint) 으로 저장합니다.
+        self.assertEqual(
+            [query['sql'].split()[0] for query in context.captured_queries],
+            ['SELECT', 'SAVEPOINT', 'INSERT', 'UPDATE', 'RELEASE'],
+        )
+
+        # And: 오답입니다.
+        self.assertFalse(result.is_valid)
+        self.assertIsNone(result.next_sheet_id)
+        self.assertIsNone(result.answer_reply)
+        self.assertEqual(WrongAnswer.objects.filter(sheet=self.start_sheet, answer='wrong').count(), 2)
+        self.assertEqual(SheetWrongAnswerCount.objects.get(sheet=self.start_sheet, normalized_answer='wrong').count, 2)
+
+    def test_submit_sheet_answer_should_replace_sheet_path_when_solved_again_on_new_version(self):
+        # Given: 정답을 제출하여 final_sheet 으로 가는 경로가 저장되었습니다.
+        submit_sheet_answer(self.user.id, self.start_sheet.id, 'test answer')
+        # And: Sheet version 이 바뀌고, 정답의 다음 Sheet 가 new_sheet 으로 바뀝니다.
+        new_sheet = Sheet.objects.create(
+            story=self.story,
+            title='new_sheet',
+            question='test_question',
+            is_final=True,
+        )
+        self.next_sheet_path.delete()
+        NextSheetPath.objects.create(
+            answer=self.start_sheet_answer,
+            sheet=new_sheet,
+            quantity=10,
+        )
+        self.start_sheet.version += 1
+        self.start_sheet.save()
+
+        # When: 다시 정답을 제출합니다.
+        result = submit_sheet_answer(self.user.id, self.start_sheet.id, 'test answer')
+
+        # Then: 경로의 이전 간선이 새로운 다음 Sheet 로 바뀝니다.
+        self.assertEqual(result.next_sheet_id, new_sheet.id)
+        self.assertEqual(
+            UserStorySolve.get_sheet_path(self.user.id, self.story.id),
+            [(self.start_sheet.id, new_sheet.id)],
+        )
+
+    def test_submit_sheet_answer_should_rollback_solve_when_append_sheet_path_failed(self):
+        # When: 정답 저장 후 경로 추가가 실패합니다.
+        with patch.object(UserStorySolve, 'append_sheet_path', side_effect=DatabaseError('db error')):
+            with self.assertRaises(DatabaseError):
+                submit_sheet_answer(self.user.id, self.start_sheet.id, 'test answer')
+
+        # Then: 정답 Snapshot 도 저장되지 않습니다.
+        user_sheet_answer_solve = UserSheetAnswerSolve.objects.get(id=self.user_sheet_answer_solve.id)
+        self.assertNotEqual(user_sheet_answer_solve.solving_status, UserSheetAnswerSolve.SOLVING_STATUS_CHOICES[1][0])
+        self.assertIsNone(user_sheet_answer_solve.solved_sheet_answer_id)
+
+    def test_submit_sheet_answer_should_raise_error_when_already_solved(self):
+        # Given: 이미 정답을 제출했습니다.
+        submit_sheet_answer(self.user.id, self.start_sheet.id, 'test answer')
+
+        # When: 다시 정답을 제출합니다.
+        # Then: 이미 해결한 Sheet 에러를 반환합니다.
+        with self.assertRaises(SheetAlreadySolvedException):
+            submit_sheet_answer(self.user.id, self.start_sheet.id, 'test answer')
+
+    @patch('story.models.send_user_sheet_solved_notifications.apply_async')
+    def test_submit_sheet_answer_should_notify_when_respondent_user_has_subscription(self, mock_send_user_sheet_solved_notifications):
+        # Given: StoryEmailSubscription 생성
+        StoryEmailSubscription.objects.create(
+            story_id=self.story.id,
+            respondent_user_id=self.user.id,
+            email='test@test.com',
+        )
+
+        # When: 정답을 제출합니다.
+        with self.captureOnCommitCallbacks() as callbacks:
+            submit_sheet_answer(self.user.id, self.start_sheet.id, 'test answer')
+
+        # Then: commit 전에는 알림 task 를 enqueue 하지 않습니다.
+        mock_send_user_sheet_solved_notifications.assert_not_called()
+        # And: commit 후에 한번 enqueue 합니다.
+        for callback in callbacks:
+            callback()
+        mock_send_user_sheet_solved_notifications.assert_called_once()
+
+
 class ValidateUserPlayingSheetTestCase(LoginMixin, TestCase):
     def setUp(self):
         self.user = User.objects.all()[0]
@@ -508,6 +888,164 @@ class ValidateUserPlayingSheetTestCase(LoginMixin, TestCase):
             validate_user_playing_sheet(self.user.id, self.final_sheet1.id)
 
 
+@override_settings(CACHES=LOCMEM_CACHES)
+class GetStoryGraphTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.all()[0]
+        self.story = Story.objects.create(
+            author=self.user,
+            title='test_story',
+            description='test_description',
+        )
+        self.start_sheet = Sheet.objects.create(
+            story=self.story,
+            title='test_title',
+            question='test_question',
+            is_start=True,
+        )
+        self.final_sheet = Sheet.objects.create(
+            story=self.story,
+            title='test_title1',
+            question='test_question1',
+            is_final=True,
+        )
+        self.deleted_sheet = Sheet.objects.create(
+            story=self.story,
+            title='test_title2',
+            question='test_question2',
+            is_deleted=True,
+        )
+        self.start_sheet_answer = SheetAnswer.objects.create(
+            sheet=self.start_sheet,
+            answer='test',
+            answer_reply='test_reply',
+        )
+        self.next_sheet_path = NextSheetPath.objects.create(
+            answer=self.start_sheet_answer,
+            sheet=self.final_sheet,
+            quantity=1,
+        )
+        NextSheetPath.objects.create(
+            answer=self.start_sheet_answer,
+            sheet=self.deleted_sheet,
+            quantity=1,
+        )
+
+    def test_get_story_graph_should_compile_sheets_answers_and_paths(self):
+        # When: Story 그래프를 가져옵니다.
+        story_graph = get_story_graph(self.story.id)
+
+        # Then: 삭제되지 않은 Sheet 와 정답, 들어오는 경로가 컴파일 됩니다.
+        self.assertEqual(set(story_graph.sheet_by_id.keys()), {self.start_sheet.id, self.final_sheet.id})
+        self.assertTrue(story_graph.is_start_sheet(self.start_sheet.id))
+        self.assertFalse(story_graph.is_start_sheet(self.final_sheet.id))
+        self.assertTrue(story_graph.is_sheet_answer(self.start_sheet.id, 'test'))
+        self.assertEqual(story_graph.get_incoming_next_sheet_path_ids(self.final_sheet.id), {self.next_sheet_path.id})
+
+        # And: 캐시된 그래프는 DB 조회 없이 가져옵니다.
+        with self.assertNumQueries(0):
+            get_story_graph(self.story.id)
+
+    def test_validate_user_playing_sheet_should_only_query_user_progress_when_graph_cached(self):
+        # Given: final_sheet 으로 가는 문제를 해결했고, Story 그래프가 캐시되어 있습니다.
+        UserSheetAnswerSolve.objects.create(
+            user=self.user,
+            story=self.story,
+            sheet=self.start_sheet,
+            next_sheet_path=self.next_sheet_path,
+            solving_status='solved',
+            answer='test',
+        )
+        story_graph = get_story_graph(self.story.id)
+
+        # Expected: 시작 Sheet 는 DB 조회 없이, 다음 Sheet 는 유저 진행 상황 한번 조회로 검증합니다.
+        with self.assertNumQueries(0):
+            validate_user_playing_sheet(self.user.id, self.start_sheet.id, story_graph)
+        with self.assertNumQueries(1):
+            validate_user_playing_sheet(self.user.id, self.final_sheet.id, story_graph)
+
+    def test_get_story_graph_should_be_invalidated_when_answer_changed(self):
+        # Given: final_sheet 으로 가는 문제를 해결했고, Story 그래프가 캐시되어 있습니다.
+        UserSheetAnswerSolve.objects.create(
+            user=self.user,
+            story=self.story,
+            sheet=self.start_sheet,
+            next_sheet_path=self.next_sheet_path,
+            solving_status='solved',
+            answer='test',
+        )
+        validate_user_playing_sheet(self.user.id, self.final_sheet.id, get_story_graph(self.story.id))
+
+        # When: 정답이 변경됩니다.
+        self.start_sheet_answer.answer = 'change'
+        self.start_sheet_answer.save()
+
+        # Then: 다시 컴파일된 그래프로 검증하여 에러를 반환합니다.
+        with self.assertRaises(SheetNotAccessibleException):
+            validate_user_playing_sheet(self.user.id, self.final_sheet.id, get_story_graph(self.story.id))
+
+
+class GetSheetPathInfosTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.all()[0]
+        self.story = Story.objects.create(
+            author=self.user,
+            title='test_story',
+            description='test_description',
+        )
+        self.start_sheet = Sheet.objects.create(
+            story=self.story,
+            title='start',
+            question='test_question',
+            is_start=True,
+        )
+        self.middle_sheet = Sheet.objects.create(
+            story=self.story,
+            title='middle',
+            question='test_question',
+        )
+        self.final_sheet = Sheet.objects.create(
+            story=self.story,
+            title='final',
+            question='test_question',
+            is_final=True,
+        )
+        self.deleted_sheet = Sheet.objects.create(
+            story=self.story,
+            title='deleted',
+            question='test_question',
+            is_deleted=True,
+        )
+        # 경로: start -> middle -> final, deleted -> final, start -> middle (재해결)
+        self.sheet_path = [
+            (self.start_sheet.id, self.middle_sheet.id),
+            (self.middle_sheet.id, self.final_sheet.id),
+            (self.deleted_sheet.id, self.final_sheet.id),
+            (self.start_sheet.id, self.middle_sheet.id),
+        ]
+
+    def test_get_previous_sheet_infos(self):
+        # When: final Sheet 의 이전 Sheet 목록을 가져옵니다.
+        previous_sheet_infos = get_previous_sheet_infos(self.sheet_path, self.final_sheet.id, get_story_graph(self.story.id))
+
+        # Then: 삭제된 Sheet 를 제외한 이전 Sheet 목록
+        self.assertEqual(previous_sheet_infos, [PreviousSheetInfoDTO(sheet_id=self.middle_sheet.id, title='middle')])
+
+    def test_get_sheet_path_infos(self):
+        # When: 돌아갈 수 있는 경로를 가져옵니다.
+        sheet_path_infos = get_sheet_path_infos(self.sheet_path, get_story_graph(self.story.id))
+
+        # Then: 처음 해결한 순서대로 중복 없이, 삭제된 Sheet 를 제외한 목록
+        self.assertEqual(
+            sheet_path_infos,
+            [
+                PreviousSheetInfoDTO(sheet_id=self.start_sheet.id, title='start'),
+                PreviousSheetInfoDTO(sheet_id=self.middle_sheet.id, title='middle'),
+            ]
+        )
+
+
 class GetSheetSolvedUserSheetAnswerTestCase(LoginMixin, TestCase):
     def setUp(self):
         self.user = User.objects.all()[0]
@@ -744,6 +1282,28 @@ class CreateStoryLikeTestCase(TestCase):
         self.assertEqual(story_like.user_id, self.user.id)
         self.assertEqual(story_like.story_id, self.story.id)
 
+    def test_create_story_like_should_not_increase_like_count_when_already_liked(self):
+        # Given: 이미 좋아요를 했습니다.
+        create_story_like(self.story.id, self.user.id)
+
+        # When: 다시 좋아요를 합니다.
+        create_story_like(self.story.id, self.user.id)
+
+        # Then: 좋아요 개수는 그대로 입니다.
+        self.story.refresh_from_db()
+        self.assertEqual(self.story.like_count, 1)
+
+    def test_create_story_like_should_not_count_all_story_likes(self):
+        # Given: 다른 유저의 좋아요가 있습니다.
+        for i in range(3):
+            user = User.objects.create_user(username=f'like_user{i}', password='secret', email=f'like_user{i}@example.com')
+            create_story_like(self.story.id, user.id)
+
+        # When: 좋아요를 합니다.
+        # Then: StoryLike 조회/생성과 like_count, 시간별 좋아요 집계 update (및 savepoint) 만 실행되고 COUNT 조회를 하지 않습니다.
+        with self.assertNumQueries(8):
+            create_story_like(self.story.id, self.user.id)
+
 
 class DeleteStoryLikeTestCase(TestCase):
     def setUp(self):
@@ -772,33 +1332,38 @@ class DeleteStoryLikeTestCase(TestCase):
         self.assertEqual(story_like.user_id, self.user.id)
         self.assertEqual(story_like.story_id, self.story.id)
 
+    def test_delete_story_like_should_not_decrease_like_count_below_zero(self):
+        # Given: like_count 가 어긋나 0 인 상태에서 좋아요가 있습니다.
+        StoryLike.objects.create(
+            user=self.user,
+            story=self.story,
+        )
+
+        # When: 좋아요를 취소합니다.
+        delete_story_like(self.story.id, self.user.id)
+
+        # Then: like_count 는 0 미만이 되지 않습니다.
+        self.story.refresh_from_db()
+        self.assertEqual(self.story.like_count, 0)
+
 
-class UpdateStoryLikeCountTestCase(TestCase):
+class IncreaseStoryPlayedCountTestCase(TestCase):
     def setUp(self):
         self.user = User.objects.all()[0]
         self.story = Story.objects.create(
             author=self.user,
             title='test_story',
             description='test_description',
-            image='https://image.test',
-            background_image='https://image.test',
         )
 
-    def test_update_story_total_like_count(self):
-        # Given: StoryLike 생성
-        StoryLike.objects.create(
-            user=self.user,
-            story=self.story,
-        )
-        # And: like_count 가 0
-        self.assertEqual(self.story.like_count, 0)
+    def test_increase_story_played_count(self):
+        # When: 두번 실행
+        increase_story_played_count(self.story.id)
+        increase_story_played_count(self.story.id)
 
-        # When: 함수 실행
-        update_story_total_like_count(self.story.id)
-
-        # Then: 개수 1 증가
+        # Then: 2 증가
         self.story.refresh_from_db()
-        self.assertEqual(self.story.like_count, 1)
+        self.assertEqual(self.story.played_count, 2)
 
 
 class GetActiveStoriesTestCase(TestCase):
@@ -864,6 +1429,25 @@ class GetActiveStoriesTestCase(TestCase):
         self.assertTrue(active_stories[0].id, active_story2.id)
         self.assertTrue(active_stories[1].id, self.active_story.id)
 
+    def test_get_active_stories_by_search_should_order_by_relevance(self):
+        # Given: 제목에 검색어가 있는 Story, 설명에만 검색어가 있는 최신 Story
+        title_story = Story.objects.create(
+            author=self.user,
+            title='모험 스토리',
+            description='설명',
+        )
+        description_story = Story.objects.create(
+            author=self.user,
+            title='제목',
+            description='모험',
+        )
+
+        # When: 검색합니다.
+        active_stories = get_active_stories(search='모험')
+
+        # Then: 제목에 검색어가 있는 Story 가 먼저 조회됩니다.
+        self.assertEqual(active_stories, [title_story, description_story])
+
 
 class TestGetActiveStoryById(TestCase):
     def setUp(self):
@@ -892,101 +1476,218 @@ class TestGetActiveStoryById(TestCase):
         with self.assertRaises(StoryDoesNotExists):
             get_active_story_by_id(self.story4.id)
 
-    def test_get_stories_order_by_fields(self):
-        # Given: like_count 적용
-        self.story1.like_count = 2
-        self.story1.is_deleted = False
-        self.story1.displayable = True
-        self.story1.save()
-        self.story2.like_count = 6
-        self.story2.is_deleted = False
-        self.story2.displayable = True
-        self.story2.save()
-        self.story3.like_count = 3
-        self.story3.is_deleted = False
-        self.story3.displayable = True
-        self.story3.save()
-        for i in range(10):
-            Story.objects.create(is_deleted=False, displayable=True, like_count=1)
-
-        # When: 조회
-        order_by_like_count_active_stories = get_stories_order_by_fields(None, '-like_count')
-
-        # Then: 최대 6개의 Story 조회
-        self.assertEqual(len(order_by_like_count_active_stories), 6)
-        # And: like_count 내림차순 정렬
-        self.assertEqual(order_by_like_count_active_stories[0].id, self.story2.id)
-        self.assertEqual(order_by_like_count_active_stories[1].id, self.story3.id)
-        self.assertEqual(order_by_like_count_active_stories[2].id, self.story1.id)
 
-
-class GetActivePopularStoriesTestCase(TestCase):
+@override_settings(CACHES=LOCMEM_CACHES)
+@patch('story.services._story_title_autocomplete', None)
+class AutocompleteStoryTitlesTestCase(TestCase):
     def setUp(self):
+        cache.clear()
         self.user = User.objects.all()[0]
-        self.active_story = Story.objects.create(
+        self.story = Story.objects.create(
             author=self.user,
-            title='test_story',
+            title='모험 스토리',
             description='test_description',
-            image='https://image.test',
-            background_image='https://image.test',
+            like_count=1,
         )
-        self.displayable_false_story = Story.objects.create(
+        self.popular_story = Story.objects.create(
             author=self.user,
-            title='test_story',
+            title='스토리 빌더',
+            description='test_description',
+            like_count=10,
+        )
+        Story.objects.create(
+            author=self.user,
+            title='스토리 비밀',
+            description='test_description',
+            is_secret=True,
+        )
+        Story.objects.create(
+            author=self.user,
+            title='스토리 비활성',
             description='test_description',
-            image='https://image.test',
-            background_image='https://image.test',
             displayable=False,
         )
-        self.deleted_story = Story.objects.create(
+
+    def test_autocomplete_story_titles_should_not_hit_db_after_build(self):
+        # Given: 자동완성을 1번 만듭니다.
+        autocomplete_story_titles('스')
+
+        # When: 다시 자동완성 합니다.
+        with self.assertNumQueries(0):
+            items = autocomplete_story_titles('스토')
+
+        # Then: 활성, 공개 Story 만 like_count 순으로 반환합니다.
+        self.assertEqual([item.story_id for item in items], [self.popular_story.id, self.story.id])
+
+    def test_autocomplete_story_titles_should_update_incrementally_on_story_change(self):
+        # Given: 자동완성을 1번 만듭니다.
+        autocomplete_story_titles('스')
+
+        # When: Story 제목을 바꾸고, 새 Story 를 만들고, Story 를 비밀로 바꿉니다.
+        self.story.title = '빌더 모험'
+        self.story.save()
+        new_story = Story.objects.create(
+            author=self.user,
+            title='스토리 새로운',
+            description='test_description',
+        )
+        self.popular_story.is_secret = True
+        self.popular_story.save()
+
+        # Then: DB 에서 다시 만들지 않고 바뀐 내용으로 자동완성 합니다.
+        with self.assertNumQueries(0):
+            self.assertEqual([item.story_id for item in autocomplete_story_titles('스토')], [new_story.id])
+            self.assertEqual([item.story_id for item in autocomplete_story_titles('모험')], [self.story.id])
+
+    def test_autocomplete_story_titles_should_rebuild_when_version_changed(self):
+        # Given: 자동완성을 1번 만듭니다.
+        autocomplete_story_titles('스')
+
+        # When: 다른 프로세스에서 Story 가 바뀌어 version 이 올라갑니다.
+        Story.objects.filter(id=self.story.id).update(title='스토리 다른 프로세스')
+        increase_cache_version_by_key(STORY_TITLE_AUTOCOMPLETE_VERSION_KEY)
+
+        # Then: DB 에서 다시 만듭니다.
+        with self.assertNumQueries(1):
+            items = autocomplete_story_titles('스토리 다른')
+        self.assertEqual([item.title for item in items], ['스토리 다른 프로세스'])
+
+    def test_autocomplete_story_titles_should_clamp_size(self):
+        # Expect: 0 이하의 size 는 1개, 최대보다 큰 size 는 최대 개수까지 like_count 상위부터 반환
+        self.assertEqual([item.story_id for item in autocomplete_story_titles('스토', 0)], [self.popular_story.id])
+        self.assertEqual([item.story_id for item in autocomplete_story_titles('스토', -1)], [self.popular_story.id])
+        self.assertEqual(
+            [item.story_id for item in autocomplete_story_titles('스토', 1000)],
+            [self.popular_story.id, self.story.id],
+        )
+
+    def test_autocomplete_story_titles_should_return_empty_list_when_search_empty(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(autocomplete_story_titles(''), [])
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class GetPopularStoryListItemsTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.all()[0]
+        self.member = User.objects.create_user(username='secret_member', password='secret', email='secret_member@test.com')
+        self.story = Story.objects.create(
             author=self.user,
             title='test_story',
             description='test_description',
-            image='https://image.test',
-            background_image='https://image.test',
-            is_deleted=True,
         )
-        self.popular_story = PopularStory.objects.create(
-            story=self.active_story,
+        self.secret_story = Story.objects.create(
+            author=self.user,
+            title='test_secret_story',
+            description='test_description',
+            is_secret=True,
+        )
+        self.secret_story.secret_members.add(self.member)
+        PopularStory.objects.create(
+            story=self.secret_story,
             rank=1,
-            like_count=1,
-            base_past_second=1,
-            is_deleted=False,
+            like_count=2,
+            base_past_second=60 * 60,
         )
-        self.displayable_false_popular_story = PopularStory.objects.create(
-            story=self.displayable_false_story,
+        PopularStory.objects.create(
+            story=self.story,
             rank=2,
             like_count=1,
-            base_past_second=1,
-            is_deleted=False,
-        )
-        self.deleted_popular_story_by_story = PopularStory.objects.create(
-            story=self.deleted_story,
-            rank=3,
-            like_count=1,
-            base_past_second=1,
-            is_deleted=False,
-        )
-        self.deleted_popular_story = PopularStory.objects.create(
-            story=self.active_story,
-            rank=4,
-            like_count=1,
-            base_past_second=1,
-            is_deleted=True,
-        )
+            base_past_second=60 * 60,
+        )
+
+    def test_get_popular_story_list_items_should_share_cache(self):
+        # Given: 비로그인 유저가 인기 스토리를 1번 조회합니다.
+        get_popular_story_list_items(AnonymousUser())
+
+        # When: 비로그인 유저, 비밀 Story 멤버가 다시 조회합니다.
+        with self.assertNumQueries(0):
+            anonymous_items = get_popular_story_list_items(AnonymousUser())
+        # Then: 비밀 Story 멤버는 유저의 비밀 Story id 만 1번 조회합니다.
+        with self.assertNumQueries(1):
+            member_items = get_popular_story_list_items(self.member)
+        with self.assertNumQueries(0):
+            get_popular_story_list_items(self.member)
+
+        # And: 비로그인 유저는 비밀 Story 를 볼 수 없습니다.
+        self.assertEqual([item.story_id for item in anonymous_items], [self.story.id])
+        self.assertEqual([item.story_id for item in member_items], [self.secret_story.id, self.story.id])
+        # And: 멤버가 아닌 유저도 볼 수 없습니다.
+        self.assertEqual([item.story_id for item in get_popular_story_list_items(self.user)], [self.story.id])
+
+    def test_get_popular_story_list_items_should_invalidate_on_change(self):
+        # Given: 비밀 Story 멤버가 인기 스토리를 조회합니다.
+        get_popular_story_list_items(self.member)
+
+        # When: 멤버에서 제외되고, Story 제목이 바뀝니다.
+        self.secret_story.secret_members.remove(self.member)
+        self.story.title = 'changed_title'
+        self.story.save()
+
+        # Then: 바뀐 내용으로 다시 조회합니다.
+        items = get_popular_story_list_items(self.member)
+        self.assertEqual([(item.story_id, item.title) for item in items], [(self.story.id, 'changed_title')])
+
+    def test_get_popular_story_list_items_should_return_stale_while_revalidating(self):
+        # Given: 캐시된 인기 스토리가 만료되었고, 다른 요청이 재생성 중입니다.
+        get_popular_story_list_items(AnonymousUser())
+        cache_key = POPULAR_STORY_LIST_CACHE_KEY.format(
+            version=cache.get(POPULAR_STORY_CACHE_VERSION_KEY),
+            window=DEFAULT_POPULAR_STORY_WINDOW,
+        )
+        cache.set(cache_key, dict(cache.get(cache_key), fresh_until=0))
+        cache.add(f'{cache_key}:lock', 1)
+
+        # When: 인기 스토리를 조회합니다.
+        # Then: DB 조회 없이 만료된 목록을 반환합니다.
+        with self.assertNumQueries(0):
+            items = get_popular_story_list_items(AnonymousUser())
+        self.assertEqual([item.story_id for item in items], [self.story.id])
+
+        # When: 재생성이 끝나 lock 이 없으면
+        cache.delete(f'{cache_key}:lock')
+        # Then: 1개의 요청이 다시 생성합니다.
+        with self.assertNumQueries(1):
+            get_popular_story_list_items(AnonymousUser())
+        with self.assertNumQueries(0):
+            get_popular_story_list_items(AnonymousUser())
+
+    def test_get_popular_story_list_items_when_popular_story_not_exists(self):
+        # Given: PopularStory 가 없고, 좋아요 된 Story 가 있습니다.
+        PopularStory.objects.all().delete()
+        Story.objects.filter(id__in=[self.story.id, self.secret_story.id]).update(like_count=1)
+
+        # When: 인기 스토리를 조회합니다.
+        # Then: 좋아요 순 Story 목록을 반환합니다.
+        self.assertEqual([item.story_id for item in get_popular_story_list_items(AnonymousUser())], [self.story.id])
+        self.assertEqual(
+            [item.story_id for item in get_popular_story_list_items(self.member)],
+            [self.story.id, self.secret_story.id],
+        )
+
+    def test_get_popular_story_list_items_should_include_member_secret_story_when_popular_story_not_exists(self):
+        # Given: PopularStory 가 없고, 멤버의 비밀 Story 보다 좋아요가 많은 다른 비밀 Story 가 kill switch 개수만큼 있습니다.
+        PopularStory.objects.all().delete()
+        Story.objects.filter(id__in=[self.story.id, self.secret_story.id]).update(like_count=1)
+        for i in range(DEFAULT_POPULAR_KILL_SWITCH_STORY_COUNT):
+            Story.objects.create(
+                author=self.user,
+                title=f'other_secret_story{i}',
+                description='test_description',
+                is_secret=True,
+                like_count=10,
+            )
 
-    def test_get_active_popular_stories(self):
-        # Given: setUp 에서 4개 PopularStory 생성
-        # self.popular_story: story 정상
-        # self.displayable_false_popular_story: story 가 displayable False
-        # self.deleted_popular_story_by_story: story 가 is_deleted True
-        # self.deleted_popular_story: popular story 가 is_deleted True
-        active_popular_stories = get_active_popular_stories()
+        # When: 멤버가 인기 스토리를 조회합니다.
+        items = get_popular_story_list_items(self.member)
 
-        # Expect: 1개만 active
-        self.assertIsInstance(active_popular_stories, list)
-        self.assertTrue(len(active_popular_stories) == 1)
-        self.assertTrue(active_popular_stories[0].id, self.popular_story.id)
+        # Then: 멤버의 비밀 Story 도 좋아요 순 목록에 포함됩니다.
+        self.assertEqual([item.story_id for item in items], [self.story.id, self.secret_story.id])
+
+    def test_get_popular_story_list_items_should_fail_when_window_invalid(self):
+        with self.assertRaises(PopularStoryWindowInvalidException):
+            get_popular_story_list_items(AnonymousUser(), window='30d')
 
 
 class ResetUserStorySheetAnswerSolve(LoginMixin, TestCase):
@@ -1049,6 +1750,16 @@ class ResetUserStorySheetAnswerSolve(LoginMixin, TestCase):
         # Expect: False 반환
         self.assertFalse(reset_user_story_sheet_answer_solves(self.user.id, self.story.id))
 
+    def test_reset_user_story_sheet_answer_solves_should_reset_sheet_path(self):
+        # Given: 유저의 Story 경로
+        UserStorySolve.append_sheet_path(self.user.id, self.story.id, self.start_sheet.id, self.final_sheet1.id)
+
+        # When:
+        reset_user_story_sheet_answer_solves(self.user.id, self.story.id)
+
+        # Then: 경로가 초기화 됩니다.
+        self.assertEqual(UserStorySolve.get_sheet_path(self.user.id, self.story.id), [])
+
     def test_reset_user_story_sheet_answer_solves_should_return_true_when_user_sheet_answer_solve_exists(self):
         # Given:
         data_dict = {}
@@ -1138,6 +1849,29 @@ class CreateWrongAnswerTestCase(TestCase):
         self.assertEqual(wrong_answer.sheet_id, self.start_sheet.id)
         self.assertEqual(wrong_answer.answer, wrong_answer_text)
 
+    @override_settings(WRONG_ANSWER_WRITE_BEHIND=True, WRONG_ANSWER_BUFFER_CHUNK_SIZE=3, WRONG_ANSWER_BUFFER_MAX_LATENCY_SECONDS=5)
+    @patch('story.buffers._local_list_buffer', new_callable=LocalListBuffer)
+    @patch('story.services.flush_wrong_answer_buffer.apply_async')
+    def test_create_wrong_answer_should_buffer_when_write_behind(self, mock_flush_wrong_answer_buffer, mock_local_list_buffer):
+        # When: write-behind 설정에서 오답을 1개 제출합니다.
+        wrong_answer = create_wrong_answer(self.user.id, self.story.id, self.start_sheet.id, 'wrong_answer_text')
+
+        # Then: 바로 저장하지 않고 버퍼에 쌓습니다.
+        self.assertIsNone(wrong_answer)
+        self.assertFalse(WrongAnswer.objects.filter(sheet=self.start_sheet).exists())
+        self.assertEqual(WrongAnswerBuffer().size(), 1)
+        # And: 버퍼에 처음 쌓였기 때문에 최대 지연 시간 후 flush 를 enqueue 합니다.
+        mock_flush_wrong_answer_buffer.assert_called_once_with(countdown=5)
+
+        # When: chunk 크기만큼 오답을 쌓습니다.
+        mock_flush_wrong_answer_buffer.reset_mock()
+        create_wrong_answer(self.user.id, self.story.id, self.start_sheet.id, 'wrong_answer_text')
+        mock_flush_wrong_answer_buffer.assert_not_called()
+        create_wrong_answer(self.user.id, self.story.id, self.start_sheet.id, 'wrong_answer_text')
+
+        # Then: 즉시 flush 를 enqueue 합니다.
+        mock_flush_wrong_answer_buffer.assert_called_once_with()
+
 
 class GetUserSheetAnswerSolveHistoriesTestCase(TestCase):
     def setUp(self):
@@ -1311,3 +2045,124 @@ class GetUserSheetAnswerSolveHistoriesTestCase(TestCase):
         self.assertEqual(user_sheet_answer_solve_histories[3].solving_status, self.user_sheet_answer_solve_middle_sheet_history1.solving_status)
         self.assertEqual(user_sheet_answer_solve_histories[3].start_time, self.user_sheet_answer_solve_middle_sheet_history1.start_time.strftime('%Y-%m-%d %H:%M:%S'))
         self.assertEqual(user_sheet_answer_solve_histories[3].solved_time, self.user_sheet_answer_solve_middle_sheet_history1.solved_time.strftime('%Y-%m-%d %H:%M:%S'))
+
+
+class DTOModelFieldsProjectionTestCase(TestCase):
+    """
+    목록 조회는 DTO 가 선언한 필드만 조회하므로, DTO 가 선언하지 않은 필드를 사용하면 row 마다 deferred query 가 발생하여 실패합니다.
+    """
+    def setUp(self):
+        self.user = User.objects.all()[0]
+        self.story = Story.objects.create(
+            author=self.user,
+            title='test_story',
+            description='test_description',
+            image='https://image.test',
+            background_image='https://image.test',
+            like_count=1,
+        )
+        self.secret_story = Story.objects.create(
+            author=self.user,
+            title='test_secret_story',
+            description='test_description',
+            like_count=2,
+            is_secret=True,
+        )
+        self.start_sheet = Sheet.objects.create(
+            story=self.story,
+            title='test_title',
+            question='test_question',
+            is_start=True,
+        )
+        self.final_sheet = Sheet.objects.create(
+            story=self.story,
+            title='test_title',
+            question='test_question',
+            is_final=True,
+        )
+        self.sheet_answer = SheetAnswer.objects.create(
+            sheet=self.start_sheet,
+            answer='test',
+            answer_reply='test_reply',
+        )
+        self.next_sheet_path = NextSheetPath.objects.create(
+            answer=self.sheet_answer,
+            sheet=self.final_sheet,
+            quantity=1,
+        )
+        UserSheetAnswerSolve.objects.create(
+            user=self.user,
+            story=self.story,
+            sheet=self.start_sheet,
+            sheet_question='test_question',
+            answer='test',
+            solved_sheet_version=self.start_sheet.version,
+            solved_answer_version=self.sheet_answer.version,
+            solved_sheet_answer=self.sheet_answer,
+            solving_status=UserSheetAnswerSolve.SOLVING_STATUS_CHOICES[1][0],
+            next_sheet_path=self.next_sheet_path,
+        )
+        for rank, story in enumerate([self.story, self.secret_story], 1):
+            PopularStory.objects.create(
+                story=story,
+                rank=rank,
+                like_count=1,
+                base_past_second=60 * 60,
+            )
+
+    def test_get_active_stories_should_not_query_when_dto_is_created(self):
+        # Given: 목록 조회
+        stories = get_active_stories()
+        # Then: DTO 가 사용하지 않는 필드는 조회하지 않습니다.
+        self.assertIn('played_count', stories[0].get_deferred_fields())
+
+        # When: DTO 생성
+        # Then: 추가 query 가 없습니다.
+        with self.assertNumQueries(0):
+            items = [StoryListItemDTO.of(story).to_dict() for story in stories]
+        self.assertEqual(items[0]['description'], 'test_description')
+
+    def test_get_active_stories_by_cursor_should_not_query_when_dto_is_created(self):
+        # Given: cursor 목록 조회
+        stories, _ = get_active_stories_by_cursor(cursor='', size=10)
+
+        # When: DTO 생성
+        # Then: 추가 query 가 없습니다.
+        with self.assertNumQueries(0):
+            items = [StoryListItemDTO.of(story).to_dict() for story in stories]
+        self.assertEqual(items[0]['id'], self.story.id)
+
+    def test_get_popular_story_list_should_query_once(self):
+        # When: 인기 스토리 목록 생성
+        # Then: Story 를 포함하여 한번만 조회합니다.
+        with self.assertNumQueries(1):
+            popular_story_list = get_popular_story_list(60 * 60)
+        self.assertEqual([item.story_id for item in popular_story_list.items], [self.story.id, self.secret_story.id])
+        self.assertEqual(popular_story_list.secret_story_ids, frozenset([self.secret_story.id]))
+
+    def test_get_kill_switch_popular_story_list_should_query_once(self):
+        # When: kill switch 목록 생성
+        # Then: 한번만 조회하며, 공개 Story 만 가져옵니다.
+        with self.assertNumQueries(1):
+            popular_story_list = get_kill_switch_popular_story_list()
+        self.assertEqual([item.story_id for item in popular_story_list.items], [self.story.id])
+
+        # When: 비밀 Story id 와 함께 kill switch 목록 생성
+        # Then: 한번만 조회하며, 비밀 Story 를 포함합니다.
+        with self.assertNumQueries(1):
+            popular_story_list = get_kill_switch_popular_story_list(frozenset([self.secret_story.id]))
+        self.assertEqual([item.story_id for item in popular_story_list.items], [self.secret_story.id, self.story.id])
+
+    def test_get_sheet_solved_user_sheet_answer_should_not_query_when_dto_is_created(self):
+        # Given: 해결한 UserSheetAnswerSolve 조회
+        solved_user_sheet_answer = get_sheet_solved_user_sheet_answer(self.user.id, self.start_sheet.id)
+        # Then: DTO 가 사용하지 않는 sheet_question 은 조회하지 않습니다.
+        self.assertIn('sheet_question', solved_user_sheet_answer.get_deferred_fields())
+
+        # When: DTO 생성
+        # Then: 추가 query 가 없습니다.
+        with self.assertNumQueries(0):
+            playing_sheet = PlayingSheetInfoDTO.of(self.start_sheet, solved_user_sheet_answer).to_dict()
+        self.assertEqual(playing_sheet['next_sheet_id'], self.final_sheet.id)
+        self.assertEqual(playing_sheet['answer'], 'test')
+        self.assertEqual(playing_sheet['answer_reply'], 'test_reply')
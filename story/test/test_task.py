@@ -0,0 +1,87 @@
+from django.test import TestCase
+from unittest.mock import patch
+
+from account.models import User
+from story.models import Sheet, Story, StoryEmailSubscription, StorySlackSubscription, UserSheetAnswerSolve
+from story.task import send_user_sheet_solved_email, send_user_sheet_solved_notifications
+
+
+class SendUserSheetSolvedNotificationsTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.all()[0]
+        self.story = Story.objects.create(
+            author=self.user,
+            title='test_story',
+            description='test_description',
+        )
+        self.sheet = Sheet.objects.create(
+            story=self.story,
+            title='test_title',
+            question='test_question',
+            is_start=True,
+        )
+        self.user_sheet_answer_solve = UserSheetAnswerSolve.objects.create(
+            user=self.user,
+            story=self.story,
+            sheet=self.sheet,
+            answer='test',
+            solving_status=UserSheetAnswerSolve.SOLVING_STATUS_CHOICES[1][0],
+        )
+
+    @patch('story.task.notify_slack_channels')
+    @patch('story.task.send_email')
+    def test_send_user_sheet_solved_notifications_should_send_email_and_slack_at_once(self, mock_send_email, mock_notify_slack_channels):
+        # Given: 관전 이메일 2개, Slack webhook 2개
+        for email in ['test1@test.com', 'test2@test.com']:
+            StoryEmailSubscription.objects.create(
+                story=self.story,
+                respondent_user=self.user,
+                email=email,
+            )
+        for slack_webhook_url in ['https://slack.test/1', 'https://slack.test/2']:
+            StorySlackSubscription.objects.create(
+                story=self.story,
+                respondent_user=self.user,
+                slack_webhook_url=slack_webhook_url,
+                slack_channel_description='test',
+            )
+
+        # When: 알림 task 실행
+        send_user_sheet_solved_notifications(self.user_sheet_answer_solve.id)
+
+        # Then: 이메일은 한번에 모든 대상에게 보냅니다.
+        mock_send_email.assert_called_once()
+        self.assertEqual(set(mock_send_email.call_args.kwargs['to']), {'test1@test.com', 'test2@test.com'})
+        # And: Slack webhook 은 한번에 모든 대상에게 보냅니다.
+        mock_notify_slack_channels.assert_called_once()
+        self.assertEqual(
+            set(mock_notify_slack_channels.call_args.kwargs['channel_urls']),
+            {'https://slack.test/1', 'https://slack.test/2'},
+        )
+
+    @patch('story.task.notify_slack_channels')
+    @patch('story.task.send_email')
+    def test_send_user_sheet_solved_notifications_should_not_send_email_when_email_subscription_not_exists(self, mock_send_email, mock_notify_slack_channels):
+        # Given: 관전 이메일이 없습니다.
+        # When: 알림 task 실행
+        send_user_sheet_solved_notifications(self.user_sheet_answer_solve.id)
+
+        # Then: 이메일을 보내지 않습니다.
+        mock_send_email.assert_not_called()
+
+    @patch('story.task.send_email')
+    def test_send_user_sheet_solved_email_should_send_same_email_as_notifications(self, mock_send_email):
+        # Given: 관전 이메일 1개
+        StoryEmailSubscription.objects.create(
+            story=self.story,
+            respondent_user=self.user,
+            email='test@test.com',
+        )
+
+        # When: 이전에 enqueue 된 이메일 task 와 알림 task 를 실행합니다.
+        send_user_sheet_solved_email(self.user_sheet_answer_solve.id, ['test@test.com'])
+        send_user_sheet_solved_notifications(self.user_sheet_answer_solve.id)
+
+        # Then: 같은 이메일을 보냅니다.
+        self.assertEqual(mock_send_email.call_count, 2)
+        self.assertEqual(mock_send_email.call_args_list[0], mock_send_email.call_args_list[1])
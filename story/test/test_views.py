@@ -1,13 +1,19 @@
 import json
+import time
 from datetime import datetime
+from unittest.mock import patch
 
+from django.conf import settings
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from freezegun import freeze_time
 
 from account.models import User
 from config.common.exception_codes import StoryDoesNotExists
 from config.test_helper.helper import LoginMixin
+from story.buffers import LocalHyperLogLogClient, StoryViewCounter
 from story.constants import StoryLevel
 from story.models import (
     PopularStory,
@@ -379,6 +385,28 @@ class SheetPlayAPIViewTestCase(LoginMixin, TestCase):
         self.assertEqual(response.status_code, 400)
         self.assertEqual(content.get('message'), '존재하지 않은 Sheet 입니다.')
 
+    def test_get_sheet_play_api_should_fail_not_accessible_when_sheet_not_exists(self):
+        # When: 없는 Sheet 로 sheet_play 요청
+        response = self.c.get(reverse('story:sheet_play', args=[0]))
+        content = json.loads(response.content)
+
+        # Then: 접근할 수 없는 Sheet 입니다.
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(content.get('message'), '접근할 수 없는 Sheet 입니다.')
+
+    def test_get_sheet_play_api_should_fail_not_accessible_when_deleted_sheet_is_not_reachable(self):
+        # Given: 유저가 갈 수 없는 Sheet 가 삭제됩니다.
+        self.normal_sheet.is_deleted = True
+        self.normal_sheet.save()
+
+        # When: sheet_play 요청
+        response = self.c.get(reverse('story:sheet_play', args=[self.normal_sheet.id]))
+        content = json.loads(response.content)
+
+        # Then: 접근할 수 없는 Sheet 입니다.
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(content.get('message'), '접근할 수 없는 Sheet 입니다.')
+
     def test_get_sheet_play_api_should_return_playing_sheet_dto_when_success(self):
         # Given: 유효한 UserSheetAnswerSolve 생성
         _generate_user_sheet_answer_solve_with_next_path(
@@ -406,6 +434,27 @@ class SheetPlayAPIViewTestCase(LoginMixin, TestCase):
         self.assertIsNone(content.get('answer_reply'))
         self.assertFalse(content.get('is_solved'))
 
+    def test_get_sheet_play_api_should_return_previous_sheet_infos_from_sheet_path(self):
+        # Given: start Sheet 를 해결하여 normal Sheet 로 왔습니다.
+        _generate_user_sheet_answer_solve_with_next_path(
+            user=self.c.user,
+            story=self.story,
+            current_sheet=self.start_sheet,
+            next_sheet=self.normal_sheet,
+            sheet_answer=self.start_sheet_answer1,
+            solving_status='solved',
+        )
+        UserStorySolve.append_sheet_path(self.c.user.id, self.story.id, self.start_sheet.id, self.normal_sheet.id)
+
+        # When: sheet_play 요청
+        response = self.c.get(reverse('story:sheet_play', args=[self.normal_sheet.id]))
+        content = json.loads(response.content)
+
+        # Then: 이전 Sheet 와 돌아갈 수 있는 경로를 반환합니다.
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(content.get('previous_sheet_infos'), [{'sheet_id': self.start_sheet.id, 'title': self.start_sheet.title}])
+        self.assertEqual(content.get('sheet_path_infos'), [{'sheet_id': self.start_sheet.id, 'title': self.start_sheet.title}])
+
     def test_get_sheet_play_api_should_create_user_sheet_answer_solve_when_success(self):
         # Given: 현재 sheet를 플레이할 수 있도록 이전 UserSheetAnswerSolve 생성
         _generate_user_sheet_answer_solve_with_next_path(
@@ -671,6 +720,33 @@ class SheetAnswerCheckAPIViewTestCase(LoginMixin, TestCase):
         self.assertEqual(response.status_code, 400)
         self.assertEqual(content.get('message'), '존재하지 않은 Sheet 입니다.')
 
+    def test_submit_answer_should_read_json_body(self):
+        # Given: JSON body 로 sheet_id, 정답 명시
+
+        # When: submit_answer 요청
+        response = self.c.post(
+            reverse('story:submit_answer'),
+            data=json.dumps(self.request_data),
+            content_type='application/json',
+        )
+        content = json.loads(response.content)
+
+        # Then: 조회 성공
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(content.get('is_valid'))
+
+    def test_submit_answer_should_fail_when_sheet_id_is_not_integer(self):
+        # Given: 숫자가 아닌 sheet_id
+        self.request_data['sheet_id'] = 'sheet'
+
+        # When: submit_answer 요청
+        response = self.c.post(reverse('story:submit_answer'), data=self.request_data)
+        content = json.loads(response.content)
+
+        # Then: 입력값 Error 반환
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(content.get('message'), '입력값을 다시 확인해주세요.')
+
     def test_get_story_next_sheet_should_fail_when_story_is_deleted(self):
         # Given: sheet 삭제 됐을 경우
         self.start_sheet.story.is_deleted = True
@@ -932,6 +1008,86 @@ class StoryListAPIViewTestCase(LoginMixin, TestCase):
         self.assertEqual(len(content['stories']), 1)
         self.assertEqual(content['stories'][0]['id'], self.story2.id)
 
+    def test_story_list_api_with_cursor(self):
+        # Given: story3 추가
+        story3 = Story.objects.create(
+            author=self.user,
+            title='test_story3',
+            description='test_description3',
+        )
+
+        # When: 빈 cursor 로 첫 페이지 요청
+        response = self.c.get(reverse('story:story_list'), data={'cursor': '', 'size': 2})
+        content = json.loads(response.content)
+
+        # Then: 최신순 2개와 next_cursor 반환
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([story['id'] for story in content['stories']], [story3.id, self.story2.id])
+        self.assertTrue(content['next_cursor'])
+
+        # When: 새 story 가 추가된 후 next_cursor 로 다음 페이지 요청
+        Story.objects.create(
+            author=self.user,
+            title='test_story4',
+            description='test_description4',
+        )
+        response = self.c.get(reverse('story:story_list'), data={'cursor': content['next_cursor'], 'size': 2})
+        content = json.loads(response.content)
+
+        # Then: 중복 없이 남은 story 만 반환하고, 다음 페이지가 없음
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([story['id'] for story in content['stories']], [self.story1.id])
+        self.assertIsNone(content['next_cursor'])
+
+    def test_story_list_api_with_paging_should_return_next_cursor(self):
+        # When: page/size 로 첫 페이지 요청
+        response = self.c.get(reverse('story:story_list'), data={'size': 1})
+        content = json.loads(response.content)
+
+        # When: 받은 next_cursor 로 이어서 요청
+        response = self.c.get(reverse('story:story_list'), data={'cursor': content['next_cursor'], 'size': 1})
+        content = json.loads(response.content)
+
+        # Then: 다음 story 반환
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([story['id'] for story in content['stories']], [self.story1.id])
+
+    def test_story_list_api_with_search_cursor_should_follow_search_score(self):
+        # Given: id 순서와 검색 관련도 순서가 다른 Story 3개 (관련도: title_story > description_story)
+        both_story = Story.objects.create(author=self.user, title='모험', description='모험')
+        description_story = Story.objects.create(author=self.user, title='test_story', description='모험')
+        title_story = Story.objects.create(author=self.user, title='모험', description='test_description')
+
+        # When: page/size 로 첫 페이지 요청 후 next_cursor 로 끝까지 이어서 요청
+        response = self.c.get(reverse('story:story_list'), data={'search': '모험', 'size': 1})
+        content = json.loads(response.content)
+        story_ids = [story['id'] for story in content['stories']]
+        while content['next_cursor']:
+            response = self.c.get(
+                reverse('story:story_list'),
+                data={'search': '모험', 'cursor': content['next_cursor'], 'size': 1},
+            )
+            self.assertEqual(response.status_code, 200)
+            content = json.loads(response.content)
+            story_ids += [story['id'] for story in content['stories']]
+
+        # Then: 건너뛰거나 중복 없이 검색 관련도 순으로 반환
+        self.assertEqual(story_ids, [both_story.id, title_story.id, description_story.id])
+
+    def test_story_list_api_should_fail_when_cursor_invalid(self):
+        # Given: 변조된 cursor
+        response = self.c.get(reverse('story:story_list'), data={'cursor': '', 'size': 1})
+        cursor = json.loads(response.content)['next_cursor']
+        tampered_cursor = cursor[:-1] + ('A' if cursor[-1] != 'A' else 'B')
+
+        # When: 변조된 cursor 로 요청
+        response = self.c.get(reverse('story:story_list'), data={'cursor': tampered_cursor, 'size': 1})
+        content = json.loads(response.content)
+
+        # Then: cursor 조회 실패
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(content.get('message'), '유효하지 않은 cursor 입니다.')
+
 
 class StorySheetSolveAPIViewTestCase(LoginMixin, TestCase):
     def setUp(self):
@@ -1166,28 +1322,28 @@ class PopularStoryListAPIViewTestCase(LoginMixin, TestCase):
             story=self.active_story,
             rank=1,
             like_count=1,
-            base_past_second=1,
+            base_past_second=60 * 60,
             is_deleted=False,
         )
         self.displayable_false_popular_story = PopularStory.objects.create(
             story=self.displayable_false_story,
             rank=2,
             like_count=1,
-            base_past_second=1,
+            base_past_second=60 * 60,
             is_deleted=False,
         )
         self.deleted_popular_story_by_story = PopularStory.objects.create(
             story=self.deleted_story,
             rank=3,
             like_count=1,
-            base_past_second=1,
+            base_past_second=60 * 60,
             is_deleted=False,
         )
         self.deleted_popular_story = PopularStory.objects.create(
             story=self.active_story,
             rank=4,
             like_count=1,
-            base_past_second=1,
+            base_past_second=60 * 60,
             is_deleted=True,
         )
 
@@ -1208,6 +1364,38 @@ class PopularStoryListAPIViewTestCase(LoginMixin, TestCase):
         self.assertEqual(len(content['popular_stories']), 1)
         self.assertEqual(content['popular_stories'][0]['story_id'], self.active_story.id)
 
+    def test_popular_story_list_api_by_window(self):
+        # Given: 24h window 의 PopularStory 생성
+        story = Story.objects.create(
+            author=self.user,
+            title='test_story_24h',
+            description='test_description',
+        )
+        PopularStory.objects.create(
+            story=story,
+            rank=1,
+            like_count=1,
+            base_past_second=60 * 60 * 24,
+        )
+
+        # When: window=24h 로 요청
+        response = self.c.get(reverse('story:story_popular_list'), {'window': '24h'})
+        content = json.loads(response.content)
+
+        # Then: 정상 접근
+        self.assertEqual(response.status_code, 200)
+        # And: 24h window 의 story list 만 반환
+        self.assertEqual([popular_story['story_id'] for popular_story in content['popular_stories']], [story.id])
+
+    def test_popular_story_list_api_when_window_invalid(self):
+        # When: 유효하지 않은 window 로 요청
+        response = self.c.get(reverse('story:story_popular_list'), {'window': '30d'})
+        content = json.loads(response.content)
+
+        # Then: 인기 스토리 기간 조회 실패
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(content.get('message'), '유효하지 않은 인기 스토리 기간 입니다.')
+
     def test_popular_story_list_api_when_popular_story_not_exists(self):
         # Given: PopularStory 제거
         PopularStory.objects.all().delete()
@@ -1226,6 +1414,36 @@ class PopularStoryListAPIViewTestCase(LoginMixin, TestCase):
         self.assertEqual(content['popular_stories'][0]['story_id'], self.active_story.id)
 
 
+class StoryTitleAutocompleteAPIViewTestCase(LoginMixin, TestCase):
+    def setUp(self):
+        super(StoryTitleAutocompleteAPIViewTestCase, self).setUp()
+        self.user = User.objects.all()[0]
+        self.story = Story.objects.create(
+            author=self.user,
+            title='모험 스토리',
+            description='test_description',
+        )
+
+    def test_story_title_autocomplete_api(self):
+        # When: 자동완성 요청
+        response = self.c.get(reverse('story:story_title_autocomplete'), {'search': '스토'})
+        content = json.loads(response.content)
+
+        # Then: 정상 접근
+        self.assertEqual(response.status_code, 200)
+        # And: 단어가 검색어로 시작하는 story 반환
+        self.assertEqual(content['stories'], [{'story_id': self.story.id, 'title': '모험 스토리'}])
+
+    def test_story_title_autocomplete_api_should_fail_when_size_is_not_integer(self):
+        # When: 숫자가 아닌 size 로 자동완성 요청
+        response = self.c.get(reverse('story:story_title_autocomplete'), {'search': '스토', 'size': 'ten'})
+        content = json.loads(response.content)
+
+        # Then: 입력값 Error 반환
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(content.get('message'), '입력값을 다시 확인해주세요.')
+
+
 class StoryDetailAPIViewTestCase(LoginMixin, TestCase):
     def setUp(self):
         super(StoryDetailAPIViewTestCase, self).setUp()
@@ -1266,6 +1484,20 @@ class StoryDetailAPIViewTestCase(LoginMixin, TestCase):
         # And: is_liked True
         self.assertTrue(content['is_liked'])
 
+    @patch('story.buffers._local_hyper_log_log_client', new_callable=LocalHyperLogLogClient)
+    def test_story_detail_api_should_record_view_without_db_write(self, mock_local_hyper_log_log_client):
+        # When: 같은 유저가 story detail 을 두번 요청합니다.
+        with CaptureQueriesContext(connection) as captured_queries:
+            self.c.get(reverse('story:story_detail', args=[self.story.id]))
+            self.c.get(reverse('story:story_detail', args=[self.story.id]))
+
+        # Then: DB 에 쓰지 않습니다.
+        self.assertFalse([query for query in captured_queries if not query['sql'].startswith('SELECT')])
+        # And: 조회수는 flush 후 순 조회수 1 만큼 증가합니다.
+        StoryViewCounter().flush(timestamp=time.time() + settings.STORY_VIEW_BUCKET_SECONDS)
+        self.story.refresh_from_db()
+        self.assertEqual(self.story.view_count, 1)
+
     def test_story_detail_api_should_fail_when_story_not_exists(self):
         # Given:
         self.story.is_deleted = True
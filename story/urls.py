@@ -10,6 +10,7 @@ from story.views import (
     StoryPlayGetRecentUnsolvedSheetAPIView,
     StoryPopularListAPIView,
     StorySheetSolveAPIView,
+    StoryTitleAutocompleteAPIView,
 )
 
 
@@ -20,6 +21,7 @@ urlpatterns = [
     path('<int:story_id>', StoryDetailAPIView.as_view(), name='story_detail'),
 
     path('popular', StoryPopularListAPIView.as_view(), name='story_popular_list'),
+    path('autocomplete', StoryTitleAutocompleteAPIView.as_view(), name='story_title_autocomplete'),
 
     path('<int:story_id>/play', StoryPlayAPIView.as_view(), name='story_play'),
     path('<int:story_id>/recent-play-sheet', StoryPlayGetRecentUnsolvedSheetAPIView.as_view(), name='get_recent_play_sheet'),
@@ -1,19 +1,16 @@
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from common_decorator import mandatories, custom_login_required_for_method, pagination
-from story.constants import StoryErrorMessage
+from common_decorator import mandatories, optionals, custom_login_required_for_method, pagination
+from common_library import get_request_ip, get_next_cursor
+from story.constants import DEFAULT_POPULAR_STORY_WINDOW, DEFAULT_STORY_TITLE_AUTOCOMPLETE_SIZE
 from story.dtos import (
     PlayingSheetInfoDTO,
-    PreviousSheetInfoDTO,
     GroupedSheetAnswerSolveDTO,
     StoryListItemDTO,
     StoryDetailItemDTO,
-    StoryPopularListItemDTO,
 )
 from story.models import (
-    NextSheetPath,
-    SheetAnswer,
     Story,
     StoryLike,
     UserSheetAnswerSolve,
@@ -21,24 +18,42 @@ from story.models import (
 )
 from story.services import (
     get_running_start_sheet_by_story,
-    get_sheet_answer_with_next_path_responses,
-    get_valid_answer_info_with_random_quantity,
-    get_running_sheet,
-    validate_user_playing_sheet, get_sheet_solved_user_sheet_answer, get_recent_played_sheet_by_story_id,
-    create_story_like, delete_story_like, get_active_stories, get_active_story_by_id, get_active_popular_stories,
-    get_stories_order_by_fields, reset_user_story_sheet_answer_solves, create_wrong_answer,
-    get_user_sheet_answer_solve_histories,
+    get_user_playing_sheet,
+    validate_user_playing_sheet, get_story_graph, get_previous_sheet_infos, get_sheet_path_infos,
+    get_sheet_solved_user_sheet_answer, get_recent_played_sheet_by_story_id,
+    create_story_like, delete_story_like, get_active_stories, get_active_stories_by_cursor, get_active_stories_order_by,
+    get_active_story_by_id, get_popular_story_list_items,
+    reset_user_story_sheet_answer_solves,
+    get_user_sheet_answer_solve_histories, submit_sheet_answer, increase_story_played_count, record_story_view,
+    autocomplete_story_titles,
 )
 
 
 class StoryListAPIView(APIView):
-    @pagination(default_size=10)
-    def get(self, request, start_row, end_row):
+    @pagination(default_size=10, cursor=True)
+    def get(self, request, start_row, end_row, cursor):
         search = request.GET.get('search', '')
-        stories = get_active_stories(search, start_row, end_row, user=request.user)
+        if cursor is None:
+            stories = get_active_stories(search, start_row, end_row, user=request.user)
+            next_cursor = get_next_cursor(stories, end_row - start_row, get_active_stories_order_by(search))
+        else:
+            stories, next_cursor = get_active_stories_by_cursor(search, cursor, end_row - start_row, user=request.user)
         return Response(
             data={
-                'stories': [StoryListItemDTO.of(story).to_dict() for story in stories]
+                'stories': [StoryListItemDTO.of(story).to_dict() for story in stories],
+                'next_cursor': next_cursor,
+            },
+            status=200
+        )
+
+
+class StoryTitleAutocompleteAPIView(APIView):
+    @optionals({'search': '', 'size': DEFAULT_STORY_TITLE_AUTOCOMPLETE_SIZE}, types={'size': int})
+    def get(self, request, o):
+        items = autocomplete_story_titles(o['search'], o['size'])
+        return Response(
+            data={
+                'stories': [item.to_dict() for item in items]
             },
             status=200
         )
@@ -47,6 +62,7 @@ class StoryListAPIView(APIView):
 class StoryDetailAPIView(APIView):
     def get(self, request, story_id):
         story = get_active_story_by_id(story_id, user=request.user)
+        record_story_view(story.id, request.user.id, get_request_ip(request))
         return Response(
             data=StoryDetailItemDTO.of(
                 story,
@@ -60,23 +76,12 @@ class StoryDetailAPIView(APIView):
 
 
 class StoryPopularListAPIView(APIView):
-    def get(self, request):
-        popular_stories = get_active_popular_stories(user=request.user)
-        if not popular_stories:
-            return Response(
-                data={
-                    'popular_stories': [
-                        StoryPopularListItemDTO.by_story(story).to_dict() for story in
-                        get_stories_order_by_fields(request.user, '-like_count')
-                    ]
-                },
-                status=200
-            )
+    @optionals({'window': DEFAULT_POPULAR_STORY_WINDOW})
+    def get(self, request, o):
+        popular_story_items = get_popular_story_list_items(user=request.user, window=o['window'])
         return Response(
             data={
-                'popular_stories': [
-                    StoryPopularListItemDTO.of(popular_stories).to_dict() for popular_stories in popular_stories
-                ]
+                'popular_stories': [popular_story_item.to_dict() for popular_story_item in popular_story_items]
             },
             status=200
         )
@@ -92,9 +97,7 @@ class StoryPlayAPIView(APIView):
             user=request.user,
         )
         if is_created:
-            story = Story.objects.get(id=story_id)
-            story.played_count += 1
-            story.save()
+            increase_story_played_count(story_id)
 
         UserSheetAnswerSolve.generate_cls_if_first_time(
             user=request.user,
@@ -137,34 +140,26 @@ class StoryPlayGetRecentUnsolvedSheetAPIView(APIView):
 class SheetPlayAPIView(APIView):
     @custom_login_required_for_method
     def get(self, request, sheet_id):
-        validate_user_playing_sheet(request.user.id, sheet_id)
+        sheet = get_user_playing_sheet(request.user.id, sheet_id)
+        story_graph = get_story_graph(sheet.story_id)
+        validate_user_playing_sheet(request.user.id, sheet.id, story_graph)
 
-        sheet = get_running_sheet(sheet_id)
         user_sheet_answer_solve, _ = UserSheetAnswerSolve.generate_cls_if_first_time(
             user=request.user,
             sheet_id=sheet.id,
         )
 
         solved_user_sheet_answer = get_sheet_solved_user_sheet_answer(request.user.id, sheet_id)
-        previous_sheet_infos = UserSheetAnswerSolve.get_previous_user_sheet_answer_solves_with_current_sheet_id(
-            user_id=request.user.id,
-            current_sheet_id=sheet_id,
-        )
-        previous_sheet_info_dto_list = list(
-            map(
-                lambda previous_sheet_info: PreviousSheetInfoDTO(
-                    sheet_id=previous_sheet_info['sheet_id'],
-                    title=previous_sheet_info['sheet__title'],
-                ),
-                previous_sheet_infos
-            )
-        )
+        sheet_path = UserStorySolve.get_sheet_path(request.user.id, sheet.story_id)
+        previous_sheet_info_dto_list = get_previous_sheet_infos(sheet_path, sheet.id, story_graph)
+        sheet_path_info_dto_list = get_sheet_path_infos(sheet_path, story_graph)
         if solved_user_sheet_answer:
             return Response(
                 data=PlayingSheetInfoDTO.of(
                     sheet=sheet,
                     user_sheet_answer_solve=solved_user_sheet_answer,
                     previous_sheet_infos=previous_sheet_info_dto_list,
+                    sheet_path_infos=sheet_path_info_dto_list,
                 ).to_dict(),
                 status=200
             )
@@ -172,58 +167,19 @@ class SheetPlayAPIView(APIView):
         playing_sheet = PlayingSheetInfoDTO.of(
             sheet=sheet,
             previous_sheet_infos=previous_sheet_info_dto_list,
+            sheet_path_infos=sheet_path_info_dto_list,
         ).to_dict()
         return Response(playing_sheet, status=200)
 
 
 class SheetAnswerCheckAPIView(APIView):
-    @mandatories('sheet_id', 'answer')
+    @mandatories('sheet_id', 'answer', types={'sheet_id': int})
     @custom_login_required_for_method
     def post(self, request, m):
-        sheet = get_running_sheet(m['sheet_id'])
-
-        answer_responses = get_sheet_answer_with_next_path_responses(sheet.id)
-        answer_reply = None
-
-        solved_user_sheet_answer = get_sheet_solved_user_sheet_answer(request.user.id, sheet.id)
-        if solved_user_sheet_answer:
-            return Response({'message': StoryErrorMessage.ALREADY_SOLVED.label}, status=400)
-
-        is_valid, sheet_answer_id, next_sheet_path_id, next_sheet_id = get_valid_answer_info_with_random_quantity(
-            answer=m['answer'],
-            answer_responses=answer_responses
+        return Response(
+            data=submit_sheet_answer(request.user.id, m['sheet_id'], m['answer']).to_dict(),
+            status=200
         )
-        if not is_valid:
-            create_wrong_answer(request.user.id, int(sheet.story_id), sheet.id, m['answer'])
-
-        # 나중에 Service 레이어로 위치 변환
-        try:
-            sheet_answer = SheetAnswer.objects.select_related(
-                'sheet'
-            ).get(
-                id=sheet_answer_id
-            )
-            answer_reply = sheet_answer.answer_reply
-            if is_valid and request.user.is_authenticated:
-                user_sheet_answer_solve = UserSheetAnswerSolve.objects.get(
-                    user=request.user,
-                    sheet=sheet_answer.sheet,
-                )
-                try:
-                    next_sheet_path = NextSheetPath.objects.get(
-                        id=next_sheet_path_id,
-                        sheet_id=next_sheet_id,
-                    )
-                except NextSheetPath.DoesNotExist:
-                    next_sheet_path = None
-                user_sheet_answer_solve.solved_sheet_action(
-                    solved_sheet_answer=sheet_answer,
-                    next_sheet_path=next_sheet_path,
-                )
-        except (SheetAnswer.DoesNotExist, UserSheetAnswerSolve.DoesNotExist):
-            return Response({'is_valid': is_valid, 'next_sheet_id': next_sheet_id, 'answer_reply': answer_reply}, status=200)
-
-        return Response({'is_valid': is_valid, 'next_sheet_id': next_sheet_id, 'answer_reply': answer_reply}, status=200)
 
 
 class StorySheetSolveAPIView(APIView):